@@ -0,0 +1,41 @@
+"""Add data_versions table (ledger / period / chart-of-accounts versions)
+
+Revision ID: 2d8f6b4a1c73
+Revises: 9b1e4f6a2c58
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f6b4a1c73'
+down_revision: Union[str, Sequence[str], None] = '9b1e4f6a2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Khớp với CAC_DONG_PHIEN_BAN trong app/infrastructure/models/
+# sql_data_version.py
+CAC_DONG_PHIEN_BAN = ('so_cai', 'ky_ke_toan', 'tai_khoan')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bang = op.create_table(
+        'data_versions',
+        sa.Column('ten', sa.String(length=30), nullable=False),
+        sa.Column('phien_ban', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('ten'),
+    )
+    op.bulk_insert(
+        bang, [{'ten': ten, 'phien_ban': 0} for ten in CAC_DONG_PHIEN_BAN]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_versions')
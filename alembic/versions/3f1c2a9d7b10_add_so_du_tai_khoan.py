@@ -0,0 +1,101 @@
+"""Add so_du_tai_khoan (monthly account balance) table with backfill
+
+Revision ID: 3f1c2a9d7b10
+Revises: 8e7bd485b202
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b10'
+down_revision: Union[str, Sequence[str], None] = '8e7bd485b202'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    so_du_tai_khoan = op.create_table(
+        'so_du_tai_khoan',
+        sa.Column('so_tai_khoan', sa.String(length=20), nullable=False),
+        sa.Column('ky_thang', sa.Integer(), nullable=False),
+        sa.Column(
+            'so_du_dau_ky',
+            sa.Numeric(precision=19, scale=4),
+            nullable=False,
+        ),
+        sa.Column('ps_no', sa.Numeric(precision=19, scale=4), nullable=False),
+        sa.Column('ps_co', sa.Numeric(precision=19, scale=4), nullable=False),
+        sa.Column(
+            'so_du_cuoi_ky',
+            sa.Numeric(precision=19, scale=4),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ['so_tai_khoan'],
+            ['accounts.so_tai_khoan'],
+            name=op.f('so_du_tai_khoan_so_tai_khoan_fkey'),
+        ),
+        sa.PrimaryKeyConstraint(
+            'so_tai_khoan', 'ky_thang', name=op.f('so_du_tai_khoan_pkey')
+        ),
+    )
+
+    # --- Backfill từ các bút toán đã ghi sổ ---
+    # Gom theo (tài khoản, ngày) trong SQL, gom tiếp theo tháng và tính số dư
+    # lũy kế ở Python để không phụ thuộc hàm ngày tháng của từng dialect.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT l.so_tai_khoan, e.ngay_ct,
+                   SUM(l.no) AS ps_no, SUM(l.co) AS ps_co
+            FROM journal_entry_lines l
+            JOIN journal_entries e ON e.id = l.journal_entry_id
+            WHERE e.trang_thai = 'Posted'
+            GROUP BY l.so_tai_khoan, e.ngay_ct
+            """
+        )
+    )
+    theo_thang = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for so_tai_khoan, ngay_ct, ps_no, ps_co in rows:
+        if isinstance(ngay_ct, str):  # SQLite trả về chuỗi ISO
+            nam, thang = int(ngay_ct[:4]), int(ngay_ct[5:7])
+        else:
+            nam, thang = ngay_ct.year, ngay_ct.month
+        tong = theo_thang[(so_tai_khoan, nam * 100 + thang)]
+        tong[0] += Decimal(ps_no or 0)
+        tong[1] += Decimal(ps_co or 0)
+
+    ban_ghi = []
+    so_du = defaultdict(Decimal)
+    for (so_tai_khoan, ky_thang), (ps_no, ps_co) in sorted(
+        theo_thang.items()
+    ):
+        dau_ky = so_du[so_tai_khoan]
+        so_du[so_tai_khoan] = dau_ky + ps_no - ps_co
+        ban_ghi.append(
+            {
+                'so_tai_khoan': so_tai_khoan,
+                'ky_thang': ky_thang,
+                'so_du_dau_ky': dau_ky,
+                'ps_no': ps_no,
+                'ps_co': ps_co,
+                'so_du_cuoi_ky': so_du[so_tai_khoan],
+            }
+        )
+    if ban_ghi:
+        op.bulk_insert(so_du_tai_khoan, ban_ghi)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('so_du_tai_khoan')
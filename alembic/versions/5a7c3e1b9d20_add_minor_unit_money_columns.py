@@ -0,0 +1,78 @@
+"""Add BIGINT minor-unit money columns to journal_entry_lines with backfill
+
+Revision ID: 5a7c3e1b9d20
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c3e1b9d20'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Khớp với MINOR_UNITS / SCALE trong app/domain/models/journal_entry.py
+MINOR_UNITS = 100
+CHU_SO_THAP_PHAN = 2
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # --- Kiểm tra: số tiền lẻ hơn 1/MINOR_UNITS không đổi chính xác được ---
+    # (Domain làm tròn theo SCALE trước khi ghi; dòng cũ lẻ 3-4 chữ số thập
+    # phân phải được điều chỉnh trước, nếu không tổng trên cột BIGINT sẽ
+    # lệch với cột Numeric.)
+    so_dong_le = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"""
+                SELECT COUNT(*) FROM journal_entry_lines
+                WHERE no <> ROUND(no, {CHU_SO_THAP_PHAN})
+                   OR co <> ROUND(co, {CHU_SO_THAP_PHAN})
+                """
+            )
+        )
+        .scalar()
+    )
+    if so_dong_le:
+        raise RuntimeError(
+            f"Có {so_dong_le} dòng bút toán lẻ hơn 1/{MINOR_UNITS} đơn vị "
+            "tiền: điều chỉnh về 2 chữ số thập phân trước khi nâng cấp."
+        )
+
+    op.add_column(
+        'journal_entry_lines',
+        sa.Column(
+            'no_nho', sa.BigInteger(), nullable=False, server_default='0'
+        ),
+    )
+    op.add_column(
+        'journal_entry_lines',
+        sa.Column(
+            'co_nho', sa.BigInteger(), nullable=False, server_default='0'
+        ),
+    )
+
+    # --- Backfill: đổi Numeric(19,4) sang số nguyên đơn vị nhỏ nhất ---
+    op.execute(
+        f"""
+        UPDATE journal_entry_lines
+        SET no_nho = CAST(ROUND(no * {MINOR_UNITS}) AS BIGINT),
+            co_nho = CAST(ROUND(co * {MINOR_UNITS}) AS BIGINT)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('journal_entry_lines') as batch_op:
+        batch_op.drop_column('co_nho')
+        batch_op.drop_column('no_nho')
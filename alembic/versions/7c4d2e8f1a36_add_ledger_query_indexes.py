@@ -0,0 +1,64 @@
+"""Add composite indexes for posted-ledger queries on journal entries and lines
+
+Revision ID: 7c4d2e8f1a36
+Revises: 5a7c3e1b9d20
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4d2e8f1a36'
+down_revision: Union[str, Sequence[str], None] = '5a7c3e1b9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL: CREATE INDEX CONCURRENTLY (không khóa ghi sổ trong lúc tạo),
+    # phải chạy ngoài transaction. Dialect khác bỏ qua tham số postgresql_*.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_journal_entries_trang_thai_ngay_ct',
+            'journal_entries',
+            ['trang_thai', 'ngay_ct'],
+            postgresql_include=['id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_journal_entry_lines_so_tai_khoan_journal_entry_id',
+            'journal_entry_lines',
+            ['so_tai_khoan', 'journal_entry_id'],
+            postgresql_include=['no', 'co', 'no_nho', 'co_nho'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_journal_entry_lines_journal_entry_id',
+            'journal_entry_lines',
+            ['journal_entry_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_journal_entry_lines_journal_entry_id',
+            table_name='journal_entry_lines',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_journal_entry_lines_so_tai_khoan_journal_entry_id',
+            table_name='journal_entry_lines',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_journal_entries_trang_thai_ngay_ct',
+            table_name='journal_entries',
+            postgresql_concurrently=True,
+        )
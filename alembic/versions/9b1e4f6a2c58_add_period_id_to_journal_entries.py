@@ -0,0 +1,109 @@
+"""Add period_id foreign key to journal_entries with chunked backfill
+
+Revision ID: 9b1e4f6a2c58
+Revises: 7c4d2e8f1a36
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4f6a2c58'
+down_revision: Union[str, Sequence[str], None] = '7c4d2e8f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Số bút toán mỗi lô backfill (mỗi lô là một transaction ngắn)
+KICH_THUOC_LO = 10000
+
+accounting_periods = sa.table(
+    'accounting_periods',
+    sa.column('id', sa.Integer),
+    sa.column('ngay_bat_dau', sa.Date),
+    sa.column('ngay_ket_thuc', sa.Date),
+)
+journal_entries = sa.table(
+    'journal_entries',
+    sa.column('id', sa.Integer),
+    sa.column('ngay_ct', sa.Date),
+    sa.column('period_id', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('journal_entries') as batch_op:
+        batch_op.add_column(
+            sa.Column('period_id', sa.Integer(), nullable=True)
+        )
+        batch_op.create_foreign_key(
+            'fk_journal_entries_period_id_accounting_periods',
+            'accounting_periods',
+            ['period_id'],
+            ['id'],
+        )
+
+    # --- Backfill theo lô id: period_id = kỳ hẹp nhất chứa ngay_ct ---
+    # (cùng quy tắc với khoa_ky_hep_nhat trong app/domain/models/
+    #  accounting_period.py). Chạy autocommit: mỗi câu UPDATE là một
+    # transaction ngắn, không khóa cả bảng; chạy lại an toàn nhờ điều kiện
+    # period_id IS NULL.
+    conn = op.get_bind()
+    cac_ky = sorted(
+        conn.execute(sa.select(accounting_periods)).all(),
+        key=lambda ky: (
+            ky.ngay_ket_thuc - ky.ngay_bat_dau,
+            ky.ngay_bat_dau,
+        ),
+    )
+    id_nho_nhat, id_lon_nhat = conn.execute(
+        sa.select(
+            sa.func.min(journal_entries.c.id),
+            sa.func.max(journal_entries.c.id),
+        )
+    ).one()
+    if cac_ky and id_nho_nhat is not None:
+        with op.get_context().autocommit_block():
+            for dau in range(id_nho_nhat, id_lon_nhat + 1, KICH_THUOC_LO):
+                # Kỳ hẹp nhất chạy trước → bút toán nhận kỳ hẹp nhất
+                for ky in cac_ky:
+                    conn.execute(
+                        journal_entries.update()
+                        .where(
+                            journal_entries.c.id >= dau,
+                            journal_entries.c.id < dau + KICH_THUOC_LO,
+                            journal_entries.c.period_id.is_(None),
+                            journal_entries.c.ngay_ct >= ky.ngay_bat_dau,
+                            journal_entries.c.ngay_ct <= ky.ngay_ket_thuc,
+                        )
+                        .values(period_id=ky.id)
+                    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_journal_entries_period_id',
+            'journal_entries',
+            ['period_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_journal_entries_period_id',
+            table_name='journal_entries',
+            postgresql_concurrently=True,
+        )
+    with op.batch_alter_table('journal_entries') as batch_op:
+        batch_op.drop_constraint(
+            'fk_journal_entries_period_id_accounting_periods',
+            type_='foreignkey',
+        )
+        batch_op.drop_column('period_id')
@@ -4,6 +4,11 @@ Factory tạo các service nhỏ cho kỳ kế toán.
 [OCP] Dễ mở rộng thêm service mới nếu cần.
 [DIP] Tránh phụ thuộc trực tiếp vào implementation.
 """
+from typing import Optional
+
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
 from app.application.interfaces.period_repo import (
     AccountingPeriodRepositoryInterface,
 )
@@ -13,6 +18,9 @@ from app.application.services.accounting_periods.create_service import (
 from app.application.services.accounting_periods.lock_service import (
     LockAccountingPeriodService,
 )
+from app.application.services.accounting_periods.period_service import (
+    AccountingPeriodService,
+)
 from app.application.services.accounting_periods.query_service import (
     QueryAccountingPeriodService,
 )
@@ -29,18 +37,30 @@ class AccountingPeriodServiceFactory:
         self,
         period_repo: AccountingPeriodRepositoryInterface,
         je_repo: JournalEntryRepository,
+        period_index: Optional[AccountingPeriodIndexInterface] = None,
     ):
         self.period_repo = period_repo
         self.je_repo = je_repo
+        self.period_index = period_index
 
     def create_create_service(self) -> CreateAccountingPeriodService:
-        return CreateAccountingPeriodService(self.period_repo)
+        return CreateAccountingPeriodService(
+            self.period_repo, period_index=self.period_index
+        )
 
     def create_lock_service(self) -> LockAccountingPeriodService:
-        return LockAccountingPeriodService(self.period_repo, self.je_repo)
+        return LockAccountingPeriodService(
+            self.period_repo, self.je_repo, period_index=self.period_index
+        )
 
     def create_query_service(self) -> QueryAccountingPeriodService:
         return QueryAccountingPeriodService(self.period_repo)
 
     def create_unlock_service(self) -> UnlockAccountingPeriodService:
-        return UnlockAccountingPeriodService(self.period_repo)
+        return UnlockAccountingPeriodService(
+            self.period_repo, period_index=self.period_index
+        )
+
+    def create_period_service(self) -> AccountingPeriodService:
+        """[TT99-Đ25] Kiểm tra khóa sổ cho các service bút toán."""
+        return AccountingPeriodService(self.period_repo, self.period_index)
@@ -1,4 +1,7 @@
 # app/application/factories/journaling_service_factory.py
+from typing import Optional
+
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.application.interfaces.accounting_period_service import (
     AccountingPeriodServiceInterface,
@@ -26,14 +29,19 @@ class JournalingServiceFactory:
         je_repo: JournalEntryRepositoryInterface,
         acc_repo: AccountRepositoryInterface,
         period_service: AccountingPeriodServiceInterface,
+        account_cache: Optional[AccountCacheInterface] = None,
     ):
         self.je_repo = je_repo
         self.acc_repo = acc_repo
         self.period_service = period_service
+        self.account_cache = account_cache
 
     def create_create_service(self):
         return CreateJournalEntryService(
-            self.je_repo, self.acc_repo, self.period_service
+            self.je_repo,
+            self.acc_repo,
+            self.period_service,
+            account_cache=self.account_cache,
         )
 
     def create_posting_service(self):
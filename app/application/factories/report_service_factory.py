@@ -3,11 +3,18 @@
 """
 Factory tạo và quản lý các service báo cáo theo TT99/2025/TT-BTC.
 Tuân thủ DIP và SRP.
+
+📌 Service import ở đầu module, không nạp lười: router báo cáo vẫn import
+   chúng để khai báo kiểu, và phần nặng duy nhất (NumPy) đã được nạp lười
+   trong ledger_aggregate.
 """
+from datetime import date
+from typing import Optional
 
-from app.application.interfaces.account_repo import AccountRepositoryInterface
-from app.application.interfaces.journal_entry_repo import (
-    JournalEntryRepositoryInterface,
+from app.application.interfaces.report_cache import ReportCacheInterface
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.application.services.reports.cached_report_service import (
+    CachedReportService,
 )
 from app.application.services.reports.cash_flow_service import CashFlowService
 from app.application.services.reports.disclosure_service import (
@@ -16,56 +23,110 @@ from app.application.services.reports.disclosure_service import (
 from app.application.services.reports.financial_position_service import (
     FinancialPositionService,
 )
+from app.application.services.reports.financial_statement_bundle_service import (
+    FinancialStatementBundleService,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
 from app.application.services.reports.performance_service import (
     PerformanceService,
 )
+from app.application.services.reports.trial_balance_service import (
+    TrialBalanceService,
+)
 
 
 class ReportServiceFactory:
     """
     Factory Pattern để tạo các service báo cáo nhỏ.
     Cho phép thay thế repository bằng mock khi testing.
+    Nếu có `cache`, service B01/B02/B03, Bảng CĐSPS và bộ BCTC được bọc
+    bộ nhớ đệm.
     """
 
     def __init__(
         self,
-        je_repo: JournalEntryRepositoryInterface,
-        acc_repo: AccountRepositoryInterface,
+        report_repo: ReportRepositoryInterface,
+        cache: Optional[ReportCacheInterface] = None,
     ):
-        self._je_repo = je_repo
-        self._acc_repo = acc_repo
+        self._report_repo = report_repo
+        self._cache = cache
+
+    def _co_bo_nho_dem(self, service, loai_bao_cao: str):
+        if self._cache is None:
+            return service
+        return CachedReportService(
+            service, loai_bao_cao, self._cache, self._report_repo
+        )
+
+    # --------------------------------------------------------
+    # SỐ LIỆU DÙNG CHUNG – Engine dạng cột (NumPy)
+    # --------------------------------------------------------
+    def create_ledger_aggregate(self, ngay_ket_thuc: date) -> LedgerAggregate:
+        return LedgerAggregate.nap(self._report_repo, ngay_ket_thuc)
 
     # --------------------------------------------------------
     # BÁO CÁO B01 – Tình hình tài chính
     # --------------------------------------------------------
     def create_financial_position_service(self) -> FinancialPositionService:
-        return FinancialPositionService(
-            journal_repo=self._je_repo,
-            account_repo=self._acc_repo,
+        return self._co_bo_nho_dem(
+            FinancialPositionService(repo=self._report_repo), "B01-DN"
         )
 
     # --------------------------------------------------------
     # BÁO CÁO B02 – Kết quả hoạt động kinh doanh
     # --------------------------------------------------------
     def create_performance_service(self) -> PerformanceService:
-        return PerformanceService(
-            journal_repo=self._je_repo,
-            account_repo=self._acc_repo,
+        return self._co_bo_nho_dem(
+            PerformanceService(repo=self._report_repo), "B02-DN"
         )
 
     # --------------------------------------------------------
     # BÁO CÁO B03 – Lưu chuyển tiền tệ
     # --------------------------------------------------------
     def create_cash_flow_service(self) -> CashFlowService:
-        return CashFlowService(
-            repo=self._je_repo,
+        return self._co_bo_nho_dem(
+            CashFlowService(
+                repo=self._report_repo,
+                performance_service=self.create_performance_service(),
+            ),
+            "B03-DN",
         )
 
     # --------------------------------------------------------
     # BÁO CÁO B09 – Thuyết minh BCTC
     # --------------------------------------------------------
     def create_disclosure_service(self) -> DisclosureService:
-        return DisclosureService(
-            journal_repo=self._je_repo,
-            account_repo=self._acc_repo,
+        return DisclosureService(repo=self._report_repo)
+
+    # --------------------------------------------------------
+    # BỘ BÁO CÁO TÀI CHÍNH (B01 + B02 + B03 + B09)
+    # --------------------------------------------------------
+    def create_financial_statement_bundle_service(
+        self,
+    ) -> FinancialStatementBundleService:
+        # Các service con luôn nhận `so_lieu` dùng chung nên không cần bọc
+        # bộ nhớ đệm riêng; chỉ bọc cả bộ báo cáo
+        performance_service = PerformanceService(repo=self._report_repo)
+        return self._co_bo_nho_dem(
+            FinancialStatementBundleService(
+                repo=self._report_repo,
+                financial_position_service=FinancialPositionService(
+                    repo=self._report_repo
+                ),
+                performance_service=performance_service,
+                cash_flow_service=CashFlowService(
+                    repo=self._report_repo,
+                    performance_service=performance_service,
+                ),
+                disclosure_service=self.create_disclosure_service(),
+            ),
+            "BCTC",
+        )
+
+    # --------------------------------------------------------
+    # BẢNG CÂN ĐỐI SỐ PHÁT SINH
+    # --------------------------------------------------------
+    def create_trial_balance_service(self) -> TrialBalanceService:
+        return self._co_bo_nho_dem(
+            TrialBalanceService(repo=self._report_repo), "BCDSPS"
         )
@@ -1,4 +1,7 @@
 # app/application/factories/tai_khoan_service_factory.py
+from typing import Optional
+
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.application.interfaces.account_validator import TaiKhoanValidator
 from app.application.services.tai_khoan.create_service import (
@@ -25,18 +28,22 @@ class TaiKhoanServiceFactory:
         self,
         repo: AccountRepositoryInterface,
         validator: TaiKhoanValidator = None,
+        cache: Optional[AccountCacheInterface] = None,
     ):
         self.repo = repo
         self.validator = validator
+        self.cache = cache
 
     def create_create_service(self) -> CreateTaiKhoanService:
-        return CreateTaiKhoanService(repo=self.repo, validator=self.validator)
+        return CreateTaiKhoanService(
+            repo=self.repo, validator=self.validator, cache=self.cache
+        )
 
     def create_update_service(self) -> UpdateTaiKhoanService:
-        return UpdateTaiKhoanService(repo=self.repo)
+        return UpdateTaiKhoanService(repo=self.repo, cache=self.cache)
 
     def create_delete_service(self) -> DeleteTaiKhoanService:
-        return DeleteTaiKhoanService(repo=self.repo)
+        return DeleteTaiKhoanService(repo=self.repo, cache=self.cache)
 
     def create_query_service(self) -> QueryTaiKhoanService:
         return QueryTaiKhoanService(repo=self.repo)
@@ -0,0 +1,37 @@
+# app/application/interfaces/account_cache.py
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List
+
+from app.application.interfaces.account_repo import AccountRepositoryInterface
+from app.domain.models.account import TaiKhoan
+
+
+class AccountCacheInterface(ABC):
+    """
+    [DIP] Interface cho bộ nhớ đệm hệ thống tài khoản (so_tai_khoan → TK).
+    Service thêm / sửa / xóa tài khoản phải gọi `xoa()` sau khi ghi.
+    """
+
+    @abstractmethod
+    def lay_nhieu(
+        self, so_tai_khoan: Iterable[str], repo: AccountRepositoryInterface
+    ) -> Dict[str, TaiKhoan]:
+        """
+        Trả về các tài khoản tìm thấy trong `so_tai_khoan`. TK chưa có trong
+        bộ nhớ đệm được đọc bằng MỘT lần `repo.get_many`; TK không tồn tại
+        không có trong kết quả.
+        """
+        pass
+
+    @abstractmethod
+    def lay_tat_ca(self, repo: AccountRepositoryInterface) -> List[TaiKhoan]:
+        """
+        Toàn bộ hệ thống tài khoản: 0 truy vấn khi đã nạp, `repo.get_all`
+        một lần khi chưa.
+        """
+        pass
+
+    @abstractmethod
+    def xoa(self) -> None:
+        """Bỏ toàn bộ dữ liệu đã đệm (hệ thống tài khoản vừa thay đổi)."""
+        pass
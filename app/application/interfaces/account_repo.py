@@ -1,6 +1,6 @@
 # app/application/interfaces/account_repo.py
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from app.domain.models.account import TaiKhoan
 
@@ -19,10 +19,25 @@ class AccountRepositoryInterface(ABC):
     def get_by_id(self, so_tai_khoan: str) -> Optional[TaiKhoan]:
         pass
 
+    @abstractmethod
+    def get_many(self, so_tai_khoan: Iterable[str]) -> Dict[str, TaiKhoan]:
+        """
+        Lấy nhiều tài khoản trong MỘT truy vấn. TK không tồn tại: bỏ qua.
+        """
+        pass
+
     @abstractmethod
     def get_all(self) -> List[TaiKhoan]:
         pass
 
+    @abstractmethod
+    def get_version(self) -> int:
+        """
+        Phiên bản hệ thống tài khoản lưu trong DB (tăng mỗi lần thêm / sửa /
+        xóa, ở bất kỳ worker nào): bộ nhớ đệm COA so với giá trị này.
+        """
+        pass
+
     @abstractmethod
     def update(self, tai_khoan: TaiKhoan) -> TaiKhoan:
         pass
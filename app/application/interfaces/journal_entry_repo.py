@@ -2,7 +2,8 @@
 
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import List
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
 
 from app.domain.models.journal_entry import JournalEntry
 
@@ -20,12 +21,39 @@ class JournalEntryRepositoryInterface(ABC):
     def get_all(self) -> List[JournalEntry]:
         pass
 
+    @abstractmethod
+    def get_all_by_period(self, period_id: int) -> List[JournalEntry]:
+        """Bút toán có ngày chứng từ thuộc kỳ kế toán `period_id`."""
+        pass
+
     @abstractmethod
     def get_all_posted_in_range(
         self, start: date, end: date
     ) -> List[JournalEntry]:
         pass
 
+    @abstractmethod
+    def get_turnover_by_accounts(
+        self, start: date, end: date, so_tai_khoan: Iterable[str]
+    ) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        (PS Nợ, PS Có) đã ghi sổ trong [start, end] của riêng từng TK trong
+        `so_tai_khoan` (một truy vấn gom nhóm). TK không phát sinh: bỏ qua.
+        """
+        pass
+
+    @abstractmethod
+    def count_drafts_in_range(self, start: date, end: date) -> int:
+        """Số bút toán 'Draft' trong [start, end] (không nạp bút toán)."""
+        pass
+
+    @abstractmethod
+    def sample_draft_so_phieu(
+        self, start: date, end: date, limit: int = 5
+    ) -> List[str]:
+        """Tối đa `limit` số phiếu 'Draft' trong [start, end]."""
+        pass
+
     @abstractmethod
     def update_status(self, id: int, status: str) -> JournalEntry:
         pass
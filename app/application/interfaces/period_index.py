@@ -0,0 +1,31 @@
+# app/application/interfaces/period_index.py
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List
+
+from app.application.interfaces.period_repo import (
+    AccountingPeriodRepositoryInterface,
+)
+from app.domain.models.accounting_period import KyKeToan
+
+
+class AccountingPeriodIndexInterface(ABC):
+    """
+    [DIP] Interface cho chỉ mục khoảng thời gian của các kỳ kế toán.
+    Service khóa / mở / tạo kỳ phải gọi `xoa()` sau khi ghi.
+    """
+
+    @abstractmethod
+    def tim_theo_ngay(
+        self, ngay: date, repo: AccountingPeriodRepositoryInterface
+    ) -> List[KyKeToan]:
+        """
+        Các kỳ kế toán chứa `ngay`, kỳ ngắn nhất trước. Lần đầu (hoặc sau
+        `xoa()`) nạp toàn bộ kỳ bằng MỘT lần `repo.get_all()`.
+        """
+        pass
+
+    @abstractmethod
+    def xoa(self) -> None:
+        """Bỏ chỉ mục đã dựng (danh sách / trạng thái kỳ vừa thay đổi)."""
+        pass
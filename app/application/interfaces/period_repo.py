@@ -27,6 +27,22 @@ class AccountingPeriodRepositoryInterface(ABC):
     def get_all(self) -> List[KyKeToan]:
         pass
 
+    @abstractmethod
+    def get_version(self) -> int:
+        """
+        Phiên bản kỳ kế toán lưu trong DB (tăng mỗi lần tạo / khóa / mở
+        khóa, ở bất kỳ worker nào): chỉ mục kỳ so với giá trị này.
+        """
+        pass
+
+    @abstractmethod
+    def get_lock_version(self, id: int) -> int:
+        """
+        Số lần kỳ `id` đã được khóa (lưu trong DB, 0 nếu chưa khóa lần
+        nào): snapshot sổ cái của kỳ hết hiệu lực khi giá trị này đổi.
+        """
+        pass
+
     @abstractmethod
     def update_trang_thai(self, id: int, trang_thai: str) -> KyKeToan:
         pass
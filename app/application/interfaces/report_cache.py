@@ -0,0 +1,20 @@
+# app/application/interfaces/report_cache.py
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Hashable
+
+
+class ReportCacheInterface(ABC):
+    """
+    [DIP] Interface cho bộ nhớ đệm kết quả báo cáo.
+    Khóa đã bao gồm phiên bản sổ cái → không cần xóa thủ công khi ghi sổ.
+    """
+
+    @abstractmethod
+    def lay_hoac_tinh(
+        self, khoa: Hashable, ham_tinh: Callable[[], Any]
+    ) -> Any:
+        """
+        Trả về kết quả đã lưu theo `khoa`; nếu chưa có thì gọi `ham_tinh()`,
+        lưu lại và trả về kết quả đó.
+        """
+        pass
@@ -2,10 +2,14 @@
 from abc import ABC, abstractmethod
 from datetime import date
 from decimal import Decimal
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 from app.domain.models.account import TaiKhoan
-from app.domain.models.journal_entry import JournalEntry
+from app.domain.models.journal_entry import (
+    CotSoCai,
+    DongSoCai,
+    JournalEntry,
+)
 
 
 class ReportRepositoryInterface(ABC):
@@ -23,6 +27,20 @@ class ReportRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_posted_lines(
+        self, start: date, end: date
+    ) -> Iterator[DongSoCai]:
+        """
+        Phát theo luồng các dòng đã ghi sổ trong khoảng thời gian
+        (Số TK, Ngày CT, Nợ, Có), theo thứ tự ngày chứng từ.
+        Không dựng bút toán đầy đủ; phải tiêu thụ khi phiên DB còn mở.
+        📌 Chỉ dùng cho xuất ảnh chụp kỳ đã khóa (ledger_snapshot): các
+           service báo cáo không duyệt từng dòng mà đọc số đã gộp
+           (get_turnover, get_daily_turnover, get_posted_columns).
+        """
+        pass
+
     @abstractmethod
     def get_all_accounts(self) -> List[TaiKhoan]:
         """
@@ -33,7 +51,7 @@ class ReportRepositoryInterface(ABC):
     @abstractmethod
     def get_opening_balance(self, so_tai_khoan: str, ngay: date) -> Decimal:
         """
-        Lấy số dư đầu kỳ của TK tại ngày chỉ định.
+        Lấy số dư đầu kỳ (ròng: Nợ dương, Có âm) của TK tại ngày chỉ định.
         """
         pass
 
@@ -42,6 +60,55 @@ class ReportRepositoryInterface(ABC):
         self, so_tai_khoan: str, start: date, end: date
     ) -> Tuple[Decimal, Decimal, Decimal, Decimal, Decimal]:
         """
-        Trả về: (SDĐK Nợ, PS Nợ, PS Có, SDCK Nợ, SDCK Có)
+        Trả về: (SDĐK, PS Nợ, PS Có, SDCK Nợ, SDCK Có)
+        SDĐK là số dư ròng (Nợ dương, Có âm).
+        """
+        pass
+
+    @abstractmethod
+    def get_turnover(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """
+        Trả về: (PS Nợ, PS Có) của TK và các TK con trong khoảng [start, end].
+        """
+        pass
+
+    @abstractmethod
+    def get_trial_balance(
+        self, start: date, end: date
+    ) -> List[Tuple[str, Decimal, Decimal, Decimal, Decimal]]:
+        """
+        Bảng cân đối số phát sinh, tính bằng MỘT truy vấn gom nhóm.
+        Trả về mỗi TK có số liệu một dòng:
+        (Số TK, SDĐK ròng, PS Nợ, PS Có, SDCK ròng) — ròng: Nợ dương, Có âm.
+        Số liệu là của riêng từng TK (chưa cộng dồn TK con).
+        """
+        pass
+
+    @abstractmethod
+    def get_daily_turnover(
+        self, end: date
+    ) -> List[Tuple[str, date, Decimal, Decimal]]:
+        """
+        Phát sinh đã ghi sổ từ đầu đến ngày `end`, gom theo (TK, ngày):
+        [(Số TK, Ngày CT, PS Nợ, PS Có), ...] — đầu vào cho LedgerAggregate.
+        """
+        pass
+
+    @abstractmethod
+    def get_posted_columns(self, end: date) -> Optional[CotSoCai]:
+        """
+        Mọi dòng đã ghi sổ từ đầu sổ đến ngày `end`, dạng cột, lấy từ kho sổ
+        cái trong bộ nhớ (không đọc DB với các năm đã nạp).
+        None nếu kho dạng cột không bật — dùng get_daily_turnover.
+        """
+        pass
+
+    @abstractmethod
+    def get_ledger_version(self) -> int:
+        """
+        Phiên bản hiện tại của sổ cái (tăng mỗi khi bút toán thay đổi).
+        Dùng làm một phần khóa của bộ nhớ đệm báo cáo.
         """
         pass
@@ -1,6 +1,10 @@
 # app/application/services/accounting_periods/create_service.py
 import logging
+from typing import Optional
 
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
 from app.application.interfaces.period_repo import (
     AccountingPeriodRepositoryInterface,
 )
@@ -14,8 +18,13 @@ class CreateAccountingPeriodService:
     [SRP] Chỉ chịu trách nhiệm tạo mới kỳ kế toán.
     """
 
-    def __init__(self, repo: AccountingPeriodRepositoryInterface):
+    def __init__(
+        self,
+        repo: AccountingPeriodRepositoryInterface,
+        period_index: Optional[AccountingPeriodIndexInterface] = None,
+    ):
         self.repo = repo
+        self.period_index = period_index
 
     def execute(self, ky: KyKeToan) -> KyKeToan:
         # 1. Kiểm tra trùng tên kỳ
@@ -25,4 +34,7 @@ class CreateAccountingPeriodService:
         logger.info(
             f"[TAO_KY_KE_TOAN] Ky: {ky.ten_ky}, Ngay: {ky.ngay_bat_dau} → {ky.ngay_ket_thuc}"
         )
-        return self.repo.add(ky)
+        ket_qua = self.repo.add(ky)
+        if self.period_index:
+            self.period_index.xoa()  # Có thêm kỳ mới
+        return ket_qua
@@ -1,16 +1,23 @@
 # app/application/services/accounting_periods/lock_service.py
 import logging
 from datetime import date
+from typing import Optional
 
+from app.application.interfaces.journal_entry_repo import (
+    JournalEntryRepositoryInterface,
+)
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
 from app.application.interfaces.period_repo import (
     AccountingPeriodRepositoryInterface,
 )
-from app.infrastructure.repositories.journal_entry_repository import (
-    JournalEntryRepository,
-)
 
 logger = logging.getLogger(__name__)
 
+# Số phiếu nháp tối đa nêu trong thông báo lỗi
+SO_PHIEU_NHAP_HIEN_THI = 5
+
 
 class LockAccountingPeriodService:
     """
@@ -21,10 +28,12 @@ class LockAccountingPeriodService:
     def __init__(
         self,
         period_repo: AccountingPeriodRepositoryInterface,
-        je_repo: JournalEntryRepository,
+        je_repo: JournalEntryRepositoryInterface,
+        period_index: Optional[AccountingPeriodIndexInterface] = None,
     ):
         self.period_repo = period_repo
         self.je_repo = je_repo
+        self.period_index = period_index
 
     def execute(self, id: int, nguoi_thuc_hien: str = "System") -> bool:
         ky = self.period_repo.get_by_id(id)
@@ -34,19 +43,26 @@ class LockAccountingPeriodService:
         if ky.trang_thai == "Locked":
             raise ValueError(f"Kỳ '{ky.ten_ky}' đã bị khóa rồi.")
 
-        # 1. Kiểm tra bút toán nháp trong kỳ
-        draft_entries = self.je_repo.get_draft_entries_by_date_range(
+        # 1. Kiểm tra bút toán nháp trong kỳ: COUNT + LIMIT, không nạp bút toán
+        so_nhap = self.je_repo.count_drafts_in_range(
             ky.ngay_bat_dau, ky.ngay_ket_thuc
         )
-        if draft_entries:
-            so_phieu_list = [e.so_phieu for e in draft_entries]
+        if so_nhap:
+            so_phieu_list = self.je_repo.sample_draft_so_phieu(
+                ky.ngay_bat_dau,
+                ky.ngay_ket_thuc,
+                limit=SO_PHIEU_NHAP_HIEN_THI,
+            )
+            them = "..." if so_nhap > SO_PHIEU_NHAP_HIEN_THI else ""
             raise ValueError(
-                f"Không thể khóa kỳ '{ky.ten_ky}'. Vẫn còn {len(draft_entries)} bút toán nháp: "
-                f"{', '.join(so_phieu_list[:5])}{'...' if len(so_phieu_list) > 5 else ''}"
+                f"Không thể khóa kỳ '{ky.ten_ky}'. Vẫn còn {so_nhap} "
+                f"bút toán nháp: {', '.join(so_phieu_list)}{them}"
             )
 
         # 2. Cập nhật trạng thái
         self.period_repo.update_trang_thai(id, "Locked")
+        if self.period_index:
+            self.period_index.xoa()  # Trạng thái kỳ đã thay đổi
         logger.info(
             f"[KHOA_KY_THANH_CONG] Ky ID: {id}, Nguoi thuc hien: {nguoi_thuc_hien}"
         )
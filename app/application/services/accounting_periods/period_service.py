@@ -0,0 +1,51 @@
+# app/application/services/accounting_periods/period_service.py
+import logging
+from datetime import date
+from typing import Optional
+
+from app.application.interfaces.accounting_period_service import (
+    AccountingPeriodServiceInterface,
+)
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
+from app.application.interfaces.period_repo import (
+    AccountingPeriodRepositoryInterface,
+)
+from app.domain.models.accounting_period import KyKeToan
+
+logger = logging.getLogger(__name__)
+
+
+class AccountingPeriodService(AccountingPeriodServiceInterface):
+    """
+    [TT99-Đ25] Kiểm tra khóa sổ cho các service bút toán.
+    Tra cứu trên chỉ mục kỳ kế toán trong bộ nhớ (không truy vấn mỗi lần).
+    """
+
+    def __init__(
+        self,
+        repo: AccountingPeriodRepositoryInterface,
+        index: AccountingPeriodIndexInterface,
+    ):
+        self.repo = repo
+        self.index = index
+
+    def check_if_period_is_locked(self, ngay: date) -> bool:
+        """
+        Trả về False nếu được ghi sổ vào `ngay`.
+        Raise ValueError nếu `ngay` thuộc một kỳ đã khóa (kể cả kỳ lồng nhau).
+        """
+        for ky in self.index.tim_theo_ngay(ngay, self.repo):
+            if ky.trang_thai == "Locked":
+                logger.warning(f"[KY_DA_KHOA] Ngay: {ngay}, Ky: {ky.ten_ky}")
+                raise ValueError(
+                    f"Kỳ kế toán '{ky.ten_ky}' đã khóa sổ. "
+                    f"Không thể ghi bút toán ngày {ngay}."
+                )
+        return False
+
+    def lay_ky_ke_toan_theo_ngay(self, ngay: date) -> Optional[KyKeToan]:
+        """Kỳ ngắn nhất chứa `ngay` (None nếu ngày chưa thuộc kỳ nào)."""
+        cac_ky = self.index.tim_theo_ngay(ngay, self.repo)
+        return cac_ky[0] if cac_ky else None
@@ -1,7 +1,11 @@
 # app/application/services/accounting_periods/unlock_service.py
 import logging
 from datetime import date
+from typing import Optional
 
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
 from app.application.interfaces.period_repo import (
     AccountingPeriodRepositoryInterface,
 )
@@ -19,8 +23,13 @@ class UnlockAccountingPeriodService:
     - Việc mở kỳ phải có lý do chính đáng và được ghi nhận đầy đủ (audit trail).
     """
 
-    def __init__(self, repo: AccountingPeriodRepositoryInterface):
+    def __init__(
+        self,
+        repo: AccountingPeriodRepositoryInterface,
+        period_index: Optional[AccountingPeriodIndexInterface] = None,
+    ):
         self.repo = repo
+        self.period_index = period_index
 
     def execute(
         self, id: int, ly_do: str, nguoi_thuc_hien: str = "System"
@@ -53,6 +62,8 @@ class UnlockAccountingPeriodService:
 
         # Cập nhật trạng thái
         self.repo.update_trang_thai(id, "Open")
+        if self.period_index:
+            self.period_index.xoa()  # Trạng thái kỳ đã thay đổi
 
         logger.info(
             f"[MO_KY_THANH_CONG] Ky ID: {id}, Ly do: {ly_do}, Nguoi thuc hien: {nguoi_thuc_hien}"
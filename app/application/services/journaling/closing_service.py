@@ -2,15 +2,21 @@
 import logging
 from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Optional
 
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.application.interfaces.journal_entry_repo import (
     JournalEntryRepositoryInterface,
 )
+from app.domain.models.account import LoaiTaiKhoan
 from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
 
 logger = logging.getLogger(__name__)
 
+# Nhóm TK kết chuyển vào 421: dư Có (doanh thu) và dư Nợ (chi phí)
+_DOANH_THU = (LoaiTaiKhoan.DOANH_THU, LoaiTaiKhoan.THU_NHAP_KHAC)
+_CHI_PHI = (LoaiTaiKhoan.CHI_PHI, LoaiTaiKhoan.GIA_VON)
+
 
 class ClosingJournalEntryService:
     """
@@ -30,75 +36,53 @@ class ClosingJournalEntryService:
     ) -> list[JournalEntry]:
         """
         [TT99-Đ24] Kết chuyển Doanh thu/Chi phí vào 421.
+        Mọi TK thuộc loại Doanh thu / Thu nhập khác / Chi phí / Giá vốn trong
+        hệ thống tài khoản được kết chuyển về số dư 0; phát sinh cả năm của
+        chúng lấy từ MỘT truy vấn gom nhóm.
         """
         nam = ngay_ket_chuyen.year
 
-        tk_doanh_thu = ["511", "512", "515"]
-        tk_chi_phi = ["632", "641", "642", "635", "811", "821"]
-
-        doanh_thu_tong = sum(
-            self._tinh_phat_sinh_tai_khoan(tk, "CO", nam)
-            for tk in tk_doanh_thu
-        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        loai_tai_khoan = {
+            tk.so_tai_khoan: tk.loai_tai_khoan
+            for tk in self.account_repo.get_all()
+            if tk.loai_tai_khoan in _DOANH_THU + _CHI_PHI
+        }
+        phat_sinh = self.journal_repo.get_turnover_by_accounts(
+            date(nam, 1, 1), date(nam, 12, 31), loai_tai_khoan
+        )
 
-        chi_phi_tong = sum(
-            self._tinh_phat_sinh_tai_khoan(tk, "NO", nam) for tk in tk_chi_phi
-        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        # Số dư theo bên dư thông thường của từng TK cần kết chuyển
+        so_du_doanh_thu: Dict[str, Decimal] = {}
+        so_du_chi_phi: Dict[str, Decimal] = {}
+        for tk in sorted(phat_sinh):
+            ps_no, ps_co = phat_sinh[tk]
+            if loai_tai_khoan[tk] in _DOANH_THU:
+                so_du_doanh_thu[tk] = _lam_tron(ps_co - ps_no)
+            else:
+                so_du_chi_phi[tk] = _lam_tron(ps_no - ps_co)
 
         ket_chuyen_entries = []
 
-        # Kết chuyển doanh thu: Nợ 511 → Có 421
-        if doanh_thu_tong > 0:
-            lines = [
-                JournalEntryLine(
-                    so_tai_khoan="421", no=Decimal(0), co=doanh_thu_tong
-                )
-            ]
-            for tk in tk_doanh_thu:
-                ps_co = self._tinh_phat_sinh_tai_khoan(tk, "CO", nam)
-                if ps_co > 0:
-                    lines.append(
-                        JournalEntryLine(
-                            so_tai_khoan=tk, no=ps_co, co=Decimal(0)
-                        )
-                    )
-
-            bt = JournalEntry(
-                ngay_ct=ngay_ket_chuyen,
-                so_phieu=f"KC-DOANH-THU-{ky_hieu}",
-                mo_ta=f"Kết chuyển doanh thu kỳ {ky_hieu} (TT99 Điều 24)",
-                lines=lines,
-                trang_thai="Draft",
-            )
-            bt = self.journal_repo.add(bt)
-            self.journal_repo.update_status(bt.id, "Posted")
+        # Kết chuyển doanh thu: Nợ 511, 515, 711... → Có 421
+        bt = self._ghi_but_toan_ket_chuyen(
+            so_du_doanh_thu,
+            doanh_thu=True,
+            ngay_ket_chuyen=ngay_ket_chuyen,
+            so_phieu=f"KC-DOANH-THU-{ky_hieu}",
+            mo_ta=f"Kết chuyển doanh thu kỳ {ky_hieu} (TT99 Điều 24)",
+        )
+        if bt is not None:
             ket_chuyen_entries.append(bt)
 
         # Kết chuyển chi phí: Nợ 421 → Có 632, 641...
-        if chi_phi_tong > 0:
-            lines = [
-                JournalEntryLine(
-                    so_tai_khoan="421", no=chi_phi_tong, co=Decimal(0)
-                )
-            ]
-            for tk in tk_chi_phi:
-                ps_no = self._tinh_phat_sinh_tai_khoan(tk, "NO", nam)
-                if ps_no > 0:
-                    lines.append(
-                        JournalEntryLine(
-                            so_tai_khoan=tk, no=Decimal(0), co=ps_no
-                        )
-                    )
-
-            bt = JournalEntry(
-                ngay_ct=ngay_ket_chuyen,
-                so_phieu=f"KC-CHI-PHI-{ky_hieu}",
-                mo_ta=f"Kết chuyển chi phí kỳ {ky_hieu} (TT99 Điều 24)",
-                lines=lines,
-                trang_thai="Draft",
-            )
-            bt = self.journal_repo.add(bt)
-            self.journal_repo.update_status(bt.id, "Posted")
+        bt = self._ghi_but_toan_ket_chuyen(
+            so_du_chi_phi,
+            doanh_thu=False,
+            ngay_ket_chuyen=ngay_ket_chuyen,
+            so_phieu=f"KC-CHI-PHI-{ky_hieu}",
+            mo_ta=f"Kết chuyển chi phí kỳ {ky_hieu} (TT99 Điều 24)",
+        )
+        if bt is not None:
             ket_chuyen_entries.append(bt)
 
         logger.info(
@@ -106,18 +90,53 @@ class ClosingJournalEntryService:
         )
         return ket_chuyen_entries
 
-    def _tinh_phat_sinh_tai_khoan(
-        self, so_tai_khoan: str, loai_ps: str, nam: int
-    ) -> Decimal:
-        # Tính phát sinh Nợ hoặc Có của tài khoản trong năm
-        ngay_dau = date(nam, 1, 1)
-        ngay_ket = date(nam, 12, 31)
-        all_entries = self.journal_repo.get_all_posted_in_range(
-            ngay_dau, ngay_ket
+    def _ghi_but_toan_ket_chuyen(
+        self,
+        so_du: Dict[str, Decimal],
+        doanh_thu: bool,
+        ngay_ket_chuyen: date,
+        so_phieu: str,
+        mo_ta: str,
+    ) -> Optional[JournalEntry]:
+        """
+        Ghi sổ một bút toán đưa số dư của các TK về 0, đối ứng TK 421.
+        TK doanh thu dư Có → ghi Nợ; TK chi phí dư Nợ → ghi Có
+        (số dư ngược bên thông thường được ghi ở bên còn lại).
+        """
+        tong = sum(so_du.values(), Decimal(0))
+        if tong <= 0:
+            return None
+
+        lines = [
+            JournalEntryLine(
+                so_tai_khoan="421",
+                no=Decimal(0) if doanh_thu else tong,
+                co=tong if doanh_thu else Decimal(0),
+            )
+        ]
+        for tk, gia_tri in so_du.items():
+            if gia_tri == 0:
+                continue
+            ghi_no = (gia_tri > 0) == doanh_thu
+            lines.append(
+                JournalEntryLine(
+                    so_tai_khoan=tk,
+                    no=abs(gia_tri) if ghi_no else Decimal(0),
+                    co=Decimal(0) if ghi_no else abs(gia_tri),
+                )
+            )
+
+        bt = JournalEntry(
+            ngay_ct=ngay_ket_chuyen,
+            so_phieu=so_phieu,
+            mo_ta=mo_ta,
+            lines=lines,
+            trang_thai="Draft",
         )
-        tong = Decimal(0)
-        for entry in all_entries:
-            for line in entry.lines:
-                if line.so_tai_khoan == so_tai_khoan:
-                    tong += line.no if loai_ps == "NO" else line.co
-        return tong.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        bt = self.journal_repo.add(bt)
+        self.journal_repo.update_status(bt.id, "Posted")
+        return bt
+
+
+def _lam_tron(so_tien: Decimal) -> Decimal:
+    return so_tien.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
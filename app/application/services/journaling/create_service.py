@@ -1,6 +1,8 @@
 # app/application/services/journaling/create_service.py
 import logging
+from typing import Optional
 
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.application.interfaces.journal_entry_repo import (
     JournalEntryRepositoryInterface,
@@ -23,19 +25,27 @@ class CreateJournalEntryService:
         journal_repo: JournalEntryRepositoryInterface,
         account_repo: AccountRepositoryInterface,
         period_service: AccountingPeriodRepositoryInterface,
+        account_cache: Optional[AccountCacheInterface] = None,
     ):
         self.journal_repo = journal_repo
         self.account_repo = account_repo
         self.period_service = period_service
+        self.account_cache = account_cache
 
     def execute(self, entry: JournalEntry) -> JournalEntry:
         # 1. Kiểm tra khóa sổ
         self.period_service.check_if_period_is_locked(entry.ngay_ct)
 
-        # 2. Kiểm tra tài khoản tồn tại
+        # 2. Kiểm tra tài khoản tồn tại (0 hoặc 1 truy vấn cho mọi dòng)
+        so_tai_khoan = {line.so_tai_khoan for line in entry.lines}
+        if self.account_cache:
+            tai_khoan = self.account_cache.lay_nhieu(
+                so_tai_khoan, self.account_repo
+            )
+        else:
+            tai_khoan = self.account_repo.get_many(so_tai_khoan)
         for line in entry.lines:
-            tai_khoan = self.account_repo.get_by_id(line.so_tai_khoan)
-            if not tai_khoan:
+            if line.so_tai_khoan not in tai_khoan:
                 raise ValueError(
                     f"Tài khoản '{line.so_tai_khoan}' không tồn tại."
                 )
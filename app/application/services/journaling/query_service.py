@@ -36,6 +36,12 @@ class QueryJournalEntryService:
         """
         return self.repo.get_all()
 
+    def lay_theo_ky(self, ky_id: int) -> List[JournalEntry]:
+        """
+        Lấy bút toán thuộc một kỳ kế toán (lọc trong DB theo period_id).
+        """
+        return self.repo.get_all_by_period(ky_id)
+
     def lay_theo_ngay(
         self, ngay_bat_dau: date, ngay_ket_thuc: date
     ) -> List[JournalEntry]:
@@ -0,0 +1,140 @@
+# app/application/services/reports/account_tree_rollup.py
+"""
+[SRP] Cộng dồn số dư theo cây hệ thống tài khoản (TK con → TK cha).
+[TT99-PL2] Quan hệ cha/con lấy từ 'so_tai_khoan_cha' / 'cap_tai_khoan'.
+
+🎯 Mục tiêu:
+- Dựng cây tài khoản MỘT lần, xác định sẵn thứ tự duyệt từ lá lên gốc.
+- Cộng dồn số dư của mọi tài khoản trong MỘT lượt duyệt.
+- Tra cứu O(1) số dư Nợ/Có đã cộng dồn và số dư thuần theo bên dư
+  thông thường của bất kỳ tài khoản nào.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.domain.models.account import LoaiTaiKhoan, TaiKhoan
+
+# Tài khoản có số dư bên Nợ là bên dư thông thường; nhóm còn lại dư bên Có
+_DU_NO = (LoaiTaiKhoan.TAI_SAN, LoaiTaiKhoan.CHI_PHI, LoaiTaiKhoan.GIA_VON)
+_DU_CO = (
+    LoaiTaiKhoan.NO_PHAI_TRA,
+    LoaiTaiKhoan.VON_CHU_SO_HUU,
+    LoaiTaiKhoan.DOANH_THU,
+    LoaiTaiKhoan.THU_NHAP_KHAC,
+)
+
+
+class AccountTreeRollup:
+    """
+    Cây hệ thống tài khoản dùng để cộng dồn số dư từ TK con lên TK cha.
+
+    Cách dùng:
+        cay = AccountTreeRollup(repo.get_all_accounts())
+        cay.tong_hop({"1111": (no, co), "1121": (no, co), ...})
+        cay.so_du_thuan("111")  # Dư Nợ 111 = 1111 + 1112 + (phát sinh trên chính 111)
+    """
+
+    def __init__(self, accounts: Iterable[TaiKhoan]):
+        self._tai_khoan: Dict[str, TaiKhoan] = {
+            tk.so_tai_khoan: tk for tk in accounts
+        }
+        self._cha: Dict[str, Optional[str]] = {}
+        con: Dict[str, List[str]] = {}
+        for so_tk, tk in self._tai_khoan.items():
+            cha = tk.so_tai_khoan_cha
+            if cha == so_tk or cha not in self._tai_khoan:
+                cha = None  # TK gốc (hoặc TK cha không có trong hệ thống)
+            self._cha[so_tk] = cha
+            if cha is not None:
+                con.setdefault(cha, []).append(so_tk)
+
+        # Thứ tự hậu tố (con trước cha), tính một lần khi dựng cây
+        self._thu_tu: List[str] = []
+        da_duyet = set()
+        goc = sorted(
+            so_tk for so_tk, cha in self._cha.items() if cha is None
+        )
+        for so_tk_goc in goc:
+            ngan_xep = [(so_tk_goc, False)]
+            while ngan_xep:
+                so_tk, da_mo_rong = ngan_xep.pop()
+                if da_mo_rong:
+                    self._thu_tu.append(so_tk)
+                    continue
+                if so_tk in da_duyet:
+                    continue
+                da_duyet.add(so_tk)
+                ngan_xep.append((so_tk, True))
+                for so_tk_con in con.get(so_tk, ()):
+                    ngan_xep.append((so_tk_con, False))
+
+        # Tài khoản nằm trong vòng lặp cha/con (dữ liệu lỗi) vẫn được giữ lại
+        # như TK gốc để không làm mất số dư
+        for so_tk in sorted(self._tai_khoan):
+            if so_tk not in da_duyet:
+                self._cha[so_tk] = None
+                self._thu_tu.append(so_tk)
+
+        self._so_du: Dict[str, Tuple[Decimal, Decimal]] = {}
+
+    def tong_hop(
+        self, so_du_tai_khoan: Mapping[str, Tuple[Decimal, Decimal]]
+    ) -> "AccountTreeRollup":
+        """
+        Cộng dồn số dư (Nợ, Có) của từng tài khoản lên các TK cha.
+        `so_du_tai_khoan` là số dư ghi trực tiếp trên từng TK (không gồm TK con).
+        """
+        self._so_du = self.cong_don(so_du_tai_khoan, so_cot=2)
+        return self
+
+    def cong_don(
+        self,
+        gia_tri_tai_khoan: Mapping[str, Sequence[Decimal]],
+        so_cot: int,
+    ) -> Dict[str, Tuple[Decimal, ...]]:
+        """
+        Cộng dồn từng cột số liệu (cùng `so_cot` cột) từ TK con lên TK cha
+        trong một lượt duyệt. Trả về số liệu đã cộng dồn của MỌI tài khoản.
+        """
+        khong = (Decimal(0),) * so_cot
+        tong: Dict[str, List[Decimal]] = {}
+        for so_tk in self._thu_tu:
+            cot = tong.setdefault(so_tk, list(khong))
+            for i, gia_tri in enumerate(
+                gia_tri_tai_khoan.get(so_tk, khong)
+            ):
+                cot[i] += gia_tri
+            cha = self._cha[so_tk]
+            if cha is not None:
+                cot_cha = tong.setdefault(cha, list(khong))
+                for i in range(so_cot):
+                    cot_cha[i] += cot[i]
+        return {so_tk: tuple(tong[so_tk]) for so_tk in self._thu_tu}
+
+    def no_co(self, so_tai_khoan: str) -> Tuple[Decimal, Decimal]:
+        """(Tổng Nợ, Tổng Có) đã cộng dồn của TK và toàn bộ TK con."""
+        return self._so_du.get(so_tai_khoan, (Decimal(0), Decimal(0)))
+
+    def so_du_thuan(self, so_tai_khoan: str) -> Decimal:
+        """
+        Số dư thuần theo bên dư thông thường của loại tài khoản:
+        - Tài sản / Chi phí / Giá vốn: Nợ - Có
+        - Nợ phải trả / Vốn CSH / Doanh thu / Thu nhập khác: Có - Nợ
+        TK không có trong hệ thống (hoặc loại KHÁC) trả về 0.
+        """
+        tai_khoan = self._tai_khoan.get(so_tai_khoan)
+        if tai_khoan is None:
+            return Decimal(0)
+        tong_no, tong_co = self.no_co(so_tai_khoan)
+        if tai_khoan.loai_tai_khoan in _DU_NO:
+            return tong_no - tong_co
+        if tai_khoan.loai_tai_khoan in _DU_CO:
+            return tong_co - tong_no
+        return Decimal(0)
+
+    def tai_khoan(self, so_tai_khoan: str) -> Optional[TaiKhoan]:
+        return self._tai_khoan.get(so_tai_khoan)
+
+    def cha_cua(self, so_tai_khoan: str) -> Optional[str]:
+        """TK cha trực tiếp trong cây (None nếu là TK gốc)."""
+        return self._cha.get(so_tai_khoan)
@@ -0,0 +1,45 @@
+# app/application/services/reports/cached_report_service.py
+"""
+[SRP] Bọc một service báo cáo bằng bộ nhớ đệm kết quả.
+Khóa = (loại báo cáo, tham số lập báo cáo, phiên bản sổ cái):
+cùng kỳ, sổ cái chưa đổi → trả lại kết quả đã tính, không truy vấn lại.
+"""
+from typing import Any
+
+from app.application.interfaces.report_cache import ReportCacheInterface
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+
+
+class CachedReportService:
+    """
+    Có cùng phương thức `lay_bao_cao` với service được bọc.
+    Kết quả trả về được dùng chung giữa các lần gọi → chỉ đọc, không sửa.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        loai_bao_cao: str,
+        cache: ReportCacheInterface,
+        repo: ReportRepositoryInterface,
+    ):
+        self.service = service
+        self.loai_bao_cao = loai_bao_cao
+        self.cache = cache
+        self.repo = repo
+
+    def lay_bao_cao(self, *args, **kwargs):
+        if kwargs.get("so_lieu") is not None:
+            # Đã có số liệu dùng chung của người gọi → tính trực tiếp
+            return self.service.lay_bao_cao(*args, **kwargs)
+
+        # Đọc phiên bản TRƯỚC khi tính: kết quả không bao giờ cũ hơn khóa
+        khoa = (
+            self.loai_bao_cao,
+            args,
+            tuple(sorted(kwargs.items())),
+            self.repo.get_ledger_version(),
+        )
+        return self.cache.lay_hoac_tinh(
+            khoa, lambda: self.service.lay_bao_cao(*args, **kwargs)
+        )
@@ -1,17 +1,15 @@
 # app/application/services/reports/cash_flow_service.py
 from datetime import date
 from decimal import Decimal
-from typing import List
+from typing import Optional
 
-from app.application.interfaces.journal_entry_repo import (
-    JournalEntryRepositoryInterface,
-)
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
 
 # Giả định PerformanceService đã được định nghĩa
 from app.application.services.reports.performance_service import (
     PerformanceService,
 )
-from app.domain.models.journal_entry import JournalEntryDomain
 from app.domain.models.report import (
     BaoCaoLuuChuyenTienTe,
     LuuChuyenTienTeHDDT,
@@ -29,7 +27,7 @@ class CashFlowService:
 
     def __init__(
         self,
-        repo: JournalEntryRepositoryInterface,
+        repo: ReportRepositoryInterface,
         performance_service: PerformanceService,  # Dependency mới
     ):
         self.repo = repo
@@ -40,34 +38,38 @@ class CashFlowService:
     # --------------------------------------------------------
 
     def _tinh_phat_sinh_tai_khoan(
-        self, tk: str, loai: str, bd: date, kt: date
+        self,
+        tk: str,
+        loai: str,
+        bd: date,
+        kt: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> Decimal:
         """
         Tính tổng phát sinh NỢ (loai='NO') hoặc CÓ (loai='CO') cho một tài khoản
-        trong khoảng thời gian (bd, kt) từ các bút toán đã Posted.
+        (bao gồm TK con) trong khoảng thời gian (bd, kt) từ các bút toán đã Posted.
+        Tra cứu qua chỉ mục phát sinh của repository, không nạp lại bút toán;
+        nếu có `so_lieu` (engine dạng cột dùng chung) thì tính trên engine đó.
         """
-        all_entries: List[JournalEntryDomain] = (
-            self.repo.get_all_posted_in_range(bd, kt)
-        )
-
-        tong_phat_sinh = Decimal(0)
-
-        for entry in all_entries:
-            for line in entry.lines:
-                if line.so_tai_khoan == tk:
-                    if loai == "NO":
-                        tong_phat_sinh += line.no
-                    elif loai == "CO":
-                        tong_phat_sinh += line.co
-
-        return tong_phat_sinh
+        nguon = self.repo if so_lieu is None else so_lieu
+        ps_no, ps_co = nguon.get_turnover(tk, bd, kt)
+        if loai == "NO":
+            return ps_no
+        elif loai == "CO":
+            return ps_co
+        return Decimal(0)
 
     # --------------------------------------------------------
     # I. LƯU CHUYỂN TIỀN TỪ HOẠT ĐỘNG KINH DOANH (HĐKD)
     # --------------------------------------------------------
 
     def _tinh_loi_nhuan_truoc_thue(
-        self, ky_hieu: str, ngay_lap: date, start: date, end: date
+        self,
+        ky_hieu: str,
+        ngay_lap: date,
+        start: date,
+        end: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> Decimal:
         """
         I.01: Lợi nhuận trước thuế (Lấy từ Báo cáo B02-DN).
@@ -77,19 +79,20 @@ class CashFlowService:
             ngay_lap=ngay_lap,
             ngay_bat_dau=start,
             ngay_ket_thuc=end,
+            so_lieu=so_lieu,
         )
-        # Giả định B02 model có thuộc tính loi_nhuan_truoc_thue (Mã số 21)
-        return b02_report.loi_nhuan_truoc_thue
+        # B02 Mã số 50: Tổng lợi nhuận kế toán trước thuế
+        return b02_report.tong_loi_nhuan_truoc_thue
 
     def _tinh_dieu_chinh_khau_hao_ts_co_dinh(
-        self, start: date, end: date
+        self, start: date, end: date, so_lieu=None
     ) -> Decimal:
         """
         I.02: Điều chỉnh Khấu hao tài sản cố định (TK 214). Phát sinh Có.
         """
         # TK 214 (Hao mòn TSCĐ) - Phát sinh CÓ là khấu hao tăng
         khau_hao = self._tinh_phat_sinh_tai_khoan(
-            tk="214", loai="CO", bd=start, kt=end
+            tk="214", loai="CO", bd=start, kt=end, so_lieu=so_lieu
         )
         return khau_hao
 
@@ -113,7 +116,7 @@ class CashFlowService:
         return Decimal("15000000")  # MOCK
 
     def _tinh_thay_doi_tai_san_phai_thu(
-        self, start: date, end: date
+        self, start: date, end: date, so_lieu=None
     ) -> Decimal:
         """
         I.07: Tăng/giảm các khoản phải thu.
@@ -123,10 +126,10 @@ class CashFlowService:
         """
         # Giả định: Tài khoản 131 (Phải thu khách hàng)
         ps_no = self._tinh_phat_sinh_tai_khoan(
-            tk="131", loai="NO", bd=start, kt=end
+            tk="131", loai="NO", bd=start, kt=end, so_lieu=so_lieu
         )
         ps_co = self._tinh_phat_sinh_tai_khoan(
-            tk="131", loai="CO", bd=start, kt=end
+            tk="131", loai="CO", bd=start, kt=end, so_lieu=so_lieu
         )
         # Tăng ròng phải thu
         tang_giam_rong = ps_no - ps_co
@@ -135,7 +138,9 @@ class CashFlowService:
             tang_giam_rong.copy_negate()
         )  # Phải thu tăng (dương) thì cần TRỪ (âm) vào Lợi nhuận
 
-    def _tinh_thay_doi_phai_tra(self, start: date, end: date) -> Decimal:
+    def _tinh_thay_doi_phai_tra(
+        self, start: date, end: date, so_lieu=None
+    ) -> Decimal:
         """
         I.09: Tăng/giảm các khoản phải trả (trừ lãi vay, thuế thu nhập).
         (Phát sinh CÓ TK 331, 334, 338... - Phát sinh NỢ TK 331, 334, 338...)
@@ -144,10 +149,10 @@ class CashFlowService:
         """
         # Giả định: Tài khoản 331 (Phải trả người bán)
         ps_co = self._tinh_phat_sinh_tai_khoan(
-            tk="331", loai="CO", bd=start, kt=end
+            tk="331", loai="CO", bd=start, kt=end, so_lieu=so_lieu
         )
         ps_no = self._tinh_phat_sinh_tai_khoan(
-            tk="331", loai="NO", bd=start, kt=end
+            tk="331", loai="NO", bd=start, kt=end, so_lieu=so_lieu
         )
         # Tăng ròng phải trả
         tang_giam_rong = ps_co - ps_no
@@ -164,9 +169,11 @@ class CashFlowService:
         ngay_lap: date,
         ngay_bat_dau: date,
         ngay_ket_thuc: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> BaoCaoLuuChuyenTienTe:
         """
         Tính và tạo Báo cáo Lưu chuyển Tiền tệ (B03-DN).
+        `so_lieu`: engine dạng cột dùng chung (tùy chọn) thay cho repository.
         """
         start = ngay_bat_dau
         end = ngay_ket_thuc
@@ -175,19 +182,25 @@ class CashFlowService:
 
         # I.01: Lợi nhuận trước thuế
         loi_nhuan_truoc_thue = self._tinh_loi_nhuan_truoc_thue(
-            ky_hieu, ngay_lap, start, end
+            ky_hieu, ngay_lap, start, end, so_lieu
         )
 
         # CÁC KHOẢN ĐIỀU CHỈNH
-        khau_hao = self._tinh_dieu_chinh_khau_hao_ts_co_dinh(start, end)
+        khau_hao = self._tinh_dieu_chinh_khau_hao_ts_co_dinh(
+            start, end, so_lieu
+        )
         du_phong = self._tinh_dieu_chinh_du_phong(start, end)
         lai_tien_vay_da_tra = self._tinh_lai_tien_vay_da_tra(start, end)
 
         # I.07: Thay đổi các khoản phải thu
-        thay_doi_phai_thu = self._tinh_thay_doi_tai_san_phai_thu(start, end)
+        thay_doi_phai_thu = self._tinh_thay_doi_tai_san_phai_thu(
+            start, end, so_lieu
+        )
 
         # I.09: Thay đổi các khoản phải trả (trừ lãi vay, thuế TN)
-        thay_doi_phai_tra = self._tinh_thay_doi_phai_tra(start, end)
+        thay_doi_phai_tra = self._tinh_thay_doi_phai_tra(
+            start, end, so_lieu
+        )
 
         # I.11: LƯU CHUYỂN TIỀN THUẦN TỪ HĐKD (I.01 + I.02 + ... + I.10)
         luu_chuyen_tien_thuan_tu_hdkd = (
@@ -1,16 +1,41 @@
 # app/application/services/reports/disclosure_service.py
 """
 [SRP] Service cho Bản thuyết minh BCTC (B09-DN).
+Chi tiết từng tài khoản lấy từ Bảng cân đối số phát sinh của kỳ,
+chia theo nhóm Tài sản / Nguồn vốn / Kết quả HĐKD.
 """
 from datetime import date
+from decimal import Decimal
+from typing import Optional
 
 from app.application.interfaces.report_repo import ReportRepositoryInterface
-from app.domain.models.report import BaoCaoThuyetMinh
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.application.services.reports.trial_balance_service import (
+    TrialBalanceService,
+)
+from app.domain.models.account import LoaiTaiKhoan
+from app.domain.models.report import (
+    BaoCaoThuyetMinh,
+    ThuyetMinhKetQua,
+    ThuyetMinhNguonVon,
+    ThuyetMinhTaiSan,
+)
+
+_NGUON_VON = (LoaiTaiKhoan.NO_PHAI_TRA, LoaiTaiKhoan.VON_CHU_SO_HUU)
+_DOANH_THU = (LoaiTaiKhoan.DOANH_THU, LoaiTaiKhoan.THU_NHAP_KHAC)
+_CHI_PHI = (LoaiTaiKhoan.CHI_PHI, LoaiTaiKhoan.GIA_VON)
 
 
 class DisclosureService:
-    def __init__(self, repo: ReportRepositoryInterface):
+    def __init__(
+        self,
+        repo: ReportRepositoryInterface,
+        trial_balance_service: Optional[TrialBalanceService] = None,
+    ):
         self.repo = repo
+        self.trial_balance_service = (
+            trial_balance_service or TrialBalanceService(repo)
+        )
 
     def lay_bao_cao(
         self,
@@ -18,11 +43,55 @@ class DisclosureService:
         ngay_lap: date,
         ngay_bat_dau: date,
         ngay_ket_thuc: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> BaoCaoThuyetMinh:
-        # Lấy dữ liệu từ các báo cáo khác hoặc repo
+        """
+        Lập B09-DN cho kỳ [ngay_bat_dau, ngay_ket_thuc].
+        `so_lieu`: engine dạng cột dùng chung (tùy chọn) thay cho repository.
+        """
+        loai_tai_khoan = {
+            tk.so_tai_khoan: tk.loai_tai_khoan
+            for tk in self.repo.get_all_accounts()
+        }
+        # Số liệu riêng từng TK (không cộng dồn) → cộng nhóm không bị trùng
+        bang = self.trial_balance_service.lay_bao_cao(
+            ngay_bat_dau, ngay_ket_thuc, so_lieu=so_lieu
+        )
+
+        tai_san = ThuyetMinhTaiSan(chi_tiet_tai_khoan=[])
+        nguon_von = ThuyetMinhNguonVon(chi_tiet_tai_khoan=[])
+        ket_qua = ThuyetMinhKetQua(chi_tiet_tai_khoan=[])
+        for dong in bang.chi_tiet_tai_khoan:
+            loai = loai_tai_khoan.get(dong.so_tai_khoan)
+            if loai == LoaiTaiKhoan.TAI_SAN:
+                tai_san.chi_tiet_tai_khoan.append(dong)
+                tai_san.tong_cong_thuyet_minh += (
+                    dong.so_du_cuoi_ky_no - dong.so_du_cuoi_ky_co
+                )
+            elif loai in _NGUON_VON:
+                nguon_von.chi_tiet_tai_khoan.append(dong)
+                nguon_von.tong_cong_thuyet_minh += (
+                    dong.so_du_cuoi_ky_co - dong.so_du_cuoi_ky_no
+                )
+            elif loai in _DOANH_THU:
+                ket_qua.chi_tiet_tai_khoan.append(dong)
+                ket_qua.tong_doanh_thu += dong.phat_sinh_co
+            elif loai in _CHI_PHI:
+                ket_qua.chi_tiet_tai_khoan.append(dong)
+                ket_qua.tong_chi_phi += dong.phat_sinh_no
+
         return BaoCaoThuyetMinh(
             ngay_lap=ngay_lap,
             ky_hieu=ky_hieu,
+            dac_diem_hoat_dong_cua_doanh_nghiep=(
+                "Theo Giấy chứng nhận đăng ký doanh nghiệp."
+            ),
+            ky_ke_toan_va_don_vi_tien_te=(
+                f"Kỳ kế toán từ {ngay_bat_dau:%d/%m/%Y} đến "
+                f"{ngay_ket_thuc:%d/%m/%Y}. Đơn vị tiền tệ: VND."
+            ),
             chuan_muc_ke_toan_ap_dung="VAS và TT99/2025/TT-BTC",
-            # ...
+            thuyet_minh_tai_san=tai_san,
+            thuyet_minh_nguon_von=nguon_von,
+            thuyet_minh_ket_qua_hoat_dong_kinh_doanh=ket_qua,
         )
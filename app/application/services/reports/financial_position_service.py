@@ -6,16 +6,21 @@ Phụ lục IV: Mẫu B01-DN.
 import logging
 from datetime import date
 from decimal import Decimal
-from typing import List
+from typing import Optional
 
 from app.application.interfaces.report_repo import ReportRepositoryInterface
-from app.domain.models.account import LoaiTaiKhoan, TaiKhoan
+from app.application.services.reports.account_tree_rollup import (
+    AccountTreeRollup,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.domain.models.account import LoaiTaiKhoan
 from app.domain.models.report import (
     BaoCaoTinhHinhTaiChinh,
     NoPhaiTraDaiHan,
     NoPhaiTraNganHan,
     TaiSanDaiHan,
     TaiSanNganHan,
+    TienVaCacKhoanTgTien,
     TongNguonVon,
     TongTaiSan,
     VonChuSoHuu,
@@ -33,103 +38,119 @@ class FinancialPositionService:
         self.repo = repo
 
     def lay_bao_cao(
-        self, ky_hieu: str, ngay_lap: date, ngay_ket_thuc: date
+        self,
+        ky_hieu: str,
+        ngay_lap: date,
+        ngay_ket_thuc: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> BaoCaoTinhHinhTaiChinh:
         all_accounts = self.repo.get_all_accounts()
-        account_balances = self._tinh_tat_ca_so_du(
-            all_accounts, date(ngay_ket_thuc.year, 1, 1), ngay_ket_thuc
+        # Dựng cây TK và cộng dồn số dư một lần; mọi chỉ tiêu tra cứu O(1)
+        cay_tai_khoan = AccountTreeRollup(all_accounts).tong_hop(
+            self._tinh_tat_ca_so_du(
+                date(ngay_ket_thuc.year, 1, 1), ngay_ket_thuc, so_lieu
+            )
         )
 
         def get_balance(so_tai_khoan_goc: str) -> Decimal:
-            tong_no = Decimal(0)
-            tong_co = Decimal(0)
-            for so_tai_khoan, (sd_no, sd_co) in account_balances.items():
-                if so_tai_khoan.startswith(so_tai_khoan_goc):
-                    tong_no += sd_no
-                    tong_co += sd_co
-
-            # Xác định loại tài khoản từ DB
-            tai_khoan_goc = next(
-                (
-                    tk
-                    for tk in all_accounts
-                    if tk.so_tai_khoan == so_tai_khoan_goc
-                ),
-                None,
-            )
-            if not tai_khoan_goc:
-                return Decimal(0)
-
-            loai_tk = tai_khoan_goc.loai_tai_khoan
-            if loai_tk in [LoaiTaiKhoan.TAI_SAN]:
-                net_balance = tong_no - tong_co
-                return abs(net_balance).quantize(Decimal("0.01"))
-            elif loai_tk in [
+            tai_khoan_goc = cay_tai_khoan.tai_khoan(so_tai_khoan_goc)
+            if not tai_khoan_goc or tai_khoan_goc.loai_tai_khoan not in (
+                LoaiTaiKhoan.TAI_SAN,
                 LoaiTaiKhoan.NO_PHAI_TRA,
                 LoaiTaiKhoan.VON_CHU_SO_HUU,
-            ]:
-                net_balance = tong_co - tong_no
-                return abs(net_balance).quantize(Decimal("0.01"))
-            return Decimal(0)
+            ):
+                return Decimal(0)
+            net_balance = cay_tai_khoan.so_du_thuan(so_tai_khoan_goc)
+            return abs(net_balance).quantize(Decimal("0.01"))
 
         # Tính tài sản
         tien_mat = get_balance("111")
         tien_gui = get_balance("112")
         tien_dang_chuyen = get_balance("113")
-        tien_va_tg_tien = tien_mat + tien_gui + tien_dang_chuyen
+        tien_va_tg_tien = TienVaCacKhoanTgTien(
+            tien_mat=tien_mat,
+            tien_gui_ngan_hang=tien_gui,
+            tien_dang_chuyen=tien_dang_chuyen,
+            tong_cong=tien_mat + tien_gui + tien_dang_chuyen,
+        )
 
         tai_san_ngan_han = TaiSanNganHan(
-            tien_va_cac_khoan_tg_tien=tien_va_tg_tien,
-            cac_khoan_dau_tu_tc_ngan_han=get_balance("121"),
+            tien_va_cac_khoan_tuong_duong_tien=tien_va_tg_tien,
+            cac_khoan_dau_tu_tai_chinh_ngan_han=get_balance("121"),
             cac_khoan_phai_thu_ngan_han=get_balance("131"),
             hang_ton_kho=get_balance("156"),
             tai_san_ngan_han_khac=get_balance("150"),
-            tong_tai_san_ngan_han=get_balance("100"),
+        )
+        tai_san_ngan_han.tong_tai_san_ngan_han = (
+            tien_va_tg_tien.tong_cong
+            + tai_san_ngan_han.cac_khoan_dau_tu_tai_chinh_ngan_han
+            + tai_san_ngan_han.cac_khoan_phai_thu_ngan_han
+            + tai_san_ngan_han.hang_ton_kho
+            + tai_san_ngan_han.tai_san_ngan_han_khac
         )
 
         tai_san_dai_han = TaiSanDaiHan(
             tai_san_co_dinh_huu_hinh=get_balance("211") - get_balance("214"),
-            tai_san_co_dinh_vo_hinh=get_balance("221"),
+            tai_san_co_dinh_vo_hinh=get_balance("213"),
             bat_dong_san_dau_tu=get_balance("217"),
-            cac_khoan_dau_tu_tc_dai_han=get_balance("221"),
+            cac_khoan_dau_tu_tai_chinh_dai_han=get_balance("221"),
             tai_san_dai_han_khac=get_balance("241"),
-            tong_tai_san_dai_han=get_balance("200"),
+        )
+        tai_san_dai_han.tong_tai_san_dai_han = (
+            tai_san_dai_han.tai_san_co_dinh_huu_hinh
+            + tai_san_dai_han.tai_san_co_dinh_vo_hinh
+            + tai_san_dai_han.bat_dong_san_dau_tu
+            + tai_san_dai_han.cac_khoan_dau_tu_tai_chinh_dai_han
+            + tai_san_dai_han.tai_san_dai_han_khac
         )
 
         tong_tai_san = TongTaiSan(
             tai_san_ngan_han=tai_san_ngan_han,
             tai_san_dai_han=tai_san_dai_han,
-            tong_cong_tai_san=get_balance("100") + get_balance("200"),
+            tong_cong_tai_san=tai_san_ngan_han.tong_tai_san_ngan_han
+            + tai_san_dai_han.tong_tai_san_dai_han,
         )
 
         # Tính nguồn vốn
         no_ngan_han = NoPhaiTraNganHan(
-            vay_no_thue_tai_chinh_ngan_han=get_balance("341"),
+            vay_va_no_thue_tai_chinh_ngan_han=get_balance("341"),
             phai_tra_ngan_han_nguoi_ban=get_balance("331"),
             thue_va_cac_khoan_phai_nop_nha_nuoc=get_balance("333"),
             phai_tra_ngan_han_khac=get_balance("338"),
-            tong_no_ngan_han=get_balance("300"),
+        )
+        no_ngan_han.tong_no_ngan_han = (
+            no_ngan_han.vay_va_no_thue_tai_chinh_ngan_han
+            + no_ngan_han.phai_tra_ngan_han_nguoi_ban
+            + no_ngan_han.thue_va_cac_khoan_phai_nop_nha_nuoc
+            + no_ngan_han.phai_tra_ngan_han_khac
         )
 
         no_dai_han = NoPhaiTraDaiHan(
-            vay_no_thue_tai_chinh_dai_han=get_balance("341"),
-            du_phong_phai_tra_dai_han=Decimal(0),
-            tong_no_dai_han=get_balance("400"),
+            vay_va_no_thue_tai_chinh_dai_han=get_balance("343"),
+            du_phong_phai_tra_dai_han=get_balance("352"),
+        )
+        no_dai_han.tong_no_dai_han = (
+            no_dai_han.vay_va_no_thue_tai_chinh_dai_han
+            + no_dai_han.du_phong_phai_tra_dai_han
         )
 
         von_chu_so_huu = VonChuSoHuu(
             von_dau_tu_cua_chu_so_huu=get_balance("411"),
             loi_nhuan_sau_thue_chua_phan_phoi=get_balance("421"),
-            tong_von_chu_so_huu=get_balance("500"),
+        )
+        von_chu_so_huu.tong_von_chu_so_huu = (
+            von_chu_so_huu.von_dau_tu_cua_chu_so_huu
+            + von_chu_so_huu.thang_du_von_co_phan
+            + von_chu_so_huu.loi_nhuan_sau_thue_chua_phan_phoi
         )
 
         tong_nguon_von = TongNguonVon(
             no_phai_tra_ngan_han=no_ngan_han,
             no_phai_tra_dai_han=no_dai_han,
             von_chu_so_huu=von_chu_so_huu,
-            tong_cong_nguon_von=get_balance("300")
-            + get_balance("400")
-            + get_balance("500"),
+            tong_cong_nguon_von=no_ngan_han.tong_no_ngan_han
+            + no_dai_han.tong_no_dai_han
+            + von_chu_so_huu.tong_von_chu_so_huu,
         )
 
         # Kiểm tra cân đối
@@ -151,12 +172,17 @@ class FinancialPositionService:
         )
 
     def _tinh_tat_ca_so_du(
-        self, accounts: List[TaiKhoan], start: date, end: date
+        self, start: date, end: date, so_lieu: Optional[LedgerAggregate]
     ):
+        # Một truy vấn gom nhóm cho mọi TK thay vì mỗi TK một lần gọi
+        # (hoặc tính trên engine dạng cột dùng chung nếu có)
+        nguon = self.repo if so_lieu is None else so_lieu
         balances = {}
-        for tk in accounts:
-            _, _, _, sd_ck_no, sd_ck_co = self.repo.get_account_balance(
-                tk.so_tai_khoan, start, end
+        for so_tai_khoan, _, _, _, cuoi_ky in nguon.get_trial_balance(
+            start, end
+        ):
+            balances[so_tai_khoan] = (
+                max(cuoi_ky, Decimal(0)),
+                max(-cuoi_ky, Decimal(0)),
             )
-            balances[tk.so_tai_khoan] = (sd_ck_no, sd_ck_co)
         return balances
@@ -0,0 +1,84 @@
+# app/application/services/reports/financial_statement_bundle_service.py
+"""
+[SRP] Lập trọn bộ BCTC (B01, B02, B03, B09) của một kỳ.
+
+🎯 Mục tiêu:
+- Nạp phát sinh đã ghi sổ MỘT lần vào LedgerAggregate.
+- Mọi báo cáo trong bộ tính trên cùng số liệu đó (tham số `so_lieu`),
+  không báo cáo nào quét lại sổ cái.
+"""
+from datetime import date
+
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.application.services.reports.cash_flow_service import CashFlowService
+from app.application.services.reports.disclosure_service import (
+    DisclosureService,
+)
+from app.application.services.reports.financial_position_service import (
+    FinancialPositionService,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.application.services.reports.performance_service import (
+    PerformanceService,
+)
+from app.domain.models.report import BoBaoCaoTaiChinh
+
+
+class FinancialStatementBundleService:
+    def __init__(
+        self,
+        repo: ReportRepositoryInterface,
+        financial_position_service: FinancialPositionService,
+        performance_service: PerformanceService,
+        cash_flow_service: CashFlowService,
+        disclosure_service: DisclosureService,
+    ):
+        self.repo = repo
+        self.financial_position_service = financial_position_service
+        self.performance_service = performance_service
+        self.cash_flow_service = cash_flow_service
+        self.disclosure_service = disclosure_service
+
+    def lay_bao_cao(
+        self,
+        ky_hieu: str,
+        ngay_lap: date,
+        ngay_bat_dau: date,
+        ngay_ket_thuc: date,
+    ) -> BoBaoCaoTaiChinh:
+        if ngay_bat_dau > ngay_ket_thuc:
+            raise ValueError("Ngày bắt đầu phải trước hoặc bằng ngày kết thúc.")
+
+        # Một lần đọc sổ cái cho cả bộ báo cáo
+        so_lieu = LedgerAggregate.nap(self.repo, ngay_ket_thuc)
+
+        return BoBaoCaoTaiChinh(
+            ngay_lap=ngay_lap,
+            ky_hieu=ky_hieu,
+            bao_cao_tinh_hinh_tai_chinh=(
+                self.financial_position_service.lay_bao_cao(
+                    ky_hieu, ngay_lap, ngay_ket_thuc, so_lieu=so_lieu
+                )
+            ),
+            bao_cao_ket_qua_hdkd=self.performance_service.lay_bao_cao(
+                ky_hieu,
+                ngay_lap,
+                ngay_bat_dau,
+                ngay_ket_thuc,
+                so_lieu=so_lieu,
+            ),
+            bao_cao_luu_chuyen_tien_te=self.cash_flow_service.lay_bao_cao(
+                ky_hieu,
+                ngay_lap,
+                ngay_bat_dau,
+                ngay_ket_thuc,
+                so_lieu=so_lieu,
+            ),
+            ban_thuyet_minh=self.disclosure_service.lay_bao_cao(
+                ky_hieu,
+                ngay_lap,
+                ngay_bat_dau,
+                ngay_ket_thuc,
+                so_lieu=so_lieu,
+            ),
+        )
@@ -0,0 +1,190 @@
+# app/application/services/reports/ledger_aggregate.py
+"""
+[SRP] Engine tổng hợp số liệu sổ cái dạng cột (NumPy) cho các báo cáo.
+
+🎯 Mục tiêu:
+- Nạp phát sinh đã ghi sổ MỘT lần vào các mảng cột:
+  mã TK (category id), ngày (ordinal), PS Nợ/Có (int64, đơn vị nhỏ nhất).
+- Mọi phép cộng trên mảng số nguyên (chính xác tuyệt đối), không cộng
+  Decimal từng dòng trong vòng lặp Python.
+- Chỉ đổi về Decimal ở ranh giới DTO (`tien_te` trong report.py).
+
+📌 Dùng chung một LedgerAggregate cho nhiều báo cáo cùng kỳ (B01/B02/B03,
+   Bảng cân đối số phát sinh) qua tham số `so_lieu` của từng service.
+📌 NumPy chỉ được import khi dựng engine lần đầu (`_numpy()`): mọi service
+   báo cáo import module này, nạp NumPy sẵn làm chậm khởi động app. Các
+   phép tính sau đó dùng phương thức của ndarray, không cần module.
+"""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.domain.models.journal_entry import CotSoCai, sang_don_vi_nho
+from app.domain.models.report import tien_te
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Khóa sắp xếp = tk_id * _HE_SO_KHOA + ngày (ordinal < 2^22 với năm <= 9999)
+_HE_SO_KHOA = 1 << 22
+
+
+def _numpy():
+    """Module NumPy (import lười, một chỗ duy nhất trong file)."""
+    import numpy
+
+    return numpy
+
+
+class LedgerAggregate:
+    """
+    Sổ cái dạng cột, sắp xếp theo (TK, ngày): phát sinh khoảng ngày của
+    MỌI tài khoản tính bằng một lần searchsorted trên tổng tiền tố.
+    """
+
+    def __init__(
+        self,
+        so_tai_khoan: np.ndarray,
+        tk_id: np.ndarray,
+        ngay: np.ndarray,
+        no: np.ndarray,
+        co: np.ndarray,
+    ):
+        np = _numpy()
+
+        # Danh sách mã TK đã sắp xếp → TK con của một TK là một đoạn liên tiếp
+        self.so_tai_khoan = so_tai_khoan
+        thu_tu = np.lexsort((ngay, tk_id))
+        self.tk_id = tk_id[thu_tu]
+        self.ngay = ngay[thu_tu]
+        self._khoa = self.tk_id.astype(np.int64) * _HE_SO_KHOA + self.ngay
+        # Khóa (TK, ngày 0) của từng TK: cận của searchsorted theo khoảng
+        self._khoa_tk = (
+            np.arange(len(so_tai_khoan), dtype=np.int64) * _HE_SO_KHOA
+        )
+        # Tổng tiền tố (thêm phần tử 0 ở đầu): tổng [i, j) = cum[j] - cum[i]
+        self._cum_no = np.concatenate(([0], np.cumsum(no[thu_tu])))
+        self._cum_co = np.concatenate(([0], np.cumsum(co[thu_tu])))
+        self._cache: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def tu_phat_sinh_ngay(
+        cls, rows: Iterable[Tuple[str, date, Decimal, Decimal]]
+    ) -> "LedgerAggregate":
+        """Dựng engine từ các dòng (Số TK, Ngày, PS Nợ, PS Có)."""
+        np = _numpy()
+
+        rows = list(rows)
+        ma_tk = np.array([row[0] for row in rows], dtype=str)
+        so_tai_khoan, tk_id = np.unique(ma_tk, return_inverse=True)
+        ngay = np.fromiter(
+            (row[1].toordinal() for row in rows), np.int64, len(rows)
+        )
+        no = np.fromiter(
+            (sang_don_vi_nho(row[2]) for row in rows), np.int64, len(rows)
+        )
+        co = np.fromiter(
+            (sang_don_vi_nho(row[3]) for row in rows), np.int64, len(rows)
+        )
+        return cls(so_tai_khoan, tk_id.astype(np.int64), ngay, no, co)
+
+    @classmethod
+    def tu_cot(cls, cot: CotSoCai) -> "LedgerAggregate":
+        """
+        Dựng engine từ sổ cái dạng cột (array → NumPy qua buffer, không lặp
+        Python theo từng dòng). Mã TK được đánh lại id theo thứ tự sắp xếp.
+        """
+        np = _numpy()
+
+        ma_tk = np.array(cot.so_tai_khoan, dtype=str)
+        thu_tu = np.argsort(ma_tk)
+        id_moi = np.empty(len(ma_tk), dtype=np.int64)
+        id_moi[thu_tu] = np.arange(len(ma_tk), dtype=np.int64)
+        return cls(
+            ma_tk[thu_tu],
+            id_moi[np.asarray(cot.tk_id, dtype=np.int64)],
+            np.asarray(cot.ngay, dtype=np.int64),
+            np.asarray(cot.no, dtype=np.int64),
+            np.asarray(cot.co, dtype=np.int64),
+        )
+
+    @classmethod
+    def nap(
+        cls, repo: ReportRepositoryInterface, ngay_ket_thuc: date
+    ) -> "LedgerAggregate":
+        """
+        Nạp toàn bộ phát sinh đã ghi sổ đến `ngay_ket_thuc`: từ kho sổ cái
+        dạng cột nếu repository có (không đọc DB), ngược lại một truy vấn.
+        """
+        cot = repo.get_posted_columns(ngay_ket_thuc)
+        if cot is not None:
+            return cls.tu_cot(cot)
+        return cls.tu_phat_sinh_ngay(repo.get_daily_turnover(ngay_ket_thuc))
+
+    # --------------------------------------------------------
+    # TÍNH TOÁN TRÊN MẢNG (đơn vị nhỏ nhất, int64)
+    # --------------------------------------------------------
+
+    def phat_sinh_theo_tai_khoan(
+        self, start: Optional[date], end: date
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (PS Nợ, PS Có) trong [start, end] của TỪNG TK, theo thứ tự
+        `self.so_tai_khoan`. start=None: từ đầu sổ.
+        """
+        bd = start.toordinal() if start else 0
+        kt = end.toordinal()
+        ket_qua = self._cache.get((bd, kt))
+        if ket_qua is None:
+            dau = self._khoa.searchsorted(self._khoa_tk + bd, "left")
+            cuoi = self._khoa.searchsorted(self._khoa_tk + kt, "right")
+            ket_qua = (
+                self._cum_no[cuoi] - self._cum_no[dau],
+                self._cum_co[cuoi] - self._cum_co[dau],
+            )
+            self._cache[(bd, kt)] = ket_qua
+        return ket_qua
+
+    def _doan_tai_khoan(self, tk_goc: str) -> slice:
+        """Đoạn chỉ số của TK `tk_goc` và mọi TK con (theo tiền tố mã)."""
+        dau = self.so_tai_khoan.searchsorted(tk_goc, "left")
+        cuoi = self.so_tai_khoan.searchsorted(tk_goc + "\uffff", "left")
+        return slice(int(dau), int(cuoi))
+
+    # --------------------------------------------------------
+    # RANH GIỚI DTO (Decimal) — cùng chữ ký với ReportRepositoryInterface
+    # --------------------------------------------------------
+
+    def get_turnover(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """(PS Nợ, PS Có) của TK và các TK con trong [start, end]."""
+        no, co = self.phat_sinh_theo_tai_khoan(start, end)
+        doan = self._doan_tai_khoan(so_tai_khoan)
+        return tien_te(no[doan].sum()), tien_te(co[doan].sum())
+
+    def get_trial_balance(
+        self, start: date, end: date
+    ) -> List[Tuple[str, Decimal, Decimal, Decimal, Decimal]]:
+        """
+        (Số TK, SDĐK ròng, PS Nợ, PS Có, SDCK ròng) của riêng từng TK,
+        giống ReportRepositoryInterface.get_trial_balance.
+        """
+        no_ck, co_ck = self.phat_sinh_theo_tai_khoan(None, end)
+        ps_no, ps_co = self.phat_sinh_theo_tai_khoan(start, end)
+        cuoi_ky = no_ck - co_ck
+        dau_ky = cuoi_ky - (ps_no - ps_co)
+        (co_so_lieu,) = (dau_ky | ps_no | ps_co).nonzero()
+        return [
+            (
+                str(self.so_tai_khoan[i]),
+                tien_te(dau_ky[i]),
+                tien_te(ps_no[i]),
+                tien_te(ps_co[i]),
+                tien_te(cuoi_ky[i]),
+            )
+            for i in co_so_lieu
+        ]
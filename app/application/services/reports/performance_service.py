@@ -3,9 +3,10 @@
 [SRP] Service tính Báo cáo Kết quả HĐKD (B02-DN).
 """
 from datetime import date
-from decimal import Decimal
+from typing import Optional
 
 from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
 from app.domain.models.report import BaoCaoKetQuaHDKD
 
 
@@ -19,13 +20,14 @@ class PerformanceService:
         ngay_lap: date,
         ngay_bat_dau: date,
         ngay_ket_thuc: date,
+        so_lieu: Optional[LedgerAggregate] = None,
     ) -> BaoCaoKetQuaHDKD:
         # Tính toán tương tự như trong ReportingService cũ
         doanh_thu = self._tinh_phat_sinh_tai_khoan(
-            "511", "CO", ngay_bat_dau, ngay_ket_thuc
+            "511", "CO", ngay_bat_dau, ngay_ket_thuc, so_lieu
         )
         gia_von = self._tinh_phat_sinh_tai_khoan(
-            "632", "NO", ngay_bat_dau, ngay_ket_thuc
+            "632", "NO", ngay_bat_dau, ngay_ket_thuc, so_lieu
         )
         loi_nhuan = doanh_thu - gia_von
 
@@ -34,14 +36,15 @@ class PerformanceService:
             ky_hieu=ky_hieu,
             doanh_thu_ban_hang=doanh_thu,
             gia_von_hang_ban=gia_von,
+            tong_loi_nhuan_truoc_thue=loi_nhuan,
             loi_nhuan_sau_thue=loi_nhuan,
         )
 
-    def _tinh_phat_sinh_tai_khoan(self, tk_goc, loai_ps, bd, kt):
-        all_entries = self.repo.get_all_posted_in_range(bd, kt)
-        tong = Decimal(0)
-        for entry in all_entries:
-            for line in entry.lines:
-                if line.so_tai_khoan.startswith(tk_goc):
-                    tong += line.no if loai_ps == "NO" else line.co
-        return tong
+    def _tinh_phat_sinh_tai_khoan(
+        self, tk_goc, loai_ps, bd, kt, so_lieu=None
+    ):
+        # Tra cứu O(log n) qua repository (chỉ mục phát sinh theo ngày),
+        # hoặc qua engine dạng cột dùng chung nếu được truyền vào
+        nguon = self.repo if so_lieu is None else so_lieu
+        ps_no, ps_co = nguon.get_turnover(tk_goc, bd, kt)
+        return ps_no if loai_ps == "NO" else ps_co
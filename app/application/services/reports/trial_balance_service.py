@@ -0,0 +1,92 @@
+# app/application/services/reports/trial_balance_service.py
+"""
+[SRP] Service lập Bảng cân đối số phát sinh (Trial Balance).
+Số liệu của mọi tài khoản lấy từ MỘT truy vấn gom nhóm của repository;
+có thể cộng dồn TK con lên TK cha theo cây hệ thống tài khoản.
+"""
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.application.services.reports.account_tree_rollup import (
+    AccountTreeRollup,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.domain.models.report import BangCanDoiSoPhatSinh, ChiTietTaiKhoan
+
+logger = logging.getLogger(__name__)
+
+
+class TrialBalanceService:
+    """
+    Lập Bảng cân đối số phát sinh trong khoảng [ngay_bat_dau, ngay_ket_thuc].
+    """
+
+    def __init__(self, repo: ReportRepositoryInterface):
+        self.repo = repo
+
+    def lay_bao_cao(
+        self,
+        ngay_bat_dau: date,
+        ngay_ket_thuc: date,
+        tong_hop_theo_cay: bool = False,
+        so_lieu: Optional[LedgerAggregate] = None,
+    ) -> BangCanDoiSoPhatSinh:
+        if ngay_bat_dau > ngay_ket_thuc:
+            raise ValueError("Ngày bắt đầu phải trước hoặc bằng ngày kết thúc.")
+
+        all_accounts = self.repo.get_all_accounts()
+        cay_tai_khoan = AccountTreeRollup(all_accounts)
+
+        # (SDĐK ròng, PS Nợ, PS Có) của riêng từng TK — một truy vấn duy nhất
+        # (hoặc tính trên engine dạng cột dùng chung nếu có)
+        nguon = self.repo if so_lieu is None else so_lieu
+        so_lieu_tk = {
+            so_tai_khoan: (dau_ky, ps_no, ps_co)
+            for so_tai_khoan, dau_ky, ps_no, ps_co, _ in (
+                nguon.get_trial_balance(ngay_bat_dau, ngay_ket_thuc)
+            )
+        }
+        if tong_hop_theo_cay:
+            so_lieu_tk = cay_tai_khoan.cong_don(so_lieu_tk, so_cot=3)
+
+        bang = BangCanDoiSoPhatSinh(
+            ngay_bat_dau=ngay_bat_dau,
+            ngay_ket_thuc=ngay_ket_thuc,
+            tong_hop_theo_cay=tong_hop_theo_cay,
+            chi_tiet_tai_khoan=[],
+        )
+        for so_tai_khoan in sorted(so_lieu_tk):
+            dau_ky, ps_no, ps_co = so_lieu_tk[so_tai_khoan]
+            if not (dau_ky or ps_no or ps_co):
+                continue
+            cuoi_ky = dau_ky + ps_no - ps_co
+            tai_khoan = cay_tai_khoan.tai_khoan(so_tai_khoan)
+            dong = ChiTietTaiKhoan(
+                so_tai_khoan=so_tai_khoan,
+                ten_tai_khoan=tai_khoan.ten_tai_khoan if tai_khoan else "",
+                so_du_dau_ky_no=max(dau_ky, Decimal(0)),
+                so_du_dau_ky_co=max(-dau_ky, Decimal(0)),
+                phat_sinh_no=ps_no,
+                phat_sinh_co=ps_co,
+                so_du_cuoi_ky_no=max(cuoi_ky, Decimal(0)),
+                so_du_cuoi_ky_co=max(-cuoi_ky, Decimal(0)),
+            )
+            bang.chi_tiet_tai_khoan.append(dong)
+
+            if tong_hop_theo_cay and cay_tai_khoan.cha_cua(so_tai_khoan):
+                continue  # Đã nằm trong số liệu của TK cha
+            bang.tong_so_du_dau_ky_no += dong.so_du_dau_ky_no
+            bang.tong_so_du_dau_ky_co += dong.so_du_dau_ky_co
+            bang.tong_phat_sinh_no += dong.phat_sinh_no
+            bang.tong_phat_sinh_co += dong.phat_sinh_co
+            bang.tong_so_du_cuoi_ky_no += dong.so_du_cuoi_ky_no
+            bang.tong_so_du_cuoi_ky_co += dong.so_du_cuoi_ky_co
+
+        if bang.tong_phat_sinh_no != bang.tong_phat_sinh_co:
+            logger.warning(
+                f"[CAN DOI LOI] PS No: {bang.tong_phat_sinh_no}, PS Co: {bang.tong_phat_sinh_co}"
+            )
+        return bang
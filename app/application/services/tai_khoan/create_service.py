@@ -1,6 +1,8 @@
 # app/application/services/tai_khoan/create_service.py
 import logging
+from typing import Optional
 
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.application.interfaces.account_validator import TaiKhoanValidator
 from app.domain.models.account import TaiKhoan
@@ -17,9 +19,11 @@ class CreateTaiKhoanService:
         self,
         repo: AccountRepositoryInterface,
         validator: TaiKhoanValidator = None,
+        cache: Optional[AccountCacheInterface] = None,
     ):
         self.repo = repo
         self.validator = validator
+        self.cache = cache
 
     def execute(self, tai_khoan: TaiKhoan) -> TaiKhoan:
         # 1. Validate (nếu có)
@@ -45,4 +49,7 @@ class CreateTaiKhoanService:
         logger.info(
             f"[TAO_TAI_KHOAN] So: {tai_khoan.so_tai_khoan}, Ten: {tai_khoan.ten_tai_khoan}"
         )
-        return self.repo.add(tai_khoan)
+        ket_qua = self.repo.add(tai_khoan)
+        if self.cache:
+            self.cache.xoa()  # COA đã thay đổi
+        return ket_qua
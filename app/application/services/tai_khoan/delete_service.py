@@ -1,6 +1,8 @@
 # app/application/services/tai_khoan/delete_service.py
 import logging
+from typing import Optional
 
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 
 logger = logging.getLogger(__name__)
@@ -11,8 +13,13 @@ class DeleteTaiKhoanService:
     [SRP] Chỉ chịu trách nhiệm xóa tài khoản.
     """
 
-    def __init__(self, repo: AccountRepositoryInterface):
+    def __init__(
+        self,
+        repo: AccountRepositoryInterface,
+        cache: Optional[AccountCacheInterface] = None,
+    ):
         self.repo = repo
+        self.cache = cache
 
     def execute(self, so_tai_khoan: str) -> bool:
         # 1. Kiểm tra tồn tại
@@ -27,4 +34,7 @@ class DeleteTaiKhoanService:
             )
 
         logger.info(f"[XOA_TAI_KHOAN] So: {so_tai_khoan}")
-        return self.repo.delete(so_tai_khoan)
+        ket_qua = self.repo.delete(so_tai_khoan)
+        if self.cache:
+            self.cache.xoa()  # COA đã thay đổi
+        return ket_qua
@@ -1,4 +1,7 @@
 # app/application/services/tai_khoan/update_service.py
+from typing import Optional
+
+from app.application.interfaces.account_cache import AccountCacheInterface
 from app.application.interfaces.account_repo import AccountRepositoryInterface
 from app.domain.models.account import TaiKhoan
 
@@ -8,8 +11,13 @@ class UpdateTaiKhoanService:
     [SRP] Chỉ chịu trách nhiệm cập nhật tài khoản kế toán.
     """
 
-    def __init__(self, repo: AccountRepositoryInterface):
+    def __init__(
+        self,
+        repo: AccountRepositoryInterface,
+        cache: Optional[AccountCacheInterface] = None,
+    ):
         self.repo = repo
+        self.cache = cache
 
     def execute(self, tai_khoan_moi: TaiKhoan) -> TaiKhoan:
         # 1. Kiểm tra tài khoản cha (nếu là cấp con)
@@ -21,4 +29,7 @@ class UpdateTaiKhoanService:
                 )
 
         # 2. Gọi repo để cập nhật
-        return self.repo.update(tai_khoan_moi)
+        ket_qua = self.repo.update(tai_khoan_moi)
+        if self.cache:
+            self.cache.xoa()  # COA đã thay đổi
+        return ket_qua
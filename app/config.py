@@ -14,4 +14,77 @@ if not DATABASE_URL:
         "Biến môi trường DATABASE_URL chưa được thiết lập trong file .env"
     )
 
+# [Cấu hình] Chuỗi kết nối async (AsyncSession, luồng xuất Parquet). Để
+# trống: suy ra từ DATABASE_URL với driver async tương ứng (asyncpg /
+# aiosqlite).
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+
+def _so_nguyen(ten: str, mac_dinh: int) -> int:
+    """Đọc biến môi trường kiểu số nguyên."""
+    gia_tri = os.getenv(ten)
+    if gia_tri is None or gia_tri == "":
+        return mac_dinh
+    try:
+        return int(gia_tri)
+    except ValueError:
+        raise ValueError(f"Biến môi trường {ten} phải là số nguyên.")
+
+
+# [Cấu hình] Pool kết nối của engine chính (ghi sổ). Với SQLite chỉ áp dụng
+# pre-ping / recycle — SQLAlchemy tự chọn loại pool riêng cho SQLite.
+DB_POOL_SIZE = _so_nguyen("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _so_nguyen("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _so_nguyen("DB_POOL_TIMEOUT", 30)  # giây chờ lấy kết nối
+DB_POOL_RECYCLE = _so_nguyen("DB_POOL_RECYCLE", 1800)  # giây; -1: không
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Giới hạn thời gian mỗi câu lệnh (ms, PostgreSQL). 0: không giới hạn
+DB_STATEMENT_TIMEOUT_MS = _so_nguyen("DB_STATEMENT_TIMEOUT_MS", 0)
+
+# [Cấu hình] DB chỉ đọc (read replica) cho báo cáo và truy vấn bút toán.
+# Để trống: dùng DB chính (chung engine, chung pool).
+REPORT_DATABASE_URL = os.getenv("REPORT_DATABASE_URL")
+REPORT_ASYNC_DATABASE_URL = os.getenv("REPORT_ASYNC_DATABASE_URL")
+# Pool riêng của replica → B01/B03 chạy lâu không chiếm kết nối ghi sổ
+REPORT_DB_POOL_SIZE = _so_nguyen("REPORT_DB_POOL_SIZE", DB_POOL_SIZE)
+REPORT_DB_MAX_OVERFLOW = _so_nguyen("REPORT_DB_MAX_OVERFLOW", DB_MAX_OVERFLOW)
+REPORT_DB_STATEMENT_TIMEOUT_MS = _so_nguyen(
+    "REPORT_DB_STATEMENT_TIMEOUT_MS", DB_STATEMENT_TIMEOUT_MS
+)
+
+# [Cấu hình] Kho sổ cái dạng cột trong bộ nhớ (theo năm tài chính) cho báo
+# cáo: nạp lười, cập nhật tăng dần theo phiên bản sổ cái. Tắt mặc định —
+# mỗi năm đã nạp chiếm ~32 byte / dòng bút toán trong tiến trình.
+COLUMNAR_LEDGER_STORE = os.getenv(
+    "COLUMNAR_LEDGER_STORE", "false"
+).lower() in ("1", "true", "yes")
+
+# [Cấu hình] Thư mục chứa snapshot sổ cái (file nhị phân, đọc qua mmap)
+# của các kỳ đã khóa — xem app/infrastructure/snapshots/ledger_snapshot.py
+LEDGER_SNAPSHOT_DIR = os.getenv("LEDGER_SNAPSHOT_DIR", "snapshots")
+
+# [Cấu hình] Đo SQL theo từng yêu cầu: header X-DB-Queries / X-DB-Time và
+# log có cấu trúc (logger "app.sql"). Hình dạng câu lệnh lặp lại quá
+# SQL_N_PLUS_1_THRESHOLD lần trong một yêu cầu bị cảnh báo nghi N+1.
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SQL_N_PLUS_1_THRESHOLD = _so_nguyen("SQL_N_PLUS_1_THRESHOLD", 10)
+
+# [Cấu hình] Chế độ lưu số tiền dòng bút toán:
+# - "numeric": đọc/cộng trên cột Numeric(19,4) (mặc định)
+# - "minor_units": đọc/cộng trên cột BIGINT đơn vị nhỏ nhất (x100)
+MONEY_STORAGE = os.getenv("MONEY_STORAGE", "numeric")
+
+if MONEY_STORAGE not in ("numeric", "minor_units"):
+    raise ValueError(
+        "MONEY_STORAGE chỉ nhận giá trị 'numeric' hoặc 'minor_units'."
+    )
+
 # (Bạn có thể thêm các biến cấu hình khác ở đây nếu cần sau này)
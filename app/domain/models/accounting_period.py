@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -39,3 +39,13 @@ class KyKeToan:
         ngay khi đối tượng KyKeToan được tạo ra.
         """
         self.kiem_tra_hop_le()
+
+
+def khoa_ky_hep_nhat(ky) -> Tuple:
+    """
+    [Nghiệp vụ] Khóa sắp xếp "kỳ cụ thể nhất trước": kỳ ngắn hơn đứng
+    trước, cùng độ dài thì kỳ bắt đầu sớm hơn. Dùng để chọn MỘT kỳ cho
+    ngày chứng từ khi các kỳ lồng nhau (Năm ⊃ Quý ⊃ Tháng).
+    Nhận KyKeToan hoặc bất kỳ đối tượng có ngay_bat_dau / ngay_ket_thuc.
+    """
+    return (ky.ngay_ket_thuc - ky.ngay_bat_dau, ky.ngay_bat_dau)
@@ -1,10 +1,51 @@
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass, field, fields
 from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Sequence
 
 # Hằng số làm tròn tiền tệ (2 chữ số thập phân)
 SCALE = Decimal("0.01")
+# Số đơn vị nhỏ nhất trong một đơn vị tiền (khớp với SCALE)
+MINOR_UNITS = 100
+
+
+def sang_don_vi_nho(so_tien: Decimal) -> int:
+    """Đổi số tiền sang số nguyên đơn vị nhỏ nhất (đã làm tròn theo SCALE)."""
+    return int(so_tien.quantize(SCALE, rounding=ROUND_HALF_UP) * MINOR_UNITS)
+
+
+class DongSoCai(NamedTuple):
+    """
+    Read model: một dòng phát sinh đã ghi sổ, chỉ gồm các trường báo cáo cần.
+    📌 Tuple 4 phần tử (không __dict__, không 10 trường tùy chọn như
+       JournalEntryLine) — repository phát trực tiếp từ SELECT theo luồng.
+    """
+
+    so_tai_khoan: str
+    ngay_ct: date
+    no: Decimal
+    co: Decimal
+
+
+@dataclass(frozen=True)
+class CotSoCai:
+    """
+    Read model dạng cột: các dòng đã ghi sổ, mỗi trường một mảng kiểu cố định
+    (array), cùng độ dài. Số tiền là số nguyên đơn vị nhỏ nhất (x MINOR_UNITS).
+    📌 Dòng hủy ghi sổ được giữ dưới dạng dòng âm: cộng dồn luôn đúng, nhưng
+       không coi mỗi phần tử là một dòng bút toán thực.
+    """
+
+    so_tai_khoan: Sequence[str]  # tk_id → Số TK
+    tk_id: array  # 'i'
+    ngay: array  # 'i', date.toordinal()
+    no: array  # 'q'
+    co: array  # 'q'
+    but_toan_id: array  # 'q'
+
+    def __len__(self) -> int:
+        return len(self.ngay)
 
 
 @dataclass(frozen=True)
@@ -37,6 +78,15 @@ class JournalEntryLine:
     ma_dong_tien: Optional[str] = None  # Ví dụ: 'HĐKD', 'HĐĐT', 'HĐTC'
 
     def __post_init__(self):
+        # 0. Số tiền không lẻ hơn SCALE: cột Numeric và cột BIGINT đơn vị nhỏ
+        #    nhất lưu đúng cùng một giá trị (không làm tròn ngầm từng dòng)
+        for so_tien in (self.no, self.co):
+            if Decimal(so_tien) != Decimal(so_tien).quantize(SCALE):
+                raise ValueError(
+                    f"Số tiền {so_tien} lẻ quá {SCALE} "
+                    "(tối đa 2 chữ số thập phân)."
+                )
+
         # 1. Kiểm tra số tiền không âm
         if self.no < 0 or self.co < 0:
             raise ValueError("Số tiền Nợ/Có không thể âm.")
@@ -74,6 +124,31 @@ class JournalEntryLine:
                     f"Số tiền quy đổi ({expected}) không khớp với Nợ/Có ({actual})."
                 )
 
+    @classmethod
+    def tu_du_lieu_da_luu(
+        cls,
+        so_tai_khoan: str,
+        no: Decimal,
+        co: Decimal,
+        mo_ta: Optional[str] = None,
+    ) -> "JournalEntryLine":
+        """
+        Dựng dòng từ dữ liệu ĐÃ LƯU trong DB, KHÔNG chạy lại __post_init__.
+        📌 Bất biến đã được kiểm tra khi ghi; chỉ tầng repository dùng khi đọc.
+        """
+        dong = object.__new__(cls)
+        thuoc_tinh = dong.__dict__  # ghi thẳng, bỏ qua frozen __setattr__
+        thuoc_tinh.update(_MAC_DINH_DONG)
+        thuoc_tinh["so_tai_khoan"] = so_tai_khoan
+        thuoc_tinh["no"] = no
+        thuoc_tinh["co"] = co
+        thuoc_tinh["mo_ta"] = mo_ta
+        return dong
+
+
+# Giá trị mặc định của mọi trường JournalEntryLine (cho tu_du_lieu_da_luu)
+_MAC_DINH_DONG = {f.name: f.default for f in fields(JournalEntryLine)}
+
 
 @dataclass
 class JournalEntry:
@@ -121,6 +196,31 @@ class JournalEntry:
                 f"Bút toán không cân bằng. Tổng Nợ: {self.tong_no}, Tổng Có: {self.tong_co}."
             )
 
+    @classmethod
+    def tu_du_lieu_da_luu(
+        cls,
+        id: Optional[int],
+        ngay_ct: date,
+        so_phieu: str,
+        mo_ta: str,
+        lines: List[JournalEntryLine],
+        trang_thai: str,
+    ) -> "JournalEntry":
+        """
+        Dựng bút toán từ dữ liệu ĐÃ LƯU trong DB, KHÔNG chạy lại __post_init__
+        (số dòng, cân bằng Nợ = Có, trạng thái): bút toán đã được kiểm tra khi
+        ghi. Chỉ tầng repository dùng khi đọc.
+        """
+        but_toan = object.__new__(cls)
+        thuoc_tinh = but_toan.__dict__
+        thuoc_tinh["id"] = id
+        thuoc_tinh["ngay_ct"] = ngay_ct
+        thuoc_tinh["so_phieu"] = so_phieu
+        thuoc_tinh["mo_ta"] = mo_ta
+        thuoc_tinh["lines"] = lines
+        thuoc_tinh["trang_thai"] = trang_thai
+        return but_toan
+
     @property
     def tong_no(self) -> Decimal:
         return sum(line.no for line in self.lines).quantize(
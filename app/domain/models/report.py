@@ -4,6 +4,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from app.domain.models.journal_entry import MINOR_UNITS, SCALE
+
 # --- Các Model cho Báo cáo tài chính (DTOs) theo TT99/2025/TT-BTC (Phụ lục IV) ---
 # Dữ liệu đầu ra từ ReportingService -> API -> Client
 
@@ -11,6 +13,11 @@ from pydantic import BaseModel
 # Default các giá trị là Decimal(0)
 
 
+def tien_te(so_don_vi_nho: int) -> Decimal:
+    """Đổi số nguyên đơn vị nhỏ nhất (engine tính toán) về Decimal cho DTO."""
+    return (Decimal(int(so_don_vi_nho)) / MINOR_UNITS).quantize(SCALE)
+
+
 class BaoCaoTaiChinhBase(BaseModel):
     """Model cơ sở cho các báo cáo tài chính."""
 
@@ -276,3 +283,30 @@ class BaoCaoThuyetMinh(BaoCaoTaiChinhBase):
     thong_tin_giao_dich_voi_cac_ben_lien_quan: str = "Không có"
     cac_su_kien_sau_ngay_ket_thuc_ky_ke_toan: str = "Không có"
     # ... (các phần khác của thuyết minh)
+
+
+# --- 5. Bộ báo cáo tài chính (B01 + B02 + B03 + B09) ---
+class BoBaoCaoTaiChinh(BaoCaoTaiChinhBase):
+    """Bộ BCTC của một kỳ, lập từ cùng một lần tổng hợp sổ cái"""
+
+    bao_cao_tinh_hinh_tai_chinh: BaoCaoTinhHinhTaiChinh  # B01-DN
+    bao_cao_ket_qua_hdkd: BaoCaoKetQuaHDKD  # B02-DN
+    bao_cao_luu_chuyen_tien_te: BaoCaoLuuChuyenTienTe  # B03-DN
+    ban_thuyet_minh: BaoCaoThuyetMinh  # B09-DN
+
+
+# --- 6. Bảng cân đối số phát sinh (Trial Balance) ---
+class BangCanDoiSoPhatSinh(BaseModel):
+    """Bảng cân đối số phát sinh: SDĐK, phát sinh, SDCK của từng tài khoản"""
+
+    ngay_bat_dau: date
+    ngay_ket_thuc: date
+    tong_hop_theo_cay: bool = False  # True: TK cha gồm số liệu của TK con
+    chi_tiet_tai_khoan: List[ChiTietTaiKhoan]
+    # Dòng tổng cộng (khi tổng hợp theo cây chỉ cộng TK gốc, tránh tính trùng)
+    tong_so_du_dau_ky_no: Decimal = Decimal(0)
+    tong_so_du_dau_ky_co: Decimal = Decimal(0)
+    tong_phat_sinh_no: Decimal = Decimal(0)
+    tong_phat_sinh_co: Decimal = Decimal(0)
+    tong_so_du_cuoi_ky_no: Decimal = Decimal(0)
+    tong_so_du_cuoi_ky_co: Decimal = Decimal(0)
@@ -0,0 +1,46 @@
+# File: app/infrastructure/async_bridge.py
+"""
+Cầu nối async → code đồng bộ (repository / service) trên Session đồng bộ.
+
+🎯 Mục tiêu:
+- Endpoint `async def` gọi lại nguyên service / repository đồng bộ, không
+  viết lại nghiệp vụ hai lần.
+- Mỗi lời gọi chạy trên một luồng worker (`anyio.to_thread.run_sync`): cả
+  I/O lẫn phần tính toán (gộp sổ, dựng báo cáo, Pydantic) đều nằm ngoài
+  vòng lặp sự kiện → một báo cáo nặng không làm nghẽn các yêu cầu khác.
+
+📌 Đối tượng được bọc dựng trên Session đồng bộ (get_db / get_report_db).
+   Session chỉ được dùng bởi một lời gọi tại một thời điểm (endpoint
+   `await` lần lượt), nên chuyển giữa các luồng worker là an toàn.
+"""
+import functools
+from typing import Any
+
+import anyio
+
+
+class AsyncProxy:
+    """
+    Bọc một đối tượng đồng bộ: mọi phương thức trở thành coroutine chạy
+    trên threadpool.
+
+    Cách dùng:
+        service = AsyncProxy(ReportServiceFactory(...db...).create_...())
+        bao_cao = await service.lay_bao_cao(...)
+    """
+
+    def __init__(self, doi_tuong: Any):
+        self._doi_tuong = doi_tuong
+
+    def __getattr__(self, ten: str) -> Any:
+        thuoc_tinh = getattr(self._doi_tuong, ten)
+        if not callable(thuoc_tinh):
+            return thuoc_tinh
+
+        @functools.wraps(thuoc_tinh)
+        async def _goi(*args, **kwargs):
+            return await anyio.to_thread.run_sync(
+                functools.partial(thuoc_tinh, *args, **kwargs)
+            )
+
+        return _goi
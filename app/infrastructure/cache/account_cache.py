@@ -0,0 +1,112 @@
+# File: app/infrastructure/cache/account_cache.py
+"""
+Bộ nhớ đệm hệ thống tài khoản (COA) dùng khi kiểm tra dòng bút toán.
+
+🎯 Mục tiêu:
+- Kiểm tra tài khoản của một bút toán N dòng tốn 0 truy vấn (đã đệm)
+  hoặc 1 truy vấn (nạp lần đầu / TK chưa có), không phải N truy vấn.
+- Nạp toàn bộ COA một lần; TK mới chưa đệm được đọc theo lô (`get_many`).
+- Báo cáo lấy cả COA (`lay_tat_ca`) từ đây thay vì SELECT mỗi lần lập.
+- Service thêm / sửa / xóa tài khoản gọi `xoa()` để bỏ dữ liệu cũ.
+- Worker khác đổi COA: phiên bản `tai_khoan` trong DB (`repo.get_version`,
+  đọc chung một SELECT mỗi transaction) mới hơn phiên bản đã nạp → xóa.
+
+📌 Nằm trong bộ nhớ tiến trình, tách riêng theo từng Engine (mỗi DB một bộ).
+"""
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+from app.application.interfaces.account_cache import AccountCacheInterface
+from app.application.interfaces.account_repo import AccountRepositoryInterface
+from app.domain.models.account import TaiKhoan
+from app.infrastructure.cache.engine_alias import khoa_engine
+
+
+class AccountCache(AccountCacheInterface):
+    """so_tai_khoan → TaiKhoan, kèm bộ đếm số lần đọc DB."""
+
+    def __init__(self):
+        self._tai_khoan: Dict[str, TaiKhoan] = {}
+        self._da_nap = False
+        self._the_he = 0  # tăng mỗi lần xoa(): bỏ kết quả đọc đã cũ
+        self._phien_ban_db: Optional[int] = None  # phiên bản COA trong DB
+        self.so_lan_doc_db = 0
+        self._lock = threading.Lock()
+
+    def lay_nhieu(
+        self, so_tai_khoan: Iterable[str], repo: AccountRepositoryInterface
+    ) -> Dict[str, TaiKhoan]:
+        can_tim = set(so_tai_khoan)
+        self._doi_chieu(repo)
+        # Đọc DB NGOÀI khóa: không bắt các luồng worker khác chờ theo I/O.
+        with self._lock:
+            da_nap, the_he = self._da_nap, self._the_he
+            thieu = can_tim.difference(self._tai_khoan)
+        if not da_nap:
+            self.so_lan_doc_db += 1
+            moi = {tk.so_tai_khoan: tk for tk in repo.get_all()}
+        elif thieu:
+            # TK thêm sau lần nạp (ngoài tiến trình này): đọc theo lô
+            self.so_lan_doc_db += 1
+            moi = repo.get_many(thieu)
+        else:
+            moi = {}
+        with self._lock:
+            if the_he == self._the_he:
+                if not da_nap:
+                    self._tai_khoan = dict(moi)
+                    self._da_nap = True
+                else:
+                    self._tai_khoan.update(moi)
+            tai_khoan = {**self._tai_khoan, **moi}
+        return {
+            so_tk: tai_khoan[so_tk] for so_tk in can_tim if so_tk in tai_khoan
+        }
+
+    def lay_tat_ca(self, repo: AccountRepositoryInterface) -> List[TaiKhoan]:
+        self._doi_chieu(repo)
+        with self._lock:
+            if self._da_nap:
+                return list(self._tai_khoan.values())
+            the_he = self._the_he
+        # Đọc DB ngoài khóa (xem lay_nhieu)
+        self.so_lan_doc_db += 1
+        tat_ca = repo.get_all()
+        with self._lock:
+            if the_he == self._the_he:
+                self._tai_khoan = {tk.so_tai_khoan: tk for tk in tat_ca}
+                self._da_nap = True
+        return tat_ca
+
+    def xoa(self) -> None:
+        with self._lock:
+            self._xoa()
+
+    def _doi_chieu(self, repo: AccountRepositoryInterface) -> None:
+        """COA trong DB đã đổi (ở bất kỳ worker nào) → bỏ dữ liệu đã nạp."""
+        phien_ban_db = repo.get_version()
+        with self._lock:
+            if self._phien_ban_db is None or phien_ban_db > self._phien_ban_db:
+                self._phien_ban_db = phien_ban_db
+                self._xoa()
+
+    def _xoa(self) -> None:
+        self._tai_khoan = {}
+        self._da_nap = False
+        self._the_he += 1
+
+
+_cache_theo_engine: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_account_cache(engine) -> AccountCache:
+    """Bộ nhớ đệm COA dùng chung trong tiến trình cho một Engine."""
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        cache = _cache_theo_engine.get(engine)
+        if cache is None:
+            cache = AccountCache()
+            _cache_theo_engine[engine] = cache
+        return cache
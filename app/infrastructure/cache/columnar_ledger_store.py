@@ -0,0 +1,253 @@
+# File: app/infrastructure/cache/columnar_ledger_store.py
+"""
+Kho sổ cái dạng cột trong bộ nhớ, theo từng năm tài chính.
+
+🎯 Mục tiêu:
+- Mỗi năm nạp MỘT lần (một SELECT theo luồng) vào các mảng kiểu cố định:
+  mã TK (id), ngày (ordinal), Nợ / Có (int64, đơn vị nhỏ nhất), id bút toán.
+- Báo cáo lặp lại trên cùng các năm (nhất là năm đã khóa sổ) không đọc
+  lại DB; ~32 byte mỗi dòng thay vì một đối tượng ORM / Domain.
+- Cập nhật tăng dần theo phiên bản sổ cái: mỗi commit ghi sổ / hủy ghi sổ
+  nối thêm dòng (âm khi hủy) vào các năm đã nạp.
+- Năm nạp theo thứ tự ngày: cắt tại ngày `end` bằng tìm nhị phân rồi sao
+  chép cả đoạn, không lọc từng dòng bằng Python.
+
+📌 Quy tắc phiên bản — JournalEntryRepository._commit tăng phiên bản sổ cái
+   TRƯỚC và SAU khi commit; `p` là giá trị của lần tăng trước commit. Một
+   năm nạp bắt đầu ở phiên bản `v`:
+   - v < p: lần đọc xong trước commit → nối biến động của commit;
+   - v = p: không biết lần đọc có thấy commit hay không → bỏ, nạp lại;
+   - v > p: lần đọc bắt đầu sau commit → đã có, bỏ qua biến động.
+📌 Worker khác ghi sổ → LedgerVersion thấy phiên bản DB mới hơn → xóa kho.
+📌 Nằm trong bộ nhớ tiến trình, tách riêng theo từng Engine (mỗi DB một kho).
+"""
+import bisect
+import threading
+import weakref
+from array import array
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.domain.models.journal_entry import CotSoCai, sang_don_vi_nho
+from app.infrastructure.cache.engine_alias import khoa_engine
+from app.infrastructure.cache.report_cache import (
+    LedgerVersion,
+    get_ledger_version,
+)
+
+# (id bút toán, ngày CT, Số TK, Nợ, Có) — số tiền đơn vị nhỏ nhất
+DongSoCaiNho = Tuple[int, date, str, int, int]
+# (id bút toán, ngày CT, [(Số TK, Nợ, Có)], dấu) — biến động của một commit
+BienDongButToan = Tuple[int, date, List[Tuple[str, Decimal, Decimal]], int]
+
+# Tên cột → mã kiểu của array ('i': int32, 'q': int64)
+_KIEU_COT = (
+    ("tk_id", "i"),
+    ("ngay", "i"),
+    ("no", "q"),
+    ("co", "q"),
+    ("but_toan_id", "q"),
+)
+
+
+class CotSoCaiNam:
+    """Các dòng đã ghi sổ của một năm tài chính, mỗi trường một mảng."""
+
+    def __init__(self, nam: int, phien_ban: int):
+        self.nam = nam
+        self.phien_ban = phien_ban  # phiên bản sổ cái lúc bắt đầu nạp
+        # Số dòng đầu đã theo thứ tự ngày; phần sau là biến động nối thêm
+        # với ngày sớm hơn dòng cuối (thường rỗng: ghi sổ theo ngày tăng)
+        self.so_dong_sap_xep = 0
+        for ten, kieu in _KIEU_COT:
+            setattr(self, ten, array(kieu))
+
+    def them(
+        self, tk_id: int, ngay: int, no: int, co: int, but_toan_id: int
+    ) -> None:
+        if self.so_dong_sap_xep == len(self.ngay) and (
+            not self.ngay or ngay >= self.ngay[-1]
+        ):
+            self.so_dong_sap_xep += 1
+        self.tk_id.append(tk_id)
+        self.ngay.append(ngay)
+        self.no.append(no)
+        self.co.append(co)
+        self.but_toan_id.append(but_toan_id)
+
+    def __len__(self) -> int:
+        return len(self.ngay)
+
+
+class ColumnarLedgerStore:
+    """Tập các năm dạng cột; nạp lười khi năm đó được hỏi lần đầu."""
+
+    def __init__(self, phien_ban: LedgerVersion):
+        self._phien_ban = phien_ban
+        self._theo_nam: Dict[int, CotSoCaiNam] = {}
+        # (năm đầu tiên có dòng ghi sổ, phiên bản lúc đọc)
+        self._nam_dau: Optional[Tuple[Optional[int], int]] = None
+        self._lock = threading.Lock()
+        # Từ điển mã TK dùng chung mọi năm (chỉ thêm, không xóa)
+        self._so_tai_khoan: List[str] = []
+        self._id_tai_khoan: Dict[str, int] = {}
+        self._lock_tai_khoan = threading.Lock()
+
+    def cot(
+        self,
+        end: date,
+        nap_nam: Callable[[int], Iterable[DongSoCaiNho]],
+        nam_dau: Callable[[], Optional[int]],
+    ) -> CotSoCai:
+        """
+        Mọi dòng đã ghi sổ từ đầu sổ đến hết ngày `end`.
+        `nap_nam(nam)` đọc các dòng của năm chưa có trong kho;
+        `nam_dau()` trả về năm sớm nhất có dòng ghi sổ (None: sổ trống).
+        """
+        dau = self._lay_nam_dau(nam_dau)
+        cac_nam = (
+            []
+            if dau is None
+            else [
+                self._lay_hoac_nap(nam, nap_nam)
+                for nam in range(dau, end.year + 1)
+            ]
+        )
+        ket_qua = {ten: array(kieu) for ten, kieu in _KIEU_COT}
+        kt = end.toordinal()
+        for cot_nam in cac_nam:
+            with self._lock:  # ghi_nhan() có thể đang nối thêm dòng
+                sap_xep = cot_nam.so_dong_sap_xep
+                if cot_nam.nam == end.year:
+                    cat = bisect.bisect_right(cot_nam.ngay, kt, 0, sap_xep)
+                    duoi = [
+                        i
+                        for i in range(sap_xep, len(cot_nam))
+                        if cot_nam.ngay[i] <= kt
+                    ]
+                else:
+                    cat, duoi = len(cot_nam), []
+                for ten, _ in _KIEU_COT:
+                    cot = getattr(cot_nam, ten)
+                    # Sao chép nguyên đoạn [0, cat) một lần (memcpy)
+                    with memoryview(cot) as vung_nho:
+                        ket_qua[ten].frombytes(
+                            vung_nho.cast("B")[: cat * cot.itemsize]
+                        )
+                    ket_qua[ten].extend(cot[i] for i in duoi)
+        with self._lock_tai_khoan:
+            so_tai_khoan = tuple(self._so_tai_khoan)
+        return CotSoCai(so_tai_khoan=so_tai_khoan, **ket_qua)
+
+    def ghi_nhan(
+        self, phien_ban: int, bien_dong: Iterable[BienDongButToan]
+    ) -> None:
+        """
+        Nối biến động của một commit vào các năm đã nạp.
+        `phien_ban`: phiên bản sổ cái sau lần tăng TRƯỚC commit (xem đầu file).
+        """
+        with self._lock:
+            for but_toan_id, ngay_ct, lines, dau in bien_dong:
+                self._ghi_nhan_nam_dau(phien_ban, ngay_ct.year, dau)
+                cot_nam = self._theo_nam.get(ngay_ct.year)
+                if cot_nam is None or cot_nam.phien_ban > phien_ban:
+                    continue
+                if cot_nam.phien_ban == phien_ban:
+                    del self._theo_nam[ngay_ct.year]
+                    continue
+                ngay = ngay_ct.toordinal()
+                for so_tai_khoan, no, co in lines:
+                    cot_nam.them(
+                        self._id_tk(so_tai_khoan),
+                        ngay,
+                        dau * sang_don_vi_nho(no),
+                        dau * sang_don_vi_nho(co),
+                        but_toan_id,
+                    )
+
+    def xoa(self) -> None:
+        """Xóa toàn bộ kho (buộc nạp lại từ DB ở lần hỏi sau)."""
+        with self._lock:
+            self._theo_nam.clear()
+            self._nam_dau = None
+
+    def so_nam_da_nap(self) -> int:
+        return len(self._theo_nam)
+
+    def _ghi_nhan_nam_dau(self, phien_ban: int, nam: int, dau: int) -> None:
+        if self._nam_dau is None:
+            return
+        nam_dau, phien_ban_doc = self._nam_dau
+        if phien_ban_doc == phien_ban:
+            self._nam_dau = None
+        elif phien_ban_doc < phien_ban and dau > 0:
+            # Hủy ghi sổ không làm năm đầu muộn hơn: năm rỗng vẫn đúng
+            if nam_dau is None or nam < nam_dau:
+                self._nam_dau = (nam, phien_ban_doc)
+
+    def _id_tk(self, so_tai_khoan: str) -> int:
+        tk_id = self._id_tai_khoan.get(so_tai_khoan)
+        if tk_id is None:
+            with self._lock_tai_khoan:
+                tk_id = self._id_tai_khoan.get(so_tai_khoan)
+                if tk_id is None:
+                    tk_id = len(self._so_tai_khoan)
+                    self._so_tai_khoan.append(so_tai_khoan)
+                    self._id_tai_khoan[so_tai_khoan] = tk_id
+        return tk_id
+
+    def _lay_nam_dau(
+        self, nam_dau: Callable[[], Optional[int]]
+    ) -> Optional[int]:
+        with self._lock:
+            if self._nam_dau is not None:
+                return self._nam_dau[0]
+            phien_ban = self._phien_ban.gia_tri
+        nam = nam_dau()
+        with self._lock:
+            if self._phien_ban.gia_tri == phien_ban:
+                self._nam_dau = (nam, phien_ban)
+        return nam
+
+    def _lay_hoac_nap(
+        self, nam: int, nap_nam: Callable[[int], Iterable[DongSoCaiNho]]
+    ) -> CotSoCaiNam:
+        with self._lock:
+            cot_nam = self._theo_nam.get(nam)
+            if cot_nam is not None:
+                return cot_nam
+            phien_ban = self._phien_ban.gia_tri
+        # Đọc DB ngoài khóa (nhánh async chuyển greenlet giữa truy vấn)
+        moi = CotSoCaiNam(nam, phien_ban)
+        for but_toan_id, ngay_ct, so_tai_khoan, no, co in nap_nam(nam):
+            moi.them(
+                self._id_tk(so_tai_khoan),
+                ngay_ct.toordinal(),
+                no,
+                co,
+                but_toan_id,
+            )
+        with self._lock:
+            if self._phien_ban.gia_tri != phien_ban:
+                # Có commit trong lúc nạp: dùng cho lần gọi này, không giữ
+                return moi
+            return self._theo_nam.setdefault(nam, moi)
+
+
+_kho_theo_engine: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_columnar_ledger_store(engine) -> ColumnarLedgerStore:
+    """Kho sổ cái dạng cột dùng chung trong tiến trình cho một Engine."""
+    phien_ban = get_ledger_version(engine)
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        kho = _kho_theo_engine.get(engine)
+        if kho is None:
+            kho = ColumnarLedgerStore(phien_ban)
+            _kho_theo_engine[engine] = kho
+            # Tiến trình khác ghi sổ → nạp lại từ DB
+            phien_ban.dang_ky_xoa(kho.xoa)
+        return kho
@@ -0,0 +1,22 @@
+# File: app/infrastructure/cache/engine_alias.py
+"""
+Gộp các Engine cùng trỏ tới MỘT cơ sở dữ liệu về một khóa chung.
+
+📌 Engine đồng bộ và `AsyncEngine.sync_engine` là hai đối tượng khác nhau
+   nhưng cùng một DB: các bộ nhớ đệm theo Engine (số dư, phiên bản sổ cái,
+   COA, kỳ kế toán) phải dùng chung, nếu không thao tác qua API async sẽ
+   không làm mới bộ nhớ đệm của API đồng bộ và ngược lại.
+"""
+import weakref
+
+_engine_chinh: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def dang_ky_engine_cung_db(engine, engine_chinh) -> None:
+    """Mọi bộ nhớ đệm của `engine` dùng chung với `engine_chinh`."""
+    _engine_chinh[engine] = engine_chinh
+
+
+def khoa_engine(engine):
+    """Engine đại diện cho DB của `engine` trong các registry bộ nhớ đệm."""
+    return _engine_chinh.get(engine, engine)
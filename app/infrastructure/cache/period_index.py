@@ -0,0 +1,123 @@
+# File: app/infrastructure/cache/period_index.py
+"""
+Chỉ mục khoảng thời gian (interval index) của các kỳ kế toán.
+
+🎯 Mục tiêu:
+- Kiểm tra khóa sổ cho mỗi bút toán (tạo / ghi sổ / hủy ghi sổ) bằng một
+  lần bisect trong bộ nhớ, không truy vấn DB cho từng bút toán.
+- Các kỳ có thể lồng nhau (Năm 2025 ⊃ Q1-2025): trục thời gian được chia
+  thành các đoạn rời nhau, mỗi đoạn ghi sẵn các kỳ phủ lên nó.
+- Service khóa / mở / tạo kỳ gọi `xoa()` → lần tra cứu sau dựng lại.
+- Worker khác khóa / mở / tạo kỳ: phiên bản `ky_ke_toan` trong DB
+  (`repo.get_version`, đọc chung một SELECT mỗi transaction) mới hơn
+  phiên bản đã dựng → dựng lại trước khi trả lời.
+
+📌 Nằm trong bộ nhớ tiến trình, tách riêng theo từng Engine (mỗi DB một bộ).
+"""
+import threading
+import weakref
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from app.application.interfaces.period_index import (
+    AccountingPeriodIndexInterface,
+)
+from app.application.interfaces.period_repo import (
+    AccountingPeriodRepositoryInterface,
+)
+from app.domain.models.accounting_period import (
+    KyKeToan,
+    khoa_ky_hep_nhat,
+)
+from app.infrastructure.cache.engine_alias import khoa_engine
+
+
+class AccountingPeriodIndex(AccountingPeriodIndexInterface):
+    """Các mốc đầu đoạn đã sắp xếp + các kỳ phủ lên từng đoạn."""
+
+    def __init__(self):
+        self._moc: List[date] = []
+        self._ky_theo_doan: List[Tuple[KyKeToan, ...]] = []
+        self._da_nap = False
+        self._the_he = 0  # tăng mỗi lần xoa(): bỏ kết quả đọc đã cũ
+        self._phien_ban_db: Optional[int] = None  # phiên bản kỳ trong DB
+        self.so_lan_doc_db = 0
+        self._lock = threading.Lock()
+
+    def dung(self, cac_ky: Iterable[KyKeToan]) -> None:
+        """Dựng chỉ mục từ danh sách kỳ kế toán."""
+        # Kỳ ngắn nhất (cụ thể nhất) đứng trước trong mỗi đoạn
+        cac_ky = sorted(cac_ky, key=khoa_ky_hep_nhat)
+        moc = sorted(
+            {ky.ngay_bat_dau for ky in cac_ky}
+            | {ky.ngay_ket_thuc + timedelta(days=1) for ky in cac_ky}
+        )
+        ky_theo_doan = [
+            tuple(
+                ky
+                for ky in cac_ky
+                if ky.ngay_bat_dau <= ngay <= ky.ngay_ket_thuc
+            )
+            for ngay in moc
+        ]
+        self._moc, self._ky_theo_doan = moc, ky_theo_doan
+        self._da_nap = True
+
+    def tim_theo_ngay(
+        self, ngay: date, repo: AccountingPeriodRepositoryInterface
+    ) -> List[KyKeToan]:
+        self._doi_chieu(repo)
+        with self._lock:
+            if self._da_nap:
+                return self._tra_cuu(ngay)
+            the_he = self._the_he
+        # Đọc DB ngoài khóa (xem AccountCache.lay_nhieu)
+        self.so_lan_doc_db += 1
+        cac_ky = repo.get_all()
+        with self._lock:
+            if the_he == self._the_he:
+                self.dung(cac_ky)
+                return self._tra_cuu(ngay)
+        # Bị xoa() trong lúc đọc: trả lời từ chỉ mục tạm, không lưu lại
+        tam = AccountingPeriodIndex()
+        tam.dung(cac_ky)
+        return tam._tra_cuu(ngay)
+
+    def _tra_cuu(self, ngay: date) -> List[KyKeToan]:
+        i = bisect_right(self._moc, ngay) - 1
+        if i < 0:
+            return []
+        return list(self._ky_theo_doan[i])
+
+    def xoa(self) -> None:
+        with self._lock:
+            self._xoa()
+
+    def _doi_chieu(self, repo: AccountingPeriodRepositoryInterface) -> None:
+        """Kỳ trong DB đã đổi (ở bất kỳ worker nào) → bỏ chỉ mục đã dựng."""
+        phien_ban_db = repo.get_version()
+        with self._lock:
+            if self._phien_ban_db is None or phien_ban_db > self._phien_ban_db:
+                self._phien_ban_db = phien_ban_db
+                self._xoa()
+
+    def _xoa(self) -> None:
+        self._moc, self._ky_theo_doan = [], []
+        self._da_nap = False
+        self._the_he += 1
+
+
+_index_theo_engine: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_period_index(engine) -> AccountingPeriodIndex:
+    """Chỉ mục kỳ kế toán dùng chung trong tiến trình cho một Engine."""
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        index = _index_theo_engine.get(engine)
+        if index is None:
+            index = AccountingPeriodIndex()
+            _index_theo_engine[engine] = index
+        return index
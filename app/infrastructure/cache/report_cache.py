@@ -0,0 +1,165 @@
+# File: app/infrastructure/cache/report_cache.py
+"""
+Bộ nhớ đệm kết quả báo cáo (LRU) và phiên bản sổ cái.
+
+🎯 Mục tiêu:
+- Báo cáo của cùng một kỳ, cùng một phiên bản sổ cái chỉ tính MỘT lần;
+  các lần gọi lặp lại (dashboard, kiểm toán) chỉ tốn một lần tra dict.
+- Khóa đệm chứa phiên bản sổ cái lưu trong DB (bảng data_versions), tăng
+  trong cùng transaction với mỗi lần JournalEntryRepository commit (thêm /
+  sửa / xóa / đổi trạng thái) → khóa cũ hết hiệu lực ở MỌI worker.
+
+📌 Nằm trong bộ nhớ tiến trình, tách riêng theo từng Engine (mỗi DB một bộ).
+📌 LedgerVersion dưới đây là bộ đếm TRONG tiến trình cho quy tắc nạp của
+   chỉ mục phát sinh / kho dạng cột (không dùng làm khóa đệm báo cáo), kèm
+   phiên bản DB mà các bộ nhớ đó đang phản ánh: đọc thấy phiên bản DB mới
+   hơn mà không do chính tiến trình commit → worker khác đã ghi → xóa hết.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional
+
+from app.application.interfaces.report_cache import ReportCacheInterface
+from app.infrastructure.cache.engine_alias import khoa_engine
+
+
+KICH_THUOC_MAC_DINH = 256
+
+
+class LedgerVersion:
+    """
+    Phiên bản sổ cái của một DB trong tiến trình:
+    - `gia_tri`: bộ đếm trong tiến trình, tăng đơn điệu (trước / sau mỗi
+      commit, mỗi lần xóa bộ nhớ) — cho quy tắc nạp theo năm;
+    - `phien_ban_db`: phiên bản trong DB mà bộ nhớ trong tiến trình đang
+      phản ánh (None: chưa đối chiếu lần nào).
+    """
+
+    def __init__(self):
+        self._gia_tri = 0
+        self.phien_ban_db: Optional[int] = None
+        self._khi_xoa: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def gia_tri(self) -> int:
+        return self._gia_tri
+
+    def tang(self) -> int:
+        with self._lock:
+            return self._tang()
+
+    def dang_ky_xoa(self, ham_xoa: Callable[[], None]) -> None:
+        """Bộ nhớ cần xóa khi tiến trình khác đã thay đổi sổ cái."""
+        with self._lock:
+            self._khi_xoa.append(ham_xoa)
+
+    def doi_chieu(self, phien_ban_db: int) -> bool:
+        """
+        Đối chiếu với phiên bản vừa đọc trong phiên lập báo cáo. Mới hơn
+        phiên bản đang phản ánh → xóa bộ nhớ. Trả về False khi phiên cũ hơn
+        bộ nhớ (replica còn trễ): phiên đó phải đọc thẳng DB, không trộn số
+        liệu trong bộ nhớ (mới hơn) vào báo cáo mang khóa đệm phiên bản cũ.
+        """
+        with self._lock:
+            if self.phien_ban_db is None or phien_ban_db > self.phien_ban_db:
+                self.phien_ban_db = phien_ban_db
+                self._xoa_bo_nho()
+            return phien_ban_db == self.phien_ban_db
+
+    def sau_commit(
+        self, phien_ban_db: int, ap_dung: Callable[[], None]
+    ) -> None:
+        """
+        Chính tiến trình vừa commit thay đổi mang phiên bản `phien_ban_db`.
+        Bộ nhớ đang ở đúng phiên bản liền trước → `ap_dung()` (cập nhật tăng
+        dần); nếu không (có commit của tiến trình khác xen giữa) → xóa.
+        📌 `ap_dung` chạy trong khóa: không được gọi lại LedgerVersion.
+        """
+        with self._lock:
+            if self.phien_ban_db == phien_ban_db - 1:
+                self.phien_ban_db = phien_ban_db
+                ap_dung()
+            elif self.phien_ban_db is None or phien_ban_db > self.phien_ban_db:
+                self.phien_ban_db = phien_ban_db
+                self._xoa_bo_nho()
+
+    def _tang(self) -> int:
+        self._gia_tri += 1
+        return self._gia_tri
+
+    def _xoa_bo_nho(self) -> None:
+        # Tăng bộ đếm: lần nạp theo năm đang chạy sẽ không được giữ
+        self._tang()
+        for ham_xoa in self._khi_xoa:
+            ham_xoa()
+
+
+class ReportCache(ReportCacheInterface):
+    """LRU có giới hạn số phần tử, kèm bộ đếm trúng / trượt."""
+
+    def __init__(self, kich_thuoc_toi_da: int = KICH_THUOC_MAC_DINH):
+        if kich_thuoc_toi_da < 1:
+            raise ValueError("Kích thước bộ nhớ đệm phải lớn hơn 0.")
+        self.kich_thuoc_toi_da = kich_thuoc_toi_da
+        self.so_lan_trung = 0
+        self.so_lan_truot = 0
+        self._du_lieu: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lay_hoac_tinh(
+        self, khoa: Hashable, ham_tinh: Callable[[], Any]
+    ) -> Any:
+        with self._lock:
+            if khoa in self._du_lieu:
+                self._du_lieu.move_to_end(khoa)
+                self.so_lan_trung += 1
+                return self._du_lieu[khoa]
+            self.so_lan_truot += 1
+
+        # Tính ngoài lock để các báo cáo khác không phải chờ
+        ket_qua = ham_tinh()
+
+        with self._lock:
+            self._du_lieu[khoa] = ket_qua
+            self._du_lieu.move_to_end(khoa)
+            while len(self._du_lieu) > self.kich_thuoc_toi_da:
+                self._du_lieu.popitem(last=False)
+        return ket_qua
+
+    def __len__(self) -> int:
+        return len(self._du_lieu)
+
+    def xoa(self) -> None:
+        with self._lock:
+            self._du_lieu.clear()
+
+
+_phien_ban_theo_engine: "weakref.WeakKeyDictionary" = (
+    weakref.WeakKeyDictionary()
+)
+_cache_theo_engine: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_ledger_version(engine) -> LedgerVersion:
+    """Phiên bản sổ cái dùng chung trong tiến trình cho một Engine (một DB)."""
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        phien_ban = _phien_ban_theo_engine.get(engine)
+        if phien_ban is None:
+            phien_ban = LedgerVersion()
+            _phien_ban_theo_engine[engine] = phien_ban
+        return phien_ban
+
+
+def get_report_cache(engine) -> ReportCache:
+    """Bộ nhớ đệm báo cáo dùng chung trong tiến trình cho một Engine."""
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        cache = _cache_theo_engine.get(engine)
+        if cache is None:
+            cache = ReportCache()
+            _cache_theo_engine[engine] = cache
+        return cache
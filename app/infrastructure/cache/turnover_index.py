@@ -0,0 +1,201 @@
+# File: app/infrastructure/cache/turnover_index.py
+"""
+Chỉ mục tổng tiền tố (Fenwick tree) cho phát sinh Nợ/Có theo ngày của từng tài khoản.
+
+🎯 Mục tiêu:
+- Trả lời "PS Nợ/Có của TK X từ ngày bd đến ngày kt" trong O(log n),
+  không phải nạp lại toàn bộ bút toán đã ghi sổ cho mỗi lần hỏi.
+- Mỗi năm tài chính được nạp MỘT lần (một truy vấn GROUP BY), sau đó cập nhật
+  tăng dần khi bút toán được ghi sổ / hủy ghi sổ.
+
+📌 Chỉ mục nằm trong bộ nhớ tiến trình, tách riêng theo từng Engine (mỗi DB một chỉ mục).
+📌 Quy tắc phiên bản khi nối biến động của một commit: như kho sổ cái dạng
+   cột (xem columnar_ledger_store). Worker khác ghi sổ → LedgerVersion thấy
+   phiên bản DB mới hơn → xóa chỉ mục, nạp lại.
+"""
+import bisect
+import threading
+import weakref
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from app.infrastructure.cache.engine_alias import khoa_engine
+from app.infrastructure.cache.report_cache import (
+    LedgerVersion,
+    get_ledger_version,
+)
+
+
+# (so_tai_khoan, ngay_ct, ps_no, ps_co)
+DongPhatSinhNgay = Tuple[str, date, Decimal, Decimal]
+
+
+class FenwickTree:
+    """Cây Fenwick (Binary Indexed Tree) trên Decimal, chỉ số từ 0."""
+
+    def __init__(self, kich_thuoc: int):
+        self._cay: List[Decimal] = [Decimal(0)] * (kich_thuoc + 1)
+
+    def cong(self, vi_tri: int, gia_tri: Decimal) -> None:
+        i = vi_tri + 1
+        while i < len(self._cay):
+            self._cay[i] += gia_tri
+            i += i & -i
+
+    def tong_tien_to(self, vi_tri: int) -> Decimal:
+        """Tổng các phần tử từ 0 đến `vi_tri` (bao gồm)."""
+        tong = Decimal(0)
+        i = min(vi_tri + 1, len(self._cay) - 1)
+        while i > 0:
+            tong += self._cay[i]
+            i -= i & -i
+        return tong
+
+    def tong_khoang(self, dau: int, cuoi: int) -> Decimal:
+        if cuoi < dau:
+            return Decimal(0)
+        tong = self.tong_tien_to(cuoi)
+        if dau > 0:
+            tong -= self.tong_tien_to(dau - 1)
+        return tong
+
+
+class ChiSoPhatSinhNam:
+    """Phát sinh Nợ/Có theo ngày của mọi tài khoản trong một năm tài chính."""
+
+    def __init__(self, nam: int, phien_ban: int):
+        self.nam = nam
+        self.phien_ban = phien_ban  # phiên bản sổ cái lúc bắt đầu nạp
+        self._ngay_dau = date(nam, 1, 1).toordinal()
+        self._so_ngay = date(nam, 12, 31).toordinal() - self._ngay_dau + 1
+        self._no: Dict[str, FenwickTree] = {}
+        self._co: Dict[str, FenwickTree] = {}
+        # Mã TK đã sắp xếp: TK con của `tk_goc` là một đoạn liên tiếp
+        self._tai_khoan: List[str] = []
+
+    def cong(self, so_tai_khoan: str, ngay: date, no: Decimal, co: Decimal):
+        if so_tai_khoan not in self._no:
+            self._no[so_tai_khoan] = FenwickTree(self._so_ngay)
+            self._co[so_tai_khoan] = FenwickTree(self._so_ngay)
+            bisect.insort(self._tai_khoan, so_tai_khoan)
+        vi_tri = ngay.toordinal() - self._ngay_dau
+        if no:
+            self._no[so_tai_khoan].cong(vi_tri, no)
+        if co:
+            self._co[so_tai_khoan].cong(vi_tri, co)
+
+    def phat_sinh(
+        self, tk_goc: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """PS Nợ, PS Có của TK `tk_goc` và các TK con (theo tiền tố) trong [start, end]."""
+        dau = max(start.toordinal() - self._ngay_dau, 0)
+        cuoi = min(end.toordinal() - self._ngay_dau, self._so_ngay - 1)
+        tong_no, tong_co = Decimal(0), Decimal(0)
+        for so_tai_khoan in self._doan_tai_khoan(tk_goc):
+            tong_no += self._no[so_tai_khoan].tong_khoang(dau, cuoi)
+            tong_co += self._co[so_tai_khoan].tong_khoang(dau, cuoi)
+        return tong_no, tong_co
+
+    def _doan_tai_khoan(self, tk_goc: str) -> List[str]:
+        """TK `tk_goc` và mọi TK con (theo tiền tố mã): tìm nhị phân."""
+        dau = bisect.bisect_left(self._tai_khoan, tk_goc)
+        cuoi = bisect.bisect_left(self._tai_khoan, tk_goc + "\uffff", dau)
+        return self._tai_khoan[dau:cuoi]
+
+
+class TurnoverIndex:
+    """Tập các chỉ mục theo năm; nạp lười khi năm đó được hỏi lần đầu."""
+
+    def __init__(self, phien_ban: LedgerVersion):
+        self._phien_ban = phien_ban
+        self._theo_nam: Dict[int, ChiSoPhatSinhNam] = {}
+        self._lock = threading.Lock()
+
+    def phat_sinh(
+        self,
+        tk_goc: str,
+        start: date,
+        end: date,
+        nap_nam: Callable[[int], Iterable[DongPhatSinhNgay]],
+    ) -> Tuple[Decimal, Decimal]:
+        """
+        PS Nợ, PS Có trong [start, end] (có thể trải qua nhiều năm).
+        `nap_nam(nam)` trả về phát sinh theo ngày của năm chưa có trong chỉ mục.
+        """
+        tong_no, tong_co = Decimal(0), Decimal(0)
+        for nam in range(start.year, end.year + 1):
+            chi_so = self._lay_hoac_nap(nam, nap_nam)
+            no, co = chi_so.phat_sinh(
+                tk_goc,
+                max(start, date(nam, 1, 1)),
+                min(end, date(nam, 12, 31)),
+            )
+            tong_no += no
+            tong_co += co
+        return tong_no, tong_co
+
+    def ghi_nhan(
+        self,
+        phien_ban: int,
+        ngay_ct: date,
+        lines: Iterable[Tuple[str, Decimal, Decimal]],
+        dau: int,
+    ) -> None:
+        """
+        Cập nhật tăng dần sau khi bút toán được ghi sổ (dau=1) / hủy ghi sổ (dau=-1).
+        `phien_ban`: phiên bản sổ cái sau lần tăng TRƯỚC commit.
+        Năm chưa nạp thì bỏ qua — lần nạp sau sẽ đọc trực tiếp từ DB.
+        """
+        with self._lock:
+            chi_so = self._theo_nam.get(ngay_ct.year)
+            if chi_so is None or chi_so.phien_ban > phien_ban:
+                return
+            if chi_so.phien_ban == phien_ban:
+                # Không biết lần nạp có thấy commit hay không → nạp lại
+                del self._theo_nam[ngay_ct.year]
+                return
+            for so_tai_khoan, no, co in lines:
+                chi_so.cong(so_tai_khoan, ngay_ct, no * dau, co * dau)
+
+    def xoa(self) -> None:
+        """Xóa toàn bộ chỉ mục (buộc nạp lại từ DB ở lần hỏi sau)."""
+        with self._lock:
+            self._theo_nam.clear()
+
+    def _lay_hoac_nap(
+        self, nam: int, nap_nam: Callable[[int], Iterable[DongPhatSinhNgay]]
+    ) -> ChiSoPhatSinhNam:
+        with self._lock:
+            chi_so = self._theo_nam.get(nam)
+            if chi_so is not None:
+                return chi_so
+            phien_ban = self._phien_ban.gia_tri
+        # Đọc DB ngoài khóa: không bắt các luồng worker khác chờ theo I/O.
+        moi = ChiSoPhatSinhNam(nam, phien_ban)
+        for so_tai_khoan, ngay, no, co in nap_nam(nam):
+            moi.cong(so_tai_khoan, ngay, no, co)
+        with self._lock:
+            if self._phien_ban.gia_tri != phien_ban:
+                # Có commit / xóa trong lúc nạp: dùng cho lần gọi này
+                return moi
+            # Yêu cầu khác có thể đã nạp xong trước: giữ bản đó
+            return self._theo_nam.setdefault(nam, moi)
+
+
+_chi_so_theo_engine: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_turnover_index(engine) -> TurnoverIndex:
+    """Chỉ mục phát sinh dùng chung trong tiến trình cho một Engine (một DB)."""
+    phien_ban = get_ledger_version(engine)
+    engine = khoa_engine(engine)
+    with _registry_lock:
+        chi_so = _chi_so_theo_engine.get(engine)
+        if chi_so is None:
+            chi_so = TurnoverIndex(phien_ban)
+            _chi_so_theo_engine[engine] = chi_so
+            # Tiến trình khác ghi sổ → nạp lại từ DB
+            phien_ban.dang_ky_xoa(chi_so.xoa)
+        return chi_so
@@ -1,18 +1,150 @@
 # File: app/infrastructure/database.py
+import functools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import (  # <-- Cập nhật import
     declarative_base,
     sessionmaker,
 )
 
-from app.config import DATABASE_URL
+from app.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+    REPORT_ASYNC_DATABASE_URL,
+    REPORT_DATABASE_URL,
+    REPORT_DB_MAX_OVERFLOW,
+    REPORT_DB_POOL_SIZE,
+    REPORT_DB_STATEMENT_TIMEOUT_MS,
+)
+from app.infrastructure.cache.engine_alias import dang_ky_engine_cung_db
+
+# Driver async tương ứng với từng loại DB (khi không đặt ASYNC_DATABASE_URL)
+_DRIVER_ASYNC = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def chuoi_ket_noi_async(database_url: str) -> str:
+    """Đổi chuỗi kết nối đồng bộ sang driver async cùng loại DB."""
+    url = make_url(database_url)
+    driver = _DRIVER_ASYNC.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(
+            f"Chưa hỗ trợ kết nối async cho '{url.get_backend_name()}'. "
+            "Hãy đặt ASYNC_DATABASE_URL."
+        )
+    return url.set(
+        drivername=f"{url.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def tham_so_engine(
+    database_url: str,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+) -> dict:
+    """
+    Tham số pool / timeout cho create_engine và create_async_engine.
+    📌 SQLite: chỉ pre-ping / recycle (SQLAlchemy tự chọn pool cho SQLite).
+    📌 statement_timeout chỉ áp dụng cho PostgreSQL (psycopg2 / asyncpg).
+    """
+    url = make_url(database_url)
+    tham_so = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() == "sqlite":
+        return tham_so
+    tham_so.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    if statement_timeout_ms > 0 and url.get_backend_name() == "postgresql":
+        if url.get_driver_name() == "asyncpg":
+            tham_so["connect_args"] = {
+                "server_settings": {
+                    "statement_timeout": str(statement_timeout_ms)
+                }
+            }
+        else:
+            tham_so["connect_args"] = {
+                "options": f"-c statement_timeout={statement_timeout_ms}"
+            }
+    return tham_so
+
 
 # 1. Tạo engine kết nối DB
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **tham_so_engine(DATABASE_URL))
 
 # 2. SessionLocal là class factory để tạo session object
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 2b. Engine chỉ đọc cho báo cáo / truy vấn bút toán (read replica).
+# Không đặt REPORT_DATABASE_URL: dùng lại engine chính.
+# 📌 Bộ nhớ đệm dùng chung với DB chính; phiên bản sổ cái được đọc trong
+#    chính phiên replica (data_versions sao chép cùng dữ liệu) → replica trễ
+#    thì báo cáo đọc thẳng DB, không dùng bộ nhớ mới hơn replica.
+_THAM_SO_BAO_CAO = dict(
+    pool_size=REPORT_DB_POOL_SIZE,
+    max_overflow=REPORT_DB_MAX_OVERFLOW,
+    statement_timeout_ms=REPORT_DB_STATEMENT_TIMEOUT_MS,
+)
+if REPORT_DATABASE_URL:
+    report_engine = create_engine(
+        REPORT_DATABASE_URL,
+        **tham_so_engine(REPORT_DATABASE_URL, **_THAM_SO_BAO_CAO),
+    )
+    dang_ky_engine_cung_db(report_engine, engine)
+    ReportSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=report_engine
+    )
+else:
+    report_engine, ReportSessionLocal = engine, SessionLocal
+
+
+# 2c. Engine / session async (aiosqlite / asyncpg): chỉ luồng xuất Parquet
+# cần con trỏ phía server async → tạo lười ở lần dùng đầu tiên, import
+# module (CLI, Alembic, test) không cần driver async.
+@functools.lru_cache(maxsize=None)
+def lay_async_session_local() -> async_sessionmaker:
+    """async_sessionmaker trên DB chính (engine tạo ở lần gọi đầu tiên)."""
+    url = ASYNC_DATABASE_URL or chuoi_ket_noi_async(DATABASE_URL)
+    async_engine = create_async_engine(url, **tham_so_engine(url))
+    # Cùng một DB → luồng async và đồng bộ dùng chung bộ nhớ đệm
+    dang_ky_engine_cung_db(async_engine.sync_engine, engine)
+    return async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def lay_async_report_session_local() -> async_sessionmaker:
+    """async_sessionmaker trên DB báo cáo (replica nếu có)."""
+    if not REPORT_DATABASE_URL:
+        return lay_async_session_local()
+    url = REPORT_ASYNC_DATABASE_URL or chuoi_ket_noi_async(
+        REPORT_DATABASE_URL
+    )
+    report_async_engine = create_async_engine(
+        url, **tham_so_engine(url, **_THAM_SO_BAO_CAO)
+    )
+    dang_ky_engine_cung_db(report_async_engine.sync_engine, engine)
+    return async_sessionmaker(
+        report_async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
 # 3. Base là lớp cơ sở cho các ORM model
 Base = declarative_base()
 
@@ -22,6 +154,9 @@ Base = declarative_base()
 from app.infrastructure.models.sql_account import (  # <-- Import SQLAccount
     SQLAccount,
 )
+from app.infrastructure.models.sql_account_balance import (  # Bảng số dư theo tháng
+    SQLAccountBalance,
+)
 from app.infrastructure.models.sql_accounting_period import (  # <-- Thêm import này
     SQLAccountingPeriod,
 )
@@ -29,6 +164,9 @@ from app.infrastructure.models.sql_journal_entry import (  # <-- Import các mod
     SQLJournalEntry,
     SQLJournalEntryLine,
 )
+from app.infrastructure.models.sql_data_version import (  # Phiên bản sổ cái
+    SQLDataVersion,
+)
 
 # (Có thể import các model khác sau này)
 # from app.infrastructure.models.other_models import OtherModel
@@ -48,6 +186,71 @@ def get_db():
         db.close()
 
 
+@contextmanager
+def mo_phien_bao_cao(tao_phien_replica, tao_phien_chinh):
+    """
+    Mở Session trên replica; replica không kết nối được thì quay về DB
+    chính (báo cáo chậm hơn vẫn tốt hơn lỗi 500).
+    """
+    if tao_phien_replica is tao_phien_chinh:
+        with tao_phien_chinh() as db:
+            yield db
+        return
+
+    db = tao_phien_replica()
+    try:
+        db.connection()
+    except (DBAPIError, OSError) as e:
+        logging.warning(f"Replica báo cáo không khả dụng, dùng DB chính: {e}")
+        db.close()
+        db = tao_phien_chinh()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_report_db():
+    """
+    Dependency cung cấp Session cho báo cáo / truy vấn bút toán: trên
+    replica nếu có REPORT_DATABASE_URL, ngược lại trên DB chính.
+    """
+    with mo_phien_bao_cao(ReportSessionLocal, SessionLocal) as db:
+        yield db
+
+
+@asynccontextmanager
+async def mo_phien_bao_cao_async(tao_phien_replica, tao_phien_chinh):
+    """Như mo_phien_bao_cao, cho AsyncSession."""
+    if tao_phien_replica is tao_phien_chinh:
+        async with tao_phien_chinh() as db:
+            yield db
+        return
+
+    db = tao_phien_replica()
+    try:
+        await db.connection()
+    except (DBAPIError, OSError) as e:
+        logging.warning(f"Replica báo cáo không khả dụng, dùng DB chính: {e}")
+        await db.close()
+        db = tao_phien_chinh()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_report_db():
+    """
+    Dependency cung cấp AsyncSession trên DB báo cáo cho luồng xuất
+    Parquet (con trỏ phía server, phát từng lô).
+    """
+    async with mo_phien_bao_cao_async(
+        lay_async_report_session_local(), lay_async_session_local()
+    ) as db:
+        yield db
+
+
 # Hàm tiện ích để tạo schema (chỉ dùng cho dev/migration sau này nếu không dùng Alembic)
 def create_tables():
     """
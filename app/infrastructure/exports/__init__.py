@@ -0,0 +1,4 @@
+# File: app/infrastructure/exports/__init__.py
+"""
+Xuất dữ liệu sổ cái cho hệ thống phân tích (Arrow / Parquet).
+"""
@@ -0,0 +1,296 @@
+# File: app/infrastructure/exports/ledger_parquet.py
+"""
+Xuất dòng sổ cái đã ghi sổ ra Arrow / Parquet cho nhóm phân tích (BI).
+
+🎯 Mục tiêu:
+- Thay cho việc kéo /journal-entries (JSON lồng nhau, dựng ORM + Domain
+  cho từng bút toán): một SELECT Core nối dòng với đầu phiếu, đọc theo lô
+  (yield_per) và đổi thẳng mỗi lô thành một Arrow RecordBatch.
+- Bộ nhớ tỷ lệ với kích thước lô, không phải số dòng của cả sổ.
+- Hai đầu ra:
+  - thư mục Parquet phân vùng kiểu Hive nam=YYYY/thang=M (CLI, chạy đêm);
+  - một file Parquet phát theo luồng qua HTTP, mỗi lô một row group.
+
+📋 Số tiền là decimal128(19, 2) tính từ đơn vị nhỏ nhất (MINOR_UNITS),
+   cùng quy ước với báo cáo, không phụ thuộc MONEY_STORAGE.
+📌 pyarrow chỉ cần khi xuất; import lười để phần còn lại của ứng dụng
+   không phụ thuộc thư viện này. Chạy:
+   python -m app.infrastructure.exports.ledger_parquet --thu-muc exports
+"""
+import argparse
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+import anyio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.models.journal_entry import MINOR_UNITS
+from app.infrastructure.models.sql_journal_entry import (
+    SQLJournalEntry,
+    SQLJournalEntryLine,
+)
+
+# Số dòng mỗi lô đọc DB = số dòng mỗi RecordBatch / row group
+KICH_THUOC_LO_XUAT = 50_000
+
+COT_PHAN_VUNG = ["nam", "thang"]
+
+_DON_VI_NHO = Decimal(1) / MINOR_UNITS  # 0.01
+_SO_LE = -_DON_VI_NHO.as_tuple().exponent
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:  # pragma: no cover - tùy môi trường cài đặt
+        raise ValueError(
+            "Xuất Parquet cần thư viện pyarrow (pip install pyarrow)."
+        ) from e
+    return pyarrow
+
+
+def luoc_do():
+    """Lược đồ Arrow của một dòng sổ cái xuất ra."""
+    pa = _pyarrow()
+    tien = pa.decimal128(19, _SO_LE)
+    return pa.schema(
+        [
+            ("but_toan_id", pa.int64()),
+            ("so_phieu", pa.string()),
+            ("ngay_ct", pa.date32()),
+            ("ky_id", pa.int32()),
+            ("mo_ta_but_toan", pa.string()),
+            ("dong_id", pa.int64()),
+            ("so_tai_khoan", pa.string()),
+            ("no", tien),
+            ("co", tien),
+            ("mo_ta", pa.string()),
+            ("nam", pa.int16()),
+            ("thang", pa.int8()),
+        ]
+    )
+
+
+def cau_truy_van(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    kich_thuoc_lo: int = KICH_THUOC_LO_XUAT,
+):
+    """SELECT Core các dòng đã ghi sổ (nối đầu phiếu), theo ngày / id."""
+    truy_van = (
+        select(
+            SQLJournalEntry.id,
+            SQLJournalEntry.so_phieu,
+            SQLJournalEntry.ngay_ct,
+            SQLJournalEntry.period_id,
+            SQLJournalEntry.mo_ta,
+            SQLJournalEntryLine.id,
+            SQLJournalEntryLine.so_tai_khoan,
+            SQLJournalEntryLine.cot_no(),
+            SQLJournalEntryLine.cot_co(),
+            SQLJournalEntryLine.mo_ta,
+        )
+        .join(
+            SQLJournalEntryLine,
+            SQLJournalEntryLine.journal_entry_id == SQLJournalEntry.id,
+        )
+        .where(SQLJournalEntry.trang_thai == "Posted")
+        .order_by(
+            SQLJournalEntry.ngay_ct,
+            SQLJournalEntry.id,
+            SQLJournalEntryLine.id,
+        )
+        .execution_options(yield_per=kich_thuoc_lo)
+    )
+    if start is not None:
+        truy_van = truy_van.where(SQLJournalEntry.ngay_ct >= start)
+    if end is not None:
+        truy_van = truy_van.where(SQLJournalEntry.ngay_ct <= end)
+    return truy_van
+
+
+def sang_lo(dong: List[tuple]):
+    """Đổi một lô dòng kết quả của cau_truy_van() thành RecordBatch."""
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    schema = luoc_do()
+    cot = list(zip(*dong)) if dong else [()] * 10
+    sang_so_nguyen = SQLJournalEntryLine.sang_so_nguyen
+    don_vi_nho = pa.scalar(_DON_VI_NHO, pa.decimal128(3, _SO_LE))
+
+    def _tien(gia_tri) -> "pa.Array":
+        so_nguyen = pa.array(map(sang_so_nguyen, gia_tri), pa.int64())
+        return pc.multiply(
+            so_nguyen.cast(pa.decimal128(19, 0)), don_vi_nho
+        ).cast(schema.field("no").type)
+
+    ngay_ct = pa.array(cot[2], pa.date32())
+    return pa.record_batch(
+        [
+            pa.array(cot[0], pa.int64()),
+            pa.array(cot[1], pa.string()),
+            ngay_ct,
+            pa.array(cot[3], pa.int32()),
+            pa.array(cot[4], pa.string()),
+            pa.array(cot[5], pa.int64()),
+            pa.array(cot[6], pa.string()),
+            _tien(cot[7]),
+            _tien(cot[8]),
+            pa.array(cot[9], pa.string()),
+            pc.year(ngay_ct).cast(pa.int16()),
+            pc.month(ngay_ct).cast(pa.int8()),
+        ],
+        schema=schema,
+    )
+
+
+def iter_lo(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    kich_thuoc_lo: int = KICH_THUOC_LO_XUAT,
+) -> Iterator:
+    """Các RecordBatch dòng sổ cái (Session đồng bộ)."""
+    ket_qua = db.execute(cau_truy_van(start, end, kich_thuoc_lo))
+    for phan in ket_qua.partitions():
+        yield sang_lo(phan)
+
+
+async def aiter_lo(
+    db: AsyncSession,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    kich_thuoc_lo: int = KICH_THUOC_LO_XUAT,
+) -> AsyncIterator:
+    """
+    Các RecordBatch dòng sổ cái (AsyncSession, con trỏ phía server).
+    📌 Đổi lô sang Arrow chạy trên luồng worker, không chặn vòng lặp.
+    """
+    ket_qua = await db.stream(cau_truy_van(start, end, kich_thuoc_lo))
+    async for phan in ket_qua.partitions():
+        yield await anyio.to_thread.run_sync(sang_lo, phan)
+
+
+# --------------------------------------------------------
+# PARQUET PHÂN VÙNG (thư mục)
+# --------------------------------------------------------
+
+
+def ghi_parquet_phan_vung(cac_lo: Iterable, thu_muc: Path) -> List[Path]:
+    """
+    Ghi các RecordBatch ra thư_mục/nam=YYYY/thang=M/*.parquet.
+    Phân vùng có dữ liệu mới được ghi đè trọn vẹn; trả về các file đã ghi.
+    """
+    _pyarrow()
+    import pyarrow.dataset as ds
+
+    da_ghi: List[Path] = []
+    ds.write_dataset(
+        cac_lo,
+        thu_muc,
+        schema=luoc_do(),
+        format="parquet",
+        partitioning=COT_PHAN_VUNG,
+        partitioning_flavor="hive",
+        existing_data_behavior="delete_matching",
+        file_visitor=lambda f: da_ghi.append(Path(f.path)),
+    )
+    return sorted(da_ghi)
+
+
+# --------------------------------------------------------
+# MỘT FILE PARQUET PHÁT THEO LUỒNG (HTTP)
+# --------------------------------------------------------
+
+
+class _BoDemGhi:
+    """Đích ghi chỉ-nối-thêm cho ParquetWriter; lấy ra phần đã ghi."""
+
+    def __init__(self):
+        self._bo_dem = bytearray()
+        self._vi_tri = 0
+        self.closed = False
+
+    def write(self, du_lieu) -> int:
+        self._bo_dem += du_lieu
+        self._vi_tri += len(du_lieu)
+        return len(du_lieu)
+
+    def tell(self) -> int:
+        return self._vi_tri
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def lay_ra(self) -> bytes:
+        du_lieu = bytes(self._bo_dem)
+        self._bo_dem.clear()
+        return du_lieu
+
+
+async def luong_parquet(cac_lo: AsyncIterator) -> AsyncIterator[bytes]:
+    """
+    Một file Parquet hoàn chỉnh, phát từng đoạn byte ngay khi mỗi lô được
+    ghi thành row group (footer đến cuối) — không giữ cả file trong bộ nhớ.
+    """
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    bo_dem = _BoDemGhi()
+    writer = pq.ParquetWriter(pa.PythonFile(bo_dem, mode="w"), luoc_do())
+    try:
+        async for lo in cac_lo:
+            # Nén / mã hóa row group trên luồng worker
+            await anyio.to_thread.run_sync(writer.write_batch, lo)
+            doan = bo_dem.lay_ra()
+            if doan:
+                yield doan
+    finally:
+        writer.close()
+    yield bo_dem.lay_ra()
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+
+
+def main(argv: List[str] = None) -> int:
+    from app.infrastructure.database import ReportSessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Xuất dòng sổ cái đã ghi sổ ra Parquet theo năm/tháng."
+    )
+    parser.add_argument("--thu-muc", default="exports/so_cai")
+    parser.add_argument("--tu-ngay", type=date.fromisoformat)
+    parser.add_argument("--den-ngay", type=date.fromisoformat)
+    parser.add_argument(
+        "--lo", type=int, default=KICH_THUOC_LO_XUAT, help="Số dòng mỗi lô"
+    )
+    args = parser.parse_args(argv)
+
+    # Đọc từ DB báo cáo (replica nếu có): không tạo tải lên DB ghi sổ
+    with ReportSessionLocal() as db:
+        da_ghi = ghi_parquet_phan_vung(
+            iter_lo(db, args.tu_ngay, args.den_ngay, args.lo),
+            Path(args.thu_muc),
+        )
+    for duong_dan in da_ghi:
+        print(duong_dan)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# File: app/infrastructure/models/sql_account_balance.py
+
+from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+
+from app.infrastructure.base import Base
+
+
+class SQLAccountBalance(Base):
+    """
+    ORM Model đại diện cho bảng 'so_du_tai_khoan' (Sổ số dư tài khoản theo tháng).
+
+    Mỗi dòng là số dư của một tài khoản trong một tháng (ky_thang = YYYYMM),
+    được cập nhật trong cùng giao dịch với việc ghi sổ / hủy ghi sổ bút toán.
+    Số dư lưu dạng ròng: dư Nợ là số dương, dư Có là số âm.
+    """
+
+    __tablename__ = 'so_du_tai_khoan'
+
+    so_tai_khoan = Column(
+        String(20), ForeignKey('accounts.so_tai_khoan'), primary_key=True
+    )
+    ky_thang = Column(Integer, primary_key=True)  # Ví dụ: 202501
+    so_du_dau_ky = Column(Numeric(precision=19, scale=4), nullable=False)
+    ps_no = Column(Numeric(precision=19, scale=4), nullable=False)
+    ps_co = Column(Numeric(precision=19, scale=4), nullable=False)
+    so_du_cuoi_ky = Column(Numeric(precision=19, scale=4), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<SQLAccountBalance {self.so_tai_khoan} - {self.ky_thang}: "
+            f"{self.so_du_cuoi_ky}>"
+        )
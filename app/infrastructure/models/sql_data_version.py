@@ -0,0 +1,109 @@
+# File: app/infrastructure/models/sql_data_version.py
+
+from typing import Dict
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    String,
+    event,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.infrastructure.base import Base
+
+# Tên các dòng phiên bản (khớp với migration 2d8f6b4a1c73)
+SO_CAI = "so_cai"  # bút toán (thêm / sửa / xóa / đổi trạng thái)
+KY_KE_TOAN = "ky_ke_toan"  # kỳ kế toán (tạo / khóa / mở khóa)
+TAI_KHOAN = "tai_khoan"  # hệ thống tài khoản (thêm / sửa / xóa)
+CAC_DONG_PHIEN_BAN = (SO_CAI, KY_KE_TOAN, TAI_KHOAN)
+
+
+def dong_khoa_ky(ky_id: int) -> str:
+    """
+    Dòng đếm số lần kỳ `ky_id` được khóa (snapshot sổ cái của kỳ ghi số
+    này). Không seed: tạo ở lần khóa đầu tiên, chưa có dòng → 0.
+    """
+    return f"khoa_ky_{ky_id}"
+
+
+# Khóa trong Session.info: phiên bản đã đọc trong transaction đang mở
+_KHOA_INFO = "phien_ban_du_lieu"
+
+
+class SQLDataVersion(Base):
+    """
+    ORM Model đại diện cho bảng 'data_versions': phiên bản (tăng đơn điệu)
+    của một phần dữ liệu, lưu trong DB để MỌI tiến trình cùng thấy.
+
+    Dòng được tăng trong CÙNG transaction với thay đổi dữ liệu → bộ nhớ đệm
+    của mọi worker (và replica, vì dòng được sao chép cùng dữ liệu) so phiên
+    bản đọc được với phiên bản nó đang phản ánh.
+    """
+
+    __tablename__ = 'data_versions'
+
+    ten = Column(String(30), primary_key=True)
+    phien_ban = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SQLDataVersion {self.ten}: {self.phien_ban}>"
+
+
+@event.listens_for(SQLDataVersion.__table__, "after_create")
+def _tao_dong_phien_ban(target, connection, **kw):
+    # DB tạo bằng create_all (dev / test): có sẵn các dòng như migration
+    connection.execute(
+        insert(target),
+        [{"ten": ten, "phien_ban": 0} for ten in CAC_DONG_PHIEN_BAN],
+    )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _quen_phien_ban_da_doc(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_KHOA_INFO, None)
+
+
+def doc_cac_phien_ban(db: Session) -> Dict[str, int]:
+    """
+    Mọi dòng phiên bản (MỘT SELECT), nhớ đến hết transaction đang mở của
+    `db`: các bộ nhớ đệm dùng trong cùng yêu cầu không đọc lại.
+    """
+    phien_ban = db.info.get(_KHOA_INFO)
+    if phien_ban is None:
+        phien_ban = dict(
+            db.execute(
+                select(SQLDataVersion.ten, SQLDataVersion.phien_ban)
+            ).all()
+        )
+        db.info[_KHOA_INFO] = phien_ban
+    return phien_ban
+
+
+def doc_phien_ban(db: Session, ten: str) -> int:
+    """Phiên bản hiện tại của dòng `ten` (chưa có dòng → 0)."""
+    return doc_cac_phien_ban(db).get(ten, 0)
+
+
+def tang_phien_ban(db: Session, ten: str) -> int:
+    """
+    Tăng phiên bản trong transaction đang mở của `db`, trả về giá trị mới.
+    📌 UPDATE giữ khóa dòng đến khi commit: các transaction ghi cùng dòng
+       nối tiếp nhau → mỗi phiên bản ứng với đúng một thay đổi.
+    """
+    phien_ban = db.execute(
+        update(SQLDataVersion)
+        .where(SQLDataVersion.ten == ten)
+        .values(phien_ban=SQLDataVersion.phien_ban + 1)
+        .returning(SQLDataVersion.phien_ban)
+    ).scalar_one_or_none()
+    if phien_ban is None:
+        db.execute(insert(SQLDataVersion).values(ten=ten, phien_ban=1))
+        phien_ban = 1
+    if _KHOA_INFO in db.info:
+        db.info[_KHOA_INFO][ten] = phien_ban
+    return phien_ban
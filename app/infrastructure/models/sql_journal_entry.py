@@ -1,11 +1,26 @@
 # File: app/infrastructure/models/sql_journal_entry.py
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, String
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
 from sqlalchemy.orm import (  # Import relationship
     declarative_base,
     relationship,
+    validates,
 )
 
+from app import config
+from app.domain.models.journal_entry import sang_don_vi_nho
+from app.domain.models.report import tien_te
 from app.infrastructure.base import Base
 from app.infrastructure.models.sql_account import (  # Import để ràng buộc FK
     SQLAccount,
@@ -14,6 +29,11 @@ from app.infrastructure.models.sql_account import (  # Import để ràng buộc
 # from app.infrastructure.database import Base
 
 
+def luu_don_vi_nho() -> bool:
+    """True nếu đang đọc/cộng số tiền trên cột BIGINT đơn vị nhỏ nhất."""
+    return config.MONEY_STORAGE == "minor_units"
+
+
 class SQLJournalEntryLine(Base):
     """
     ORM Model đại diện cho bảng 'journal_entry_lines' trong cơ sở dữ liệu,
@@ -21,6 +41,19 @@ class SQLJournalEntryLine(Base):
     """
 
     __tablename__ = 'journal_entry_lines'
+    # Chỉ mục cho các truy vấn sổ cái (xem migration 7c4d2e8f1a36):
+    # - lọc theo tài khoản rồi nối về bút toán cha; trên PostgreSQL kèm
+    #   INCLUDE số tiền → SUM phát sinh đọc thẳng từ chỉ mục (index-only)
+    # - nạp dòng theo bút toán cha (joinedload / selectinload)
+    __table_args__ = (
+        Index(
+            'ix_journal_entry_lines_so_tai_khoan_journal_entry_id',
+            'so_tai_khoan',
+            'journal_entry_id',
+            postgresql_include=['no', 'co', 'no_nho', 'co_nho'],
+        ),
+        Index('ix_journal_entry_lines_journal_entry_id', 'journal_entry_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     journal_entry_id = Column(
@@ -35,6 +68,10 @@ class SQLJournalEntryLine(Base):
     co = Column(
         Numeric(precision=19, scale=4), nullable=False
     )  # Số tiền ghi Có
+    # Số tiền dạng số nguyên đơn vị nhỏ nhất (x MINOR_UNITS), luôn ghi song song
+    # với cột Numeric; được dùng khi MONEY_STORAGE = "minor_units"
+    no_nho = Column(BigInteger, nullable=False, default=0)
+    co_nho = Column(BigInteger, nullable=False, default=0)
     mo_ta = Column(String(256), nullable=True)  # Mô tả dòng (tuỳ chọn)
 
     # Relationship đến bút toán cha
@@ -44,6 +81,50 @@ class SQLJournalEntryLine(Base):
         "SQLAccount"
     )  # Không cần back_populates nếu không cần truy vấn ngược từ tài khoản
 
+    @validates("no", "co")
+    def _dong_bo_don_vi_nho(self, key, value):
+        # Mọi lần gán no/co đều cập nhật cột đơn vị nhỏ nhất tương ứng
+        setattr(self, f"{key}_nho", sang_don_vi_nho(Decimal(value)))
+        return value
+
+    @property
+    def so_tien_no(self) -> Decimal:
+        """Số tiền Nợ (Decimal), đọc từ cột theo chế độ lưu trữ."""
+        if luu_don_vi_nho():
+            return tien_te(self.no_nho)
+        return self.no
+
+    @property
+    def so_tien_co(self) -> Decimal:
+        """Số tiền Có (Decimal), đọc từ cột theo chế độ lưu trữ."""
+        if luu_don_vi_nho():
+            return tien_te(self.co_nho)
+        return self.co
+
+    @classmethod
+    def cot_no(cls):
+        """Cột dùng cho SUM/ORDER BY số tiền Nợ trong SQL."""
+        return cls.no_nho if luu_don_vi_nho() else cls.no
+
+    @classmethod
+    def cot_co(cls):
+        """Cột dùng cho SUM/ORDER BY số tiền Có trong SQL."""
+        return cls.co_nho if luu_don_vi_nho() else cls.co
+
+    @staticmethod
+    def sang_tien(gia_tri) -> Decimal:
+        """Đổi kết quả SUM trên cot_no()/cot_co() về Decimal."""
+        if luu_don_vi_nho():
+            return tien_te(gia_tri or 0)
+        return Decimal(gia_tri or 0)
+
+    @staticmethod
+    def sang_so_nguyen(gia_tri) -> int:
+        """Đổi giá trị cot_no()/cot_co() về số nguyên đơn vị nhỏ nhất."""
+        if luu_don_vi_nho():
+            return int(gia_tri or 0)
+        return sang_don_vi_nho(Decimal(gia_tri or 0))
+
 
 class SQLJournalEntry(Base):
     """
@@ -52,6 +133,16 @@ class SQLJournalEntry(Base):
     """
 
     __tablename__ = 'journal_entries'
+    # Mọi truy vấn báo cáo lọc trang_thai = 'Posted' và khoảng ngay_ct;
+    # INCLUDE id (PostgreSQL) để nối sang dòng bút toán không cần đọc bảng
+    __table_args__ = (
+        Index(
+            'ix_journal_entries_trang_thai_ngay_ct',
+            'trang_thai',
+            'ngay_ct',
+            postgresql_include=['id'],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ngay_ct = Column(Date, nullable=False)
@@ -62,6 +153,10 @@ class SQLJournalEntry(Base):
     trang_thai = Column(
         String(20), nullable=False, default="Draft"
     )  # Draft, Posted, Locked
+    # Kỳ kế toán hẹp nhất chứa ngay_ct (gán tự động khi tạo bút toán / kỳ)
+    period_id = Column(
+        Integer, ForeignKey('accounting_periods.id'), nullable=True, index=True
+    )
 
     # Relationship đến các dòng bút toán
     lines = relationship(
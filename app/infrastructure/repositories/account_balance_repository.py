@@ -0,0 +1,199 @@
+# File: app/infrastructure/repositories/account_balance_repository.py
+"""
+Repository quản lý bảng số dư tài khoản theo tháng ('so_du_tai_khoan').
+
+🎯 Mục tiêu:
+- Báo cáo đọc số dư từ bảng tổng hợp thay vì quét lại toàn bộ dòng bút toán.
+- Bảng được cập nhật khi bút toán chuyển vào / ra trạng thái 'Posted',
+  trong cùng session (cùng transaction) với việc đổi trạng thái.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.domain.models.journal_entry import JournalEntryLine
+from app.infrastructure.models.sql_account_balance import SQLAccountBalance
+from app.infrastructure.models.sql_journal_entry import (
+    SQLJournalEntry,
+    SQLJournalEntryLine,
+)
+
+
+def ky_thang_cua(ngay: date) -> int:
+    """Mã kỳ tháng (YYYYMM) của một ngày."""
+    return ngay.year * 100 + ngay.month
+
+
+class AccountBalanceRepository:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    # --------------------------------------------------------
+    # GHI: cập nhật số dư khi ghi sổ / hủy ghi sổ
+    # --------------------------------------------------------
+
+    def ghi_nhan(
+        self, ngay_ct: date, lines: Iterable[JournalEntryLine], dau: int = 1
+    ) -> None:
+        """
+        Cộng (dau=1, ghi sổ) hoặc trừ (dau=-1, hủy ghi sổ) phát sinh của các
+        dòng bút toán vào bảng số dư. Chỉ flush, KHÔNG commit — việc commit
+        do repository gọi đảm nhận để giữ chung một transaction.
+        """
+        phat_sinh: Dict[str, Tuple[Decimal, Decimal]] = defaultdict(
+            lambda: (Decimal(0), Decimal(0))
+        )
+        for line in lines:
+            no, co = phat_sinh[line.so_tai_khoan]
+            phat_sinh[line.so_tai_khoan] = (no + line.no, co + line.co)
+
+        ky_thang = ky_thang_cua(ngay_ct)
+        for so_tai_khoan, (no, co) in phat_sinh.items():
+            no, co = no * dau, co * dau
+            chenh_lech = no - co
+
+            so_du = self.db_session.get(
+                SQLAccountBalance, (so_tai_khoan, ky_thang)
+            )
+            if so_du is None:
+                dau_ky = self._so_du_cuoi_ky_truoc(so_tai_khoan, ky_thang)
+                so_du = SQLAccountBalance(
+                    so_tai_khoan=so_tai_khoan,
+                    ky_thang=ky_thang,
+                    so_du_dau_ky=dau_ky,
+                    ps_no=Decimal(0),
+                    ps_co=Decimal(0),
+                    so_du_cuoi_ky=dau_ky,
+                )
+                self.db_session.add(so_du)
+
+            so_du.ps_no += no
+            so_du.ps_co += co
+            so_du.so_du_cuoi_ky += chenh_lech
+
+            # Các tháng sau bị dịch chuyển số dư đầu/cuối kỳ một lượng bằng nhau
+            self.db_session.query(SQLAccountBalance).filter(
+                SQLAccountBalance.so_tai_khoan == so_tai_khoan,
+                SQLAccountBalance.ky_thang > ky_thang,
+            ).update(
+                {
+                    SQLAccountBalance.so_du_dau_ky: SQLAccountBalance.so_du_dau_ky
+                    + chenh_lech,
+                    SQLAccountBalance.so_du_cuoi_ky: SQLAccountBalance.so_du_cuoi_ky
+                    + chenh_lech,
+                },
+                synchronize_session="fetch",
+            )
+
+        self.db_session.flush()
+
+    # --------------------------------------------------------
+    # ĐỌC: số dư và phát sinh trong khoảng ngày bất kỳ
+    # --------------------------------------------------------
+
+    def lay_so_du_dau_ky(self, so_tai_khoan: str, ngay: date) -> Decimal:
+        """
+        Số dư ròng (Nợ dương, Có âm) của tài khoản trước ngày `ngay`.
+        = Số dư cuối các tháng trước + phát sinh từ đầu tháng đến trước `ngay`.
+        """
+        dau_thang = ngay.replace(day=1)
+        so_du = self._so_du_cuoi_ky_truoc(so_tai_khoan, ky_thang_cua(ngay))
+        if ngay > dau_thang:
+            no, co = self._phat_sinh_tu_dong(
+                so_tai_khoan, dau_thang, ngay - timedelta(days=1)
+            )
+            so_du += no - co
+        return so_du
+
+    def lay_so_du(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+        """
+        Trả về: (SDĐK ròng, PS Nợ, PS Có, SDCK ròng) trong khoảng [start, end].
+        Các tháng trọn vẹn đọc từ bảng số dư; phần lẻ đầu/cuối tháng được
+        bù trừ bằng một truy vấn SUM trên dòng bút toán.
+        """
+        dau_ky = self.lay_so_du_dau_ky(so_tai_khoan, start)
+
+        ps_no, ps_co = (
+            self.db_session.query(
+                func.coalesce(func.sum(SQLAccountBalance.ps_no), 0),
+                func.coalesce(func.sum(SQLAccountBalance.ps_co), 0),
+            )
+            .filter(
+                SQLAccountBalance.so_tai_khoan == so_tai_khoan,
+                SQLAccountBalance.ky_thang >= ky_thang_cua(start),
+                SQLAccountBalance.ky_thang <= ky_thang_cua(end),
+            )
+            .one()
+        )
+        ps_no, ps_co = Decimal(ps_no), Decimal(ps_co)
+
+        # Bỏ phần đầu tháng trước `start`
+        dau_thang = start.replace(day=1)
+        if start > dau_thang:
+            no, co = self._phat_sinh_tu_dong(
+                so_tai_khoan, dau_thang, start - timedelta(days=1)
+            )
+            ps_no, ps_co = ps_no - no, ps_co - co
+
+        # Bỏ phần cuối tháng sau `end`
+        cuoi_thang = _ngay_cuoi_thang(end)
+        if end < cuoi_thang:
+            no, co = self._phat_sinh_tu_dong(
+                so_tai_khoan, end + timedelta(days=1), cuoi_thang
+            )
+            ps_no, ps_co = ps_no - no, ps_co - co
+
+        return dau_ky, ps_no, ps_co, dau_ky + ps_no - ps_co
+
+    # --------------------------------------------------------
+    # HÀM NỘI BỘ
+    # --------------------------------------------------------
+
+    def _so_du_cuoi_ky_truoc(self, so_tai_khoan: str, ky_thang: int) -> Decimal:
+        """Số dư cuối kỳ của tháng gần nhất trước `ky_thang` (0 nếu chưa có)."""
+        so_du = (
+            self.db_session.query(SQLAccountBalance.so_du_cuoi_ky)
+            .filter(
+                SQLAccountBalance.so_tai_khoan == so_tai_khoan,
+                SQLAccountBalance.ky_thang < ky_thang,
+            )
+            .order_by(SQLAccountBalance.ky_thang.desc())
+            .limit(1)
+            .scalar()
+        )
+        return Decimal(so_du) if so_du is not None else Decimal(0)
+
+    def _phat_sinh_tu_dong(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """Tổng PS Nợ / PS Có đã ghi sổ của tài khoản trong [start, end]."""
+        no, co = (
+            self.db_session.query(
+                func.coalesce(func.sum(SQLJournalEntryLine.cot_no()), 0),
+                func.coalesce(func.sum(SQLJournalEntryLine.cot_co()), 0),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .filter(SQLJournalEntryLine.so_tai_khoan == so_tai_khoan)
+            .filter(SQLJournalEntry.trang_thai == "Posted")
+            .filter(SQLJournalEntry.ngay_ct >= start)
+            .filter(SQLJournalEntry.ngay_ct <= end)
+            .one()
+        )
+        return (
+            SQLJournalEntryLine.sang_tien(no),
+            SQLJournalEntryLine.sang_tien(co),
+        )
+
+
+def _ngay_cuoi_thang(ngay: date) -> date:
+    thang_sau = (ngay.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return thang_sau - timedelta(days=1)
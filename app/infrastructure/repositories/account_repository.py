@@ -1,9 +1,14 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.domain.models.account import TaiKhoan as TaiKhoanDomain
 from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.models.sql_data_version import (
+    TAI_KHOAN,
+    doc_phien_ban,
+    tang_phien_ban,
+)
 
 
 class AccountRepository:
@@ -31,6 +36,8 @@ class AccountRepository:
             la_tai_khoan_tong_hop=tai_khoan_domain.la_tai_khoan_tong_hop,
         )
         self.db_session.add(sql_account)
+        # Cùng transaction: bộ nhớ đệm COA của mọi worker thấy thay đổi
+        tang_phien_ban(self.db_session, TAI_KHOAN)
         self.db_session.commit()
         self.db_session.refresh(
             sql_account
@@ -38,6 +45,10 @@ class AccountRepository:
         # Trả về Domain Entity (tương tự như input, vì không có ID tự tăng)
         return tai_khoan_domain
 
+    def get_version(self) -> int:
+        # Đọc một lần mỗi transaction (dùng chung với các phiên bản khác)
+        return doc_phien_ban(self.db_session, TAI_KHOAN)
+
     def get_by_id(self, so_tai_khoan: str) -> Optional[TaiKhoanDomain]:
         """
         [Nghiệp vụ] Lấy thông tin tài khoản theo số tài khoản (Key chính).
@@ -59,6 +70,32 @@ class AccountRepository:
             la_tai_khoan_tong_hop=sql_account.la_tai_khoan_tong_hop,
         )
 
+    def get_many(
+        self, so_tai_khoan: Iterable[str]
+    ) -> Dict[str, TaiKhoanDomain]:
+        """
+        [Nghiệp vụ] Lấy nhiều tài khoản theo số tài khoản trong một truy vấn.
+        """
+        danh_sach_tk = list(so_tai_khoan)
+        if not danh_sach_tk:
+            return {}
+        sql_accounts = (
+            self.db_session.query(SQLAccount)
+            .filter(SQLAccount.so_tai_khoan.in_(danh_sach_tk))
+            .all()
+        )
+        return {
+            acc.so_tai_khoan: TaiKhoanDomain(
+                so_tai_khoan=acc.so_tai_khoan,
+                ten_tai_khoan=acc.ten_tai_khoan,
+                loai_tai_khoan=acc.loai_tai_khoan,
+                cap_tai_khoan=acc.cap_tai_khoan,
+                so_tai_khoan_cha=acc.so_tai_khoan_cha,
+                la_tai_khoan_tong_hop=acc.la_tai_khoan_tong_hop,
+            )
+            for acc in sql_accounts
+        }
+
     def get_all(self) -> List[TaiKhoanDomain]:
         """
         [Nghiệp vụ] Lấy danh sách tất cả tài khoản trong sơ đồ.
@@ -2,10 +2,19 @@
 
 from typing import List, Optional
 
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 
 from app.domain.models.accounting_period import KyKeToan as KyKeToanDomain
+from app.domain.models.accounting_period import khoa_ky_hep_nhat
 from app.infrastructure.models.sql_accounting_period import SQLAccountingPeriod
+from app.infrastructure.models.sql_data_version import (
+    KY_KE_TOAN,
+    doc_phien_ban,
+    dong_khoa_ky,
+    tang_phien_ban,
+)
+from app.infrastructure.models.sql_journal_entry import SQLJournalEntry
 
 
 class AccountingPeriodRepository:
@@ -24,6 +33,10 @@ class AccountingPeriodRepository:
             ghi_chu=ky_ke_toan_domain.ghi_chu,
         )
         self.db_session.add(sql_ky)
+        self.db_session.flush()
+        self._gan_but_toan_vao_ky(sql_ky)
+        # Cùng transaction: chỉ mục kỳ của mọi worker thấy kỳ mới
+        tang_phien_ban(self.db_session, KY_KE_TOAN)
         self.db_session.commit()
         self.db_session.refresh(sql_ky)
         return KyKeToanDomain(
@@ -35,6 +48,42 @@ class AccountingPeriodRepository:
             ghi_chu=sql_ky.ghi_chu,
         )
 
+    def _gan_but_toan_vao_ky(self, sql_ky: SQLAccountingPeriod) -> None:
+        """
+        Giữ bất biến `journal_entries.period_id` = kỳ hẹp nhất chứa ngay_ct:
+        bút toán trong khoảng của kỳ mới mà chưa có kỳ, hoặc đang thuộc
+        một kỳ rộng hơn, được chuyển sang kỳ mới (một câu UPDATE).
+        """
+        ky_rong_hon = [
+            ky.id
+            for ky in self.db_session.query(SQLAccountingPeriod).filter(
+                SQLAccountingPeriod.id != sql_ky.id,
+                SQLAccountingPeriod.ngay_bat_dau <= sql_ky.ngay_ket_thuc,
+                SQLAccountingPeriod.ngay_ket_thuc >= sql_ky.ngay_bat_dau,
+            )
+            if khoa_ky_hep_nhat(ky) > khoa_ky_hep_nhat(sql_ky)
+        ]
+        self.db_session.execute(
+            update(SQLJournalEntry)
+            .where(
+                SQLJournalEntry.ngay_ct >= sql_ky.ngay_bat_dau,
+                SQLJournalEntry.ngay_ct <= sql_ky.ngay_ket_thuc,
+                or_(
+                    SQLJournalEntry.period_id.is_(None),
+                    SQLJournalEntry.period_id.in_(ky_rong_hon),
+                ),
+            )
+            .values(period_id=sql_ky.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_version(self) -> int:
+        # Đọc một lần mỗi transaction (dùng chung với các phiên bản khác)
+        return doc_phien_ban(self.db_session, KY_KE_TOAN)
+
+    def get_lock_version(self, id: int) -> int:
+        return doc_phien_ban(self.db_session, dong_khoa_ky(id))
+
     def get_by_id(self, id: int) -> Optional[KyKeToanDomain]:
         """
         Lấy thông tin kỳ kế toán theo ID.
@@ -89,6 +138,11 @@ class AccountingPeriodRepository:
         if not sql_ky:
             return None
         sql_ky.trang_thai = trang_thai_moi
+        # Khóa / mở khóa: mọi worker tra lại trạng thái từ DB
+        tang_phien_ban(self.db_session, KY_KE_TOAN)
+        if trang_thai_moi == "Locked":
+            # Lần khóa mới: snapshot sổ cái của lần khóa trước hết hiệu lực
+            tang_phien_ban(self.db_session, dong_khoa_ky(id))
         self.db_session.commit()
         self.db_session.refresh(sql_ky)
         return KyKeToanDomain(
@@ -1,19 +1,35 @@
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.orm import Session, joinedload
 
 from app.domain.models.journal_entry import JournalEntry as JournalEntryDomain
 from app.domain.models.journal_entry import JournalEntryLine as JournalEntryLineDomain
+from app.domain.models.journal_entry import sang_don_vi_nho
+from app.infrastructure.cache.account_cache import get_account_cache
+from app.infrastructure.cache.columnar_ledger_store import (
+    get_columnar_ledger_store,
+)
+from app.infrastructure.cache.period_index import get_period_index
+from app.infrastructure.cache.report_cache import get_ledger_version
+from app.infrastructure.cache.turnover_index import get_turnover_index
+from app.infrastructure.models.sql_accounting_period import SQLAccountingPeriod
+from app.infrastructure.models.sql_data_version import SO_CAI, tang_phien_ban
 from app.infrastructure.models.sql_journal_entry import (
     SQLJournalEntry,
     SQLJournalEntryLine,
 )
+from app.infrastructure.repositories.account_balance_repository import (
+    AccountBalanceRepository,
+)
 from app.infrastructure.repositories.account_repository import (  # Import để kiểm tra tài khoản
     AccountRepository,
 )
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
 
 
 class JournalEntryRepository:
@@ -22,6 +38,58 @@ class JournalEntryRepository:
         self.account_repository = AccountRepository(
             db_session
         )  # Để kiểm tra tài khoản tồn tại
+        self.balance_repository = AccountBalanceRepository(
+            db_session
+        )  # Cập nhật bảng số dư khi bút toán vào/ra trạng thái 'Posted'
+        self._bien_dong_chua_ap_dung = []  # Chờ commit rồi mới đưa vào chỉ mục
+
+    def _ghi_nhan_so_du(
+        self, but_toan: SQLJournalEntry, lines, dau: int
+    ) -> None:
+        """
+        Ghi nhận biến động phát sinh của bút toán vào bảng số dư (cùng transaction)
+        và giữ lại để cập nhật chỉ mục phát sinh / kho sổ cái dạng cột trong
+        bộ nhớ sau khi commit.
+        """
+        ngay_ct = but_toan.ngay_ct
+        self.balance_repository.ghi_nhan(ngay_ct, lines, dau=dau)
+        self._bien_dong_chua_ap_dung.append(
+            (
+                but_toan.id,
+                ngay_ct,
+                [(l.so_tai_khoan, l.no, l.co) for l in lines],
+                dau,
+            )
+        )
+
+    def _commit(self) -> None:
+        engine = self.db_session.get_bind()
+        phien_ban = get_ledger_version(engine)
+        # Lấy trước: đăng ký với LedgerVersion cần khóa của nó, còn
+        # sau_commit() gọi _ap_dung() khi đang giữ khóa đó
+        chi_so = get_turnover_index(engine)
+        kho_cot = get_columnar_ledger_store(engine)
+        # Bút toán thay đổi → tăng phiên bản sổ cái trong DB, cùng transaction:
+        # khóa bộ nhớ đệm báo cáo của MỌI worker đổi theo
+        phien_ban_db = tang_phien_ban(self.db_session, SO_CAI)
+        # Tăng cả TRƯỚC commit: lần nạp theo năm chạy song song biết sổ cái
+        # sắp đổi (quy tắc phiên bản trong columnar_ledger_store)
+        truoc_commit = phien_ban.tang()
+        self.db_session.commit()
+        phien_ban.tang()
+        bien_dong, self._bien_dong_chua_ap_dung = (
+            self._bien_dong_chua_ap_dung,
+            [],
+        )
+
+        def _ap_dung() -> None:
+            for _, ngay_ct, lines, dau in bien_dong:
+                chi_so.ghi_nhan(truoc_commit, ngay_ct, lines, dau)
+            kho_cot.ghi_nhan(truoc_commit, bien_dong)
+
+        # Bộ nhớ trong tiến trình ở đúng phiên bản liền trước → nối biến
+        # động; worker khác đã ghi xen giữa → xóa, nạp lại từ DB
+        phien_ban.sau_commit(phien_ban_db, _ap_dung)
 
     def add(
         self, journal_entry_domain: JournalEntryDomain
@@ -29,10 +97,13 @@ class JournalEntryRepository:
         """
         Thêm một bút toán mới vào cơ sở dữ liệu.
         """
-        # Kiểm tra tài khoản tồn tại cho từng dòng
+        # Kiểm tra tài khoản tồn tại cho từng dòng (qua bộ nhớ đệm COA)
+        tai_khoan = get_account_cache(self.db_session.get_bind()).lay_nhieu(
+            (line.so_tai_khoan for line in journal_entry_domain.lines),
+            self.account_repository,
+        )
         for line in journal_entry_domain.lines:
-            tai_khoan = self.account_repository.get_by_id(line.so_tai_khoan)
-            if not tai_khoan:
+            if line.so_tai_khoan not in tai_khoan:
                 raise ValueError(
                     f"Tài khoản '{line.so_tai_khoan}' trong bút toán không tồn tại."
                 )
@@ -43,46 +114,44 @@ class JournalEntryRepository:
             so_phieu=journal_entry_domain.so_phieu,
             mo_ta=journal_entry_domain.mo_ta,
             trang_thai=journal_entry_domain.trang_thai,
+            period_id=self._ky_cua_ngay(journal_entry_domain.ngay_ct),
             # lines sẽ được thêm sau
         )
         self.db_session.add(sql_journal_entry)
         self.db_session.flush()  # Lấy ID của bút toán cha trước
 
-        # Thêm các dòng bút toán
-        sql_lines = []
-        for line in journal_entry_domain.lines:
-            sql_line = SQLJournalEntryLine(
-                journal_entry_id=sql_journal_entry.id,
-                so_tai_khoan=line.so_tai_khoan,
-                no=line.no,
-                co=line.co,
-                mo_ta=line.mo_ta,
-            )
-            sql_lines.append(sql_line)
-
-        self.db_session.add_all(sql_lines)
-        self.db_session.commit()
-        self.db_session.refresh(sql_journal_entry)
-
-        # Chuyển đổi lại về Domain Entity để trả về (cần load lines)
-        lines_domain = [
-            JournalEntryLineDomain(
-                so_tai_khoan=line.so_tai_khoan,
-                no=line.no,
-                co=line.co,
-                mo_ta=line.mo_ta,
-            )
-            for line in sql_journal_entry.lines
-        ]
-
-        return JournalEntryDomain(
+        # Thêm các dòng bút toán bằng MỘT câu INSERT nhiều dòng (executemany):
+        # dòng ORM từng cái sẽ thành N câu INSERT ... RETURNING id
+        lines = journal_entry_domain.lines
+        self.db_session.execute(
+            insert(SQLJournalEntryLine),
+            [
+                {
+                    "journal_entry_id": sql_journal_entry.id,
+                    "so_tai_khoan": line.so_tai_khoan,
+                    "no": line.no,
+                    "co": line.co,
+                    "no_nho": sang_don_vi_nho(line.no),
+                    "co_nho": sang_don_vi_nho(line.co),
+                    "mo_ta": line.mo_ta,
+                }
+                for line in lines
+            ],
+        )
+        if sql_journal_entry.trang_thai == "Posted":
+            self._ghi_nhan_so_du(sql_journal_entry, lines, dau=1)
+        # Dựng kết quả từ dữ liệu vừa ghi (đã kiểm tra ở Domain): không đọc
+        # lại bút toán sau commit
+        ket_qua = JournalEntryDomain.tu_du_lieu_da_luu(
             id=sql_journal_entry.id,
-            ngay_ct=sql_journal_entry.ngay_ct,
-            so_phieu=sql_journal_entry.so_phieu,
-            mo_ta=sql_journal_entry.mo_ta,
-            lines=lines_domain,
-            trang_thai=sql_journal_entry.trang_thai,
+            ngay_ct=journal_entry_domain.ngay_ct,
+            so_phieu=journal_entry_domain.so_phieu,
+            mo_ta=journal_entry_domain.mo_ta,
+            lines=list(lines),
+            trang_thai=journal_entry_domain.trang_thai,
         )
+        self._commit()
+        return ket_qua
 
     def get_by_id(self, id: int) -> Optional[JournalEntryDomain]:
         """
@@ -97,23 +166,7 @@ class JournalEntryRepository:
         if not sql_j:
             return None
 
-        lines_domain = [
-            JournalEntryLineDomain(
-                so_tai_khoan=line.so_tai_khoan,
-                no=line.no,
-                co=line.co,
-                mo_ta=line.mo_ta,
-            )
-            for line in sql_j.lines
-        ]
-        return JournalEntryDomain(
-            id=sql_j.id,
-            ngay_ct=sql_j.ngay_ct,
-            so_phieu=sql_j.so_phieu,
-            mo_ta=sql_j.mo_ta,
-            lines=lines_domain,
-            trang_thai=sql_j.trang_thai,
-        )
+        return self._sang_domain(sql_j)
 
     def get_all(self) -> List[JournalEntryDomain]:
         """
@@ -124,38 +177,77 @@ class JournalEntryRepository:
             .options(joinedload(SQLJournalEntry.lines))
             .all()
         )
-        journal_entries_domain = []
-        for sql_j in sql_journal_entries:
-            lines_domain = [
-                JournalEntryLineDomain(
-                    so_tai_khoan=line.so_tai_khoan,
-                    no=line.no,
-                    co=line.co,
-                    mo_ta=line.mo_ta,
-                )
-                for line in sql_j.lines
-            ]
-            journal_entries_domain.append(
-                JournalEntryDomain(
-                    id=sql_j.id,
-                    ngay_ct=sql_j.ngay_ct,
-                    so_phieu=sql_j.so_phieu,
-                    mo_ta=sql_j.mo_ta,
-                    lines=lines_domain,
-                    trang_thai=sql_j.trang_thai,
-                )
+        return [self._sang_domain(sql_j) for sql_j in sql_journal_entries]
+
+    def _ky_cua_ngay(self, ngay_ct: date) -> Optional[int]:
+        """ID kỳ kế toán hẹp nhất chứa `ngay_ct` (chỉ mục kỳ trong bộ nhớ)."""
+        cac_ky = get_period_index(self.db_session.get_bind()).tim_theo_ngay(
+            ngay_ct, AccountingPeriodRepository(self.db_session)
+        )
+        return cac_ky[0].id if cac_ky else None
+
+    def get_all_by_period(self, period_id: int) -> List[JournalEntryDomain]:
+        """
+        Lấy tất cả bút toán trong một kỳ kế toán, lọc trong SQL.
+        📌 period_id của bút toán là kỳ HẸP NHẤT chứa ngày chứng từ, nên bút
+           toán của kỳ Năm có thể mang period_id của Quý / Tháng bên trong:
+           lọc theo mọi kỳ giao với kỳ cần lấy (chỉ mục period_id) rồi giới
+           hạn đúng khoảng ngày của kỳ.
+        📌 Kèm period_id NULL: bút toán tạo khi chỉ mục kỳ của tiến trình
+           khác chưa biết kỳ mới vẫn được tìm thấy.
+        """
+        ky = self.db_session.get(SQLAccountingPeriod, period_id)
+        if ky is None:
+            return []
+        ky_giao_nhau = (
+            self.db_session.query(SQLAccountingPeriod.id)
+            .filter(
+                SQLAccountingPeriod.ngay_bat_dau <= ky.ngay_ket_thuc,
+                SQLAccountingPeriod.ngay_ket_thuc >= ky.ngay_bat_dau,
+            )
+            .scalar_subquery()
+        )
+        sql_journal_entries = (
+            self.db_session.query(SQLJournalEntry)
+            .options(joinedload(SQLJournalEntry.lines))
+            .filter(
+                or_(
+                    SQLJournalEntry.period_id.in_(ky_giao_nhau),
+                    SQLJournalEntry.period_id.is_(None),
+                ),
+                SQLJournalEntry.ngay_ct >= ky.ngay_bat_dau,
+                SQLJournalEntry.ngay_ct <= ky.ngay_ket_thuc,
             )
-        return journal_entries_domain
+            .order_by(SQLJournalEntry.ngay_ct, SQLJournalEntry.id)
+            .all()
+        )
+        return [self._sang_domain(sql_j) for sql_j in sql_journal_entries]
+
+    @staticmethod
+    def _dong_sang_domain(
+        line: SQLJournalEntryLine,
+    ) -> JournalEntryLineDomain:
+        """Chuyển dòng ORM sang Value Object (dữ liệu đã lưu, không kiểm lại)."""
+        return JournalEntryLineDomain.tu_du_lieu_da_luu(
+            line.so_tai_khoan, line.so_tien_no, line.so_tien_co, line.mo_ta
+        )
 
-    def get_all_by_period(self, period_id: int) -> List[SQLJournalEntry]:
+    @staticmethod
+    def _sang_domain(sql_j: SQLJournalEntry) -> JournalEntryDomain:
         """
-        Lấy tất cả bút toán trong một kỳ kế toán.
-        Giả sử có trường period_id trong SQLJournalEntry.
+        Chuyển ORM Model (đã nạp lines) sang Domain Entity.
+        📌 Đường dựng tin cậy: bút toán đã qua __post_init__ khi ghi, đọc lại
+           không kiểm tra cân bằng / dấu / tỷ giá lần nữa cho từng dòng.
         """
-        # Giả định period_id được thêm vào SQLJournalEntry (chưa thấy trong snippet)
-        # Tạm thời chỉ trả về tất cả cho đến khi mô hình SQLJournalEntry được cập nhật
-        return self.db_session.query(SQLJournalEntry).all()
-        # return self.db_session.query(SQLJournalEntry).filter(SQLJournalEntry.period_id == period_id).all()
+        dong_sang_domain = JournalEntryRepository._dong_sang_domain
+        return JournalEntryDomain.tu_du_lieu_da_luu(
+            sql_j.id,
+            sql_j.ngay_ct,
+            sql_j.so_phieu,
+            sql_j.mo_ta,
+            [dong_sang_domain(line) for line in sql_j.lines],
+            sql_j.trang_thai,
+        )
 
     def update(
         self, id: int, journal_entry_domain_updated: JournalEntryDomain
@@ -173,7 +265,17 @@ class JournalEntryRepository:
         if not sql_journal_entry:
             return None
 
-        # 1. Cập nhật thông tin chính
+        # 0. Bút toán đang ghi sổ thì gỡ phát sinh cũ khỏi bảng số dư
+        if sql_journal_entry.trang_thai == "Posted":
+            self._ghi_nhan_so_du(
+                sql_journal_entry, sql_journal_entry.lines, dau=-1
+            )
+
+        # 1. Cập nhật thông tin chính (đổi ngày → tính lại kỳ như add())
+        if sql_journal_entry.ngay_ct != journal_entry_domain_updated.ngay_ct:
+            sql_journal_entry.period_id = self._ky_cua_ngay(
+                journal_entry_domain_updated.ngay_ct
+            )
         sql_journal_entry.ngay_ct = journal_entry_domain_updated.ngay_ct
         sql_journal_entry.so_phieu = journal_entry_domain_updated.so_phieu
         sql_journal_entry.mo_ta = journal_entry_domain_updated.mo_ta
@@ -198,27 +300,14 @@ class JournalEntryRepository:
 
         sql_journal_entry.lines = sql_lines  # Gán lại relationship
 
-        self.db_session.commit()
+        if sql_journal_entry.trang_thai == "Posted":
+            self._ghi_nhan_so_du(sql_journal_entry, sql_lines, dau=1)
+
+        self._commit()
         self.db_session.refresh(sql_journal_entry)
 
         # Chuyển đổi lại về Domain Entity để trả về
-        lines_domain_updated = [
-            JournalEntryLineDomain(
-                so_tai_khoan=line.so_tai_khoan,
-                no=line.no,
-                co=line.co,
-                mo_ta=line.mo_ta,
-            )
-            for line in sql_journal_entry.lines
-        ]
-        return JournalEntryDomain(
-            id=sql_journal_entry.id,
-            ngay_ct=sql_journal_entry.ngay_ct,
-            so_phieu=sql_journal_entry.so_phieu,
-            mo_ta=sql_journal_entry.mo_ta,
-            lines=lines_domain_updated,
-            trang_thai=sql_journal_entry.trang_thai,
-        )
+        return self._sang_domain(sql_journal_entry)
 
     def delete(self, id: int) -> bool:
         """
@@ -233,14 +322,51 @@ class JournalEntryRepository:
         if not sql_journal_entry:
             return False
 
+        if sql_journal_entry.trang_thai == "Posted":
+            self._ghi_nhan_so_du(
+                sql_journal_entry, sql_journal_entry.lines, dau=-1
+            )
+
         # Xóa các dòng trước (Cascade Delete nên được thiết lập ở ORM, nhưng làm thủ công cho chắc chắn)
         for line in sql_journal_entry.lines:
             self.db_session.delete(line)
 
         self.db_session.delete(sql_journal_entry)
-        self.db_session.commit()
+        self._commit()
         return True
 
+    def update_status(
+        self, id: int, status: str
+    ) -> Optional[JournalEntryDomain]:
+        """
+        Cập nhật trạng thái bút toán (Draft → Posted, Posted → Draft, ...).
+        Bảng số dư tài khoản được cập nhật trong cùng transaction khi bút toán
+        đi vào hoặc đi ra khỏi trạng thái 'Posted'.
+        """
+        sql_journal_entry = (
+            self.db_session.query(SQLJournalEntry)
+            .options(joinedload(SQLJournalEntry.lines))
+            .filter(SQLJournalEntry.id == id)
+            .first()
+        )
+        if not sql_journal_entry:
+            return None
+
+        da_ghi_so = sql_journal_entry.trang_thai == "Posted"
+        ghi_so = status == "Posted"
+        if da_ghi_so != ghi_so:
+            self._ghi_nhan_so_du(
+                sql_journal_entry,
+                sql_journal_entry.lines,
+                dau=1 if ghi_so else -1,
+            )
+
+        sql_journal_entry.trang_thai = status
+        # Dòng đã nạp cùng bút toán: dựng kết quả trước commit, không refresh
+        ket_qua = self._sang_domain(sql_journal_entry)
+        self._commit()
+        return ket_qua
+
     def get_posted_lines_by_account_and_date(
         self, so_tai_khoan: str, end_date: date
     ) -> List[JournalEntryLineDomain]:
@@ -266,15 +392,7 @@ class JournalEntryRepository:
         )
 
         # Chuyển đổi sang Domain VO
-        return [
-            JournalEntryLineDomain(
-                so_tai_khoan=line.so_tai_khoan,
-                no=line.no,
-                co=line.co,
-                mo_ta=line.mo_ta,
-            )
-            for line in sql_lines
-        ]
+        return [self._dong_sang_domain(line) for line in sql_lines]
 
     def get_all_posted_in_range(
         self, start: date, end: date
@@ -299,25 +417,69 @@ class JournalEntryRepository:
         )
 
         # Chuyển đổi từ ORM Model sang Domain Entity
-        journal_entries_domain = []
-        for sql_j in sql_journal_entries:
-            lines_domain = [
-                JournalEntryLineDomain(
-                    so_tai_khoan=line.so_tai_khoan,
-                    no=line.no,
-                    co=line.co,
-                    mo_ta=line.mo_ta,
-                )
-                for line in sql_j.lines
-            ]
-            journal_entries_domain.append(
-                JournalEntryDomain(
-                    id=sql_j.id,
-                    ngay_ct=sql_j.ngay_ct,
-                    so_phieu=sql_j.so_phieu,
-                    mo_ta=sql_j.mo_ta,
-                    lines=lines_domain,
-                    trang_thai=sql_j.trang_thai,
+        return [self._sang_domain(sql_j) for sql_j in sql_journal_entries]
+
+    def count_drafts_in_range(self, start: date, end: date) -> int:
+        """
+        Số bút toán 'Draft' có ngày chứng từ trong [start, end].
+        SELECT COUNT(*) trên chỉ mục (trang_thai, ngay_ct), không nạp bút toán.
+        """
+        return self.db_session.execute(
+            select(func.count())
+            .select_from(SQLJournalEntry)
+            .where(
+                SQLJournalEntry.trang_thai == "Draft",
+                SQLJournalEntry.ngay_ct >= start,
+                SQLJournalEntry.ngay_ct <= end,
+            )
+        ).scalar_one()
+
+    def sample_draft_so_phieu(
+        self, start: date, end: date, limit: int = 5
+    ) -> List[str]:
+        """Tối đa `limit` số phiếu 'Draft' trong [start, end] (sớm nhất)."""
+        return list(
+            self.db_session.execute(
+                select(SQLJournalEntry.so_phieu)
+                .where(
+                    SQLJournalEntry.trang_thai == "Draft",
+                    SQLJournalEntry.ngay_ct >= start,
+                    SQLJournalEntry.ngay_ct <= end,
                 )
+                .order_by(SQLJournalEntry.ngay_ct, SQLJournalEntry.id)
+                .limit(limit)
+            ).scalars()
+        )
+
+    def get_turnover_by_accounts(
+        self, start: date, end: date, so_tai_khoan: Iterable[str]
+    ) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        (PS Nợ, PS Có) đã 'Posted' trong [start, end] của từng tài khoản,
+        gom nhóm trong SQL (một truy vấn cho mọi tài khoản).
+        """
+        danh_sach_tk = list(so_tai_khoan)
+        if not danh_sach_tk:
+            return {}
+        rows = (
+            self.db_session.query(
+                SQLJournalEntryLine.so_tai_khoan,
+                func.sum(SQLJournalEntryLine.cot_no()),
+                func.sum(SQLJournalEntryLine.cot_co()),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
             )
-        return journal_entries_domain
+            .filter(SQLJournalEntryLine.so_tai_khoan.in_(danh_sach_tk))
+            .filter(SQLJournalEntry.trang_thai == "Posted")
+            .filter(SQLJournalEntry.ngay_ct >= start)
+            .filter(SQLJournalEntry.ngay_ct <= end)
+            .group_by(SQLJournalEntryLine.so_tai_khoan)
+            .all()
+        )
+        sang_tien = SQLJournalEntryLine.sang_tien
+        return {
+            tk: (sang_tien(ps_no), sang_tien(ps_co))
+            for tk, ps_no, ps_co in rows
+        }
@@ -1,22 +1,53 @@
 # app/infrastructure/repositories/reporting_repository_impl.py
 from datetime import date
 from decimal import Decimal
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, joinedload
 
+from app import config
+from app.application.interfaces.report_repo import ReportRepositoryInterface
 from app.application.interfaces.reporting_repository import ReportingRepository
 from app.domain.models.account import TaiKhoan
-from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
-from app.infrastructure.models.sql_account import SQLAccount
+from app.domain.models.journal_entry import (
+    CotSoCai,
+    DongSoCai,
+    JournalEntry,
+    JournalEntryLine,
+)
+from app.infrastructure.cache.account_cache import get_account_cache
+from app.infrastructure.cache.columnar_ledger_store import (
+    DongSoCaiNho,
+    get_columnar_ledger_store,
+)
+from app.infrastructure.cache.report_cache import get_ledger_version
+from app.infrastructure.cache.turnover_index import (
+    DongPhatSinhNgay,
+    get_turnover_index,
+)
+from app.infrastructure.models.sql_data_version import SO_CAI, doc_phien_ban
 
 # --- Các import cần thiết để file không bị lỗi (giả sử bạn có các model này)
-from app.infrastructure.models.sql_journal_entry import SQLJournalEntry
+from app.infrastructure.models.sql_journal_entry import (
+    SQLJournalEntry,
+    SQLJournalEntryLine,
+)
+from app.infrastructure.repositories.account_balance_repository import (
+    AccountBalanceRepository,
+)
+from app.infrastructure.repositories.account_repository import (
+    AccountRepository,
+)
 
+# Số dòng mỗi lô khi phát dòng sổ cái theo luồng (yield_per)
+KICH_THUOC_LO_DONG = 5000
 
-class ReportingRepositoryImpl(ReportingRepository):
+
+class ReportingRepositoryImpl(ReportingRepository, ReportRepositoryInterface):
     def __init__(self, db: Session):
         self.db = db
+        self.balance_repository = AccountBalanceRepository(db)
 
     def get_all_posted_entries_in_range(
         self, start: date, end: date
@@ -24,6 +55,7 @@ class ReportingRepositoryImpl(ReportingRepository):
         # Truy vấn từ SQLJournalEntry và map sang Domain
         sql_entries = (
             self.db.query(SQLJournalEntry)
+            .options(joinedload(SQLJournalEntry.lines))
             .filter(
                 SQLJournalEntry.ngay_ct.between(start, end),
                 SQLJournalEntry.trang_thai == "Posted",
@@ -33,51 +65,274 @@ class ReportingRepositoryImpl(ReportingRepository):
 
         return [self._map_sql_to_domain(sql_e) for sql_e in sql_entries]
 
+    def get_all_posted_in_range(
+        self, start: date, end: date
+    ) -> List[JournalEntry]:
+        # Tên theo ReportRepositoryInterface
+        return self.get_all_posted_entries_in_range(start, end)
+
+    def iter_posted_lines(
+        self, start: date, end: date, kich_thuoc_lo: int = KICH_THUOC_LO_DONG
+    ) -> Iterator[DongSoCai]:
+        # SELECT Core 4 cột: không dựng ORM object / identity map; yield_per
+        # đọc từng lô (PostgreSQL: con trỏ phía server) → bộ nhớ tỷ lệ với
+        # kích thước lô, không phải số dòng cả năm
+        ket_qua = self.db.execute(
+            select(
+                SQLJournalEntryLine.so_tai_khoan,
+                SQLJournalEntry.ngay_ct,
+                SQLJournalEntryLine.cot_no(),
+                SQLJournalEntryLine.cot_co(),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .where(
+                SQLJournalEntry.trang_thai == "Posted",
+                SQLJournalEntry.ngay_ct >= start,
+                SQLJournalEntry.ngay_ct <= end,
+            )
+            .order_by(
+                SQLJournalEntry.ngay_ct,
+                SQLJournalEntry.id,
+                SQLJournalEntryLine.id,
+            )
+            .execution_options(yield_per=kich_thuoc_lo)
+        )
+        sang_tien = SQLJournalEntryLine.sang_tien
+        for so_tai_khoan, ngay_ct, no, co in ket_qua:
+            yield DongSoCai(
+                so_tai_khoan, ngay_ct, sang_tien(no), sang_tien(co)
+            )
+
     def get_all_accounts(self) -> List[TaiKhoan]:
-        sql_accounts = self.db.query(SQLAccount).all()
-        return [
-            TaiKhoan(
-                so_tai_khoan=sql_acc.so_tai_khoan,
-                ten_tai_khoan=sql_acc.ten_tai_khoan,
-                loai_tai_khoan=sql_acc.loai_tai_khoan,
-                cap_tai_khoan=sql_acc.cap_tai_khoan,
-                so_tai_khoan_cha=sql_acc.so_tai_khoan_cha,
-                la_tai_khoan_tong_hop=sql_acc.la_tai_khoan_tong_hop,
-            )
-            for sql_acc in sql_accounts
-        ]
+        # COA dùng chung với kiểm tra bút toán: đã nạp → 0 truy vấn, báo cáo
+        # gộp (B01 + B02 + B09) không SELECT bảng tài khoản nhiều lần
+        return get_account_cache(self.db.get_bind()).lay_tat_ca(
+            AccountRepository(self.db)
+        )
 
     def get_opening_balance(self, so_tai_khoan: str, ngay: date) -> Decimal:
-        # Lấy số dư đầu kỳ từ bảng Sổ Cái hoặc Sổ Tổng Hợp
-        # Trong ví dụ này, giả lập
-        return Decimal("0")
+        # Đọc từ bảng số dư tài khoản theo tháng (so_du_tai_khoan)
+        return self.balance_repository.lay_so_du_dau_ky(so_tai_khoan, ngay)
 
     def get_account_balance(
         self, so_tai_khoan: str, ngay_bat_dau: date, ngay_ket_thuc: date
     ) -> Tuple[Decimal, Decimal, Decimal, Decimal, Decimal]:
-        # Tính số dư đầu kỳ, phát sinh, số dư cuối kỳ
         # Trả về (SDĐK, PS Nợ, PS Có, SDCK Nợ, SDCK Có)
-        # Trong ví dụ này, giả lập
+        # SDĐK là số dư ròng (Nợ dương, Có âm); SDCK tách theo bên dư
+        dau_ky, ps_no, ps_co, cuoi_ky = self.balance_repository.lay_so_du(
+            so_tai_khoan, ngay_bat_dau, ngay_ket_thuc
+        )
         return (
-            Decimal("0"),
-            Decimal("100"),
-            Decimal("50"),
-            Decimal("50"),
-            Decimal("0"),
+            dau_ky,
+            ps_no,
+            ps_co,
+            max(cuoi_ky, Decimal(0)),
+            max(-cuoi_ky, Decimal(0)),
+        )
+
+    def get_ledger_version(self) -> int:
+        # Đọc trong CHÍNH phiên lập báo cáo (kể cả replica): khóa đệm khớp
+        # với dữ liệu phiên này nhìn thấy, chung cho mọi worker
+        return doc_phien_ban(self.db, SO_CAI)
+
+    def _doi_chieu_bo_nho(self) -> bool:
+        """
+        Trước khi đọc bộ nhớ trong tiến trình (chỉ mục phát sinh, kho dạng
+        cột): worker khác đã ghi sổ → xóa để nạp lại. Phiên bản đọc MỘT lần
+        mỗi transaction, dùng chung với khóa đệm báo cáo.
+        False: phiên (replica) trễ hơn bộ nhớ → đọc thẳng DB.
+        """
+        return get_ledger_version(self.db.get_bind()).doi_chieu(
+            self.get_ledger_version()
+        )
+
+    def get_posted_columns(self, end: date) -> Optional[CotSoCai]:
+        if not config.COLUMNAR_LEDGER_STORE:
+            return None
+        # Kho dạng cột theo năm (nạp lười, cập nhật tăng dần khi ghi sổ)
+        if not self._doi_chieu_bo_nho():
+            return None  # replica trễ: gom theo ngày bằng SQL
+        return get_columnar_ledger_store(self.db.get_bind()).cot(
+            end, self._dong_so_cai_nam, self._nam_dau_so_cai
+        )
+
+    def _dong_so_cai_nam(self, nam: int) -> Iterator[DongSoCaiNho]:
+        """Các dòng đã ghi sổ của năm `nam` (SELECT Core theo luồng)."""
+        ket_qua = self.db.execute(
+            select(
+                SQLJournalEntry.id,
+                SQLJournalEntry.ngay_ct,
+                SQLJournalEntryLine.so_tai_khoan,
+                SQLJournalEntryLine.cot_no(),
+                SQLJournalEntryLine.cot_co(),
+            )
+            .join(
+                SQLJournalEntryLine,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .where(
+                SQLJournalEntry.trang_thai == "Posted",
+                SQLJournalEntry.ngay_ct >= date(nam, 1, 1),
+                SQLJournalEntry.ngay_ct <= date(nam, 12, 31),
+            )
+            # Theo ngày (chỉ mục trang_thai, ngay_ct): kho cắt năm bằng
+            # tìm nhị phân
+            .order_by(SQLJournalEntry.ngay_ct)
+            .execution_options(yield_per=KICH_THUOC_LO_DONG)
+        )
+        sang_so_nguyen = SQLJournalEntryLine.sang_so_nguyen
+        for but_toan_id, ngay_ct, so_tai_khoan, no, co in ket_qua:
+            yield (
+                but_toan_id,
+                ngay_ct,
+                so_tai_khoan,
+                sang_so_nguyen(no),
+                sang_so_nguyen(co),
+            )
+
+    def _nam_dau_so_cai(self) -> Optional[int]:
+        """Năm sớm nhất có bút toán đã ghi sổ (chỉ mục trang_thai, ngay_ct)."""
+        ngay_dau = self.db.execute(
+            select(func.min(SQLJournalEntry.ngay_ct)).where(
+                SQLJournalEntry.trang_thai == "Posted"
+            )
+        ).scalar_one()
+        return ngay_dau.year if ngay_dau is not None else None
+
+    def get_turnover(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        # Đọc từ chỉ mục Fenwick trong bộ nhớ (nạp mỗi năm một lần)
+        if not self._doi_chieu_bo_nho():
+            return self._phat_sinh_sql(so_tai_khoan, start, end)
+        chi_so = get_turnover_index(self.db.get_bind())
+        return chi_so.phat_sinh(
+            so_tai_khoan, start, end, self._phat_sinh_theo_ngay
+        )
+
+    def _phat_sinh_sql(
+        self, tk_goc: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """PS Nợ, PS Có của TK `tk_goc` và TK con (theo tiền tố), bằng SQL."""
+        no, co = (
+            self.db.query(
+                func.sum(SQLJournalEntryLine.cot_no()),
+                func.sum(SQLJournalEntryLine.cot_co()),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .filter(
+                SQLJournalEntry.trang_thai == "Posted",
+                SQLJournalEntry.ngay_ct.between(start, end),
+                SQLJournalEntryLine.so_tai_khoan.startswith(tk_goc),
+            )
+            .one()
         )
+        sang_tien = SQLJournalEntryLine.sang_tien
+        return sang_tien(no), sang_tien(co)
+
+    def get_trial_balance(
+        self, start: date, end: date
+    ) -> List[Tuple[str, Decimal, Decimal, Decimal, Decimal]]:
+        # Một truy vấn GROUP BY duy nhất: SDĐK (trước `start`) và phát sinh
+        # trong kỳ được tách bằng CASE theo ngày chứng từ
+        trong_ky = SQLJournalEntry.ngay_ct >= start
+        cot_no = SQLJournalEntryLine.cot_no()
+        cot_co = SQLJournalEntryLine.cot_co()
+        rows = (
+            self.db.query(
+                SQLJournalEntryLine.so_tai_khoan,
+                func.sum(
+                    case(
+                        (~trong_ky, cot_no - cot_co),
+                        else_=0,
+                    )
+                ),
+                func.sum(case((trong_ky, cot_no), else_=0)),
+                func.sum(case((trong_ky, cot_co), else_=0)),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .filter(
+                SQLJournalEntry.trang_thai == "Posted",
+                SQLJournalEntry.ngay_ct <= end,
+            )
+            .group_by(SQLJournalEntryLine.so_tai_khoan)
+            .all()
+        )
+        ket_qua = []
+        sang_tien = SQLJournalEntryLine.sang_tien
+        for so_tai_khoan, dau_ky, ps_no, ps_co in rows:
+            dau_ky = sang_tien(dau_ky)
+            ps_no, ps_co = sang_tien(ps_no), sang_tien(ps_co)
+            ket_qua.append(
+                (so_tai_khoan, dau_ky, ps_no, ps_co, dau_ky + ps_no - ps_co)
+            )
+        return ket_qua
+
+    def get_daily_turnover(
+        self, end: date
+    ) -> List[Tuple[str, date, Decimal, Decimal]]:
+        # Gom trong SQL theo (tài khoản, ngày): số dòng trả về tỷ lệ với
+        # số TK x số ngày có phát sinh, không phải số dòng bút toán
+        return self._phat_sinh_gom_theo_ngay(None, end)
+
+    def _phat_sinh_theo_ngay(self, nam: int) -> List[DongPhatSinhNgay]:
+        """Phát sinh đã ghi sổ của năm `nam`, gom theo (tài khoản, ngày)."""
+        return self._phat_sinh_gom_theo_ngay(
+            date(nam, 1, 1), date(nam, 12, 31)
+        )
+
+    def _phat_sinh_gom_theo_ngay(
+        self, start: Optional[date], end: date
+    ) -> List[DongPhatSinhNgay]:
+        query = (
+            self.db.query(
+                SQLJournalEntryLine.so_tai_khoan,
+                SQLJournalEntry.ngay_ct,
+                func.sum(SQLJournalEntryLine.cot_no()),
+                func.sum(SQLJournalEntryLine.cot_co()),
+            )
+            .join(
+                SQLJournalEntry,
+                SQLJournalEntry.id == SQLJournalEntryLine.journal_entry_id,
+            )
+            .filter(
+                SQLJournalEntry.trang_thai == "Posted",
+                SQLJournalEntry.ngay_ct <= end,
+            )
+        )
+        if start is not None:
+            query = query.filter(SQLJournalEntry.ngay_ct >= start)
+        rows = query.group_by(
+            SQLJournalEntryLine.so_tai_khoan, SQLJournalEntry.ngay_ct
+        ).all()
+        sang_tien = SQLJournalEntryLine.sang_tien
+        return [
+            (so_tai_khoan, ngay_ct, sang_tien(no), sang_tien(co))
+            for so_tai_khoan, ngay_ct, no, co in rows
+        ]
 
     def _map_sql_to_domain(self, sql_entry) -> JournalEntry:
+        # Dữ liệu đã lưu → đường dựng tin cậy, không kiểm tra lại bất biến
         lines = [
-            JournalEntryLine(
-                so_tai_khoan=line.so_tai_khoan, no=line.no, co=line.co
+            JournalEntryLine.tu_du_lieu_da_luu(
+                line.so_tai_khoan, line.so_tien_no, line.so_tien_co
             )
             for line in sql_entry.lines
         ]
-        return JournalEntry(
-            id=sql_entry.id,
-            ngay_ct=sql_entry.ngay_ct,
-            so_phieu=sql_entry.so_phieu,
-            mo_ta=sql_entry.mo_ta,
-            lines=lines,
-            trang_thai=sql_entry.trang_thai,
+        return JournalEntry.tu_du_lieu_da_luu(
+            sql_entry.id,
+            sql_entry.ngay_ct,
+            sql_entry.so_phieu,
+            sql_entry.mo_ta,
+            lines,
+            sql_entry.trang_thai,
         )
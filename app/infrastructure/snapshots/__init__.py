@@ -0,0 +1,4 @@
+# File: app/infrastructure/snapshots/__init__.py
+"""
+File snapshot sổ cái (nhị phân, đọc qua mmap) của các kỳ kế toán đã khóa.
+"""
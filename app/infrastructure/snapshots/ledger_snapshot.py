@@ -0,0 +1,422 @@
+# File: app/infrastructure/snapshots/ledger_snapshot.py
+"""
+Snapshot sổ cái của kỳ kế toán ĐÃ KHÓA: file nhị phân bản ghi cố định,
+đọc bằng numpy.memmap để lập báo cáo kỳ cũ không chạm DB OLTP.
+
+🎯 Mục tiêu:
+- Số liệu kỳ đã khóa không đổi → xuất MỘT lần ra file, các lần lập báo
+  cáo quý / năm sau đó chỉ đọc file.
+- Đọc zero-copy: hệ điều hành nạp trang theo nhu cầu, bộ nhớ tiến trình
+  không tăng theo kích thước lịch sử.
+- Đối tượng đọc có cùng get_turnover / get_trial_balance với
+  LedgerAggregate → truyền thẳng làm `so_lieu` cho các service báo cáo.
+
+📋 Cấu trúc file (little-endian, không đệm):
+- Đầu file (48 byte): magic "TT99SNAP", phiên bản định dạng (u16),
+  độ dài mã TK (u16), id kỳ (i32), ngày bắt đầu / kết thúc (i32 ordinal),
+  số tài khoản (u64), số dòng (u64), lần khóa kỳ (u64).
+- Bảng tài khoản (sắp xếp theo mã TK), mỗi TK: mã TK (20 byte), SDĐK ròng
+  đầu kỳ (i64), vị trí dòng đầu tiên (u64), số dòng (u64).
+- Các dòng, nhóm theo TK rồi theo ngày: ngày (i32 ordinal), Nợ (i64),
+  Có (i64) — số tiền là đơn vị nhỏ nhất (x MINOR_UNITS).
+
+📌 Mở khóa kỳ làm snapshot hết hiệu lực: xuat_cac_ky_da_khoa() xóa file
+   của kỳ không còn khóa, và xuất lại file mang lần khóa khác với DB
+   (mở khóa → sửa → khóa lại giữa hai lần chạy). Chạy:
+   python -m app.infrastructure.snapshots.ledger_snapshot --thu-muc snapshots
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from app.application.interfaces.period_repo import (
+    AccountingPeriodRepositoryInterface,
+)
+from app.application.interfaces.report_repo import ReportRepositoryInterface
+from app.domain.models.accounting_period import KyKeToan
+from app.domain.models.journal_entry import DongSoCai, sang_don_vi_nho
+from app.domain.models.report import tien_te
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"TT99SNAP"
+PHIEN_BAN_DINH_DANG = 2
+DO_DAI_MA_TK = 20  # khớp accounts.so_tai_khoan String(20)
+
+_DAU_FILE = struct.Struct("<8sHHiiiQQQ")
+
+
+def _kieu_bang_tai_khoan():
+    import numpy as np
+
+    return np.dtype(
+        [
+            ("so_tai_khoan", f"S{DO_DAI_MA_TK}"),
+            ("dau_ky", "<i8"),
+            ("vi_tri", "<u8"),
+            ("so_dong", "<u8"),
+        ]
+    )
+
+
+def _kieu_dong():
+    import numpy as np
+
+    return np.dtype([("ngay", "<i4"), ("no", "<i8"), ("co", "<i8")])
+
+
+def ten_file_snapshot(ky_id: int) -> str:
+    return f"so_cai_ky_{ky_id}.bin"
+
+
+# --------------------------------------------------------
+# GHI SNAPSHOT
+# --------------------------------------------------------
+
+
+def ghi_snapshot(
+    duong_dan: Path,
+    ky: KyKeToan,
+    dau_ky: Mapping[str, int],
+    dong: Iterable[DongSoCai],
+    lan_khoa: int = 0,
+) -> Path:
+    """
+    Ghi snapshot của kỳ `ky`: `dau_ky` là SDĐK ròng (đơn vị nhỏ nhất) của
+    từng TK, `dong` là các dòng đã ghi sổ trong kỳ theo thứ tự ngày,
+    `lan_khoa` là lần khóa kỳ mà số liệu thuộc về.
+    Ghi ra file tạm rồi đổi tên → người đọc không bao giờ thấy file dở.
+    """
+    import numpy as np
+
+    theo_tk: Dict[str, Tuple[array, array, array]] = {}
+    for so_tai_khoan, ngay_ct, no, co in dong:
+        cot = theo_tk.get(so_tai_khoan)
+        if cot is None:
+            cot = theo_tk[so_tai_khoan] = (array("i"), array("q"), array("q"))
+        cot[0].append(ngay_ct.toordinal())
+        cot[1].append(sang_don_vi_nho(no))
+        cot[2].append(sang_don_vi_nho(co))
+
+    ma_tk = sorted(set(theo_tk) | {tk for tk, sd in dau_ky.items() if sd})
+    bang = np.zeros(len(ma_tk), dtype=_kieu_bang_tai_khoan())
+    vi_tri = 0
+    for i, so_tai_khoan in enumerate(ma_tk):
+        cot = theo_tk.get(so_tai_khoan)
+        so_dong = len(cot[0]) if cot is not None else 0
+        bang[i] = (
+            so_tai_khoan.encode(),
+            dau_ky.get(so_tai_khoan, 0),
+            vi_tri,
+            so_dong,
+        )
+        vi_tri += so_dong
+
+    duong_dan = Path(duong_dan)
+    duong_dan.parent.mkdir(parents=True, exist_ok=True)
+    file_tam = duong_dan.with_name(duong_dan.name + ".tmp")
+    with open(file_tam, "wb") as f:
+        f.write(
+            _DAU_FILE.pack(
+                MAGIC,
+                PHIEN_BAN_DINH_DANG,
+                DO_DAI_MA_TK,
+                ky.id or 0,
+                ky.ngay_bat_dau.toordinal(),
+                ky.ngay_ket_thuc.toordinal(),
+                len(ma_tk),
+                vi_tri,
+                lan_khoa,
+            )
+        )
+        f.write(bang.tobytes())
+        kieu_dong = _kieu_dong()
+        for so_tai_khoan in ma_tk:
+            if so_tai_khoan not in theo_tk:
+                continue
+            ngay, no, co = theo_tk.pop(so_tai_khoan)
+            ban_ghi = np.empty(len(ngay), dtype=kieu_dong)
+            ban_ghi["ngay"] = np.frombuffer(ngay, dtype=np.int32)
+            ban_ghi["no"] = np.frombuffer(no, dtype=np.int64)
+            ban_ghi["co"] = np.frombuffer(co, dtype=np.int64)
+            f.write(ban_ghi.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(file_tam, duong_dan)
+    return duong_dan
+
+
+def xuat_snapshot_ky(
+    ky: KyKeToan,
+    report_repo: ReportRepositoryInterface,
+    thu_muc: Path,
+    lan_khoa: int = 0,
+) -> Path:
+    """Xuất snapshot của một kỳ đã khóa (một GROUP BY + một SELECT luồng)."""
+    if ky.trang_thai != "Locked":
+        raise ValueError(
+            f"Kỳ '{ky.ten_ky}' chưa khóa, không thể xuất snapshot sổ cái."
+        )
+    bd, kt = ky.ngay_bat_dau, ky.ngay_ket_thuc
+    dau_ky = {
+        so_tai_khoan: sang_don_vi_nho(sd_dau_ky)
+        for so_tai_khoan, sd_dau_ky, *_ in report_repo.get_trial_balance(
+            bd, bd
+        )
+    }
+    return ghi_snapshot(
+        Path(thu_muc) / ten_file_snapshot(ky.id),
+        ky,
+        dau_ky,
+        report_repo.iter_posted_lines(bd, kt),
+        lan_khoa,
+    )
+
+
+def xuat_cac_ky_da_khoa(
+    period_repo: AccountingPeriodRepositoryInterface,
+    report_repo: ReportRepositoryInterface,
+    thu_muc: Path,
+    ghi_de: bool = False,
+) -> List[Path]:
+    """
+    Xuất snapshot cho mọi kỳ đã khóa chưa có file hoặc có file của một lần
+    khóa trước (hoặc mọi kỳ nếu `ghi_de`), xóa file của kỳ đang mở khóa.
+    Trả về các file đã ghi.
+    """
+    da_ghi = []
+    for ky in period_repo.get_all():
+        duong_dan = Path(thu_muc) / ten_file_snapshot(ky.id)
+        if ky.trang_thai != "Locked":
+            duong_dan.unlink(missing_ok=True)
+            continue
+        lan_khoa = period_repo.get_lock_version(ky.id)
+        if ghi_de or doc_lan_khoa(duong_dan) != lan_khoa:
+            da_ghi.append(
+                xuat_snapshot_ky(ky, report_repo, thu_muc, lan_khoa)
+            )
+    return da_ghi
+
+
+def _doc_dau_file(duong_dan: Path) -> tuple:
+    """Các trường đầu file; sai magic / định dạng → ValueError."""
+    with open(duong_dan, "rb") as f:
+        dau_file = f.read(_DAU_FILE.size)
+    if len(dau_file) < _DAU_FILE.size:
+        raise ValueError(f"File snapshot không hợp lệ: {duong_dan}")
+    truong = _DAU_FILE.unpack(dau_file)
+    if truong[:3] != (MAGIC, PHIEN_BAN_DINH_DANG, DO_DAI_MA_TK):
+        raise ValueError(f"File snapshot không hợp lệ: {duong_dan}")
+    return truong
+
+
+def doc_lan_khoa(duong_dan: Path) -> Optional[int]:
+    """
+    Lần khóa kỳ ghi trong file (chỉ đọc đầu file); None nếu không dùng
+    được: chưa có file, file hỏng hoặc định dạng cũ.
+    """
+    try:
+        return _doc_dau_file(Path(duong_dan))[-1]
+    except (OSError, ValueError):
+        return None
+
+
+# --------------------------------------------------------
+# ĐỌC SNAPSHOT (numpy.memmap, zero-copy)
+# --------------------------------------------------------
+
+
+class LedgerSnapshot:
+    """
+    Snapshot sổ cái một kỳ, ánh xạ bộ nhớ. Trả lời phát sinh / bảng cân đối
+    số phát sinh cho mọi khoảng ngày NẰM TRONG kỳ.
+    """
+
+    def __init__(self, duong_dan: Path):
+        import numpy as np
+
+        duong_dan = Path(duong_dan)
+        (
+            *_,
+            self.ky_id,
+            bd,
+            kt,
+            so_tai_khoan,
+            so_dong,
+            self.lan_khoa,
+        ) = _doc_dau_file(duong_dan)
+        self.ngay_bat_dau = date.fromordinal(bd)
+        self.ngay_ket_thuc = date.fromordinal(kt)
+
+        kieu_bang, kieu_dong = _kieu_bang_tai_khoan(), _kieu_dong()
+        vi_tri_dong = _DAU_FILE.size + so_tai_khoan * kieu_bang.itemsize
+        if duong_dan.stat().st_size != (
+            vi_tri_dong + so_dong * kieu_dong.itemsize
+        ):
+            raise ValueError(f"File snapshot bị cắt cụt: {duong_dan}")
+
+        def _anh_xa(kieu, vi_tri: int, so_phan_tu: int) -> np.ndarray:
+            if not so_phan_tu:  # mmap không nhận vùng rỗng
+                return np.zeros(0, dtype=kieu)
+            return np.memmap(
+                duong_dan,
+                dtype=kieu,
+                mode="r",
+                offset=vi_tri,
+                shape=(so_phan_tu,),
+            )
+
+        self._bang = _anh_xa(kieu_bang, _DAU_FILE.size, so_tai_khoan)
+        self._dong = _anh_xa(kieu_dong, vi_tri_dong, so_dong)
+        self.so_tai_khoan = self._bang["so_tai_khoan"]
+
+    def __len__(self) -> int:
+        return len(self._dong)
+
+    def __enter__(self) -> "LedgerSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.dong()
+
+    def dong(self) -> None:
+        """Bỏ ánh xạ bộ nhớ (file có thể bị ghi đè / xóa sau đó)."""
+        self._bang = self._dong = self.so_tai_khoan = None
+
+    # --------------------------------------------------------
+    # TÍNH TOÁN TRÊN VÙNG ÁNH XẠ (đơn vị nhỏ nhất, int64)
+    # --------------------------------------------------------
+
+    def _khoang(self, start: Optional[date], end: date) -> Tuple[int, int]:
+        start = start or self.ngay_bat_dau
+        if start < self.ngay_bat_dau or end > self.ngay_ket_thuc:
+            raise ValueError(
+                f"Snapshot chỉ có số liệu từ {self.ngay_bat_dau} "
+                f"đến {self.ngay_ket_thuc}."
+            )
+        return start.toordinal(), end.toordinal()
+
+    def _phat_sinh_tk(self, i: int, bd: int, kt: int) -> Tuple[int, int]:
+        """(PS Nợ, PS Có) của TK thứ i trong [bd, kt] (ordinal)."""
+        import numpy as np
+
+        dau = int(self._bang["vi_tri"][i])
+        doan = self._dong[dau : dau + int(self._bang["so_dong"][i])]
+        ngay = doan["ngay"]  # đã sắp xếp theo ngày trong từng TK
+        doan = doan[
+            np.searchsorted(ngay, bd, "left") : np.searchsorted(
+                ngay, kt, "right"
+            )
+        ]
+        return int(doan["no"].sum()), int(doan["co"].sum())
+
+    def _doan_tai_khoan(self, tk_goc: str) -> range:
+        """Chỉ số của TK `tk_goc` và mọi TK con (theo tiền tố mã)."""
+        import numpy as np
+
+        ma = tk_goc.encode()
+        dau = np.searchsorted(self.so_tai_khoan, ma, "left")
+        cuoi = np.searchsorted(self.so_tai_khoan, ma + b"\xff", "left")
+        return range(int(dau), int(cuoi))
+
+    # --------------------------------------------------------
+    # RANH GIỚI DTO (Decimal) — cùng chữ ký với LedgerAggregate
+    # --------------------------------------------------------
+
+    def get_turnover(
+        self, so_tai_khoan: str, start: date, end: date
+    ) -> Tuple[Decimal, Decimal]:
+        """(PS Nợ, PS Có) của TK và các TK con trong [start, end]."""
+        bd, kt = self._khoang(start, end)
+        tong_no = tong_co = 0
+        for i in self._doan_tai_khoan(so_tai_khoan):
+            no, co = self._phat_sinh_tk(i, bd, kt)
+            tong_no += no
+            tong_co += co
+        return tien_te(tong_no), tien_te(tong_co)
+
+    def get_trial_balance(
+        self, start: date, end: date
+    ) -> List[Tuple[str, Decimal, Decimal, Decimal, Decimal]]:
+        """
+        (Số TK, SDĐK ròng, PS Nợ, PS Có, SDCK ròng) của riêng từng TK,
+        giống ReportRepositoryInterface.get_trial_balance.
+        """
+        bd, kt = self._khoang(start, end)
+        ket_qua = []
+        for i in range(len(self.so_tai_khoan)):
+            truoc_no, truoc_co = self._phat_sinh_tk(
+                i, self.ngay_bat_dau.toordinal(), bd - 1
+            )
+            dau_ky = int(self._bang["dau_ky"][i]) + truoc_no - truoc_co
+            ps_no, ps_co = self._phat_sinh_tk(i, bd, kt)
+            if not (dau_ky or ps_no or ps_co):
+                continue
+            ket_qua.append(
+                (
+                    self.so_tai_khoan[i].decode(),
+                    tien_te(dau_ky),
+                    tien_te(ps_no),
+                    tien_te(ps_co),
+                    tien_te(dau_ky + ps_no - ps_co),
+                )
+            )
+        return ket_qua
+
+
+# --------------------------------------------------------
+# CLI
+# --------------------------------------------------------
+
+
+def main(argv: List[str] = None) -> int:
+    from app import config
+    from app.infrastructure.database import ReportSessionLocal
+    from app.infrastructure.repositories.accounting_period_repository import (
+        AccountingPeriodRepository,
+    )
+    from app.infrastructure.repositories.reporting_repository_impl import (
+        ReportingRepositoryImpl,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Xuất snapshot sổ cái của các kỳ kế toán đã khóa."
+    )
+    parser.add_argument("--thu-muc", default=config.LEDGER_SNAPSHOT_DIR)
+    parser.add_argument(
+        "--ghi-de", action="store_true", help="Xuất lại cả kỳ đã có file"
+    )
+    args = parser.parse_args(argv)
+
+    # Đọc từ DB báo cáo (replica nếu có): không tạo tải lên DB ghi sổ
+    with ReportSessionLocal() as db:
+        da_ghi = xuat_cac_ky_da_khoa(
+            AccountingPeriodRepository(db),
+            ReportingRepositoryImpl(db),
+            Path(args.thu_muc),
+            ghi_de=args.ghi_de,
+        )
+    for duong_dan in da_ghi:
+        print(duong_dan)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# File: app/infrastructure/sql_instrumentation.py
+"""
+Đo truy vấn SQL theo từng yêu cầu (request) qua event của SQLAlchemy.
+
+🎯 Mục tiêu:
+- Đếm câu lệnh, tổng thời gian DB, số dòng của MỘT yêu cầu / khối mã.
+- Phát hiện N+1: cùng "hình dạng" câu lệnh lặp lại quá ngưỡng (ví dụ
+  get_by_id từng dòng, get_account_balance từng TK).
+
+📌 Hook gắn vào lớp Engine → áp dụng cho mọi engine (đồng bộ, async qua
+   sync_engine, replica báo cáo). Số liệu ghi vào các phạm vi đo đang mở
+   trong ContextVar: ngoài phạm vi đo (theo_doi_sql) hook không làm gì.
+📌 ContextVar đi theo threadpool (endpoint đồng bộ, AsyncProxy) và greenlet
+   của AsyncSession, nên mọi câu lệnh của yêu cầu đều được tính.
+📌 Số dòng lấy từ cursor.rowcount: PostgreSQL tính cả SELECT; SQLite chỉ
+   tính INSERT / UPDATE / DELETE (SELECT trả về -1, bỏ qua).
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Danh sách tham số của IN (...) mở rộng → một dấu chỗ: IN (?, ?, ?) ≡ IN (?)
+_DANH_SACH_THAM_SO = re.compile(
+    r"\(\s*(\?|%\(\w+\)s|\$\d+|:\w+)(\s*,\s*(\?|%\(\w+\)s|\$\d+|:\w+))+\s*\)"
+)
+_KHOANG_TRANG = re.compile(r"\s+")
+
+
+def hinh_dang_cau_lenh(cau_lenh: str) -> str:
+    """Chuẩn hóa câu lệnh (đã tham số hóa) để so sánh các lần lặp."""
+    cau_lenh = _KHOANG_TRANG.sub(" ", cau_lenh).strip()
+    return _DANH_SACH_THAM_SO.sub("(?)", cau_lenh)
+
+
+class ThongKeTruyVan:
+    """Số liệu SQL của một phạm vi đo (thường là một yêu cầu HTTP)."""
+
+    def __init__(self):
+        self.so_cau_lenh = 0
+        self.thoi_gian_db = 0.0  # giây
+        self.so_dong = 0
+        self.theo_hinh_dang: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def ghi(self, cau_lenh: str, thoi_gian: float, so_dong: int) -> None:
+        hinh_dang = hinh_dang_cau_lenh(cau_lenh)
+        with self._lock:
+            self.so_cau_lenh += 1
+            self.thoi_gian_db += thoi_gian
+            self.so_dong += max(so_dong, 0)
+            self.theo_hinh_dang[hinh_dang] += 1
+
+    def lap_lai(self, nguong: int) -> List[Tuple[str, int]]:
+        """Các hình dạng câu lệnh chạy hơn `nguong` lần (nghi N+1)."""
+        with self._lock:
+            return [
+                (hinh_dang, so_lan)
+                for hinh_dang, so_lan in self.theo_hinh_dang.most_common()
+                if so_lan > nguong
+            ]
+
+
+# Các phạm vi đo đang mở (lồng nhau: mọi phạm vi đều nhận câu lệnh)
+_dang_do: ContextVar[Tuple[ThongKeTruyVan, ...]] = ContextVar(
+    "thong_ke_truy_van", default=()
+)
+
+
+def _truoc_khi_chay(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if _dang_do.get():
+        conn.info.setdefault("_thoi_diem_chay", []).append(
+            time.perf_counter()
+        )
+
+
+def _sau_khi_chay(conn, cursor, statement, parameters, context, executemany):
+    cac_thong_ke = _dang_do.get()
+    thoi_diem = conn.info.get("_thoi_diem_chay")
+    if not cac_thong_ke or not thoi_diem:
+        return
+    thoi_gian = time.perf_counter() - thoi_diem.pop()
+    for thong_ke in cac_thong_ke:
+        thong_ke.ghi(statement, thoi_gian, cursor.rowcount)
+
+
+def _khi_loi(ngu_canh) -> None:
+    # Câu lệnh lỗi không qua after_cursor_execute: bỏ mốc thời gian treo
+    if ngu_canh.connection is not None:
+        thoi_diem = ngu_canh.connection.info.get("_thoi_diem_chay")
+        if thoi_diem:
+            thoi_diem.pop()
+
+
+_da_cai_dat = False
+_lock_cai_dat = threading.Lock()
+
+
+def cai_dat_theo_doi_sql() -> None:
+    """Gắn hook đo vào mọi Engine (gọi nhiều lần vẫn chỉ gắn một lần)."""
+    global _da_cai_dat
+    with _lock_cai_dat:
+        if _da_cai_dat:
+            return
+        event.listen(Engine, "before_cursor_execute", _truoc_khi_chay)
+        event.listen(Engine, "after_cursor_execute", _sau_khi_chay)
+        event.listen(Engine, "handle_error", _khi_loi)
+        _da_cai_dat = True
+
+
+@contextmanager
+def theo_doi_sql() -> Iterator[ThongKeTruyVan]:
+    """Đo mọi câu lệnh SQL chạy trong khối `with` (cả threadpool, run_sync)."""
+    cai_dat_theo_doi_sql()
+    thong_ke = ThongKeTruyVan()
+    token = _dang_do.set(_dang_do.get() + (thong_ke,))
+    try:
+        yield thong_ke
+    finally:
+        _dang_do.reset(token)
+
+
+@contextmanager
+def assert_max_queries(toi_da: int) -> Iterator[ThongKeTruyVan]:
+    """
+    Ngân sách truy vấn: khối `with` chạy quá `toi_da` câu lệnh SQL →
+    AssertionError liệt kê các hình dạng câu lệnh (dùng trong test /
+    benchmark để bắt hồi quy số truy vấn của repository).
+
+    📌 Khối ném ngoại lệ thì để nguyên ngoại lệ đó, không kiểm ngân sách.
+    """
+    with theo_doi_sql() as thong_ke:
+        yield thong_ke
+    if thong_ke.so_cau_lenh > toi_da:
+        chi_tiet = "\n".join(
+            f"  {so_lan} × {hinh_dang}"
+            for hinh_dang, so_lan in thong_ke.lap_lai(0)
+        )
+        raise AssertionError(
+            f"Vượt ngân sách truy vấn: {thong_ke.so_cau_lenh} câu lệnh "
+            f"(tối đa {toi_da}):\n{chi_tiet}"
+        )
@@ -1,7 +1,15 @@
 from fastapi import FastAPI
 
+from app import config
+from app.presentation.api.middleware import SQLInstrumentationMiddleware
 from app.presentation.api.v1.accounting import router as accounting_router
 
 app = FastAPI(title="Hệ thống kế toán TT99", version="1.0.0")
 
 app.include_router(accounting_router)
+
+if config.SQL_INSTRUMENTATION:
+    app.add_middleware(
+        SQLInstrumentationMiddleware,
+        nguong_lap_lai=config.SQL_N_PLUS_1_THRESHOLD,
+    )
@@ -0,0 +1,79 @@
+# app/presentation/api/middleware.py
+"""
+Middleware đo SQL theo từng yêu cầu HTTP.
+
+🎯 Mục tiêu:
+- Header X-DB-Queries (số câu lệnh) và X-DB-Time (ms) trên mỗi phản hồi.
+- Một dòng log JSON (logger "app.sql") mỗi yêu cầu: số câu lệnh, thời gian
+  DB, số dòng; cảnh báo (WARNING) kèm các câu lệnh lặp lại nghi N+1.
+
+📌 Middleware ASGI thuần (không qua BaseHTTPMiddleware): header ghi tại
+   thời điểm bắt đầu phản hồi; log ghi sau phần thân cuối cùng nên tính cả
+   truy vấn của phản hồi phát theo luồng (StreamingResponse).
+"""
+import json
+import logging
+import time
+
+from app.infrastructure.sql_instrumentation import theo_doi_sql
+
+logger = logging.getLogger("app.sql")
+
+# Độ dài tối đa của câu lệnh trong log (câu SELECT của ORM rất dài)
+DO_DAI_CAU_LENH_LOG = 300
+
+
+class SQLInstrumentationMiddleware:
+    def __init__(self, app, nguong_lap_lai: int = 10):
+        self.app = app
+        self.nguong_lap_lai = nguong_lap_lai
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        bat_dau = time.perf_counter()
+        trang_thai = {"ma": 500}
+
+        with theo_doi_sql() as thong_ke:
+
+            async def gui(message):
+                if message["type"] == "http.response.start":
+                    trang_thai["ma"] = message["status"]
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-db-queries", str(thong_ke.so_cau_lenh).encode()),
+                        (
+                            b"x-db-time",
+                            f"{thong_ke.thoi_gian_db * 1000:.2f}".encode(),
+                        ),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, gui)
+            finally:
+                self._ghi_log(scope, trang_thai["ma"], thong_ke, bat_dau)
+
+    def _ghi_log(self, scope, ma_trang_thai, thong_ke, bat_dau) -> None:
+        lap_lai = thong_ke.lap_lai(self.nguong_lap_lai)
+        ban_ghi = {
+            "su_kien": "sql_theo_yeu_cau",
+            "phuong_thuc": scope.get("method"),
+            "duong_dan": scope.get("path"),
+            "trang_thai": ma_trang_thai,
+            "so_cau_lenh": thong_ke.so_cau_lenh,
+            "thoi_gian_db_ms": round(thong_ke.thoi_gian_db * 1000, 2),
+            "so_dong": thong_ke.so_dong,
+            "thoi_gian_ms": round((time.perf_counter() - bat_dau) * 1000, 2),
+        }
+        if lap_lai:
+            ban_ghi["nghi_n_cong_1"] = [
+                {"cau_lenh": cau_lenh[:DO_DAI_CAU_LENH_LOG], "so_lan": so_lan}
+                for cau_lenh, so_lan in lap_lai
+            ]
+        logger.log(
+            logging.WARNING if lap_lai else logging.INFO,
+            json.dumps(ban_ghi, ensure_ascii=False),
+        )
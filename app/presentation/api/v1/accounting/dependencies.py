@@ -9,7 +9,6 @@ Dependency Injection (DI) container cho các service kế toán theo TT99/2025/T
 - Tách biệt logic khởi tạo khỏi logic nghiệp vụ (SRP).
 """
 from typing import Generator
-from unittest.mock import Mock
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
@@ -28,7 +27,8 @@ from app.application.factories.report_service_factory import (
 from app.application.factories.tai_khoan_service_factory import (
     TaiKhoanServiceFactory,
 )
-from app.infrastructure.database import get_db
+from app.infrastructure.async_bridge import AsyncProxy
+from app.infrastructure.database import get_db, get_report_db
 from app.infrastructure.repositories.account_repository import (
     AccountRepository,
 )
@@ -54,9 +54,15 @@ def get_tai_khoan_service_factory(
         AccountRepository,
     )
 
+    from app.infrastructure.cache.account_cache import get_account_cache
+
     repo = AccountRepository(db)
     validator = TT99TaiKhoanValidator()
-    return TaiKhoanServiceFactory(repo=repo, validator=validator)
+    return TaiKhoanServiceFactory(
+        repo=repo,
+        validator=validator,
+        cache=get_account_cache(db.get_bind()),
+    )
 
 
 def get_period_service_factory(
@@ -72,29 +78,36 @@ def get_period_service_factory(
         JournalEntryRepository,
     )
 
+    from app.infrastructure.cache.period_index import get_period_index
+
     period_repo = AccountingPeriodRepository(db)
     je_repo = JournalEntryRepository(db)
     return AccountingPeriodServiceFactory(
-        period_repo=period_repo, je_repo=je_repo
+        period_repo=period_repo,
+        je_repo=je_repo,
+        period_index=get_period_index(db.get_bind()),
     )
 
 
 def get_report_service_factory(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_report_db),
 ) -> ReportServiceFactory:
     """
     [TT99-PL4] Cung cấp factory cho các service tạo báo cáo tài chính.
+    Endpoint gọi service qua AsyncProxy (threadpool) nên phần gộp sổ /
+    dựng báo cáo không chặn vòng lặp sự kiện.
+    Phiên chạy trên DB báo cáo (replica nếu có), pool riêng với ghi sổ.
     """
-    from app.infrastructure.repositories.account_repository import (
-        AccountRepository,
-    )
-    from app.infrastructure.repositories.journal_entry_repository import (
-        JournalEntryRepository,
+    from app.infrastructure.cache.report_cache import get_report_cache
+    from app.infrastructure.repositories.reporting_repository_impl import (
+        ReportingRepositoryImpl,
     )
 
-    je_repo = JournalEntryRepository(db)
-    acc_repo = AccountRepository(db)
-    return ReportServiceFactory(je_repo=je_repo, acc_repo=acc_repo)
+    report_repo = ReportingRepositoryImpl(db)
+    return ReportServiceFactory(
+        report_repo=report_repo,
+        cache=get_report_cache(db.get_bind()),
+    )
 
 
 # ————————————————————————————————————————————————————————————————————————————————
@@ -198,7 +211,7 @@ def get_financial_position_service(
     """
     [TT99-PL4] Service tạo Báo cáo tình hình tài chính (B01-DN).
     """
-    return factory.create_financial_position_service()
+    return AsyncProxy(factory.create_financial_position_service())
 
 
 def get_performance_service(
@@ -207,7 +220,7 @@ def get_performance_service(
     """
     [TT99-PL4] Service tạo Báo cáo kết quả HĐKD (B02-DN).
     """
-    return factory.create_performance_service()
+    return AsyncProxy(factory.create_performance_service())
 
 
 def get_cash_flow_service(
@@ -216,7 +229,7 @@ def get_cash_flow_service(
     """
     [TT99-PL4] Service tạo Báo cáo lưu chuyển tiền tệ (B03-DN).
     """
-    return factory.create_cash_flow_service()
+    return AsyncProxy(factory.create_cash_flow_service())
 
 
 def get_disclosure_service(
@@ -225,7 +238,26 @@ def get_disclosure_service(
     """
     [TT99-PL4] Service tạo Bản thuyết minh BCTC (B09-DN).
     """
-    return factory.create_disclosure_service()
+    return AsyncProxy(factory.create_disclosure_service())
+
+
+def get_trial_balance_service(
+    factory: ReportServiceFactory = Depends(get_report_service_factory),
+):
+    """
+    Service tạo Bảng cân đối số phát sinh.
+    """
+    return AsyncProxy(factory.create_trial_balance_service())
+
+
+def get_financial_statement_bundle_service(
+    factory: ReportServiceFactory = Depends(get_report_service_factory),
+):
+    """
+    [TT99-PL4] Service tạo trọn bộ BCTC (B01, B02, B03, B09) từ một lần
+    đọc sổ cái.
+    """
+    return AsyncProxy(factory.create_financial_statement_bundle_service())
 
 
 def get_journaling_service_factory(
@@ -233,24 +265,30 @@ def get_journaling_service_factory(
 ) -> JournalingServiceFactory:
     """
     [TT99-Đ24] Cung cấp factory cho các service xử lý bút toán kế toán.
+    Endpoint `async def` gọi service qua AsyncProxy (threadpool).
     """
-    from unittest.mock import MagicMock
-
-    from app.application.interfaces.accounting_period_service import (
-        AccountingPeriodServiceInterface,
+    from app.application.services.accounting_periods.period_service import (
+        AccountingPeriodService,
+    )
+    from app.infrastructure.cache.account_cache import get_account_cache
+    from app.infrastructure.cache.period_index import get_period_index
+    from app.infrastructure.repositories.accounting_period_repository import (
+        AccountingPeriodRepository,
     )
 
-    period_service = MagicMock(spec=AccountingPeriodServiceInterface)
-    period_service.check_if_period_is_locked.return_value = False
+    # Kiểm tra khóa sổ trên chỉ mục kỳ kế toán trong bộ nhớ
+    period_service = AccountingPeriodService(
+        AccountingPeriodRepository(db), get_period_index(db.get_bind())
+    )
 
     je_repo = JournalEntryRepository(db)
     acc_repo = AccountRepository(db)
-    # period_service = AccountingPeriodService(...)  # nếu bạn có DI cho service này
-    # hoặc mock nếu test
-    # period_service = Mock()  # nếu bạn chưa có DI cho AccountingPeriodService
 
     return JournalingServiceFactory(
-        je_repo=je_repo, acc_repo=acc_repo, period_service=period_service
+        je_repo=je_repo,
+        acc_repo=acc_repo,
+        period_service=period_service,
+        account_cache=get_account_cache(db.get_bind()),
     )
 
 
@@ -262,7 +300,7 @@ def get_create_journal_service(
         get_journaling_service_factory
     ),
 ):
-    return factory.create_create_service()
+    return AsyncProxy(factory.create_create_service())
 
 
 def get_posting_journal_service(
@@ -270,15 +308,21 @@ def get_posting_journal_service(
         get_journaling_service_factory
     ),
 ):
-    return factory.create_posting_service()
+    return AsyncProxy(factory.create_posting_service())
 
 
 def get_query_journal_service(
-    factory: JournalingServiceFactory = Depends(
-        get_journaling_service_factory
-    ),
+    db: Session = Depends(get_report_db),
 ):
-    return factory.create_query_service()
+    """
+    [SRP] Truy vấn bút toán chỉ đọc → chạy trên DB báo cáo (replica nếu
+    có), không cần kiểm tra tài khoản / khóa sổ như factory ghi sổ.
+    """
+    from app.application.services.journaling.query_service import (
+        QueryJournalEntryService,
+    )
+
+    return AsyncProxy(QueryJournalEntryService(JournalEntryRepository(db)))
 
 
 def get_closing_journal_service(
@@ -286,4 +330,4 @@ def get_closing_journal_service(
         get_journaling_service_factory
     ),
 ):
-    return factory.create_closing_service()
+    return AsyncProxy(factory.create_closing_service())
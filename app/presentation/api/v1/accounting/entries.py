@@ -46,7 +46,7 @@ router = APIRouter(
 @router.post(
     "", response_model=JournalEntryDomain, status_code=status.HTTP_201_CREATED
 )
-def tao_phieu_ke_toan(
+async def tao_phieu_ke_toan(
     entry: JournalEntryDomain,
     service: CreateJournalEntryService = Depends(
         get_create_journal_service
@@ -59,13 +59,13 @@ def tao_phieu_ke_toan(
     - Không được ghi vào kỳ đã khóa.
     """
     try:
-        return service.execute(entry)
+        return await service.execute(entry)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{id}", response_model=JournalEntryDomain)
-def lay_phieu_ke_toan(
+async def lay_phieu_ke_toan(
     id: int,
     service: QueryJournalEntryService = Depends(
         get_query_journal_service
@@ -74,14 +74,14 @@ def lay_phieu_ke_toan(
     """
     [TT99-PL1] Lấy thông tin chi tiết một bút toán theo ID.
     """
-    je = service.lay_theo_id(id)
+    je = await service.lay_theo_id(id)
     if not je:
         raise HTTPException(status_code=404, detail="Không tìm thấy bút toán.")
     return je
 
 
 @router.get("", response_model=List[JournalEntryDomain])
-def lay_tat_ca_phieu_ke_toan(
+async def lay_tat_ca_phieu_ke_toan(
     ky_id: int = Query(None, description="Lọc theo kỳ kế toán"),
     service: QueryJournalEntryService = Depends(
         get_query_journal_service
@@ -91,15 +91,13 @@ def lay_tat_ca_phieu_ke_toan(
     [TT99-PL1] Lấy danh sách tất cả bút toán.
     Có thể lọc theo kỳ kế toán.
     """
-    if ky_id:
-        # Nếu có kỳ, gọi service lọc theo kỳ (giả sử có phương thức này)
-        # return service.lay_theo_ky(ky_id)
-        pass  # tạm thời không có service filter theo kỳ
-    return service.lay_tat_ca()
+    if ky_id is not None:
+        return await service.lay_theo_ky(ky_id)
+    return await service.lay_tat_ca()
 
 
 @router.post("/{id}/post", response_model=JournalEntryDomain)
-def ghi_so_phieu_ke_toan(
+async def ghi_so_phieu_ke_toan(
     id: int,
     service: PostingJournalEntryService = Depends(
         get_posting_journal_service
@@ -111,13 +109,13 @@ def ghi_so_phieu_ke_toan(
     - Không cho phép ghi sổ bút toán đã ghi hoặc bị khóa.
     """
     try:
-        return service.execute(id)
+        return await service.execute(id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{id}/unpost", response_model=JournalEntryDomain)
-def huy_ghi_so_phieu_ke_toan(
+async def huy_ghi_so_phieu_ke_toan(
     id: int,
     service: PostingJournalEntryService = Depends(
         get_posting_journal_service
@@ -129,7 +127,7 @@ def huy_ghi_so_phieu_ke_toan(
     - Không được phép nếu đã có bút toán kết chuyển sau kỳ đó.
     """
     try:
-        return service.unpost(
+        return await service.unpost(
             id
         )  # Nếu bạn có phương thức unpost trong PostingService
     except ValueError as e:
@@ -137,7 +135,7 @@ def huy_ghi_so_phieu_ke_toan(
 
 
 @router.post("/end-of-period-close")
-def ket_chuyen_cuoi_ky(
+async def ket_chuyen_cuoi_ky(
     ky_hieu: str = Query(
         ..., description="Ký hiệu kỳ kế toán (ví dụ: 'Năm 2025')"
     ),
@@ -154,7 +152,7 @@ def ket_chuyen_cuoi_ky(
     - Kết chuyển Doanh thu/Chi phí → Lợi nhuận sau thuế (421).
     """
     try:
-        ket_chuyen = service.execute(
+        ket_chuyen = await service.execute(
             ky_hieu=ky_hieu, ngay_ket_chuyen=ngay_ket_chuyen
         )
         return {
@@ -0,0 +1,39 @@
+# app/presentation/api/v1/accounting/exports.py
+"""
+API Endpoints xuất dữ liệu sổ cái cho hệ thống phân tích (BI).
+
+🎯 Mục tiêu:
+- Thay việc kéo toàn bộ /journal-entries dạng JSON bằng một file Parquet
+  dạng cột, phát theo luồng từ con trỏ DB (không dựng ORM, không phân trang).
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database import get_async_report_db
+from app.infrastructure.exports.ledger_parquet import aiter_lo, luong_parquet
+
+router = APIRouter(prefix="/exports", tags=["Accounting - Exports"])
+
+
+@router.get("/ledger-lines.parquet")
+async def xuat_dong_so_cai_parquet(
+    ngay_bat_dau: Optional[date] = None,
+    ngay_ket_thuc: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_report_db),
+):
+    if ngay_bat_dau and ngay_ket_thuc and ngay_bat_dau > ngay_ket_thuc:
+        raise HTTPException(
+            status_code=400,
+            detail="Ngày bắt đầu không thể sau ngày kết thúc.",
+        )
+    return StreamingResponse(
+        luong_parquet(aiter_lo(db, ngay_bat_dau, ngay_ket_thuc)),
+        media_type="application/vnd.apache.parquet",
+        headers={
+            "Content-Disposition": 'attachment; filename="so_cai.parquet"'
+        },
+    )
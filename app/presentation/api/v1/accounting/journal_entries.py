@@ -12,8 +12,8 @@ router = APIRouter()
 
 
 @router.post("/journal-entries", ...)
-def create_journal_entry(
+async def create_journal_entry(
     entry: JournalEntry,
     service: CreateJournalEntryService = Depends(get_create_journal_service),
 ):
-    return service.execute(entry)
+    return await service.execute(entry)
@@ -119,9 +119,9 @@ def lay_tat_ca_ky_ke_toan(
     [TT99-Đ25] Lấy danh sách tất cả kỳ kế toán.
 
     📝 Luồng xử lý:
-    - Gọi `QueryPeriodService.lay_tat_ca()` để lấy danh sách.
+    - Gọi `QueryPeriodService.lay_tat_ca_ky()` để lấy danh sách.
     """
-    return service.lay_tat_ca()
+    return service.lay_tat_ca_ky()
 
 
 # --- 3. KHÓA KỲ KẾ TOÁN ---
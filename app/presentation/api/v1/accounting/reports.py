@@ -1,19 +1,29 @@
 # app/presentation/api/v1/accounting/reports.py
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.application.services.reports.cash_flow_service import CashFlowService
 from app.application.services.reports.financial_position_service import (
     FinancialPositionService,
 )
+from app.application.services.reports.financial_statement_bundle_service import (
+    FinancialStatementBundleService,
+)
+from app.application.services.reports.trial_balance_service import (
+    TrialBalanceService,
+)
 from app.domain.models.report import (
+    BangCanDoiSoPhatSinh,
     BaoCaoLuuChuyenTienTe,
     BaoCaoTinhHinhTaiChinh,
+    BoBaoCaoTaiChinh,
 )
 from app.presentation.api.v1.accounting.dependencies import (
     get_cash_flow_service,
     get_financial_position_service,
+    get_financial_statement_bundle_service,
+    get_trial_balance_service,
 )
 
 router = APIRouter()
@@ -22,7 +32,7 @@ router = APIRouter()
 @router.get(
     "/reports/financial-position", response_model=BaoCaoTinhHinhTaiChinh
 )
-def get_financial_position(
+async def get_financial_position(
     ky_hieu: str,
     ngay_lap: date,
     ngay_ket_thuc: date,
@@ -30,15 +40,50 @@ def get_financial_position(
         get_financial_position_service
     ),
 ):
-    return service.lay_bao_cao(ky_hieu, ngay_lap, ngay_ket_thuc)
+    return await service.lay_bao_cao(ky_hieu, ngay_lap, ngay_ket_thuc)
 
 
 @router.get("/reports/cash-flow", response_model=BaoCaoLuuChuyenTienTe)
-def get_cash_flow(
+async def get_cash_flow(
     ky_hieu: str,
     ngay_lap: date,
     ngay_bat_dau: date,
     ngay_ket_thuc: date,
     service: CashFlowService = Depends(get_cash_flow_service),
 ):
-    return service.lay_bao_cao(ky_hieu, ngay_lap, ngay_bat_dau, ngay_ket_thuc)
+    return await service.lay_bao_cao(
+        ky_hieu, ngay_lap, ngay_bat_dau, ngay_ket_thuc
+    )
+
+
+@router.get("/reports/trial-balance", response_model=BangCanDoiSoPhatSinh)
+async def get_trial_balance(
+    ngay_bat_dau: date,
+    ngay_ket_thuc: date,
+    tong_hop_theo_cay: bool = False,
+    service: TrialBalanceService = Depends(get_trial_balance_service),
+):
+    try:
+        return await service.lay_bao_cao(
+            ngay_bat_dau, ngay_ket_thuc, tong_hop_theo_cay
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/reports/bundle", response_model=BoBaoCaoTaiChinh)
+async def get_financial_statement_bundle(
+    ky_hieu: str,
+    ngay_lap: date,
+    ngay_bat_dau: date,
+    ngay_ket_thuc: date,
+    service: FinancialStatementBundleService = Depends(
+        get_financial_statement_bundle_service
+    ),
+):
+    try:
+        return await service.lay_bao_cao(
+            ky_hieu, ngay_lap, ngay_bat_dau, ngay_ket_thuc
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,10 @@
+# benchmarks/__init__.py
+"""
+Các benchmark hiệu năng (chạy tay, không nằm trong bộ pytest).
+
+Ví dụ: python -m benchmarks.import_time
+"""
+import os
+
+# app.config bắt buộc có DATABASE_URL; benchmark tự tạo engine SQLite riêng
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,175 @@
+# benchmarks/hydration.py
+"""
+Benchmark dựng Domain Entity từ dữ liệu đã đọc khỏi DB (hydration).
+
+🎯 Mục tiêu:
+- So sánh chi phí mỗi dòng bút toán giữa hai đường dựng:
+  * `kiem_tra`: constructor dataclass → chạy __post_init__ (dấu, cân bằng
+    Nợ = Có lượng tử hóa hai lần, tỷ giá) như trước đây.
+  * `tin_cay`: `tu_du_lieu_da_luu` → bỏ qua kiểm tra (repository dùng).
+- Dữ liệu giả lập đúng dạng ORM trả về (Decimal, date, str), 2 dòng mỗi
+  bút toán; phần đọc DB giống nhau ở hai đường nên được loại khỏi phép đo.
+- Lấy trung vị nhiều lần đo, ghi JSON để so sánh.
+
+Chạy:
+    python -m benchmarks.hydration --dong 1000000 --lan 3 --json hydr.json
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+
+# (so_tai_khoan, no, co, mo_ta)
+DongTho = Tuple[str, Decimal, Decimal, str]
+# (id, ngay_ct, so_phieu, mo_ta, trang_thai, dòng)
+ButToanTho = Tuple[int, date, str, str, str, List[DongTho]]
+
+SO_DONG_MAC_DINH = 1_000_000
+
+
+def tao_du_lieu(so_dong: int) -> List[ButToanTho]:
+    """Bút toán 2 dòng (Nợ 1111 / Có 5111) với số tiền khác nhau."""
+    khong = Decimal("0")
+    ngay_dau = date(2025, 1, 1)
+    du_lieu = []
+    for i in range(so_dong // 2):
+        so_tien = Decimal(i % 100000 + 1) / 100
+        du_lieu.append(
+            (
+                i + 1,
+                ngay_dau + timedelta(days=i % 365),
+                f"PT{i + 1:07d}",
+                "Bán hàng",
+                "Posted",
+                [
+                    ("1111", so_tien, khong, "Thu tiền"),
+                    ("5111", khong, so_tien, "Doanh thu"),
+                ],
+            )
+        )
+    return du_lieu
+
+
+def dung_co_kiem_tra(du_lieu: List[ButToanTho]) -> list:
+    """Đường cũ: constructor dataclass, chạy toàn bộ __post_init__."""
+    return [
+        JournalEntry(
+            id=id,
+            ngay_ct=ngay_ct,
+            so_phieu=so_phieu,
+            mo_ta=mo_ta,
+            lines=[
+                JournalEntryLine(so_tai_khoan=tk, no=no, co=co, mo_ta=mt)
+                for tk, no, co, mt in dong
+            ],
+            trang_thai=trang_thai,
+        )
+        for id, ngay_ct, so_phieu, mo_ta, trang_thai, dong in du_lieu
+    ]
+
+
+def dung_tin_cay(du_lieu: List[ButToanTho]) -> list:
+    """Đường repository: tu_du_lieu_da_luu, không kiểm tra lại."""
+    dung_dong = JournalEntryLine.tu_du_lieu_da_luu
+    return [
+        JournalEntry.tu_du_lieu_da_luu(
+            id,
+            ngay_ct,
+            so_phieu,
+            mo_ta,
+            [dung_dong(tk, no, co, mt) for tk, no, co, mt in dong],
+            trang_thai,
+        )
+        for id, ngay_ct, so_phieu, mo_ta, trang_thai, dong in du_lieu
+    ]
+
+
+CAC_DUONG: Dict[str, Callable[[List[ButToanTho]], list]] = {
+    "kiem_tra": dung_co_kiem_tra,
+    "tin_cay": dung_tin_cay,
+}
+
+
+def do_thoi_gian(
+    ham: Callable[[List[ButToanTho]], list],
+    du_lieu: List[ButToanTho],
+    so_lan: int,
+) -> float:
+    """Trung vị thời gian (giây) của `so_lan` lần dựng toàn bộ `du_lieu`."""
+    cac_lan = []
+    for _ in range(so_lan):
+        gc.collect()
+        # Như timeit: tắt GC khi đo để chi phí thu gom (tỷ lệ với số đối
+        # tượng đang sống) không che mất chi phí kiểm tra bất biến
+        gc.disable()
+        try:
+            bat_dau = time.perf_counter()
+            ket_qua = ham(du_lieu)
+            cac_lan.append(time.perf_counter() - bat_dau)
+        finally:
+            gc.enable()
+        del ket_qua
+    return statistics.median(cac_lan)
+
+
+def do_hydration(so_dong: int, so_lan: int) -> Dict[str, Dict[str, float]]:
+    """Tên đường dựng → {"tong_s", "ns_moi_dong"} trên `so_dong` dòng."""
+    du_lieu = tao_du_lieu(so_dong)
+    so_dong_thuc = 2 * len(du_lieu)
+    ket_qua = {}
+    for ten, ham in CAC_DUONG.items():
+        tong_s = do_thoi_gian(ham, du_lieu, so_lan)
+        ket_qua[ten] = {
+            "tong_s": tong_s,
+            "ns_moi_dong": tong_s * 1e9 / so_dong_thuc,
+        }
+    return ket_qua
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--dong", type=int, default=SO_DONG_MAC_DINH, help="Số dòng"
+    )
+    parser.add_argument("--lan", type=int, default=3, help="Số lần đo")
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    args = parser.parse_args(argv)
+
+    ket_qua = do_hydration(args.dong, args.lan)
+    he_so = ket_qua["kiem_tra"]["tong_s"] / ket_qua["tin_cay"]["tong_s"]
+
+    print(f"{'đường dựng':<10} {'tổng (s)':>10} {'ns/dòng':>10}")
+    for ten, so_do in ket_qua.items():
+        print(
+            f"{ten:<10} {so_do['tong_s']:10.3f} {so_do['ns_moi_dong']:10.0f}"
+        )
+    print(f"\n{args.dong} dòng, {args.lan} lần đo: nhanh hơn {he_so:.2f}×")
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "so_dong": args.dong,
+                    "so_lan": args.lan,
+                    "he_so_tang_toc": he_so,
+                    "duong_dung": ket_qua,
+                },
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
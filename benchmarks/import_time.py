@@ -0,0 +1,113 @@
+# benchmarks/import_time.py
+"""
+Benchmark thời gian khởi động: chi phí import từng module của `app.main`.
+
+🎯 Mục tiêu:
+- Mỗi lần đo chạy một tiến trình Python MỚI với `-X importtime`
+  (cold import), lấy trung vị nhiều lần để giảm nhiễu.
+- Ghi kết quả từng module (self / tích lũy, ms) ra JSON để so sánh.
+- Vượt ngân sách khởi động (`--ngan-sach-ms`) → mã thoát 1 (dùng cho CI).
+
+Chạy:
+    python -m benchmarks.import_time --lan 5 --top 25 --json import_time.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+THU_MUC_GOC = Path(__file__).resolve().parent.parent
+
+# Ngân sách mặc định cho tổng thời gian import app.main (ms)
+NGAN_SACH_MAC_DINH_MS = 1500.0
+
+_DONG_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(.*)$")
+
+
+def do_mot_lan(module: str = "app.main") -> Dict[str, Tuple[int, int]]:
+    """Import `module` trong tiến trình mới: tên → (self, tích lũy) µs."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    ket_qua = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=THU_MUC_GOC,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    thoi_gian: Dict[str, Tuple[int, int]] = {}
+    for dong in ket_qua.stderr.splitlines():
+        khop = _DONG_IMPORTTIME.match(dong)
+        if khop:
+            rieng, tich_luy, ten = khop.groups()
+            thoi_gian[ten.strip()] = (int(rieng), int(tich_luy))
+    return thoi_gian
+
+
+def do_thoi_gian_import(
+    module: str = "app.main", so_lan: int = 5
+) -> Dict[str, Dict[str, float]]:
+    """Trung vị qua `so_lan` lần đo: tên → {"self_ms", "tich_luy_ms"}."""
+    cac_lan = [do_mot_lan(module) for _ in range(so_lan)]
+    ten_module = set().union(*cac_lan)
+    ket_qua = {}
+    for ten in ten_module:
+        mau = [lan[ten] for lan in cac_lan if ten in lan]
+        ket_qua[ten] = {
+            "self_ms": statistics.median(r for r, _ in mau) / 1000,
+            "tich_luy_ms": statistics.median(t for _, t in mau) / 1000,
+        }
+    return ket_qua
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--lan", type=int, default=5, help="Số lần đo")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    parser.add_argument(
+        "--ngan-sach-ms", type=float, default=NGAN_SACH_MAC_DINH_MS
+    )
+    args = parser.parse_args(argv)
+
+    ket_qua = do_thoi_gian_import(args.module, args.lan)
+    tong_ms = ket_qua[args.module]["tich_luy_ms"]
+
+    print(f"{'tích lũy (ms)':>14} {'self (ms)':>10}  module")
+    for ten, so_do in sorted(
+        ket_qua.items(), key=lambda muc: -muc[1]["tich_luy_ms"]
+    )[: args.top]:
+        print(f"{so_do['tich_luy_ms']:14.1f} {so_do['self_ms']:10.1f}  {ten}")
+    print(
+        f"\nImport {args.module}: {tong_ms:.1f} ms "
+        f"(ngân sách {args.ngan_sach_ms:.0f} ms, {args.lan} lần đo)"
+    )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "module": args.module,
+                    "so_lan": args.lan,
+                    "tong_ms": tong_ms,
+                    "ngan_sach_ms": args.ngan_sach_ms,
+                    "modules": ket_qua,
+                },
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+    return 0 if tong_ms <= args.ngan_sach_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
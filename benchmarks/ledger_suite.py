@@ -0,0 +1,328 @@
+# benchmarks/ledger_suite.py
+"""
+Bộ benchmark các service kế toán trên sổ cái giả lập (SQLite dạng file).
+
+🎯 Mục tiêu:
+- Dữ liệu nền tất định từ benchmarks.synthetic_ledger: số bút toán, số
+  dòng mỗi bút toán, số năm là tham số dòng lệnh.
+- Đo từng thao tác: tạo bút toán (CreateJournalEntryService), ghi sổ
+  (PostingJournalEntryService), bốn báo cáo B01 / B02 / B03 / B09, các
+  endpoint danh sách (tài khoản, bút toán, kỳ) qua TestClient, và cuối
+  cùng kết chuyển mỗi năm (ClosingJournalEntryService — thay đổi sổ cái).
+- Báo cáo gọi thẳng service KHÔNG bộ nhớ đệm: đo chi phí tính thật.
+- Ghi trung vị / p95 (ms) ra JSON kèm tham số và môi trường để so sánh.
+- Đếm câu lệnh SQL mỗi lần đo; vượt NGAN_SACH_TRUY_VAN → mã thoát 1
+  (bắt hồi quy số truy vấn của repository trước khi triển khai).
+
+Chạy:
+    python -m benchmarks.ledger_suite --but-toan 20000 --dong 3 --nam 2 \
+        --json ledger_suite.json
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.application.factories.journaling_service_factory import (
+    JournalingServiceFactory,
+)
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.application.services.accounting_periods.period_service import (
+    AccountingPeriodService,
+)
+from app.infrastructure.cache.account_cache import get_account_cache
+from app.infrastructure.cache.period_index import get_period_index
+from app.infrastructure.repositories.account_repository import (
+    AccountRepository,
+)
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+from app.infrastructure.sql_instrumentation import theo_doi_sql
+from benchmarks.synthetic_ledger import (
+    NAM_DAU,
+    nap_so_cai,
+    tao_but_toan,
+    tao_db,
+)
+
+ENDPOINT_DANH_SACH = {
+    "api_danh_sach_tai_khoan": "/accounting/v1/accounts?limit=1000",
+    "api_danh_sach_but_toan": "/accounting/v1/journal-entries",
+    "api_danh_sach_ky": "/accounting/v1/accounting-periods",
+}
+
+# Ngân sách số câu lệnh SQL mỗi lần đo, theo số dòng mỗi bút toán. Nạp nền
+# và kết chuyển tăng theo kích thước sổ cái → không đặt ngân sách.
+NGAN_SACH_TRUY_VAN: Dict[str, Callable[[int], int]] = {
+    # SELECT phiên bản (COA / kỳ của worker khác) + INSERT phiếu + một
+    # INSERT nhiều dòng + UPDATE phiên bản sổ cái
+    "tao_but_toan": lambda so_dong: 4,
+    # Đọc / cập nhật phiếu, đọc phiên bản kỳ (khóa sổ ở worker khác), tăng
+    # phiên bản sổ cái + tối đa 4 câu lệnh số dư cho mỗi tài khoản
+    "ghi_so_but_toan": lambda so_dong: 5 + 4 * so_dong,
+    # Báo cáo: đọc phiên bản (khóa đệm) + tổng hợp; COA lấy từ bộ nhớ đệm
+    "b01_tinh_hinh_tai_chinh": lambda so_dong: 2,
+    "b02_ket_qua_hdkd": lambda so_dong: 2,
+    "b03_luu_chuyen_tien_te": lambda so_dong: 2,
+    "b09_thuyet_minh": lambda so_dong: 4,
+    **{ten: (lambda so_dong: 1) for ten in ENDPOINT_DANH_SACH},
+}
+
+
+def tong_hop(cac_lan: List[Tuple[float, int]]) -> Dict[str, float]:
+    """
+    Các lần đo (giây, số câu lệnh SQL) → {"so_lan", "trung_vi_ms",
+    "p95_ms", "tong_s", "so_cau_lenh_toi_da"}.
+    """
+    sap_xep = sorted(thoi_gian for thoi_gian, _ in cac_lan)
+    return {
+        "so_lan": len(sap_xep),
+        "trung_vi_ms": statistics.median(sap_xep) * 1000,
+        "p95_ms": sap_xep[max(0, -(-len(sap_xep) * 95 // 100) - 1)] * 1000,
+        "tong_s": sum(sap_xep),
+        "so_cau_lenh_toi_da": max(so_cau_lenh for _, so_cau_lenh in cac_lan),
+    }
+
+
+def do_tung_lan(ham: Callable, tham_so: list) -> List[Tuple[float, int]]:
+    """(Thời gian (giây), số câu lệnh SQL) của ham(x) cho từng x."""
+    cac_lan = []
+    for x in tham_so:
+        with theo_doi_sql() as thong_ke:
+            bat_dau = time.perf_counter()
+            ham(x)
+            thoi_gian = time.perf_counter() - bat_dau
+        cac_lan.append((thoi_gian, thong_ke.so_cau_lenh))
+    return cac_lan
+
+
+def vuot_ngan_sach(
+    ket_qua: Dict[str, Dict[str, float]], so_dong: int
+) -> Dict[str, Tuple[int, int]]:
+    """Phép đo vượt NGAN_SACH_TRUY_VAN → (số câu lệnh tối đa, ngân sách)."""
+    vuot = {}
+    for ten, ngan_sach in NGAN_SACH_TRUY_VAN.items():
+        if ten not in ket_qua:
+            continue
+        toi_da = ngan_sach(so_dong)
+        if ket_qua[ten]["so_cau_lenh_toi_da"] > toi_da:
+            vuot[ten] = (ket_qua[ten]["so_cau_lenh_toi_da"], toi_da)
+    return vuot
+
+
+def _factory_but_toan(db: Session) -> JournalingServiceFactory:
+    """Dựng như get_journaling_service_factory của tầng API."""
+    return JournalingServiceFactory(
+        je_repo=JournalEntryRepository(db),
+        acc_repo=AccountRepository(db),
+        period_service=AccountingPeriodService(
+            AccountingPeriodRepository(db), get_period_index(db.get_bind())
+        ),
+        account_cache=get_account_cache(db.get_bind()),
+    )
+
+
+def _do_bao_cao(db: Session, nam: int, so_lan: int) -> Dict[str, list]:
+    factory = ReportServiceFactory(ReportingRepositoryImpl(db))
+    ky, bd, kt = f"Năm {nam}", date(nam, 1, 1), date(nam, 12, 31)
+    bao_cao = {
+        "b01_tinh_hinh_tai_chinh": lambda _: (
+            factory.create_financial_position_service().lay_bao_cao(
+                ky, kt, kt
+            )
+        ),
+        "b02_ket_qua_hdkd": lambda _: (
+            factory.create_performance_service().lay_bao_cao(ky, kt, bd, kt)
+        ),
+        "b03_luu_chuyen_tien_te": lambda _: (
+            factory.create_cash_flow_service().lay_bao_cao(ky, kt, bd, kt)
+        ),
+        "b09_thuyet_minh": lambda _: (
+            factory.create_disclosure_service().lay_bao_cao(ky, kt, bd, kt)
+        ),
+    }
+    return {
+        ten: do_tung_lan(ham, range(so_lan)) for ten, ham in bao_cao.items()
+    }
+
+
+def _do_endpoint(duong_dan_db: Path, so_lan: int) -> Dict[str, list]:
+    from fastapi.testclient import TestClient
+
+    from app.infrastructure.database import get_db, get_report_db
+    from app.main import app
+
+    engine = create_engine(
+        f"sqlite:///{duong_dan_db}", connect_args={"check_same_thread": False}
+    )
+    tao_phien = sessionmaker(autoflush=False, bind=engine)
+
+    def _phien():
+        with tao_phien() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _phien
+    app.dependency_overrides[get_report_db] = _phien
+    try:
+        with TestClient(app) as client:
+
+            def _goi(url: str) -> None:
+                client.get(url).raise_for_status()
+
+            return {
+                ten: do_tung_lan(lambda _: _goi(url), range(so_lan))
+                for ten, url in ENDPOINT_DANH_SACH.items()
+            }
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+def chay_bo_benchmark(
+    thu_muc: Path,
+    so_but_toan: int,
+    so_dong: int = 2,
+    so_nam: int = 1,
+    so_tao: int = 200,
+    so_lan: int = 5,
+    hat_giong: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """Tên phép đo → tong_hop(...) trên DB mới tạo trong `thu_muc`."""
+    duong_dan_db = Path(thu_muc) / "ledger_suite.db"
+    engine, tao_phien = tao_db(duong_dan_db, so_nam)
+    nam_cuoi = NAM_DAU + so_nam - 1
+    ket_qua: Dict[str, list] = {}
+    try:
+        with tao_phien() as db:
+            ket_qua["nap_so_cai_nen"] = do_tung_lan(
+                lambda _: nap_so_cai(
+                    db, tao_but_toan(so_but_toan, so_dong, so_nam, hat_giong)
+                ),
+                [None],
+            )
+
+            factory = _factory_but_toan(db)
+            moi = list(
+                tao_but_toan(so_tao, so_dong, so_nam, hat_giong + 1, "BM")
+            )
+            tao = factory.create_create_service()
+            ids = []
+            ket_qua["tao_but_toan"] = do_tung_lan(
+                lambda entry: ids.append(tao.execute(entry).id), moi
+            )
+            ket_qua["ghi_so_but_toan"] = do_tung_lan(
+                factory.create_posting_service().execute, ids
+            )
+            ket_qua.update(_do_bao_cao(db, nam_cuoi, so_lan))
+
+        ket_qua.update(_do_endpoint(duong_dan_db, so_lan))
+
+        # Kết chuyển thay đổi sổ cái → đo cuối cùng, mỗi năm một lần
+        with tao_phien() as db:
+            ket_chuyen = _factory_but_toan(db).create_closing_service()
+            ket_qua["ket_chuyen_cuoi_nam"] = do_tung_lan(
+                lambda nam: ket_chuyen.execute(str(nam), date(nam, 12, 31)),
+                range(NAM_DAU, nam_cuoi + 1),
+            )
+    finally:
+        engine.dispose()
+    return {ten: tong_hop(cac_lan) for ten, cac_lan in ket_qua.items()}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--but-toan", type=int, default=5000)
+    parser.add_argument(
+        "--dong", type=int, default=2, help="Số dòng mỗi bút toán"
+    )
+    parser.add_argument("--nam", type=int, default=1, help="Số năm")
+    parser.add_argument(
+        "--tao", type=int, default=200, help="Số bút toán tạo / ghi sổ"
+    )
+    parser.add_argument("--lan", type=int, default=5, help="Số lần đo")
+    parser.add_argument("--hat-giong", type=int, default=0)
+    parser.add_argument("--thu-muc", help="Thư mục đặt DB (mặc định: tạm)")
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    args = parser.parse_args(argv)
+
+    # Service ghi log INFO / WARNING cho từng bút toán: tắt khi đo
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as thu_muc_tam:
+        ket_qua = chay_bo_benchmark(
+            Path(args.thu_muc or thu_muc_tam),
+            args.but_toan,
+            args.dong,
+            args.nam,
+            args.tao,
+            args.lan,
+            args.hat_giong,
+        )
+
+    print(
+        f"{'phép đo':<26} {'lần':>5} {'trung vị ms':>12} {'p95 ms':>10} "
+        f"{'SQL tối đa':>10}"
+    )
+    for ten, so_do in ket_qua.items():
+        print(
+            f"{ten:<26} {so_do['so_lan']:>5} "
+            f"{so_do['trung_vi_ms']:12.2f} {so_do['p95_ms']:10.2f} "
+            f"{so_do['so_cau_lenh_toi_da']:>10}"
+        )
+    vuot = vuot_ngan_sach(ket_qua, args.dong)
+    for ten, (so_cau_lenh, toi_da) in vuot.items():
+        print(
+            f"VƯỢT NGÂN SÁCH TRUY VẤN: {ten} chạy {so_cau_lenh} câu lệnh "
+            f"(tối đa {toi_da})"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "tham_so": {
+                        "so_but_toan": args.but_toan,
+                        "so_dong": args.dong,
+                        "so_nam": args.nam,
+                        "so_tao": args.tao,
+                        "so_lan": args.lan,
+                        "hat_giong": args.hat_giong,
+                    },
+                    "moi_truong": {
+                        "python": platform.python_version(),
+                        "sqlalchemy": sqlalchemy.__version__,
+                        "nen_tang": platform.platform(),
+                    },
+                    "ket_qua": ket_qua,
+                    "vuot_ngan_sach": vuot,
+                },
+                ensure_ascii=False,
+                indent=2,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+    return 1 if vuot else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# benchmarks/synthetic_ledger.py
+"""
+Sinh sổ cái giả lập TẤT ĐỊNH trên hệ thống tài khoản seed (COA_DATA).
+
+🎯 Mục tiêu:
+- Cùng tham số (số bút toán, số dòng mỗi bút toán, số năm, hạt giống)
+  → cùng dữ liệu, để các lần chạy benchmark so sánh được với nhau.
+- Bút toán luôn cân (Nợ = Có): n - 1 dòng Nợ, một dòng Có tổng.
+- DB SQLite dạng file đã tạo bảng, seed COA và một kỳ kế toán mỗi năm.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.infrastructure.database  # noqa: F401  (đăng ký ORM model)
+from app.domain.models.accounting_period import KyKeToan
+from app.domain.models.journal_entry import (
+    JournalEntry,
+    JournalEntryLine,
+)
+from app.infrastructure.base import Base
+from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.seed import COA_DATA
+
+NAM_DAU = 2024
+
+# TT99 Phụ lục II không có nhóm 9xx → bỏ TK 911 (Domain từ chối TK này)
+TAI_KHOAN_SEED = [
+    item for item in COA_DATA if not item["so_tai_khoan"].startswith("9")
+]
+# Chỉ ghi sổ vào TK chi tiết
+TAI_KHOAN_CHI_TIET = [
+    item["so_tai_khoan"]
+    for item in TAI_KHOAN_SEED
+    if not item["la_tai_khoan_tong_hop"]
+]
+
+
+def tao_but_toan(
+    so_but_toan: int,
+    so_dong: int = 2,
+    so_nam: int = 1,
+    hat_giong: int = 0,
+    tien_to: str = "SL",
+) -> Iterator[JournalEntry]:
+    """
+    `so_but_toan` bút toán rải đều trên `so_nam` năm tính từ NAM_DAU,
+    mỗi bút toán `so_dong` dòng. Số phiếu: <tien_to><số thứ tự 8 chữ số>.
+    """
+    if so_dong < 2:
+        raise ValueError("Mỗi bút toán cần ít nhất 2 dòng (Nợ và Có).")
+    if so_nam < 1:
+        raise ValueError("Số năm phải lớn hơn 0.")
+    ngau_nhien = random.Random(hat_giong)
+    for i in range(so_but_toan):
+        nam = NAM_DAU + i % so_nam
+        ngay_ct = date(nam, 1, 1) + timedelta(days=ngau_nhien.randrange(365))
+        dong_no = [
+            JournalEntryLine(
+                so_tai_khoan=ngau_nhien.choice(TAI_KHOAN_CHI_TIET),
+                no=Decimal(ngau_nhien.randrange(1, 10**7)) / 100,
+            )
+            for _ in range(so_dong - 1)
+        ]
+        dong_co = JournalEntryLine(
+            so_tai_khoan=ngau_nhien.choice(TAI_KHOAN_CHI_TIET),
+            co=sum((line.no for line in dong_no), Decimal(0)),
+        )
+        yield JournalEntry(
+            ngay_ct=ngay_ct,
+            so_phieu=f"{tien_to}{i + 1:08d}",
+            mo_ta="Bút toán giả lập",
+            lines=dong_no + [dong_co],
+        )
+
+
+def tao_db(duong_dan: Path, so_nam: int = 1) -> Tuple[Engine, sessionmaker]:
+    """DB SQLite mới tại `duong_dan`: bảng, COA seed, kỳ 'Năm YYYY'."""
+    duong_dan = Path(duong_dan)
+    duong_dan.unlink(missing_ok=True)
+    engine = create_engine(
+        f"sqlite:///{duong_dan}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    tao_phien = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with tao_phien() as db:
+        db.add_all([SQLAccount(**item) for item in TAI_KHOAN_SEED])
+        db.commit()
+        period_repo = AccountingPeriodRepository(db)
+        for nam in range(NAM_DAU, NAM_DAU + so_nam):
+            period_repo.add(
+                KyKeToan(
+                    ten_ky=f"Năm {nam}",
+                    ngay_bat_dau=date(nam, 1, 1),
+                    ngay_ket_thuc=date(nam, 12, 31),
+                )
+            )
+    return engine, tao_phien
+
+
+def nap_so_cai(db: Session, but_toan: Iterable[JournalEntry]) -> List[int]:
+    """Ghi sổ trực tiếp qua repository (dữ liệu nền); trả về các id."""
+    repo = JournalEntryRepository(db)
+    ids = []
+    for entry in but_toan:
+        entry.trang_thai = "Posted"
+        ids.append(repo.add(entry).id)
+    return ids
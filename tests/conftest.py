@@ -7,3 +7,20 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent  # Lên 2 cấp: từ tests/ → tt99acct/
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
+
+# app.config bắt buộc có DATABASE_URL; test dùng SQLite in-memory nếu chưa đặt
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Ngân sách truy vấn: `with assert_max_queries(3): ...`."""
+    from app.infrastructure.sql_instrumentation import (
+        assert_max_queries as ngan_sach,
+    )
+
+    return ngan_sach
@@ -15,7 +15,7 @@ Integration Tests cho các API endpoint liên quan đến quản lý tài khoả
 """
 from datetime import date
 from decimal import Decimal
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -24,8 +24,10 @@ from app.domain.models.account import LoaiTaiKhoan, TaiKhoan
 from app.domain.models.accounting_period import KyKeToan
 from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
 from app.domain.models.report import (
+    BangCanDoiSoPhatSinh,
     BaoCaoLuuChuyenTienTe,
     BaoCaoTinhHinhTaiChinh,
+    ChiTietTaiKhoan,
     LuuChuyenTienTeHDDT,
     LuuChuyenTienTeHDKD,
     LuuChuyenTienTeHDTC,
@@ -134,10 +136,14 @@ def client_with_mock_cash_flow_service():
     )
 
     # 👇 Tạo mock
-    mock_service = MagicMock()
+    mock_service = AsyncMock()  # Endpoint báo cáo là `async def`
+
+    from app.presentation.api.v1.accounting.dependencies import (
+        get_cash_flow_service,
+    )
 
     # 👇 Override dependency
-    app.dependency_overrides[CashFlowService] = lambda: mock_service
+    app.dependency_overrides[get_cash_flow_service] = lambda: mock_service
 
     with TestClient(app) as client:
         yield client, mock_service
@@ -252,7 +258,7 @@ def test_get_financial_position_report_success(
         FinancialPositionService,
     )
 
-    mock_service = MagicMock()
+    mock_service = AsyncMock()
     from app.presentation.api.v1.accounting.dependencies import (
         get_financial_position_service,
     )
@@ -342,3 +348,259 @@ def test_get_cash_flow_report_success(client_with_mock_cash_flow_service):
     assert data["ky_hieu"] == "Năm 2025"
 
     # ✅ Không cần clear ở đây vì fixture đã làm
+
+
+def test_get_trial_balance_success(client_with_mock_create_account_service):
+    """
+    Test lấy Bảng cân đối số phát sinh, có cộng dồn theo cây tài khoản.
+    """
+    client, _ = client_with_mock_create_account_service
+
+    from app.presentation.api.v1.accounting.dependencies import (
+        get_trial_balance_service,
+    )
+
+    mock_service = AsyncMock()
+    app.dependency_overrides[get_trial_balance_service] = lambda: mock_service
+    mock_service.lay_bao_cao.return_value = BangCanDoiSoPhatSinh(
+        ngay_bat_dau=date(2025, 1, 1),
+        ngay_ket_thuc=date(2025, 12, 31),
+        tong_hop_theo_cay=True,
+        chi_tiet_tai_khoan=[
+            ChiTietTaiKhoan(
+                so_tai_khoan="111",
+                ten_tai_khoan="Tiền mặt",
+                phat_sinh_no=Decimal("1000"),
+                so_du_cuoi_ky_no=Decimal("1000"),
+            )
+        ],
+        tong_phat_sinh_no=Decimal("1000"),
+    )
+
+    response = client.get(
+        "/accounting/v1/reports/trial-balance?ngay_bat_dau=2025-01-01"
+        + "&ngay_ket_thuc=2025-12-31&tong_hop_theo_cay=true"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["chi_tiet_tai_khoan"][0]["so_tai_khoan"] == "111"
+    mock_service.lay_bao_cao.assert_called_once_with(
+        date(2025, 1, 1), date(2025, 12, 31), True
+    )
+
+    app.dependency_overrides.clear()
+
+
+def test_get_financial_statement_bundle_invalid_period(
+    client_with_mock_create_account_service,
+):
+    """
+    Test bộ BCTC: kỳ không hợp lệ → 400 (lỗi nghiệp vụ từ service).
+    """
+    client, _ = client_with_mock_create_account_service
+
+    from app.presentation.api.v1.accounting.dependencies import (
+        get_financial_statement_bundle_service,
+    )
+
+    mock_service = AsyncMock()
+    app.dependency_overrides[get_financial_statement_bundle_service] = (
+        lambda: mock_service
+    )
+    mock_service.lay_bao_cao.side_effect = ValueError(
+        "Ngày bắt đầu phải trước hoặc bằng ngày kết thúc."
+    )
+
+    response = client.get(
+        "/accounting/v1/reports/bundle?ky_hieu=Năm 2025&ngay_lap=2025-12-31"
+        + "&ngay_bat_dau=2025-12-31&ngay_ket_thuc=2025-01-01"
+    )
+
+    assert response.status_code == 400
+    assert "Ngày bắt đầu" in response.json()["detail"]
+    mock_service.lay_bao_cao.assert_called_once_with(
+        "Năm 2025", date(2025, 12, 31), date(2025, 12, 31), date(2025, 1, 1)
+    )
+
+    app.dependency_overrides.clear()
+
+
+def test_lay_phieu_ke_toan_loc_theo_ky(
+    client_with_mock_create_account_service,
+):
+    """
+    Test danh sách bút toán có ky_id: lọc theo kỳ ở service (không lấy
+    toàn bộ sổ cái).
+    """
+    client, _ = client_with_mock_create_account_service
+
+    from app.presentation.api.v1.accounting.dependencies import (
+        get_query_journal_service,
+    )
+
+    mock_service = AsyncMock()
+    app.dependency_overrides[get_query_journal_service] = (
+        lambda: mock_service
+    )
+    mock_service.lay_theo_ky.return_value = [
+        JournalEntry(
+            id=1,
+            ngay_ct=date(2025, 2, 10),
+            so_phieu="PT01",
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("100")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("100")),
+            ],
+        )
+    ]
+
+    response = client.get("/accounting/v1/journal-entries?ky_id=2")
+
+    assert response.status_code == 200
+    assert [bt["so_phieu"] for bt in response.json()] == ["PT01"]
+    mock_service.lay_theo_ky.assert_called_once_with(2)
+    mock_service.lay_tat_ca.assert_not_called()
+
+    app.dependency_overrides.clear()
+
+
+# ————————————————————————————————————————————————————————————————————————————————
+# 5. NGÂN SÁCH TRUY VẤN (QUERY BUDGET) TRÊN DB THẬT
+# ————————————————————————————————————————————————————————————————————————————————
+
+
+@pytest.fixture
+def client_with_ledger_db(tmp_path):
+    """
+    Fixture TestClient trên DB SQLite dạng file (COA + kỳ "Năm 2024"), dùng
+    cho cả phiên ghi sổ (get_db) lẫn phiên báo cáo (get_report_db).
+
+    📌 Tạo trước một bút toán để nạp bộ đệm tài khoản / kỳ: ngân sách đo ở
+       trạng thái ổn định, không tính lần nạp đầu tiên của tiến trình.
+    """
+    from app.infrastructure.database import get_db, get_report_db
+    from benchmarks.synthetic_ledger import tao_db
+
+    duong_dan_db = tmp_path / "ledger.db"
+    engine, tao_phien = tao_db(duong_dan_db)
+
+    def _phien():
+        with tao_phien() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _phien
+    app.dependency_overrides[get_report_db] = _phien
+    try:
+        with TestClient(app) as client:
+            client.post(
+                "/accounting/v1/journal-entries", json=_phieu("PT00", 2)
+            ).raise_for_status()
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+def _phieu(so_phieu: str, so_dong: int) -> dict:
+    """Phiếu thu tiền mặt (Nợ 1111 × (n-1) / Có 5111) có `so_dong` dòng."""
+    return {
+        "ngay_ct": "2024-03-01",
+        "so_phieu": so_phieu,
+        "lines": [{"so_tai_khoan": "1111", "no": "10"}] * (so_dong - 1)
+        + [{"so_tai_khoan": "5111", "co": str(10 * (so_dong - 1))}],
+    }
+
+
+@pytest.mark.parametrize("so_dong", [2, 10])
+def test_ngan_sach_tao_but_toan(
+    client_with_ledger_db, assert_max_queries, so_dong
+):
+    """
+    Tạo bút toán N dòng: SELECT phiên bản dữ liệu (COA / kỳ kế toán của
+    worker khác) + INSERT phiếu + một INSERT nhiều dòng + UPDATE phiên bản
+    sổ cái → tối đa 4 câu lệnh, không phụ thuộc N.
+    """
+    client = client_with_ledger_db
+
+    with assert_max_queries(4):
+        response = client.post(
+            "/accounting/v1/journal-entries", json=_phieu("PT01", so_dong)
+        )
+
+    assert response.status_code == 201
+    assert len(response.json()["lines"]) == so_dong
+    assert int(response.headers["X-DB-Queries"]) <= 4
+
+
+def test_ngan_sach_ghi_so_but_toan(client_with_ledger_db, assert_max_queries):
+    """
+    Ghi sổ: đọc phiếu (service + repository), đọc phiên bản kỳ kế toán
+    trong DB (khóa sổ do worker khác), cập nhật trạng thái, tăng phiên bản
+    sổ cái (5) + cập nhật số dư lũy kế tối đa 4 câu lệnh cho mỗi tài khoản.
+    """
+    client = client_with_ledger_db
+    ma = client.post(
+        "/accounting/v1/journal-entries", json=_phieu("PT02", 5)
+    ).json()["id"]
+
+    with assert_max_queries(5 + 4 * 2):  # 2 tài khoản: 1111, 5111
+        response = client.post(f"/accounting/v1/journal-entries/{ma}/post")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "duong_dan, toi_da",
+    [
+        ("/accounts", 1),
+        ("/journal-entries", 1),
+        ("/journal-entries/1", 1),
+        ("/accounting-periods", 1),
+        (
+            "/reports/trial-balance?ngay_bat_dau=2024-01-01"
+            "&ngay_ket_thuc=2024-12-31",
+            2,
+        ),
+        (
+            "/reports/financial-position?ky_hieu=Năm 2024"
+            "&ngay_lap=2024-12-31&ngay_ket_thuc=2024-12-31",
+            2,
+        ),
+        (
+            "/reports/cash-flow?ky_hieu=Năm 2024&ngay_lap=2024-12-31"
+            "&ngay_bat_dau=2024-01-01&ngay_ket_thuc=2024-12-31",
+            2,
+        ),
+        (
+            "/reports/bundle?ky_hieu=Năm 2024&ngay_lap=2024-12-31"
+            "&ngay_bat_dau=2024-01-01&ngay_ket_thuc=2024-12-31",
+            4,
+        ),
+    ],
+)
+def test_ngan_sach_endpoint_doc(
+    client_with_ledger_db, assert_max_queries, duong_dan, toi_da
+):
+    """Endpoint đọc: số câu lệnh cố định, không tăng theo số bản ghi."""
+    client = client_with_ledger_db
+    for i in range(3):
+        client.post(
+            "/accounting/v1/journal-entries", json=_phieu(f"PT1{i}", 3)
+        ).raise_for_status()
+
+    with assert_max_queries(toi_da):
+        response = client.get(f"/accounting/v1{duong_dan}")
+
+    assert response.status_code == 200
+
+
+def test_assert_max_queries_bao_loi_khi_vuot(assert_max_queries):
+    """Vượt ngân sách → AssertionError liệt kê hình dạng câu lệnh."""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine("sqlite://")
+    with pytest.raises(AssertionError, match=r"3 câu lệnh \(tối đa 2\)"):
+        with assert_max_queries(2), engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+    engine.dispose()
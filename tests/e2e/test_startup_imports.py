@@ -0,0 +1,44 @@
+# tests/e2e/test_startup_imports.py
+"""
+Kiểm tra chi phí khởi động của `app.main`.
+
+🎯 Mục tiêu:
+- Wiring production không nạp module chỉ dùng cho test (unittest.mock).
+- Thư viện nặng chỉ dùng khi tính báo cáo (NumPy) được nạp lười.
+- Benchmark `-X importtime` đọc được thời gian từng module.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.import_time import THU_MUC_GOC, do_mot_lan
+
+
+def _module_da_nap(*ten_module: str) -> list:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    ket_qua = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; "
+            f"print([m for m in {list(ten_module)!r} if m in sys.modules])",
+        ],
+        cwd=THU_MUC_GOC,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return eval(ket_qua.stdout)
+
+
+def test_khoi_dong_khong_nap_module_test_va_numpy():
+    assert _module_da_nap("unittest", "unittest.mock", "numpy") == []
+
+
+def test_benchmark_doc_thoi_gian_tung_module():
+    thoi_gian = do_mot_lan("app.main")
+    rieng, tich_luy = thoi_gian["app.main"]
+    assert 0 < rieng <= tich_luy
+    assert "app.presentation.api.v1.accounting.dependencies" in thoi_gian
@@ -0,0 +1,71 @@
+# tests/integration/conftest.py
+"""
+Fixture dùng chung cho Integration Tests tầng Infrastructure.
+
+🎯 Mục tiêu:
+- Mỗi test có một DB SQLite in-memory riêng, đã tạo bảng và seed COA (TT99 Phụ lục II).
+- Không phụ thuộc PostgreSQL thật.
+- `hai_worker`: hai Engine trên CÙNG một file SQLite, mô phỏng hai tiến
+  trình (bộ nhớ đệm trong tiến trình tách theo Engine).
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.infrastructure.database  # noqa: F401  (đăng ký toàn bộ ORM model)
+from app.infrastructure.base import Base
+from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.seed import COA_DATA
+
+
+@pytest.fixture
+def db_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _seed_coa(session) -> None:
+    # TT99 Phụ lục II không có nhóm 9xx → bỏ TK 911 (Domain từ chối TK này)
+    session.add_all(
+        [
+            SQLAccount(**item)
+            for item in COA_DATA
+            if not item["so_tai_khoan"].startswith("9")
+        ]
+    )
+    session.commit()
+
+
+@pytest.fixture
+def db_session(db_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    _seed_coa(session)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def hai_worker(tmp_path):
+    """(phiên worker này, phiên worker khác) trên cùng một DB."""
+    url = f"sqlite:///{tmp_path / 'ledger.db'}"
+    engine_nay, engine_khac = create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=engine_nay)
+    phien_nay = sessionmaker(bind=engine_nay)()
+    phien_khac = sessionmaker(bind=engine_khac)()
+    _seed_coa(phien_nay)
+    try:
+        yield phien_nay, phien_khac
+    finally:
+        phien_nay.close()
+        phien_khac.close()
+        engine_nay.dispose()
+        engine_khac.dispose()
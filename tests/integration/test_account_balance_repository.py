@@ -0,0 +1,75 @@
+# tests/integration/test_account_balance_repository.py
+"""
+Integration Tests cho bảng số dư tài khoản theo tháng ('so_du_tai_khoan').
+
+📋 TT99/2025/TT-BTC:
+- Điều 24: Chỉ bút toán đã ghi sổ (Posted) mới ảnh hưởng số dư.
+
+🎯 Mục tiêu:
+- Ghi sổ / hủy ghi sổ cập nhật số dư trong cùng transaction.
+- Số dư đọc từ bảng khớp với phát sinh thực tế, kể cả khoảng ngày lẻ tháng.
+"""
+from datetime import date
+from decimal import Decimal
+
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.models.sql_account_balance import SQLAccountBalance
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _but_toan(so_phieu: str, ngay: date, so_tien: str) -> JournalEntry:
+    return JournalEntry(
+        ngay_ct=ngay,
+        so_phieu=so_phieu,
+        lines=[
+            JournalEntryLine(so_tai_khoan="1111", no=Decimal(so_tien)),
+            JournalEntryLine(so_tai_khoan="5111", co=Decimal(so_tien)),
+        ],
+    )
+
+
+def test_ghi_so_va_huy_ghi_so_cap_nhat_so_du(db_session):
+    repo = JournalEntryRepository(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+
+    bt_thang_1 = repo.add(_but_toan("PT01", date(2025, 1, 10), "100"))
+    bt_thang_3 = repo.add(_but_toan("PT02", date(2025, 3, 5), "50"))
+    repo.update_status(bt_thang_3.id, "Posted")
+    repo.update_status(bt_thang_1.id, "Posted")
+
+    # Ghi sổ bút toán tháng 1 sau → số dư đầu kỳ tháng 3 phải được dịch theo
+    thang_3 = db_session.get(SQLAccountBalance, ("1111", 202503))
+    assert thang_3.so_du_dau_ky == Decimal("100")
+    assert thang_3.so_du_cuoi_ky == Decimal("150")
+
+    assert report_repo.get_opening_balance("1111", date(2025, 3, 1)) == 100
+    assert report_repo.get_account_balance(
+        "1111", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (0, 150, 0, 150, 0)
+    # Khoảng lẻ tháng: chỉ lấy phần từ 06/03 trở đi
+    assert report_repo.get_account_balance(
+        "1111", date(2025, 3, 6), date(2025, 3, 31)
+    ) == (150, 0, 0, 150, 0)
+    assert report_repo.get_account_balance(
+        "5111", date(2025, 1, 1), date(2025, 3, 5)
+    ) == (0, 0, 150, 0, 150)
+
+    repo.update_status(bt_thang_1.id, "Draft")
+
+    thang_3 = db_session.get(SQLAccountBalance, ("1111", 202503))
+    assert thang_3.so_du_dau_ky == Decimal("0")
+    assert report_repo.get_account_balance(
+        "1111", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (0, 50, 0, 50, 0)
+
+
+def test_but_toan_nhap_khong_anh_huong_so_du(db_session):
+    repo = JournalEntryRepository(db_session)
+    repo.add(_but_toan("PT03", date(2025, 2, 1), "70"))
+
+    assert db_session.query(SQLAccountBalance).count() == 0
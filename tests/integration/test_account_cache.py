@@ -0,0 +1,135 @@
+# tests/integration/test_account_cache.py
+"""
+Integration Tests cho bộ nhớ đệm hệ thống tài khoản (AccountCache).
+
+🎯 Mục tiêu:
+- Tạo bút toán nhiều dòng: kiểm tra tài khoản tốn 0 hoặc 1 truy vấn,
+  không phụ thuộc số dòng.
+- Thêm / sửa / xóa tài khoản qua service làm bộ nhớ đệm hết hiệu lực.
+- Worker khác thêm tài khoản (phiên bản COA trong DB tăng) → nạp lại.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+
+from app.application.services.journaling.create_service import (
+    CreateJournalEntryService,
+)
+from app.application.services.tai_khoan.create_service import (
+    CreateTaiKhoanService,
+)
+from app.domain.models.account import LoaiTaiKhoan, TaiKhoan
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.cache.account_cache import get_account_cache
+from app.infrastructure.repositories.account_repository import (
+    AccountRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+
+
+@pytest.fixture
+def dem_truy_van_tai_khoan(db_engine):
+    """Danh sách câu SELECT trên bảng accounts đã chạy."""
+    cau_lenh = []
+
+    def _ghi_lai(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT") and (
+            "FROM accounts" in statement
+        ):
+            cau_lenh.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", _ghi_lai)
+    yield cau_lenh
+    event.remove(db_engine, "before_cursor_execute", _ghi_lai)
+
+
+def _but_toan_luong(
+    so_phieu: str, so_dong: int, tk_chi_phi: str = "6421"
+) -> JournalEntry:
+    lines = [
+        JournalEntryLine(so_tai_khoan=tk_chi_phi, no=Decimal("10"))
+        for _ in range(so_dong)
+    ]
+    lines.append(
+        JournalEntryLine(so_tai_khoan="334", co=Decimal("10") * so_dong)
+    )
+    return JournalEntry(
+        ngay_ct=date(2025, 1, 31), so_phieu=so_phieu, lines=lines
+    )
+
+
+def _service_tao_but_toan(db_session, db_engine):
+    return CreateJournalEntryService(
+        JournalEntryRepository(db_session),
+        AccountRepository(db_session),
+        MagicMock(),
+        account_cache=get_account_cache(db_engine),
+    )
+
+
+def test_but_toan_200_dong_toi_da_mot_truy_van(
+    db_session, db_engine, dem_truy_van_tai_khoan
+):
+    service = _service_tao_but_toan(db_session, db_engine)
+
+    service.execute(_but_toan_luong("BL01", 200))
+    assert len(dem_truy_van_tai_khoan) == 1  # Nạp COA lần đầu
+
+    service.execute(_but_toan_luong("BL02", 200))
+    assert len(dem_truy_van_tai_khoan) == 1  # Đã đệm: không truy vấn thêm
+
+
+def test_tai_khoan_khong_ton_tai(db_session, db_engine):
+    service = _service_tao_but_toan(db_session, db_engine)
+    with pytest.raises(ValueError, match="'6499' không tồn tại"):
+        service.execute(_but_toan_luong("BL01", 1, tk_chi_phi="6499"))
+
+
+def test_them_tai_khoan_lam_moi_bo_nho_dem(db_session, db_engine):
+    cache = get_account_cache(db_engine)
+    account_repo = AccountRepository(db_session)
+    assert "6429" not in cache.lay_nhieu(["6429"], account_repo)
+    so_lan_doc = cache.so_lan_doc_db
+
+    CreateTaiKhoanService(account_repo, cache=cache).execute(
+        TaiKhoan(
+            so_tai_khoan="6429",
+            ten_tai_khoan="Chi phí quản lý khác",
+            loai_tai_khoan=LoaiTaiKhoan.CHI_PHI,
+            cap_tai_khoan=2,
+            so_tai_khoan_cha="642",
+        )
+    )
+
+    assert "6429" in cache.lay_nhieu(["6429", "6421"], account_repo)
+    assert cache.so_lan_doc_db == so_lan_doc + 1  # Nạp lại COA một lần
+
+
+def test_worker_khac_them_tai_khoan_thi_nap_lai(hai_worker):
+    phien_nay, phien_khac = hai_worker
+    cache = get_account_cache(phien_nay.get_bind())
+    repo_nay = AccountRepository(phien_nay)
+
+    def _so_tai_khoan():
+        return {tk.so_tai_khoan for tk in cache.lay_tat_ca(repo_nay)}
+
+    assert "6429" not in _so_tai_khoan()
+    phien_nay.rollback()  # hết yêu cầu
+
+    # Worker khác ghi thẳng repository: không gọi cache.xoa() ở đây
+    AccountRepository(phien_khac).add(
+        TaiKhoan(
+            so_tai_khoan="6429",
+            ten_tai_khoan="Chi phí quản lý khác",
+            loai_tai_khoan=LoaiTaiKhoan.CHI_PHI,
+            cap_tai_khoan=2,
+            so_tai_khoan_cha="642",
+        )
+    )
+
+    assert "6429" in _so_tai_khoan()
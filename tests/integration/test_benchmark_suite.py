@@ -0,0 +1,57 @@
+# tests/integration/test_benchmark_suite.py
+"""
+Integration Tests cho bộ benchmark sổ cái giả lập (benchmarks/).
+
+🎯 Mục tiêu:
+- Bộ sinh dữ liệu tất định và mọi bút toán sinh ra đều cân.
+- Một lần chạy nhỏ đo đủ mọi phép đo (service, báo cáo, endpoint).
+- Số câu lệnh SQL mỗi phép đo nằm trong NGAN_SACH_TRUY_VAN.
+"""
+import pytest
+
+from benchmarks.ledger_suite import (
+    ENDPOINT_DANH_SACH,
+    chay_bo_benchmark,
+    vuot_ngan_sach,
+)
+from benchmarks.synthetic_ledger import tao_but_toan
+
+
+def test_sinh_but_toan_tat_dinh_va_can():
+    lan_1 = list(tao_but_toan(50, so_dong=4, so_nam=3, hat_giong=7))
+    lan_2 = list(tao_but_toan(50, so_dong=4, so_nam=3, hat_giong=7))
+
+    assert lan_1 == lan_2
+    assert lan_1 != list(tao_but_toan(50, so_dong=4, so_nam=3, hat_giong=8))
+    assert {bt.ngay_ct.year for bt in lan_1} == {2024, 2025, 2026}
+    for bt in lan_1:
+        assert len(bt.lines) == 4
+        assert sum(d.no for d in bt.lines) == sum(d.co for d in bt.lines)
+    with pytest.raises(ValueError, match="ít nhất 2 dòng"):
+        next(tao_but_toan(1, so_dong=1))
+
+
+def test_chay_bo_benchmark_do_du_phep_do(tmp_path):
+    ket_qua = chay_bo_benchmark(
+        tmp_path, so_but_toan=40, so_dong=3, so_nam=2, so_tao=5, so_lan=2
+    )
+
+    assert set(ket_qua) == {
+        "nap_so_cai_nen",
+        "tao_but_toan",
+        "ghi_so_but_toan",
+        "b01_tinh_hinh_tai_chinh",
+        "b02_ket_qua_hdkd",
+        "b03_luu_chuyen_tien_te",
+        "b09_thuyet_minh",
+        "ket_chuyen_cuoi_nam",
+        *ENDPOINT_DANH_SACH,
+    }
+    assert ket_qua["tao_but_toan"]["so_lan"] == 5
+    assert ket_qua["ket_chuyen_cuoi_nam"]["so_lan"] == 2
+    assert all(so_do["trung_vi_ms"] > 0 for so_do in ket_qua.values())
+    assert ket_qua["tao_but_toan"]["so_cau_lenh_toi_da"] == 4
+    assert vuot_ngan_sach(ket_qua, so_dong=3) == {}
+    assert vuot_ngan_sach(
+        {"tao_but_toan": {"so_cau_lenh_toi_da": 5}}, so_dong=3
+    ) == {"tao_but_toan": (5, 4)}
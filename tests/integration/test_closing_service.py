@@ -0,0 +1,98 @@
+# tests/integration/test_closing_service.py
+"""
+Integration Tests cho kết chuyển cuối kỳ (ClosingJournalEntryService).
+
+📋 TT99/2025/TT-BTC:
+- Điều 24: Kết chuyển Doanh thu/Chi phí vào 421, không dùng TK 911.
+
+🎯 Mục tiêu:
+- Mọi TK Doanh thu / Thu nhập khác / Chi phí / Giá vốn trong hệ thống TK
+  được đưa về số dư 0.
+- Phát sinh cả năm lấy từ MỘT truy vấn gom nhóm, không quét lại sổ cái.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.application.services.journaling.closing_service import (
+    ClosingJournalEntryService,
+)
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.account_repository import (
+    AccountRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+
+BUT_TOAN = [
+    ("HD01", date(2025, 3, 1), "1111", "5111", "1000"),
+    ("TL01", date(2025, 4, 1), "5213", "1111", "100"),  # Hàng bán bị trả lại
+    ("TN01", date(2025, 5, 1), "1111", "711", "50"),
+    ("PX01", date(2025, 3, 1), "632", "1561", "600"),
+    ("PC01", date(2025, 6, 1), "6421", "1111", "120.50"),
+    ("HD00", date(2024, 12, 31), "1111", "5111", "999"),  # Năm trước
+    ("HD02", date(2025, 7, 1), "1111", "5111", "777"),  # Chưa ghi sổ
+]
+
+
+def _ghi_so_mau(repo):
+    for so_phieu, ngay, tk_no, tk_co, so_tien in BUT_TOAN:
+        but_toan = repo.add(
+            JournalEntry(
+                ngay_ct=ngay,
+                so_phieu=so_phieu,
+                lines=[
+                    JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                    JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+                ],
+            )
+        )
+        if so_phieu != "HD02":
+            repo.update_status(but_toan.id, "Posted")
+
+
+def test_ket_chuyen_moi_tk_ket_qua_ve_khong(db_session):
+    journal_repo = JournalEntryRepository(db_session)
+    _ghi_so_mau(journal_repo)
+    service = ClosingJournalEntryService(
+        journal_repo, AccountRepository(db_session)
+    )
+
+    with patch.object(
+        journal_repo, "get_all_posted_in_range"
+    ) as quet_so_cai, patch.object(
+        journal_repo,
+        "get_turnover_by_accounts",
+        wraps=journal_repo.get_turnover_by_accounts,
+    ) as phat_sinh:
+        but_toan = service.execute("Năm 2025", date(2025, 12, 31))
+
+    quet_so_cai.assert_not_called()
+    phat_sinh.assert_called_once()
+    assert [bt.so_phieu for bt in but_toan] == [
+        "KC-DOANH-THU-Năm 2025",
+        "KC-CHI-PHI-Năm 2025",
+    ]
+
+    doanh_thu = {l.so_tai_khoan: (l.no, l.co) for l in but_toan[0].lines}
+    assert doanh_thu == {
+        "421": (Decimal(0), Decimal("950.00")),
+        "5111": (Decimal("1000.00"), Decimal(0)),
+        "5213": (Decimal(0), Decimal("100.00")),
+        "711": (Decimal("50.00"), Decimal(0)),
+    }
+    chi_phi = {l.so_tai_khoan: (l.no, l.co) for l in but_toan[1].lines}
+    assert chi_phi == {
+        "421": (Decimal("720.50"), Decimal(0)),
+        "632": (Decimal(0), Decimal("600.00")),
+        "6421": (Decimal(0), Decimal("120.50")),
+    }
+
+    # Sau kết chuyển, các TK kết quả trong năm không còn số dư
+    con_lai = journal_repo.get_turnover_by_accounts(
+        date(2025, 1, 1),
+        date(2025, 12, 31),
+        ["5111", "5213", "711", "632", "6421"],
+    )
+    assert all(no == co for no, co in con_lai.values())
@@ -0,0 +1,220 @@
+# tests/integration/test_columnar_ledger_store.py
+"""
+Integration Tests cho kho sổ cái dạng cột theo năm tài chính.
+
+🎯 Mục tiêu:
+- Năm được nạp lười ở lần hỏi đầu; các lần sau không chạy câu SQL nào.
+- Ghi sổ / hủy ghi sổ cập nhật tăng dần các năm đã nạp (không nạp lại).
+- LedgerAggregate dựng từ kho cho số liệu giống đường truy vấn SQL.
+- Quy tắc phiên bản: lần nạp có thể đã thấy commit thì bị bỏ.
+- Worker khác ghi sổ → kho xóa và nạp lại; năm cuối cắt theo ngày `end`
+  bằng tìm nhị phân (dòng nối thêm trái thứ tự ngày vẫn được lọc đúng).
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from app import config
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.cache.columnar_ledger_store import (
+    ColumnarLedgerStore,
+    get_columnar_ledger_store,
+)
+from app.infrastructure.cache.report_cache import LedgerVersion
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+BD, KT = date(2025, 1, 1), date(2025, 12, 31)
+
+
+@pytest.fixture(autouse=True)
+def bat_kho_dang_cot(monkeypatch):
+    monkeypatch.setattr(config, "COLUMNAR_LEDGER_STORE", True)
+
+
+def _ghi_so(repo, so_phieu, ngay, tk_no, tk_co, so_tien) -> JournalEntry:
+    but_toan = repo.add(
+        JournalEntry(
+            ngay_ct=ngay,
+            so_phieu=so_phieu,
+            lines=[
+                JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+            ],
+        )
+    )
+    return repo.update_status(but_toan.id, "Posted")
+
+
+def _dem_cau_lenh(engine, ham):
+    cau_lenh = []
+
+    def _ghi(conn, cursor, statement, parameters, context, executemany):
+        cau_lenh.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _ghi)
+    try:
+        ket_qua = ham()
+    finally:
+        event.remove(engine, "before_cursor_execute", _ghi)
+    return ket_qua, len(cau_lenh)
+
+
+def _khop_voi_sql(report_repo, end=KT):
+    tu_kho = LedgerAggregate.nap(report_repo, end)
+    assert tu_kho.get_trial_balance(BD, end) == (
+        report_repo.get_trial_balance(BD, end)
+    )
+
+
+def test_nap_luoi_roi_khong_doc_db(db_session, db_engine):
+    repo = JournalEntryRepository(db_session)
+    _ghi_so(repo, "PT01", date(2024, 12, 20), "1111", "4111", "5000")
+    _ghi_so(repo, "HD01", date(2025, 1, 5), "1311", "5111", "1200.50")
+    _ghi_so(repo, "HD02", date(2025, 7, 1), "1311", "5111", "99.99")
+    nhap = repo.add(
+        JournalEntry(
+            ngay_ct=date(2025, 2, 1),
+            so_phieu="PN01",
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("7")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("7")),
+            ],
+        )
+    )
+    report_repo = ReportingRepositoryImpl(db_session)
+    kho = get_columnar_ledger_store(db_engine)
+    assert kho.so_nam_da_nap() == 0
+
+    cot, so_lenh = _dem_cau_lenh(
+        db_engine, lambda: report_repo.get_posted_columns(date(2025, 6, 30))
+    )
+    # Phiên bản sổ cái (đối chiếu với worker khác; trong báo cáo đã đọc
+    # sẵn cho khóa đệm) + năm đầu + năm 2024 + năm 2025
+    assert so_lenh == 4
+    assert kho.so_nam_da_nap() == 2
+    # Chỉ dòng đến 30/06/2025 và đã ghi sổ (không có PN01 nháp)
+    assert len(cot) == 4
+    assert nhap.id not in cot.but_toan_id
+    assert sorted(cot.no) == [0, 0, 120050, 500000]
+
+    _, so_lenh = _dem_cau_lenh(
+        db_engine, lambda: LedgerAggregate.nap(report_repo, KT)
+    )
+    assert so_lenh == 0
+    _khop_voi_sql(report_repo)
+    _khop_voi_sql(report_repo, date(2025, 3, 31))
+
+
+def test_ghi_so_cap_nhat_tang_dan(db_session, db_engine):
+    repo = JournalEntryRepository(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+    bt1 = _ghi_so(repo, "HD01", date(2025, 1, 5), "1311", "5111", "100")
+    report_repo.get_posted_columns(KT)  # nạp năm 2025
+
+    _ghi_so(repo, "HD02", date(2025, 3, 1), "1311", "5111", "40")
+    repo.update_status(bt1.id, "Draft")  # hủy ghi sổ → dòng âm
+    _ghi_so(repo, "PT01", date(2024, 5, 1), "1111", "4111", "10")  # năm mới
+
+    cot, so_lenh = _dem_cau_lenh(
+        db_engine, lambda: report_repo.get_posted_columns(KT)
+    )
+    assert so_lenh == 2  # phiên bản + chỉ nạp năm 2024 chưa có trong kho
+    assert len(cot) == 8  # 2024: 2 dòng; 2025: 2 + 2 + 2 dòng âm
+    assert sum(cot.no) == sum(cot.co) == 5000
+    _khop_voi_sql(report_repo)
+
+
+def test_bo_bao_cao_dung_kho_dang_cot(db_session, monkeypatch):
+    repo = JournalEntryRepository(db_session)
+    _ghi_so(repo, "HD01", date(2025, 1, 5), "1311", "5111", "1200.50")
+    _ghi_so(repo, "PX01", date(2025, 1, 5), "632", "1561", "700.25")
+    report_repo = ReportingRepositoryImpl(db_session)
+    bo = ReportServiceFactory(
+        report_repo
+    ).create_financial_statement_bundle_service()
+
+    with patch.object(report_repo, "get_daily_turnover") as doc_phat_sinh:
+        tu_kho = bo.lay_bao_cao("Năm 2025", KT, BD, KT)
+    doc_phat_sinh.assert_not_called()
+
+    monkeypatch.setattr(config, "COLUMNAR_LEDGER_STORE", False)
+    assert bo.lay_bao_cao("Năm 2025", KT, BD, KT) == tu_kho
+
+
+def test_quy_tac_phien_ban_khi_nap_song_song_commit():
+    phien_ban = LedgerVersion()
+    kho = ColumnarLedgerStore(phien_ban)
+    dong = [(1, date(2025, 1, 5), "1111", 100, 0)]
+    bien_dong = [
+        (2, date(2025, 2, 1), [("1111", Decimal("1"), Decimal(0))], 1)
+    ]
+
+    def nap():
+        return kho.cot(KT, lambda nam: dong, lambda: 2025)
+
+    # Năm nạp ở phiên bản 0, commit tăng trước lên 1 → nối biến động
+    assert len(nap()) == 1
+    kho.ghi_nhan(phien_ban.tang(), bien_dong)
+    phien_ban.tang()
+    assert list(nap().no) == [100, 100]
+
+    # Năm nạp ở đúng phiên bản p → không biết đã thấy commit chưa: bỏ
+    kho.xoa()
+    nap()
+    kho.ghi_nhan(phien_ban.gia_tri, bien_dong)
+    assert kho.so_nam_da_nap() == 0
+
+    # Năm nạp sau commit → đã có biến động, bỏ qua
+    nap()
+    kho.ghi_nhan(phien_ban.gia_tri - 1, bien_dong)
+    assert list(nap().no) == [100]
+
+
+def test_worker_khac_ghi_so_thi_nap_lai(hai_worker):
+    phien_nay, phien_khac = hai_worker
+    repo_nay = JournalEntryRepository(phien_nay)
+    _ghi_so(repo_nay, "HD01", date(2025, 1, 5), "1311", "5111", "100")
+    report_repo = ReportingRepositoryImpl(phien_nay)
+    assert len(report_repo.get_posted_columns(KT)) == 2
+    phien_nay.rollback()  # hết yêu cầu
+
+    repo_khac = JournalEntryRepository(phien_khac)
+    _ghi_so(repo_khac, "HD02", date(2025, 3, 1), "1311", "5111", "40")
+    cot = report_repo.get_posted_columns(KT)
+    assert sum(cot.no) == 14000
+
+
+def test_cat_nam_cuoi_theo_ngay_ke_ca_dong_noi_them():
+    phien_ban = LedgerVersion()
+    kho = ColumnarLedgerStore(phien_ban)
+    dong = [
+        (1, date(2025, 1, 5), "1111", 1, 0),
+        (2, date(2025, 3, 1), "1111", 2, 0),
+        (3, date(2025, 9, 1), "1111", 4, 0),
+    ]
+
+    def cot(end):
+        return kho.cot(end, lambda nam: dong, lambda: 2025)
+
+    assert list(cot(date(2025, 3, 1)).no) == [1, 2]
+    # Ghi sổ bút toán ngày sớm hơn dòng cuối → phần nối thêm ngoài thứ tự
+    kho.ghi_nhan(
+        phien_ban.tang(),
+        [(4, date(2025, 2, 1), [("1111", Decimal("0.08"), Decimal(0))], 1)],
+    )
+    phien_ban.tang()
+    assert list(cot(date(2025, 3, 1)).no) == [1, 2, 8]
+    assert list(cot(date(2025, 1, 31)).no) == [1]
+    assert list(cot(KT).no) == [1, 2, 4, 8]
@@ -0,0 +1,95 @@
+# tests/integration/test_financial_statement_bundle.py
+"""
+Integration Tests cho bộ BCTC (B01 + B02 + B03 + B09).
+
+🎯 Mục tiêu:
+- Cả bộ báo cáo chỉ đọc phát sinh sổ cái MỘT lần.
+- Số liệu trong bộ khớp với từng báo cáo lập riêng lẻ.
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+BUT_TOAN = [
+    ("PT01", date(2024, 12, 20), "1111", "4111", "5000"),
+    ("HD01", date(2025, 1, 5), "1311", "5111", "1200.50"),
+    ("PX01", date(2025, 1, 5), "632", "1561", "700.25"),
+    ("PT02", date(2025, 2, 14), "1111", "1311", "1000"),
+]
+
+KY = ("Năm 2025", date(2025, 12, 31), date(2025, 1, 1), date(2025, 12, 31))
+
+
+def _ghi_so_mau(db_session):
+    repo = JournalEntryRepository(db_session)
+    for so_phieu, ngay, tk_no, tk_co, so_tien in BUT_TOAN:
+        but_toan = repo.add(
+            JournalEntry(
+                ngay_ct=ngay,
+                so_phieu=so_phieu,
+                lines=[
+                    JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                    JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+                ],
+            )
+        )
+        repo.update_status(but_toan.id, "Posted")
+
+
+def test_bo_bao_cao_doc_so_cai_mot_lan(db_session):
+    _ghi_so_mau(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+    factory = ReportServiceFactory(report_repo)
+
+    with patch.object(
+        report_repo,
+        "get_daily_turnover",
+        wraps=report_repo.get_daily_turnover,
+    ) as doc_phat_sinh, patch.object(
+        report_repo, "get_turnover"
+    ) as tong_phat_sinh, patch.object(
+        report_repo, "get_trial_balance"
+    ) as bang_can_doi:
+        bo = factory.create_financial_statement_bundle_service().lay_bao_cao(
+            *KY
+        )
+
+    doc_phat_sinh.assert_called_once_with(date(2025, 12, 31))
+    tong_phat_sinh.assert_not_called()
+    bang_can_doi.assert_not_called()
+
+    b02 = factory.create_performance_service().lay_bao_cao(*KY)
+    b03 = factory.create_cash_flow_service().lay_bao_cao(*KY)
+    b01 = factory.create_financial_position_service().lay_bao_cao(
+        KY[0], KY[1], KY[3]
+    )
+    assert bo.bao_cao_ket_qua_hdkd == b02
+    assert bo.bao_cao_luu_chuyen_tien_te == b03
+    assert bo.bao_cao_tinh_hinh_tai_chinh == b01
+
+
+def test_ban_thuyet_minh_theo_nhom_tai_khoan(db_session):
+    _ghi_so_mau(db_session)
+    factory = ReportServiceFactory(ReportingRepositoryImpl(db_session))
+
+    b09 = factory.create_financial_statement_bundle_service().lay_bao_cao(
+        *KY
+    ).ban_thuyet_minh
+
+    assert b09.thuyet_minh_tai_san.tong_cong_thuyet_minh == Decimal("5500.25")
+    assert b09.thuyet_minh_nguon_von.tong_cong_thuyet_minh == Decimal("5000")
+    ket_qua = b09.thuyet_minh_ket_qua_hoat_dong_kinh_doanh
+    assert ket_qua.tong_doanh_thu == Decimal("1200.50")
+    assert ket_qua.tong_chi_phi == Decimal("700.25")
+    assert b09 == factory.create_disclosure_service().lay_bao_cao(*KY)
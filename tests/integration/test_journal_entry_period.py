@@ -0,0 +1,112 @@
+# tests/integration/test_journal_entry_period.py
+"""
+Integration Tests cho journal_entries.period_id.
+
+🎯 Mục tiêu:
+- Bút toán mới tự nhận kỳ kế toán HẸP NHẤT chứa ngày chứng từ.
+- get_all_by_period lọc trong SQL, kể cả kỳ lồng nhau (Năm ⊃ Quý).
+- Tạo kỳ hẹp hơn sau đó → bút toán cũ được chuyển sang kỳ mới.
+- Sửa ngày chứng từ sang kỳ khác → period_id được tính lại.
+"""
+from datetime import date
+from decimal import Decimal
+
+from app.domain.models.accounting_period import KyKeToan
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.models.sql_journal_entry import SQLJournalEntry
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+
+
+def _ky(repo, ten_ky, bd, kt) -> KyKeToan:
+    return repo.add(KyKeToan(ten_ky=ten_ky, ngay_bat_dau=bd, ngay_ket_thuc=kt))
+
+
+def _but_toan(repo, so_phieu: str, ngay_ct: date) -> JournalEntry:
+    return repo.add(
+        JournalEntry(
+            ngay_ct=ngay_ct,
+            so_phieu=so_phieu,
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("100")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("100")),
+            ],
+        )
+    )
+
+
+def _period_id(db_session, id: int):
+    return db_session.get(SQLJournalEntry, id).period_id
+
+
+def test_period_id_va_loc_theo_ky(db_session):
+    ky_repo = AccountingPeriodRepository(db_session)
+    nam = _ky(ky_repo, "Năm 2025", date(2025, 1, 1), date(2025, 12, 31))
+    quy1 = _ky(ky_repo, "Q1-2025", date(2025, 1, 1), date(2025, 3, 31))
+
+    repo = JournalEntryRepository(db_session)
+    thang2 = _but_toan(repo, "PT01", date(2025, 2, 10))
+    thang5 = _but_toan(repo, "PT02", date(2025, 5, 10))
+    nam_sau = _but_toan(repo, "PT03", date(2026, 1, 5))
+
+    assert _period_id(db_session, thang2.id) == quy1.id
+    assert _period_id(db_session, thang5.id) == nam.id
+    assert _period_id(db_session, nam_sau.id) is None
+
+    assert [bt.so_phieu for bt in repo.get_all_by_period(quy1.id)] == [
+        "PT01"
+    ]
+    # Kỳ Năm gồm cả bút toán mang period_id của Q1 bên trong
+    assert [bt.so_phieu for bt in repo.get_all_by_period(nam.id)] == [
+        "PT01",
+        "PT02",
+    ]
+    assert repo.get_all_by_period(9999) == []
+
+
+def test_tao_ky_hep_hon_chuyen_but_toan_sang_ky_moi(db_session):
+    ky_repo = AccountingPeriodRepository(db_session)
+    repo = JournalEntryRepository(db_session)
+    chua_co_ky = _but_toan(repo, "PT01", date(2025, 5, 10))
+    assert _period_id(db_session, chua_co_ky.id) is None
+
+    nam = _ky(ky_repo, "Năm 2025", date(2025, 1, 1), date(2025, 12, 31))
+    db_session.expire_all()
+    assert _period_id(db_session, chua_co_ky.id) == nam.id
+
+    thang5 = _ky(ky_repo, "T05-2025", date(2025, 5, 1), date(2025, 5, 31))
+    db_session.expire_all()
+    assert _period_id(db_session, chua_co_ky.id) == thang5.id
+    assert [bt.id for bt in repo.get_all_by_period(nam.id)] == [
+        chua_co_ky.id
+    ]
+
+
+def test_sua_ngay_chung_tu_chuyen_but_toan_sang_ky_khac(db_session):
+    ky_repo = AccountingPeriodRepository(db_session)
+    nam = _ky(ky_repo, "Năm 2025", date(2025, 1, 1), date(2025, 12, 31))
+    quy1 = _ky(ky_repo, "Q1-2025", date(2025, 1, 1), date(2025, 3, 31))
+
+    repo = JournalEntryRepository(db_session)
+    but_toan = _but_toan(repo, "PT01", date(2025, 2, 10))
+    assert _period_id(db_session, but_toan.id) == quy1.id
+
+    repo.update(
+        but_toan.id,
+        JournalEntry(
+            ngay_ct=date(2025, 5, 10),
+            so_phieu="PT01",
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("100")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("100")),
+            ],
+        ),
+    )
+
+    assert _period_id(db_session, but_toan.id) == nam.id
+    assert repo.get_all_by_period(quy1.id) == []
+    assert [bt.id for bt in repo.get_all_by_period(nam.id)] == [but_toan.id]
@@ -0,0 +1,93 @@
+# tests/integration/test_ledger_aggregate.py
+"""
+Integration Tests cho engine tổng hợp dạng cột (LedgerAggregate).
+
+🎯 Mục tiêu:
+- Kết quả tính trên mảng NumPy (int64, đơn vị nhỏ nhất) khớp với các
+  truy vấn SQL của repository.
+- Báo cáo B02/B03 nhận engine dùng chung qua tham số `so_lieu`.
+"""
+from datetime import date
+from decimal import Decimal
+
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.application.services.reports.ledger_aggregate import LedgerAggregate
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+BUT_TOAN = [
+    ("PT01", date(2024, 12, 20), "1111", "4111", "5000"),
+    ("HD01", date(2025, 1, 5), "1311", "5111", "1200.50"),
+    ("PX01", date(2025, 1, 5), "632", "1561", "700.25"),
+    ("PT02", date(2025, 2, 14), "1111", "1311", "1000"),
+    ("PC01", date(2025, 3, 1), "331", "1121", "300"),
+]
+
+
+def _ghi_so_mau(db_session):
+    repo = JournalEntryRepository(db_session)
+    for so_phieu, ngay, tk_no, tk_co, so_tien in BUT_TOAN:
+        but_toan = repo.add(
+            JournalEntry(
+                ngay_ct=ngay,
+                so_phieu=so_phieu,
+                lines=[
+                    JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                    JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+                ],
+            )
+        )
+        repo.update_status(but_toan.id, "Posted")
+
+
+def test_engine_khop_voi_truy_van_sql(db_session):
+    _ghi_so_mau(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+    so_lieu = LedgerAggregate.nap(report_repo, date(2025, 12, 31))
+
+    for tk in ("111", "1311", "131", "511", "632", "156", "112", "331"):
+        assert so_lieu.get_turnover(
+            tk, date(2025, 1, 1), date(2025, 2, 28)
+        ) == report_repo.get_turnover(tk, date(2025, 1, 1), date(2025, 2, 28))
+
+    assert so_lieu.get_trial_balance(
+        date(2025, 1, 1), date(2025, 12, 31)
+    ) == sorted(
+        report_repo.get_trial_balance(date(2025, 1, 1), date(2025, 12, 31))
+    )
+
+
+def test_bao_cao_dung_chung_engine(db_session):
+    _ghi_so_mau(db_session)
+    factory = ReportServiceFactory(ReportingRepositoryImpl(db_session))
+    so_lieu = factory.create_ledger_aggregate(date(2025, 12, 31))
+
+    b02 = factory.create_performance_service().lay_bao_cao(
+        "Năm 2025",
+        date(2025, 12, 31),
+        date(2025, 1, 1),
+        date(2025, 12, 31),
+        so_lieu=so_lieu,
+    )
+    assert b02.doanh_thu_ban_hang == Decimal("1200.50")
+    assert b02.gia_von_hang_ban == Decimal("700.25")
+    assert b02.tong_loi_nhuan_truoc_thue == Decimal("500.25")
+
+    b03 = factory.create_cash_flow_service().lay_bao_cao(
+        "Năm 2025",
+        date(2025, 12, 31),
+        date(2025, 1, 1),
+        date(2025, 12, 31),
+        so_lieu=so_lieu,
+    )
+    assert (
+        b03.luu_chuyen_tien_te_hdkd.tang_giam_cac_khoan_phai_thu
+        == Decimal("-200.50")
+    )
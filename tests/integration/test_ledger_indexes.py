@@ -0,0 +1,117 @@
+# tests/integration/test_ledger_indexes.py
+"""
+Integration Tests: kế hoạch truy vấn (EXPLAIN QUERY PLAN) của sổ cái.
+
+🎯 Mục tiêu:
+- Các truy vấn nóng của repository (dòng đã ghi sổ theo TK / khoảng ngày,
+  phát sinh gom nhóm, bảng CĐSPS, bút toán theo kỳ) dùng chỉ mục, không
+  quét toàn bảng journal_entries / journal_entry_lines.
+- Câu SQL được lấy từ chính repository (sự kiện before_cursor_execute),
+  nên đổi truy vấn làm mất chỉ mục sẽ làm test fail.
+"""
+import re
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.domain.models.accounting_period import KyKeToan
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+# "SCAN <bảng>" (kể cả "USING INDEX") = đọc toàn bộ bảng / chỉ mục
+_QUET_TOAN_BANG = re.compile(r"^SCAN (journal_entries|journal_entry_lines)")
+
+BD, KT = date(2025, 1, 1), date(2025, 3, 31)
+
+TRUY_VAN_NONG = {
+    "dong_theo_tk": lambda s: JournalEntryRepository(
+        s
+    ).get_posted_lines_by_account_and_date("1111", KT),
+    "but_toan_trong_ky": lambda s: JournalEntryRepository(
+        s
+    ).get_all_posted_in_range(BD, KT),
+    "phat_sinh_nhieu_tk": lambda s: JournalEntryRepository(
+        s
+    ).get_turnover_by_accounts(BD, KT, ["1111", "5111"]),
+    "bang_cdsps": lambda s: ReportingRepositoryImpl(s).get_trial_balance(
+        BD, KT
+    ),
+    "phat_sinh_theo_ngay": lambda s: ReportingRepositoryImpl(
+        s
+    )._phat_sinh_theo_ngay(2025),
+    "dong_so_cai_theo_luong": lambda s: list(
+        ReportingRepositoryImpl(s).iter_posted_lines(BD, KT)
+    ),
+    "dem_but_toan_nhap": lambda s: JournalEntryRepository(
+        s
+    ).count_drafts_in_range(BD, KT),
+    "mau_so_phieu_nhap": lambda s: JournalEntryRepository(
+        s
+    ).sample_draft_so_phieu(BD, KT),
+}
+
+
+def _ke_hoach(db_session, goi_truy_van) -> list:
+    """Các dòng EXPLAIN QUERY PLAN của mọi câu SQL mà `goi_truy_van` chạy."""
+    engine = db_session.get_bind()
+    cau_lenh = []
+
+    def _ghi(conn, cursor, statement, parameters, context, executemany):
+        cau_lenh.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _ghi)
+    try:
+        goi_truy_van(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _ghi)
+
+    assert cau_lenh, "Truy vấn không chạy câu SQL nào"
+    with engine.connect() as conn:
+        return [
+            dong[-1]
+            for statement, parameters in cau_lenh
+            for dong in conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+        ]
+
+
+@pytest.mark.parametrize("ten", sorted(TRUY_VAN_NONG))
+def test_truy_van_so_cai_khong_quet_toan_bang(db_session, ten):
+    ke_hoach = _ke_hoach(db_session, TRUY_VAN_NONG[ten])
+    quet = [dong for dong in ke_hoach if _QUET_TOAN_BANG.match(dong)]
+    assert not quet, f"{ten}: quét toàn bảng {quet} trong {ke_hoach}"
+
+
+def test_mat_chi_muc_thi_phat_hien_quet_toan_bang(db_session):
+    """Đối chứng: bỏ chỉ mục (trang_thai, ngay_ct) → có dòng SCAN."""
+    with db_session.get_bind().begin() as conn:
+        conn.exec_driver_sql(
+            "DROP INDEX ix_journal_entries_trang_thai_ngay_ct"
+        )
+    ke_hoach = _ke_hoach(db_session, TRUY_VAN_NONG["but_toan_trong_ky"])
+    assert any(_QUET_TOAN_BANG.match(dong) for dong in ke_hoach)
+
+
+def test_but_toan_theo_ky_loc_bang_chi_muc_period_id(db_session):
+    ky = AccountingPeriodRepository(db_session).add(
+        KyKeToan(
+            ten_ky="Q1-2025",
+            ngay_bat_dau=date(2025, 1, 1),
+            ngay_ket_thuc=date(2025, 3, 31),
+        )
+    )
+    ke_hoach = _ke_hoach(
+        db_session,
+        lambda s: JournalEntryRepository(s).get_all_by_period(ky.id),
+    )
+    assert not [dong for dong in ke_hoach if _QUET_TOAN_BANG.match(dong)]
+    assert any("ix_journal_entries_period_id" in dong for dong in ke_hoach)
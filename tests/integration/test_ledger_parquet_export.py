@@ -0,0 +1,158 @@
+# tests/integration/test_ledger_parquet_export.py
+"""
+Integration Tests cho xuất dòng sổ cái ra Arrow / Parquet.
+
+🎯 Mục tiêu:
+- Thư mục Parquet phân vùng nam=/thang= chứa đúng các dòng đã ghi sổ,
+  số tiền decimal chính xác.
+- Endpoint phát một file Parquet theo luồng, mỗi lô một row group.
+"""
+import asyncio
+import io
+from datetime import date
+from decimal import Decimal
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.base import Base
+from app.infrastructure.database import get_async_report_db
+from app.infrastructure.exports.ledger_parquet import (
+    aiter_lo,
+    ghi_parquet_phan_vung,
+    iter_lo,
+    luong_parquet,
+)
+from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.seed import COA_DATA
+from app.main import app
+
+BUT_TOAN = [
+    ("PT01", date(2024, 12, 20), "Posted", "5000"),
+    ("HD01", date(2025, 1, 5), "Posted", "1200.50"),
+    ("HD02", date(2025, 1, 31), "Posted", "0.01"),
+    ("PN01", date(2025, 2, 1), "Draft", "7"),
+    ("HD03", date(2025, 3, 14), "Posted", "99.99"),
+]
+
+
+def _ghi_so(db_session) -> None:
+    repo = JournalEntryRepository(db_session)
+    for so_phieu, ngay, trang_thai, so_tien in BUT_TOAN:
+        repo.add(
+            JournalEntry(
+                ngay_ct=ngay,
+                so_phieu=so_phieu,
+                trang_thai=trang_thai,
+                lines=[
+                    JournalEntryLine(
+                        so_tai_khoan="1111", no=Decimal(so_tien), mo_ta="Thu"
+                    ),
+                    JournalEntryLine(
+                        so_tai_khoan="5111", co=Decimal(so_tien)
+                    ),
+                ],
+            )
+        )
+
+
+def test_xuat_parquet_phan_vung(db_session, tmp_path):
+    _ghi_so(db_session)
+
+    da_ghi = ghi_parquet_phan_vung(
+        iter_lo(db_session, kich_thuoc_lo=3), tmp_path
+    )
+
+    assert {f.parent.relative_to(tmp_path).as_posix() for f in da_ghi} == {
+        "nam=2024/thang=12",
+        "nam=2025/thang=1",
+        "nam=2025/thang=3",
+    }
+    bang = ds.dataset(tmp_path, partitioning="hive").to_table()
+    assert bang.num_rows == 8  # 4 bút toán đã ghi sổ x 2 dòng, không PN01
+    assert "PN01" not in bang["so_phieu"].to_pylist()
+    assert sum(bang["no"].to_pylist()) == Decimal("6300.50")
+    assert sum(bang["co"].to_pylist()) == Decimal("6300.50")
+
+    thang_1 = ds.dataset(tmp_path / "nam=2025" / "thang=1").to_table()
+    assert sorted(thang_1["no"].to_pylist()) == [
+        Decimal("0.00"),
+        Decimal("0.00"),
+        Decimal("0.01"),
+        Decimal("1200.50"),
+    ]
+
+
+def test_endpoint_phat_file_parquet_theo_luong(tmp_path):
+    duong_dan = tmp_path / "so_cai.db"
+    engine = create_engine(f"sqlite:///{duong_dan}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            [
+                SQLAccount(**item)
+                for item in COA_DATA
+                if not item["so_tai_khoan"].startswith("9")
+            ]
+        )
+        db.commit()
+        _ghi_so(db)
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{duong_dan}")
+    tao_phien = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def _phien_bao_cao():
+        async with tao_phien() as db:
+            yield db
+
+    async def _cac_doan():
+        async with tao_phien() as db:
+            return [
+                doan
+                async for doan in luong_parquet(
+                    aiter_lo(db, kich_thuoc_lo=2)
+                )
+            ]
+
+    # Mỗi lô 2 dòng → nhiều đoạn byte, ghép lại thành một file hợp lệ
+    cac_doan = asyncio.run(_cac_doan())
+    assert len(cac_doan) > 2
+    tep = pq.ParquetFile(io.BytesIO(b"".join(cac_doan)))
+    assert tep.metadata.num_rows == 8
+    assert tep.metadata.num_row_groups == 4
+
+    app.dependency_overrides[get_async_report_db] = _phien_bao_cao
+    try:
+        with TestClient(app) as client:
+            response = client.get(
+                "/accounting/v1/exports/ledger-lines.parquet",
+                params={
+                    "ngay_bat_dau": "2025-01-01",
+                    "ngay_ket_thuc": "2025-01-31",
+                },
+            )
+            loi = client.get(
+                "/accounting/v1/exports/ledger-lines.parquet",
+                params={
+                    "ngay_bat_dau": "2025-02-01",
+                    "ngay_ket_thuc": "2025-01-31",
+                },
+            )
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+
+    assert response.status_code == 200
+    bang = pq.read_table(io.BytesIO(response.content))
+    assert bang["so_phieu"].to_pylist() == ["HD01", "HD01", "HD02", "HD02"]
+    assert bang["no"].to_pylist()[0] == Decimal("1200.50")
+    assert loi.status_code == 400
@@ -0,0 +1,175 @@
+# tests/integration/test_ledger_snapshot.py
+"""
+Integration Tests cho snapshot sổ cái (file nhị phân + numpy.memmap).
+
+🎯 Mục tiêu:
+- Snapshot kỳ đã khóa cho phát sinh / bảng CĐSPS giống truy vấn SQL.
+- Báo cáo KQHĐKD lập từ snapshot không chạy câu SQL nào.
+- Từ chối kỳ chưa khóa, file hỏng và khoảng ngày ngoài kỳ.
+- Mở khóa → sửa → khóa lại giữa hai lần xuất → snapshot được xuất lại.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.application.services.reports.performance_service import (
+    PerformanceService,
+)
+from app.domain.models.accounting_period import KyKeToan
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+from app.infrastructure.snapshots.ledger_snapshot import (
+    LedgerSnapshot,
+    ten_file_snapshot,
+    xuat_cac_ky_da_khoa,
+    xuat_snapshot_ky,
+)
+
+BD, KT = date(2025, 1, 1), date(2025, 3, 31)
+
+
+def _ghi_so(repo, so_phieu, ngay, tk_no, tk_co, so_tien):
+    repo.add(
+        JournalEntry(
+            ngay_ct=ngay,
+            so_phieu=so_phieu,
+            trang_thai="Posted",
+            lines=[
+                JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+            ],
+        )
+    )
+
+
+@pytest.fixture
+def so_lieu(db_session):
+    repo = JournalEntryRepository(db_session)
+    _ghi_so(repo, "PT01", date(2024, 12, 20), "1111", "4111", "5000")
+    _ghi_so(repo, "HD01", date(2025, 1, 5), "1311", "5111", "1200.50")
+    _ghi_so(repo, "PX01", date(2025, 1, 5), "632", "1561", "700.25")
+    _ghi_so(repo, "HD02", date(2025, 2, 14), "1111", "5113", "99.99")
+    _ghi_so(repo, "HD03", date(2025, 4, 2), "1311", "5111", "10")  # Q2
+    period_repo = AccountingPeriodRepository(db_session)
+    q1 = period_repo.add(
+        KyKeToan(
+            ten_ky="Q1-2025",
+            ngay_bat_dau=BD,
+            ngay_ket_thuc=KT,
+            trang_thai="Locked",
+        )
+    )
+    q2 = period_repo.add(
+        KyKeToan(
+            ten_ky="Q2-2025",
+            ngay_bat_dau=date(2025, 4, 1),
+            ngay_ket_thuc=date(2025, 6, 30),
+        )
+    )
+    return period_repo, ReportingRepositoryImpl(db_session), q1, q2
+
+
+def test_snapshot_khop_voi_sql(so_lieu, tmp_path):
+    _, report_repo, q1, _ = so_lieu
+    duong_dan = xuat_snapshot_ky(q1, report_repo, tmp_path)
+
+    with LedgerSnapshot(duong_dan) as snapshot:
+        assert (snapshot.ky_id, snapshot.ngay_ket_thuc) == (q1.id, KT)
+        assert len(snapshot) == 6
+        for start, end in [(BD, KT), (date(2025, 1, 6), date(2025, 2, 28))]:
+            assert snapshot.get_trial_balance(start, end) == (
+                report_repo.get_trial_balance(start, end)
+            )
+            for tk in ["1", "111", "1311", "511", "5113", "632", "911"]:
+                assert snapshot.get_turnover(tk, start, end) == (
+                    report_repo.get_turnover(tk, start, end)
+                )
+        with pytest.raises(ValueError, match="Snapshot chỉ có số liệu"):
+            snapshot.get_turnover("511", BD, date(2025, 4, 30))
+
+
+def test_bao_cao_tu_snapshot_khong_chay_sql(so_lieu, tmp_path, db_engine):
+    _, report_repo, q1, _ = so_lieu
+    service = PerformanceService(report_repo)
+    tu_db = service.lay_bao_cao("Q1-2025", KT, BD, KT)
+
+    cau_lenh = []
+
+    def _ghi(conn, cursor, statement, parameters, context, executemany):
+        cau_lenh.append(statement)
+
+    with LedgerSnapshot(xuat_snapshot_ky(q1, report_repo, tmp_path)) as s:
+        event.listen(db_engine, "before_cursor_execute", _ghi)
+        try:
+            tu_snapshot = service.lay_bao_cao("Q1-2025", KT, BD, KT, s)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _ghi)
+
+    assert cau_lenh == []
+    assert tu_snapshot == tu_db
+    assert tu_snapshot.doanh_thu_ban_hang == Decimal("1300.49")
+
+
+def test_chi_xuat_ky_da_khoa(so_lieu, tmp_path):
+    period_repo, report_repo, q1, q2 = so_lieu
+    with pytest.raises(ValueError, match="chưa khóa"):
+        xuat_snapshot_ky(q2, report_repo, tmp_path)
+
+    assert xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path) == [
+        tmp_path / ten_file_snapshot(q1.id)
+    ]
+    # Đã có file → không xuất lại; mở khóa kỳ → xóa file cũ
+    assert xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path) == []
+    period_repo.update_trang_thai(q1.id, "Open")
+    xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_khoa_lai_sau_khi_sua_thi_xuat_lai(so_lieu, tmp_path, db_session):
+    period_repo, report_repo, q1, _ = so_lieu
+    xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path)
+
+    # Mở khóa → sửa → khóa lại, CLI không chạy trong lúc kỳ đang mở
+    period_repo.update_trang_thai(q1.id, "Open")
+    _ghi_so(
+        JournalEntryRepository(db_session),
+        "HD04",
+        date(2025, 3, 1),
+        "1111",
+        "5111",
+        "50",
+    )
+    period_repo.update_trang_thai(q1.id, "Locked")
+
+    assert xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path) == [
+        tmp_path / ten_file_snapshot(q1.id)
+    ]
+    with LedgerSnapshot(tmp_path / ten_file_snapshot(q1.id)) as snapshot:
+        assert snapshot.lan_khoa == period_repo.get_lock_version(q1.id) == 1
+        assert snapshot.get_turnover("511", BD, KT) == (
+            report_repo.get_turnover("511", BD, KT)
+        )
+    assert xuat_cac_ky_da_khoa(period_repo, report_repo, tmp_path) == []
+
+
+def test_file_hong_bi_tu_choi(so_lieu, tmp_path):
+    _, report_repo, q1, _ = so_lieu
+    duong_dan = xuat_snapshot_ky(q1, report_repo, tmp_path)
+    noi_dung = duong_dan.read_bytes()
+
+    duong_dan.write_bytes(noi_dung[:-5])
+    with pytest.raises(ValueError, match="bị cắt cụt"):
+        LedgerSnapshot(duong_dan)
+    duong_dan.write_bytes(b"XXXXXXXX" + noi_dung[8:])
+    with pytest.raises(ValueError, match="không hợp lệ"):
+        LedgerSnapshot(duong_dan)
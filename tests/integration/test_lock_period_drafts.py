@@ -0,0 +1,116 @@
+# tests/integration/test_lock_period_drafts.py
+"""
+Integration Tests cho kiểm tra bút toán nháp khi khóa kỳ.
+
+📋 TT99/2025/TT-BTC:
+- Điều 25: Không khóa kỳ khi còn bút toán chưa ghi sổ.
+
+🎯 Mục tiêu:
+- Khóa kỳ chỉ chạy COUNT(*) và LIMIT 5 trên journal_entries, không nạp
+  bút toán / dòng bút toán.
+- Thông báo lỗi nêu tổng số nháp và tối đa 5 số phiếu.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.application.services.accounting_periods.lock_service import (
+    LockAccountingPeriodService,
+)
+from app.domain.models.accounting_period import KyKeToan
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+
+
+@pytest.fixture
+def ky_q1(db_session):
+    return AccountingPeriodRepository(db_session).add(
+        KyKeToan(
+            ten_ky="Q1-2025",
+            ngay_bat_dau=date(2025, 1, 1),
+            ngay_ket_thuc=date(2025, 3, 31),
+        )
+    )
+
+
+def _them(repo, so_phieu: str, ngay_ct: date, trang_thai: str = "Draft"):
+    repo.add(
+        JournalEntry(
+            ngay_ct=ngay_ct,
+            so_phieu=so_phieu,
+            trang_thai=trang_thai,
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("10")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("10")),
+            ],
+        )
+    )
+
+
+def test_dem_va_lay_mau_so_phieu_nhap(db_session, ky_q1):
+    repo = JournalEntryRepository(db_session)
+    for ngay in range(7, 0, -1):
+        _them(repo, f"PN{ngay:02d}", date(2025, 1, ngay))
+    _them(repo, "PT01", date(2025, 1, 1), trang_thai="Posted")
+    _them(repo, "PN99", date(2025, 4, 1))  # ngoài kỳ
+
+    bd, kt = date(2025, 1, 1), date(2025, 3, 31)
+    assert repo.count_drafts_in_range(bd, kt) == 7
+    assert repo.sample_draft_so_phieu(bd, kt, limit=3) == [
+        "PN01",
+        "PN02",
+        "PN03",
+    ]
+    assert repo.count_drafts_in_range(date(2025, 5, 1), date(2025, 5, 31)) == 0
+
+
+def test_khoa_ky_chi_dem_khong_nap_but_toan(db_session, db_engine, ky_q1):
+    repo = JournalEntryRepository(db_session)
+    for i in range(1, 8):
+        _them(repo, f"PN{i:02d}", date(2025, 2, i))
+    service = LockAccountingPeriodService(
+        AccountingPeriodRepository(db_session), repo
+    )
+
+    cau_lenh = []
+
+    def _ghi(conn, cursor, statement, parameters, context, executemany):
+        cau_lenh.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", _ghi)
+    try:
+        with pytest.raises(ValueError) as loi:
+            service.execute(ky_q1.id)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", _ghi)
+
+    assert str(loi.value) == (
+        "Không thể khóa kỳ 'Q1-2025'. Vẫn còn 7 bút toán nháp: "
+        "PN01, PN02, PN03, PN04, PN05..."
+    )
+    tren_but_toan = [c for c in cau_lenh if "journal_entries" in c]
+    assert len(tren_but_toan) == 2
+    assert "count(*)" in tren_but_toan[0].lower()
+    assert "LIMIT" in tren_but_toan[1]
+    assert not any("journal_entry_lines" in c for c in cau_lenh)
+
+
+def test_khoa_ky_khong_con_nhap(db_session, ky_q1):
+    repo = JournalEntryRepository(db_session)
+    _them(repo, "PT01", date(2025, 2, 1), trang_thai="Posted")
+    service = LockAccountingPeriodService(
+        AccountingPeriodRepository(db_session), repo
+    )
+
+    assert service.execute(ky_q1.id) is True
+    assert (
+        AccountingPeriodRepository(db_session).get_by_id(ky_q1.id).trang_thai
+        == "Locked"
+    )
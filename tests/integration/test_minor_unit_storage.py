@@ -0,0 +1,115 @@
+# tests/integration/test_minor_unit_storage.py
+"""
+Integration Tests cho chế độ lưu số tiền dạng BIGINT đơn vị nhỏ nhất.
+
+🎯 Mục tiêu:
+- Cột no_nho / co_nho luôn được ghi song song với cột Numeric.
+- Khi MONEY_STORAGE = "minor_units", SUM và ánh xạ về Domain đọc từ cột
+  BIGINT và cho kết quả giống hệt chế độ Numeric.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import config
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.models.sql_journal_entry import SQLJournalEntryLine
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _ghi_so(db_session):
+    repo = JournalEntryRepository(db_session)
+    but_toan = repo.add(
+        JournalEntry(
+            ngay_ct=date(2025, 5, 5),
+            so_phieu="HD99",
+            lines=[
+                JournalEntryLine(so_tai_khoan="1311", no=Decimal("1234.56")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("1234.56")),
+            ],
+        )
+    )
+    repo.update_status(but_toan.id, "Posted")
+    return repo, but_toan.id
+
+
+def test_ghi_song_song_cot_don_vi_nho(db_session):
+    _ghi_so(db_session)
+    dong = (
+        db_session.query(SQLJournalEntryLine)
+        .filter(SQLJournalEntryLine.so_tai_khoan == "1311")
+        .one()
+    )
+    assert (dong.no_nho, dong.co_nho) == (123456, 0)
+
+
+@pytest.mark.parametrize("che_do", ["numeric", "minor_units"])
+def test_doc_va_cong_theo_che_do_luu_tru(db_session, monkeypatch, che_do):
+    monkeypatch.setattr(config, "MONEY_STORAGE", che_do)
+    repo, id_but_toan = _ghi_so(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+
+    assert sorted(
+        report_repo.get_trial_balance(date(2025, 1, 1), date(2025, 12, 31))
+    ) == [
+        (
+            "1311",
+            Decimal(0),
+            Decimal("1234.56"),
+            Decimal(0),
+            Decimal("1234.56"),
+        ),
+        (
+            "5111",
+            Decimal(0),
+            Decimal(0),
+            Decimal("1234.56"),
+            Decimal("-1234.56"),
+        ),
+    ]
+    assert report_repo.get_account_balance(
+        "1311", date(2025, 5, 3), date(2025, 5, 20)
+    )[1] == Decimal("1234.56")
+    assert repo.get_by_id(id_but_toan).tong_no == Decimal("1234.56")
+
+
+@pytest.mark.parametrize("so_tien", ["10.005", "10.0001", "0.001"])
+def test_dong_le_qua_scale_bi_tu_choi(so_tien):
+    # Cùng quy tắc với migration 5a7c3e1b9d20: không làm tròn ngầm từng dòng
+    with pytest.raises(ValueError, match="tối đa 2 chữ số thập phân"):
+        JournalEntryLine(so_tai_khoan="1311", no=Decimal(so_tien))
+
+
+def test_so_tien_du_so_0_van_hop_le():
+    dong = JournalEntryLine(so_tai_khoan="1311", no=Decimal("10.0100"))
+    assert dong.no == Decimal("10.01")
+
+
+def test_migration_tu_choi_dong_le_hon_don_vi_nho():
+    import importlib.util
+    from pathlib import Path
+
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import create_engine, text
+
+    thu_muc = Path(__file__).parents[2] / "alembic" / "versions"
+    duong_dan = next(thu_muc.glob("5a7c3e1b9d20_*.py"))
+    spec = importlib.util.spec_from_file_location("mig_5a7c", duong_dan)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    # Bảng trước migration (chưa có no_nho / co_nho)
+    with create_engine("sqlite://").begin() as conn:
+        conn.execute(text("CREATE TABLE journal_entry_lines (no, co)"))
+        conn.execute(text("INSERT INTO journal_entry_lines VALUES (12.34, 0)"))
+        conn.execute(text("INSERT INTO journal_entry_lines VALUES (0, 1.005)"))
+        with Operations.context(MigrationContext.configure(conn)):
+            with pytest.raises(RuntimeError, match="Có 1 dòng"):
+                migration.upgrade()
@@ -0,0 +1,108 @@
+# tests/integration/test_period_index.py
+"""
+Integration Tests cho chỉ mục kỳ kế toán và kiểm tra khóa sổ.
+
+📋 TT99/2025/TT-BTC:
+- Điều 25: Không ghi sổ vào kỳ đã khóa.
+
+🎯 Mục tiêu:
+- Kiểm tra khóa sổ cho nhiều bút toán chỉ đọc bảng kỳ kế toán MỘT lần.
+- Kỳ lồng nhau: ngày thuộc kỳ con đã khóa (hoặc kỳ cha đã khóa) đều bị chặn.
+- Khóa / mở kỳ qua service làm chỉ mục được dựng lại.
+- Worker khác khóa kỳ (phiên bản kỳ trong DB tăng) → worker này bị chặn
+  ngay, không dùng chỉ mục cũ.
+"""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.application.factories.accounting_periods_service_factory import (
+    AccountingPeriodServiceFactory,
+)
+from app.domain.models.accounting_period import KyKeToan
+from app.infrastructure.cache.period_index import get_period_index
+from app.infrastructure.repositories.accounting_period_repository import (
+    AccountingPeriodRepository,
+)
+
+
+@pytest.fixture
+def factory(db_session, db_engine):
+    period_repo = AccountingPeriodRepository(db_session)
+    for ten_ky, bd, kt in (
+        ("Năm 2025", date(2025, 1, 1), date(2025, 12, 31)),
+        ("Q1-2025", date(2025, 1, 1), date(2025, 3, 31)),
+        ("Q2-2025", date(2025, 4, 1), date(2025, 6, 30)),
+    ):
+        period_repo.add(
+            KyKeToan(ten_ky=ten_ky, ngay_bat_dau=bd, ngay_ket_thuc=kt)
+        )
+    je_repo = MagicMock()
+    je_repo.count_drafts_in_range.return_value = 0
+    return AccountingPeriodServiceFactory(
+        period_repo, je_repo, period_index=get_period_index(db_engine)
+    )
+
+
+def test_tra_cuu_ky_theo_ngay_mot_lan_doc(factory, db_engine):
+    service = factory.create_period_service()
+
+    assert service.lay_ky_ke_toan_theo_ngay(date(2025, 2, 1)).ten_ky == (
+        "Q1-2025"
+    )
+    assert service.lay_ky_ke_toan_theo_ngay(date(2025, 9, 1)).ten_ky == (
+        "Năm 2025"
+    )
+    assert service.lay_ky_ke_toan_theo_ngay(date(2024, 12, 31)) is None
+    for thang in range(1, 13):
+        assert service.check_if_period_is_locked(date(2025, thang, 1)) is False
+    assert get_period_index(db_engine).so_lan_doc_db == 1
+
+
+def test_khoa_va_mo_ky_lam_moi_chi_muc(factory):
+    service = factory.create_period_service()
+    assert service.check_if_period_is_locked(date(2025, 5, 15)) is False
+
+    q2 = factory.create_query_service().lay_tat_ca_ky()[2]
+    factory.create_lock_service().execute(q2.id)
+
+    with pytest.raises(ValueError, match="'Q2-2025' đã khóa sổ"):
+        service.check_if_period_is_locked(date(2025, 5, 15))
+    assert service.check_if_period_is_locked(date(2025, 7, 1)) is False
+
+    factory.create_unlock_service().execute(q2.id, ly_do="Điều chỉnh")
+    assert service.check_if_period_is_locked(date(2025, 5, 15)) is False
+
+
+def test_ky_cha_da_khoa_chan_ca_ky_con(factory):
+    service = factory.create_period_service()
+    nam = factory.create_query_service().lay_tat_ca_ky()[0]
+    factory.create_lock_service().execute(nam.id)
+
+    with pytest.raises(ValueError, match="'Năm 2025' đã khóa sổ"):
+        service.check_if_period_is_locked(date(2025, 2, 1))
+
+
+def test_worker_khac_khoa_ky_thi_chan_ngay(hai_worker):
+    phien_nay, phien_khac = hai_worker
+    ky = AccountingPeriodRepository(phien_nay).add(
+        KyKeToan(
+            ten_ky="Q1-2025",
+            ngay_bat_dau=date(2025, 1, 1),
+            ngay_ket_thuc=date(2025, 3, 31),
+        )
+    )
+    service = AccountingPeriodServiceFactory(
+        AccountingPeriodRepository(phien_nay),
+        MagicMock(),
+        period_index=get_period_index(phien_nay.get_bind()),
+    ).create_period_service()
+    assert service.check_if_period_is_locked(date(2025, 2, 1)) is False
+    phien_nay.rollback()  # hết yêu cầu
+
+    # Worker khác khóa kỳ: chỉ mục của worker này không được xoa()
+    AccountingPeriodRepository(phien_khac).update_trang_thai(ky.id, "Locked")
+
+    with pytest.raises(ValueError, match="'Q1-2025' đã khóa sổ"):
+        service.check_if_period_is_locked(date(2025, 2, 1))
@@ -0,0 +1,102 @@
+# tests/integration/test_report_cache.py
+"""
+Integration Tests cho bộ nhớ đệm kết quả báo cáo theo phiên bản sổ cái.
+
+🎯 Mục tiêu:
+- Gọi lặp lại cùng báo cáo, cùng kỳ → trả kết quả đã đệm (không tính lại).
+- Mọi thay đổi bút toán (thêm / đổi trạng thái) → phiên bản sổ cái tăng,
+  báo cáo được tính lại với số liệu mới.
+- Phiên bản lưu trong DB: worker khác ghi sổ → báo cáo đệm ở đây hết
+  hiệu lực (không chỉ khi ghi trong cùng tiến trình).
+- LRU giới hạn số phần tử, đếm số lần trúng / trượt.
+"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.cache.report_cache import ReportCache
+from app.infrastructure.models.sql_data_version import SO_CAI, tang_phien_ban
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _ban_hang(repo, so_phieu, so_tien):
+    but_toan = repo.add(
+        JournalEntry(
+            ngay_ct=date(2025, 3, 3),
+            so_phieu=so_phieu,
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal(so_tien)),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal(so_tien)),
+            ],
+        )
+    )
+    return but_toan.id
+
+
+def test_lru_gioi_han_va_bo_dem():
+    cache = ReportCache(kich_thuoc_toi_da=2)
+    assert cache.lay_hoac_tinh("a", lambda: 1) == 1
+    assert cache.lay_hoac_tinh("b", lambda: 2) == 2
+    assert cache.lay_hoac_tinh("a", lambda: 99) == 1  # trúng, "a" mới dùng
+    cache.lay_hoac_tinh("c", lambda: 3)  # đẩy "b" ra
+    assert cache.lay_hoac_tinh("b", lambda: 20) == 20
+    assert (cache.so_lan_trung, cache.so_lan_truot) == (1, 4)
+    assert len(cache) == 2
+
+
+def test_bao_cao_duoc_dem_va_het_hieu_luc_khi_ghi_so(db_session):
+    repo = JournalEntryRepository(db_session)
+    cache = ReportCache()
+    factory = ReportServiceFactory(
+        ReportingRepositoryImpl(db_session), cache=cache
+    )
+    service = factory.create_trial_balance_service()
+    ky = (date(2025, 1, 1), date(2025, 12, 31))
+
+    id_1 = _ban_hang(repo, "HD01", "100")
+    repo.update_status(id_1, "Posted")
+    lan_1 = service.lay_bao_cao(*ky)
+    assert service.lay_bao_cao(*ky) is lan_1
+    assert (cache.so_lan_trung, cache.so_lan_truot) == (1, 1)
+
+    # Thêm bút toán nháp vẫn tăng phiên bản sổ cái
+    id_2 = _ban_hang(repo, "HD02", "50")
+    assert service.lay_bao_cao(*ky) is not lan_1
+
+    repo.update_status(id_2, "Posted")
+    lan_3 = service.lay_bao_cao(*ky)
+    assert lan_3.tong_phat_sinh_no == Decimal("150")
+    assert cache.so_lan_truot == 3
+
+
+def test_worker_khac_ghi_so_lam_bao_cao_het_hieu_luc(db_session):
+    """Phiên bản tăng ở phiên khác (worker khác) → khóa đệm đổi theo."""
+    repo = JournalEntryRepository(db_session)
+    cache = ReportCache()
+    service = ReportServiceFactory(
+        ReportingRepositoryImpl(db_session), cache=cache
+    ).create_trial_balance_service()
+    ky = (date(2025, 1, 1), date(2025, 12, 31))
+    repo.update_status(_ban_hang(repo, "HD01", "100"), "Posted")
+    lan_1 = service.lay_bao_cao(*ky)
+    db_session.rollback()  # hết yêu cầu: transaction đọc kết thúc
+    assert service.lay_bao_cao(*ky) is lan_1
+
+    # Worker khác chỉ chạm DB, không chạm bộ nhớ của tiến trình này
+    with Session(db_session.get_bind()) as khac:
+        tang_phien_ban(khac, SO_CAI)
+        khac.commit()
+    db_session.rollback()
+
+    assert service.lay_bao_cao(*ky) is not lan_1
+    assert (cache.so_lan_trung, cache.so_lan_truot) == (1, 2)
@@ -0,0 +1,118 @@
+# tests/integration/test_report_read_model.py
+"""
+Integration Tests cho read model DongSoCai (dòng sổ cái phát theo luồng).
+
+🎯 Mục tiêu:
+- iter_posted_lines trả đúng (Số TK, Ngày CT, Nợ, Có) của các dòng đã ghi
+  sổ trong khoảng ngày, theo thứ tự ngày chứng từ.
+- Duyệt cả năm theo luồng chiếm bộ nhớ đỉnh nhỏ hơn nhiều lần so với nạp
+  bút toán đầy đủ (ORM + JournalEntry).
+"""
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.domain.models.journal_entry import (
+    DongSoCai,
+    JournalEntry,
+    JournalEntryLine,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _ghi_so(db_session, so_but_toan: int) -> None:
+    repo = JournalEntryRepository(db_session)
+    for i in range(so_but_toan):
+        repo.add(
+            JournalEntry(
+                ngay_ct=date(2025, 1, 1) + timedelta(days=i % 365),
+                so_phieu=f"PT{i:04d}",
+                trang_thai="Posted",
+                lines=[
+                    JournalEntryLine(
+                        so_tai_khoan="1111", no=Decimal(i + 1), mo_ta="Thu"
+                    ),
+                    JournalEntryLine(
+                        so_tai_khoan="5111", co=Decimal(i + 1), mo_ta="DT"
+                    ),
+                ],
+            )
+        )
+
+
+def test_dong_so_cai_theo_luong(db_session):
+    repo = JournalEntryRepository(db_session)
+    for so_phieu, ngay, trang_thai in [
+        ("PT02", date(2025, 2, 1), "Posted"),
+        ("PT01", date(2025, 1, 5), "Posted"),
+        ("PN01", date(2025, 1, 6), "Draft"),
+        ("PT03", date(2025, 4, 1), "Posted"),  # ngoài khoảng
+    ]:
+        repo.add(
+            JournalEntry(
+                ngay_ct=ngay,
+                so_phieu=so_phieu,
+                trang_thai=trang_thai,
+                lines=[
+                    JournalEntryLine(so_tai_khoan="1111", no=Decimal("12.5")),
+                    JournalEntryLine(so_tai_khoan="5111", co=Decimal("12.5")),
+                ],
+            )
+        )
+
+    dong = list(
+        ReportingRepositoryImpl(db_session).iter_posted_lines(
+            date(2025, 1, 1), date(2025, 3, 31)
+        )
+    )
+
+    tien, khong = Decimal("12.50"), Decimal(0)
+    assert dong == [
+        ("1111", date(2025, 1, 5), tien, khong),
+        ("5111", date(2025, 1, 5), khong, tien),
+        ("1111", date(2025, 2, 1), tien, khong),
+        ("5111", date(2025, 2, 1), khong, tien),
+    ]
+    assert all(isinstance(d, DongSoCai) for d in dong)
+    assert dong[0].so_tai_khoan == "1111" and dong[0].no == tien
+
+
+def _bo_nho_dinh(ham) -> int:
+    ham()  # làm nóng: biên dịch câu SQL, bộ nhớ đệm của SQLAlchemy
+    tracemalloc.start()
+    try:
+        ham()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_duyet_theo_luong_it_bo_nho_hon_nap_but_toan(db_session):
+    _ghi_so(db_session, 1000)
+    db_session.expunge_all()
+    repo = ReportingRepositoryImpl(db_session)
+    bd, kt = date(2025, 1, 1), date(2025, 12, 31)
+
+    def nap_but_toan():
+        return sum(
+            (
+                line.no
+                for bt in repo.get_all_posted_in_range(bd, kt)
+                for line in bt.lines
+            ),
+            Decimal(0),
+        )
+
+    def theo_luong():
+        return sum(
+            (d.no for d in repo.iter_posted_lines(bd, kt, kich_thuoc_lo=50)),
+            Decimal(0),
+        )
+
+    assert nap_but_toan() == theo_luong()
+    assert _bo_nho_dinh(theo_luong) * 10 < _bo_nho_dinh(nap_but_toan)
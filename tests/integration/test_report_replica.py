@@ -0,0 +1,188 @@
+# tests/integration/test_report_replica.py
+"""
+Integration Tests cho pool kết nối và định tuyến báo cáo sang replica.
+
+🎯 Mục tiêu:
+- Tham số pool / statement_timeout đúng theo loại DB và driver.
+- Phiên báo cáo đọc từ replica (một DB SQLite thứ hai đóng vai replica).
+- Replica không kết nối được → quay về DB chính (Session và AsyncSession).
+- Replica trễ hơn bộ nhớ trong tiến trình → đọc thẳng replica, không trộn.
+"""
+import asyncio
+import shutil
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.application.factories.report_service_factory import (
+    ReportServiceFactory,
+)
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app import config
+from app.infrastructure.base import Base
+from app.infrastructure.cache.engine_alias import dang_ky_engine_cung_db
+from app.infrastructure.database import (
+    mo_phien_bao_cao,
+    mo_phien_bao_cao_async,
+    tham_so_engine,
+)
+from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.models.sql_journal_entry import SQLJournalEntry
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+from app.infrastructure.seed import COA_DATA
+
+
+def _ghi_so_doanh_thu(db, so_phieu: str, doanh_thu: str) -> None:
+    repo = JournalEntryRepository(db)
+    but_toan = repo.add(
+        JournalEntry(
+            ngay_ct=date(2025, 3, 1),
+            so_phieu=so_phieu,
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal(doanh_thu)),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal(doanh_thu)),
+            ],
+        )
+    )
+    repo.update_status(but_toan.id, "Posted")
+
+
+def _tao_db(duong_dan, doanh_thu: str):
+    """DB SQLite dạng file có một bút toán doanh thu đã ghi sổ."""
+    engine = create_engine(f"sqlite:///{duong_dan}")
+    Base.metadata.create_all(bind=engine)
+    tao_phien = sessionmaker(autoflush=False, bind=engine)
+    with tao_phien() as db:
+        db.add_all(
+            [
+                SQLAccount(**item)
+                for item in COA_DATA
+                if not item["so_tai_khoan"].startswith("9")
+            ]
+        )
+        db.commit()
+        _ghi_so_doanh_thu(db, "PT01", doanh_thu)
+    return engine, tao_phien
+
+
+def _doanh_thu(db) -> Decimal:
+    b02 = (
+        ReportServiceFactory(ReportingRepositoryImpl(db))
+        .create_performance_service()
+        .lay_bao_cao(
+            "Q1-2025", date(2025, 3, 31), date(2025, 1, 1), date(2025, 3, 31)
+        )
+    )
+    return b02.doanh_thu_ban_hang
+
+
+def test_tham_so_engine_theo_loai_db():
+    sqlite = tham_so_engine("sqlite://")
+    assert "pool_size" not in sqlite
+    assert sqlite["pool_pre_ping"] is True
+
+    pg = tham_so_engine(
+        "postgresql://u:p@h/db",
+        pool_size=20,
+        max_overflow=0,
+        statement_timeout_ms=30000,
+    )
+    assert pg["pool_size"] == 20
+    assert pg["max_overflow"] == 0
+    assert pg["connect_args"] == {"options": "-c statement_timeout=30000"}
+
+    pg_async = tham_so_engine(
+        "postgresql+asyncpg://u:p@h/db", statement_timeout_ms=500
+    )
+    assert pg_async["connect_args"] == {
+        "server_settings": {"statement_timeout": "500"}
+    }
+    assert "connect_args" not in tham_so_engine("postgresql://u:p@h/db")
+
+
+def test_bao_cao_doc_tu_replica_va_quay_ve_db_chinh(tmp_path):
+    chinh, phien_chinh = _tao_db(tmp_path / "chinh.db", "1000")
+    replica, phien_replica = _tao_db(tmp_path / "replica.db", "2000")
+    hong = create_engine(
+        f"sqlite:///{tmp_path / 'khong_co' / 'replica.db'}"
+    )
+    phien_hong = sessionmaker(bind=hong)
+
+    with mo_phien_bao_cao(phien_replica, phien_chinh) as db:
+        assert _doanh_thu(db) == Decimal("2000")
+    with mo_phien_bao_cao(phien_hong, phien_chinh) as db:
+        assert _doanh_thu(db) == Decimal("1000")
+    with mo_phien_bao_cao(phien_chinh, phien_chinh) as db:
+        assert _doanh_thu(db) == Decimal("1000")
+
+    for engine in (chinh, replica, hong):
+        engine.dispose()
+
+
+def test_phien_async_quay_ve_db_chinh(tmp_path):
+    """Luồng xuất Parquet (AsyncSession) cũng quay về DB chính."""
+    _tao_db(tmp_path / "chinh.db", "1000")[0].dispose()
+
+    async def _chay():
+        chinh = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/chinh.db")
+        hong = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'khong_co' / 'replica.db'}"
+        )
+        phien_chinh = async_sessionmaker(chinh, expire_on_commit=False)
+        phien_hong = async_sessionmaker(hong, expire_on_commit=False)
+        async with mo_phien_bao_cao_async(phien_hong, phien_chinh) as db:
+            so_phieu = await db.scalar(
+                select(func.count()).select_from(SQLJournalEntry)
+            )
+        for engine in (chinh, hong):
+            await engine.dispose()
+        return so_phieu
+
+    assert asyncio.run(_chay()) == 1
+
+
+def test_replica_tre_khong_dung_bo_nho_moi_hon(tmp_path, monkeypatch):
+    """
+    Replica chưa nhận bút toán mới nhất (phiên bản sổ cái thấp hơn bộ nhớ
+    của tiến trình): báo cáo trên replica đọc thẳng replica, nhất quán với
+    khóa đệm (phiên bản đọc trong phiên replica).
+    """
+    monkeypatch.setattr(config, "COLUMNAR_LEDGER_STORE", True)
+    chinh, phien_chinh = _tao_db(tmp_path / "chinh.db", "1000")
+    chinh.dispose()
+    shutil.copy(tmp_path / "chinh.db", tmp_path / "replica.db")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    dang_ky_engine_cung_db(replica, chinh)
+
+    with phien_chinh() as db:
+        _ghi_so_doanh_thu(db, "PT02", "500")
+        repo = ReportingRepositoryImpl(db)
+        # Nạp chỉ mục / kho dạng cột từ DB chính (đã có PT02)
+        assert repo.get_turnover(
+            "511", date(2025, 1, 1), date(2025, 3, 31)
+        ) == (Decimal(0), Decimal("1500"))
+        assert repo.get_posted_columns(date(2025, 3, 31)) is not None
+        assert _doanh_thu(db) == Decimal("1500")
+
+    with sessionmaker(bind=replica)() as db:
+        repo = ReportingRepositoryImpl(db)
+        assert repo.get_posted_columns(date(2025, 3, 31)) is None
+        assert repo.get_turnover(
+            "511", date(2025, 1, 1), date(2025, 3, 31)
+        ) == (Decimal(0), Decimal("1000"))
+        assert _doanh_thu(db) == Decimal("1000")
+
+    with phien_chinh() as db:
+        # DB chính vẫn dùng bộ nhớ (không bị replica trễ làm mất)
+        assert _doanh_thu(db) == Decimal("1500")
+
+    for engine in (chinh, replica):
+        engine.dispose()
@@ -0,0 +1,109 @@
+# tests/integration/test_sql_instrumentation.py
+"""
+Integration Tests cho đo SQL theo yêu cầu và phát hiện N+1.
+
+🎯 Mục tiêu:
+- Câu lệnh cùng hình dạng (khác tham số, khác số phần tử IN) được gộp.
+- Phạm vi đo lồng nhau đều nhận câu lệnh; ngoài phạm vi không đo.
+- Middleware gắn X-DB-Queries / X-DB-Time, ghi log JSON và cảnh báo N+1
+  cho cả endpoint đồng bộ (threadpool) lẫn async (run_sync).
+"""
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.infrastructure.database import get_db
+from app.infrastructure.models.sql_account import SQLAccount
+from app.infrastructure.sql_instrumentation import (
+    hinh_dang_cau_lenh,
+    theo_doi_sql,
+)
+from app.main import app
+from app.presentation.api.middleware import SQLInstrumentationMiddleware
+
+
+def test_hinh_dang_cau_lenh_gop_tham_so():
+    assert hinh_dang_cau_lenh(
+        "SELECT a\n  FROM t WHERE id IN (?, ?, ?)"
+    ) == hinh_dang_cau_lenh("SELECT a FROM t WHERE id IN (?)")
+    assert hinh_dang_cau_lenh(
+        "SELECT a FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+    ) == ("SELECT a FROM t WHERE id IN (?)")
+
+
+def test_pham_vi_do_long_nhau(db_session):
+    db_session.execute(text("SELECT 1"))  # ngoài phạm vi: không đo
+    with theo_doi_sql() as ngoai:
+        for so_tai_khoan in ["1111", "1121", "1311"]:
+            db_session.execute(
+                select(SQLAccount).where(
+                    SQLAccount.so_tai_khoan == so_tai_khoan
+                )
+            )
+        with theo_doi_sql() as trong:
+            db_session.execute(text("SELECT 2"))
+
+    assert (ngoai.so_cau_lenh, trong.so_cau_lenh) == (4, 1)
+    assert ngoai.thoi_gian_db > 0
+    [(cau_lenh, so_lan)] = ngoai.lap_lai(2)
+    assert cau_lenh.startswith("SELECT accounts.") and so_lan == 3
+    assert ngoai.lap_lai(3) == []
+
+
+def test_header_tren_endpoint_that(db_session):
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        with TestClient(app) as client:
+            response = client.get("/accounting/v1/accounts")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert float(response.headers["X-DB-Time"]) > 0
+
+
+def _ung_dung_n_cong_1(db_engine) -> FastAPI:
+    ung_dung = FastAPI()
+    ung_dung.add_middleware(SQLInstrumentationMiddleware, nguong_lap_lai=10)
+    async_engine = create_async_engine("sqlite+aiosqlite://")
+
+    @ung_dung.get("/dong-bo")
+    def dong_bo():
+        with db_engine.connect() as conn:
+            for i in range(12):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    @ung_dung.get("/bat-dong-bo")
+    async def bat_dong_bo():
+        async with async_engine.connect() as conn:
+            await conn.run_sync(lambda c: c.execute(text("SELECT 1")))
+        return {}
+
+    return ung_dung
+
+
+def test_middleware_canh_bao_n_cong_1(db_engine, caplog):
+    caplog.set_level(logging.INFO, logger="app.sql")
+    with TestClient(_ung_dung_n_cong_1(db_engine)) as client:
+        dong_bo = client.get("/dong-bo")
+        bat_dong_bo = client.get("/bat-dong-bo")
+
+    assert dong_bo.headers["X-DB-Queries"] == "12"
+    assert bat_dong_bo.headers["X-DB-Queries"] == "1"
+
+    ban_ghi = [r for r in caplog.records if r.name == "app.sql"]
+    canh_bao, binh_thuong = [json.loads(r.getMessage()) for r in ban_ghi]
+    assert [r.levelno for r in ban_ghi] == [logging.WARNING, logging.INFO]
+    assert canh_bao["duong_dan"] == "/dong-bo"
+    assert canh_bao["so_cau_lenh"] == 12
+    assert canh_bao["nghi_n_cong_1"] == [
+        {"cau_lenh": "SELECT ?", "so_lan": 12}
+    ]
+    assert binh_thuong["trang_thai"] == 200
+    assert "nghi_n_cong_1" not in binh_thuong
@@ -0,0 +1,95 @@
+# tests/integration/test_trial_balance.py
+"""
+Integration Tests cho Bảng cân đối số phát sinh.
+
+🎯 Mục tiêu:
+- SDĐK / PS Nợ / PS Có / SDCK của mọi TK tính bằng một truy vấn gom nhóm.
+- Tùy chọn cộng dồn TK con lên TK cha theo cây hệ thống tài khoản.
+"""
+from datetime import date
+from decimal import Decimal
+
+from app.application.services.reports.trial_balance_service import (
+    TrialBalanceService,
+)
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _ghi_so(repo, so_phieu, ngay, tk_no, tk_co, so_tien):
+    but_toan = repo.add(
+        JournalEntry(
+            ngay_ct=ngay,
+            so_phieu=so_phieu,
+            lines=[
+                JournalEntryLine(so_tai_khoan=tk_no, no=Decimal(so_tien)),
+                JournalEntryLine(so_tai_khoan=tk_co, co=Decimal(so_tien)),
+            ],
+        )
+    )
+    repo.update_status(but_toan.id, "Posted")
+
+
+def _tao_so_lieu(db_session):
+    repo = JournalEntryRepository(db_session)
+    _ghi_so(repo, "PT01", date(2025, 1, 5), "1111", "4111", "1000")
+    _ghi_so(repo, "PT02", date(2025, 2, 10), "1121", "1111", "300")
+    _ghi_so(repo, "PT03", date(2025, 2, 20), "1111", "5111", "200")
+    # Bút toán nháp không được tính
+    repo.add(
+        JournalEntry(
+            ngay_ct=date(2025, 2, 25),
+            so_phieu="PT04",
+            lines=[
+                JournalEntryLine(so_tai_khoan="1111", no=Decimal("999")),
+                JournalEntryLine(so_tai_khoan="5111", co=Decimal("999")),
+            ],
+        )
+    )
+
+
+def test_get_trial_balance_mot_truy_van(db_session):
+    _tao_so_lieu(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+
+    so_lieu = {
+        dong[0]: dong[1:]
+        for dong in report_repo.get_trial_balance(
+            date(2025, 2, 1), date(2025, 2, 28)
+        )
+    }
+    assert so_lieu["1111"] == (
+        Decimal("1000"),
+        Decimal("200"),
+        Decimal("300"),
+        Decimal("900"),
+    )
+    assert so_lieu["4111"] == (
+        Decimal("-1000"),
+        Decimal("0"),
+        Decimal("0"),
+        Decimal("-1000"),
+    )
+
+
+def test_trial_balance_tong_hop_theo_cay(db_session):
+    _tao_so_lieu(db_session)
+    service = TrialBalanceService(ReportingRepositoryImpl(db_session))
+
+    bang = service.lay_bao_cao(
+        date(2025, 2, 1), date(2025, 2, 28), tong_hop_theo_cay=True
+    )
+    dong = {d.so_tai_khoan: d for d in bang.chi_tiet_tai_khoan}
+
+    assert dong["111"].so_du_dau_ky_no == Decimal("1000")
+    assert dong["111"].so_du_cuoi_ky_no == Decimal("900")
+    assert dong["112"].phat_sinh_no == Decimal("300")
+    assert dong["411"].so_du_cuoi_ky_co == Decimal("1000")
+    # Chỉ cộng TK gốc → không tính trùng TK con
+    assert bang.tong_phat_sinh_no == bang.tong_phat_sinh_co == Decimal("500")
+    assert bang.tong_so_du_cuoi_ky_no == bang.tong_so_du_cuoi_ky_co
@@ -0,0 +1,118 @@
+# tests/integration/test_turnover_index.py
+"""
+Integration Tests cho chỉ mục phát sinh theo ngày (Fenwick tree).
+
+🎯 Mục tiêu:
+- Truy vấn PS Nợ/Có khoảng ngày bất kỳ khớp với dữ liệu đã ghi sổ.
+- Chỉ mục được cập nhật tăng dần khi ghi sổ / hủy ghi sổ (không nạp lại).
+- Worker khác ghi sổ (phiên bản sổ cái trong DB tăng) → nạp lại từ DB.
+"""
+from datetime import date
+from decimal import Decimal
+
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from app.infrastructure.cache.turnover_index import (
+    ChiSoPhatSinhNam,
+    FenwickTree,
+)
+from app.infrastructure.repositories.journal_entry_repository import (
+    JournalEntryRepository,
+)
+from app.infrastructure.repositories.reporting_repository_impl import (
+    ReportingRepositoryImpl,
+)
+
+
+def _ban_hang(so_phieu: str, ngay: date, so_tien: str) -> JournalEntry:
+    return JournalEntry(
+        ngay_ct=ngay,
+        so_phieu=so_phieu,
+        lines=[
+            JournalEntryLine(so_tai_khoan="1311", no=Decimal(so_tien)),
+            JournalEntryLine(so_tai_khoan="5111", co=Decimal(so_tien)),
+        ],
+    )
+
+
+def test_fenwick_tong_khoang():
+    cay = FenwickTree(10)
+    for i in range(10):
+        cay.cong(i, Decimal(i))
+    assert cay.tong_khoang(0, 9) == Decimal(45)
+    assert cay.tong_khoang(3, 5) == Decimal(12)
+    assert cay.tong_khoang(5, 3) == Decimal(0)
+
+
+def test_phat_sinh_chi_cong_doan_tai_khoan_con():
+    chi_so = ChiSoPhatSinhNam(2025, phien_ban=0)
+    for so_tai_khoan in ["1311", "131", "1312", "13", "1321", "1111"]:
+        chi_so.cong(so_tai_khoan, date(2025, 3, 1), Decimal(1), Decimal(0))
+
+    assert chi_so._doan_tai_khoan("131") == ["131", "1311", "1312"]
+    assert chi_so.phat_sinh(
+        "131", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (Decimal(3), Decimal(0))
+    assert chi_so.phat_sinh(
+        "13", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (Decimal(5), Decimal(0))
+    assert chi_so._doan_tai_khoan("14") == []
+
+
+def test_phat_sinh_theo_khoang_ngay_va_cap_nhat_tang_dan(db_session):
+    repo = JournalEntryRepository(db_session)
+    report_repo = ReportingRepositoryImpl(db_session)
+
+    bt1 = repo.add(_ban_hang("HD01", date(2025, 2, 10), "100"))
+    repo.update_status(bt1.id, "Posted")
+
+    # Lần hỏi đầu tiên nạp năm 2025 vào chỉ mục; TK 131 gồm cả TK con 1311
+    assert report_repo.get_turnover(
+        "131", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (Decimal("100"), Decimal("0"))
+
+    bt2 = repo.add(_ban_hang("HD02", date(2025, 6, 1), "40"))
+    repo.update_status(bt2.id, "Posted")
+    assert report_repo.get_turnover(
+        "511", date(2025, 1, 1), date(2025, 12, 31)
+    ) == (Decimal("0"), Decimal("140"))
+    assert report_repo.get_turnover(
+        "511", date(2025, 3, 1), date(2025, 6, 1)
+    ) == (Decimal("0"), Decimal("40"))
+
+    repo.update_status(bt1.id, "Draft")
+    assert report_repo.get_turnover(
+        "1311", date(2024, 12, 1), date(2026, 1, 31)
+    ) == (Decimal("40"), Decimal("0"))
+
+
+def test_worker_khac_ghi_so_thi_nap_lai(hai_worker, monkeypatch):
+    phien_nay, phien_khac = hai_worker
+    repo_nay = JournalEntryRepository(phien_nay)
+    repo_khac = JournalEntryRepository(phien_khac)
+    so_lan_nap = []
+    nap_nam = ReportingRepositoryImpl._phat_sinh_theo_ngay
+    monkeypatch.setattr(
+        ReportingRepositoryImpl,
+        "_phat_sinh_theo_ngay",
+        lambda self, nam: so_lan_nap.append(nam) or nap_nam(self, nam),
+    )
+    ca_nam = (date(2025, 1, 1), date(2025, 12, 31))
+
+    bt1 = repo_nay.add(_ban_hang("HD01", date(2025, 2, 10), "100"))
+    repo_nay.update_status(bt1.id, "Posted")
+    report_repo = ReportingRepositoryImpl(phien_nay)
+    assert report_repo.get_turnover("131", *ca_nam)[0] == Decimal("100")
+    phien_nay.rollback()  # hết yêu cầu
+
+    # Chính worker này ghi sổ → nối tăng dần, không nạp lại
+    bt2 = repo_nay.add(_ban_hang("HD02", date(2025, 3, 1), "20"))
+    repo_nay.update_status(bt2.id, "Posted")
+    assert report_repo.get_turnover("131", *ca_nam)[0] == Decimal("120")
+    assert so_lan_nap == [2025]
+    phien_nay.rollback()
+
+    # Worker khác ghi sổ: bộ nhớ của worker này không được báo
+    bt3 = repo_khac.add(_ban_hang("HD03", date(2025, 4, 1), "5"))
+    repo_khac.update_status(bt3.id, "Posted")
+    assert report_repo.get_turnover("131", *ca_nam)[0] == Decimal("125")
+    assert so_lan_nap == [2025, 2025]
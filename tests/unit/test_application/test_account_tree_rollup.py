@@ -0,0 +1,86 @@
+# tests/unit/test_application/test_account_tree_rollup.py
+"""
+Unit tests cho AccountTreeRollup và B01-DN dựng trên cây tài khoản.
+
+📋 TT99/2025/TT-BTC:
+- Phụ lục II: Tài khoản cấp 2 thuộc tài khoản cấp 1 (so_tai_khoan_cha)
+- Phụ lục IV: Chỉ tiêu B01-DN lấy số dư của TK cấp 1 (gồm TK con)
+"""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from app.application.services.reports.account_tree_rollup import (
+    AccountTreeRollup,
+)
+from app.application.services.reports.financial_position_service import (
+    FinancialPositionService,
+)
+from app.domain.models.account import LoaiTaiKhoan, TaiKhoan
+
+
+def _tk(so_tk, loai, cha=None):
+    return TaiKhoan(
+        so_tai_khoan=so_tk,
+        ten_tai_khoan=f"TK {so_tk}",
+        loai_tai_khoan=loai,
+        cap_tai_khoan=2 if cha else 1,
+        so_tai_khoan_cha=cha,
+    )
+
+
+HE_THONG_TK = [
+    _tk("111", LoaiTaiKhoan.TAI_SAN),
+    _tk("1111", LoaiTaiKhoan.TAI_SAN, "111"),
+    _tk("1112", LoaiTaiKhoan.TAI_SAN, "111"),
+    _tk("211", LoaiTaiKhoan.TAI_SAN),
+    _tk("214", LoaiTaiKhoan.TAI_SAN),
+    _tk("2141", LoaiTaiKhoan.TAI_SAN, "214"),
+    _tk("331", LoaiTaiKhoan.NO_PHAI_TRA),
+    _tk("411", LoaiTaiKhoan.VON_CHU_SO_HUU),
+]
+
+
+def test_cong_don_tu_tk_con_len_tk_cha():
+    cay = AccountTreeRollup(HE_THONG_TK).tong_hop(
+        {
+            "1111": (Decimal("500"), Decimal("100")),
+            "1112": (Decimal("50"), Decimal("0")),
+            "111": (Decimal("10"), Decimal("0")),  # Ghi trực tiếp lên TK cha
+            "2141": (Decimal("0"), Decimal("30")),
+        }
+    )
+    assert cay.no_co("111") == (Decimal("560"), Decimal("100"))
+    assert cay.so_du_thuan("111") == Decimal("460")
+    assert cay.so_du_thuan("214") == Decimal("-30")
+    assert cay.so_du_thuan("999") == Decimal(0)
+
+
+def test_b01_tinh_tu_mot_lan_cong_don():
+    repo = MagicMock()
+    repo.get_all_accounts.return_value = HE_THONG_TK
+    so_du = {
+        "1111": (Decimal("700"), Decimal("0")),
+        "211": (Decimal("400"), Decimal("0")),
+        "2141": (Decimal("0"), Decimal("100")),
+        "331": (Decimal("0"), Decimal("200")),
+        "411": (Decimal("0"), Decimal("800")),
+    }
+    repo.get_trial_balance.return_value = [
+        (tk, Decimal(0), no, co, no - co) for tk, (no, co) in so_du.items()
+    ]
+
+    bao_cao = FinancialPositionService(repo).lay_bao_cao(
+        "Năm 2025", date(2025, 12, 31), date(2025, 12, 31)
+    )
+
+    tai_san = bao_cao.tai_san
+    assert (
+        tai_san.tai_san_ngan_han.tien_va_cac_khoan_tuong_duong_tien.tien_mat
+        == Decimal("700.00")
+    )
+    assert tai_san.tai_san_dai_han.tai_san_co_dinh_huu_hinh == Decimal(
+        "300.00"
+    )
+    assert tai_san.tong_cong_tai_san == Decimal("1000.00")
+    assert bao_cao.nguon_von.tong_cong_nguon_von == Decimal("1000.00")
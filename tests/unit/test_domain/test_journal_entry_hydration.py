@@ -0,0 +1,79 @@
+# tests/unit/test_domain/test_journal_entry_hydration.py
+"""
+Unit tests cho đường dựng tin cậy `tu_du_lieu_da_luu` của bút toán.
+
+🎯 Mục tiêu:
+- Kết quả bằng (==) đối tượng dựng qua constructor có kiểm tra.
+- Không chạy lại __post_init__ (dữ liệu đã lưu được tin cậy).
+- Dòng bút toán vẫn bất biến (frozen) sau khi dựng.
+"""
+import dataclasses
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.domain.models.journal_entry import JournalEntry, JournalEntryLine
+from benchmarks.hydration import do_hydration
+
+
+def test_dung_tin_cay_bang_dung_co_kiem_tra():
+    co_kiem_tra = JournalEntry(
+        id=7,
+        ngay_ct=date(2025, 1, 15),
+        so_phieu="PT01",
+        mo_ta="Bán hàng",
+        lines=[
+            JournalEntryLine(so_tai_khoan="1111", no=Decimal("100")),
+            JournalEntryLine(
+                so_tai_khoan="5111", co=Decimal("100"), mo_ta="Doanh thu"
+            ),
+        ],
+        trang_thai="Posted",
+    )
+    tin_cay = JournalEntry.tu_du_lieu_da_luu(
+        7,
+        date(2025, 1, 15),
+        "PT01",
+        "Bán hàng",
+        [
+            JournalEntryLine.tu_du_lieu_da_luu(
+                "1111", Decimal("100"), Decimal("0")
+            ),
+            JournalEntryLine.tu_du_lieu_da_luu(
+                "5111", Decimal("0"), Decimal("100"), "Doanh thu"
+            ),
+        ],
+        "Posted",
+    )
+    assert tin_cay == co_kiem_tra
+    assert dataclasses.asdict(tin_cay) == dataclasses.asdict(co_kiem_tra)
+    assert tin_cay.tong_no == tin_cay.tong_co == Decimal("100.00")
+
+
+def test_dung_tin_cay_khong_kiem_tra_lai_bat_bien():
+    # Lệch Nợ/Có, một dòng: constructor sẽ từ chối, đường tin cậy thì không
+    dong = JournalEntryLine.tu_du_lieu_da_luu(
+        "1111", Decimal("0"), Decimal("0")
+    )
+    but_toan = JournalEntry.tu_du_lieu_da_luu(
+        1, date(2025, 1, 1), "PT01", "", [dong], "Posted"
+    )
+    assert but_toan.lines == [dong]
+    with pytest.raises(ValueError):
+        JournalEntry(so_phieu="PT01", lines=[dong])
+
+
+def test_dong_dung_tin_cay_van_bat_bien():
+    dong = JournalEntryLine.tu_du_lieu_da_luu(
+        "1111", Decimal("10"), Decimal("0")
+    )
+    assert dong.ty_gia is None and dong.ma_dong_tien is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        dong.no = Decimal("20")
+
+
+def test_benchmark_hydration_do_chi_phi_moi_dong():
+    ket_qua = do_hydration(so_dong=200, so_lan=1)
+    assert set(ket_qua) == {"kiem_tra", "tin_cay"}
+    assert all(so_do["ns_moi_dong"] > 0 for so_do in ket_qua.values())